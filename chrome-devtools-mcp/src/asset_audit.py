@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""Asset Weight Audit
+
+This module estimates how many bytes a page's scripts, stylesheets and fonts could shed.
+For each asset body it measures the decoded size, the gzip level 9 size and a brotli
+size, and compares them with the body bytes actually transferred, leaving out response
+headers. Responses that were already content-encoded or came from a cache are not
+reported as compression opportunities. It also finds:
+
+    - Assets with identical content served from more than one URL
+    - Large base64 blobs inlined into text assets, such as images or fonts embedded as
+      ``data:`` URLs in JavaScript or CSS, and large ``data:`` URL requests themselves
+
+Brotli sizes are measured with quality 11 when the ``brotli`` package is installed.
+Otherwise they are estimated from the gzip size, since brotli typically saves a further
+15-20% on text and nothing on already compressed formats such as WOFF2.
+"""
+
+from __future__ import annotations
+
+import base64
+import gzip
+import hashlib
+import re
+from typing import Any
+
+from .cache_analysis import cache_source
+
+try:
+    import brotli  # type: ignore[import-not-found]
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+ASSET_TYPES = {"Script": "script", "Stylesheet": "stylesheet", "Font": "font"}
+DEFAULT_MIN_BLOB_BYTES = 4 * 1024
+# Ratio of brotli-11 to gzip-9 output for text, used when brotli is not installed
+_BROTLI_TEXT_RATIO = 0.82
+_PRECOMPRESSED_MIME_TYPES = ("font/woff2", "font/woff", "application/font-woff")
+_INLINE_PATTERN = r"data:([\w.+-]+/[\w.+-]+)?(?:;[\w-]+=[\w-]+)*;base64,([A-Za-z0-9+/]{%d,}={0,2})"
+
+
+def body_bytes(result: dict[str, Any]) -> bytes:
+    """Decode a ``Network.getResponseBody`` result to raw bytes."""
+    body = result.get("body", "")
+    if result.get("base64Encoded"):
+        return base64.b64decode(body)
+    return str(body).encode("utf-8", "surrogatepass")
+
+
+def compressed_sizes(raw: bytes, mime_type: str = "") -> dict[str, Any]:
+    """Return the raw, gzip-9 and brotli sizes of a body."""
+    gzip_size = len(gzip.compress(raw, compresslevel=9, mtime=0))
+    if brotli is not None:
+        brotli_size = len(brotli.compress(raw, quality=11))
+    elif mime_type.startswith(_PRECOMPRESSED_MIME_TYPES):
+        brotli_size = gzip_size
+    else:
+        brotli_size = int(gzip_size * _BROTLI_TEXT_RATIO)
+    return {
+        "rawBytes": len(raw),
+        "gzipBytes": gzip_size,
+        "brotliBytes": min(brotli_size, len(raw)),
+        "brotliEstimated": brotli is None,
+    }
+
+
+def transfer_size(record: dict[str, Any], raw_size: int) -> int:
+    """
+    Return the body bytes a record transferred over the network.
+
+    Cache hits transferred nothing. ``encodedDataLength`` on completion includes the
+    response headers, so the bytes already received when the response arrived are
+    subtracted from it.
+    """
+    if cache_source(record) != "network":
+        return 0
+    total = record.get("encodedDataLength")
+    if not total:
+        return raw_size
+    headers = (record.get("response") or {}).get("encodedDataLength") or 0
+    return max(0, int(total) - int(headers))
+
+
+def content_encoding(record: dict[str, Any]) -> str:
+    """Return the lower-cased Content-Encoding a response was served with, if any."""
+    headers = (record.get("response") or {}).get("headers") or {}
+    for name, value in headers.items():
+        if name.lower() == "content-encoding":
+            return str(value).strip().lower()
+    return ""
+
+
+def find_inline_blobs(text: str, min_bytes: int = DEFAULT_MIN_BLOB_BYTES) -> list[dict[str, Any]]:
+    """
+    Find base64 ``data:`` URLs of at least ``min_bytes`` encoded characters in text.
+
+    Returns:
+        One entry per blob with its MIME type, offset, encoded and decoded sizes
+    """
+    blobs = []
+    for match in re.finditer(_INLINE_PATTERN % min_bytes, text):
+        encoded = len(match.group(2))
+        blobs.append(
+            {
+                "mimeType": match.group(1) or "text/plain",
+                "offset": match.start(),
+                "encodedBytes": encoded,
+                "decodedBytes": encoded * 3 // 4 - match.group(2).count("="),
+            }
+        )
+    return blobs
+
+
+def audit_assets(
+    assets: list[tuple[dict[str, Any], bytes]],
+    min_blob_bytes: int = DEFAULT_MIN_BLOB_BYTES,
+    limit: int = 20,
+) -> dict[str, Any]:
+    """
+    Audit asset bodies for compression, duplication and inlined blob savings.
+
+    Args:
+        assets: Pairs of a network record and its decoded body
+        min_blob_bytes: Smallest inlined base64 blob to report, in encoded bytes
+        limit: Maximum number of assets and opportunities to report
+
+    Returns:
+        Totals, per-asset sizes, duplicate groups, inlined blobs and savings opportunities
+        ranked by bytes saved
+    """
+    rows = []
+    by_hash: dict[str, list[dict[str, Any]]] = {}
+    blobs = []
+    opportunities = []
+    totals = {"transferBytes": 0, "rawBytes": 0, "gzipBytes": 0, "brotliBytes": 0}
+
+    for record, raw in assets:
+        url = record.get("url", "")
+        mime_type = (record.get("response") or {}).get("mimeType", "")
+        transfer = transfer_size(record, len(raw))
+        encoding = content_encoding(record)
+        digest = hashlib.sha256(raw).hexdigest()
+        row = {
+            "url": url if not url.startswith("data:") else url[:64] + "...",
+            "type": ASSET_TYPES.get(record.get("resourceType") or "", "other"),
+            "mimeType": mime_type,
+            "transferBytes": transfer,
+            "contentEncoding": encoding or None,
+            **compressed_sizes(raw, mime_type),
+            "sha256": digest,
+        }
+        rows.append(row)
+        by_hash.setdefault(digest, []).append(row)
+        for key in totals:
+            totals[key] += row[key]
+
+        best = min(row["gzipBytes"], row["brotliBytes"])
+        compressible = not encoding or encoding == "identity"
+        if compressible and transfer - best > 0 and not url.startswith("data:"):
+            opportunities.append(
+                {
+                    "kind": "compression",
+                    "url": row["url"],
+                    "savingBytes": transfer - best,
+                    "detail": f"{transfer} bytes transferred, {best} with brotli/gzip",
+                }
+            )
+
+        found: list[dict[str, Any]] = []
+        if url.startswith("data:") and len(url) >= min_blob_bytes:
+            found.append(
+                {
+                    "mimeType": mime_type,
+                    "offset": 0,
+                    "encodedBytes": len(url),
+                    "decodedBytes": len(raw),
+                }
+            )
+        elif row["type"] in ("script", "stylesheet") or mime_type.startswith("text/"):
+            found = find_inline_blobs(raw.decode("utf-8", "replace"), min_blob_bytes)
+        for blob in found:
+            blob["url"] = row["url"]
+            blobs.append(blob)
+            opportunities.append(
+                {
+                    "kind": "inline-base64",
+                    "url": row["url"],
+                    "savingBytes": blob["encodedBytes"] - blob["decodedBytes"],
+                    "detail": (
+                        f"{blob['mimeType']} inlined as {blob['encodedBytes']} base64 bytes; "
+                        "serve it as a separately cached file"
+                    ),
+                }
+            )
+
+    duplicates = []
+    for digest, group in by_hash.items():
+        if len(group) < 2:
+            continue
+        wasted = sum(row["transferBytes"] for row in group[1:])
+        duplicates.append(
+            {
+                "sha256": digest,
+                "urls": [row["url"] for row in group],
+                "rawBytes": group[0]["rawBytes"],
+                "wastedBytes": wasted,
+            }
+        )
+        opportunities.append(
+            {
+                "kind": "duplicate",
+                "url": group[0]["url"],
+                "savingBytes": wasted,
+                "detail": f"same content served from {len(group)} URLs",
+            }
+        )
+
+    rows.sort(key=lambda row: row["rawBytes"], reverse=True)
+    duplicates.sort(key=lambda group: group["wastedBytes"], reverse=True)
+    blobs.sort(key=lambda blob: blob["encodedBytes"], reverse=True)
+    opportunities.sort(key=lambda item: item["savingBytes"], reverse=True)
+    return {
+        "assets": len(rows),
+        "totals": totals,
+        "brotliEstimated": brotli is None,
+        "potentialSavingBytes": sum(item["savingBytes"] for item in opportunities),
+        "opportunities": opportunities[:limit],
+        "largestAssets": rows[:limit],
+        "duplicates": duplicates[:limit],
+        "inlineBlobs": blobs[:limit],
+    }
@@ -0,0 +1,410 @@
+#!/usr/bin/env python3
+"""Page Load Benchmarking
+
+This module navigates a page repeatedly under controlled conditions and summarises the
+distribution of its load metrics. Each run records navigation timing, First Contentful
+Paint, Largest Contentful Paint, long tasks and JavaScript heap use.
+
+Runs can start from a cold HTTP cache (cleared and disabled before every navigation) or
+a warm one (primed by an untimed navigation), with optional CPU throttling and network
+emulation. Summaries report percentiles and the standard deviation after discarding
+outliers outside Tukey's fences, and the raw per-run samples can be saved to JSON.
+
+Two saved sample sets can then be compared per metric with a Mann-Whitney U test and a
+bootstrap confidence interval on the change in median, flagging regressions that are
+both statistically significant and larger than a threshold.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import math
+import random
+import statistics
+import time
+from typing import Any
+
+CACHE_MODES = ("cold", "warm")
+DEFAULT_TIMEOUT = 30.0
+DEFAULT_SETTLE_MS = 1000
+# Chrome DevTools throttling presets: latency (ms), download and upload (bytes/s)
+NETWORK_PRESETS: dict[str, tuple[float, float, float]] = {
+    "slow-3g": (2000, 500 * 1024 / 8 * 0.8, 500 * 1024 / 8 * 0.8),
+    "fast-3g": (562.5, 1.6 * 1024 * 1024 / 8 * 0.9, 750 * 1024 / 8 * 0.9),
+    "slow-4g": (150, 9 * 1024 * 1024 / 8 * 0.9, 1.5 * 1024 * 1024 / 8 * 0.9),
+}
+
+# Buffers LCP and long tasks from the very start of each navigation
+OBSERVER_SCRIPT = """
+window.__benchmark = {lcp: 0, longTasks: []};
+try {
+    new PerformanceObserver(list => {
+        for (const entry of list.getEntries()) window.__benchmark.lcp = entry.startTime;
+    }).observe({type: 'largest-contentful-paint', buffered: true});
+    new PerformanceObserver(list => {
+        for (const entry of list.getEntries()) window.__benchmark.longTasks.push(entry.duration);
+    }).observe({type: 'longtask', buffered: true});
+} catch (e) {}
+"""
+
+COLLECT_SCRIPT = """
+(() => {
+    const nav = performance.getEntriesByType('navigation')[0] || {};
+    const fcp = performance.getEntriesByName('first-contentful-paint')[0];
+    const state = window.__benchmark || {lcp: 0, longTasks: []};
+    return {
+        ttfb: nav.responseStart,
+        domContentLoaded: nav.domContentLoadedEventEnd,
+        load: nav.loadEventEnd,
+        transferSize: nav.transferSize,
+        fcp: fcp ? fcp.startTime : null,
+        lcp: state.lcp || null,
+        longTaskCount: state.longTasks.length,
+        longTaskTotal: state.longTasks.reduce((a, b) => a + b, 0),
+        totalBlockingTime: state.longTasks.reduce((a, b) => a + Math.max(0, b - 50), 0)
+    };
+})()
+"""
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    """Return the ``fraction`` (0-1) percentile of sorted ``values`` by linear interpolation."""
+    position = (len(values) - 1) * fraction
+    lower = math.floor(position)
+    upper = min(lower + 1, len(values) - 1)
+    return values[lower] + (values[upper] - values[lower]) * (position - lower)
+
+
+def reject_outliers(values: list[float]) -> tuple[list[float], list[float]]:
+    """
+    Split values into kept and rejected using Tukey's fences (1.5 IQR beyond the quartiles).
+
+    Fewer than four values are all kept, since the quartiles are not meaningful.
+    """
+    if len(values) < 4:
+        return list(values), []
+    ordered = sorted(values)
+    q1, q3 = percentile(ordered, 0.25), percentile(ordered, 0.75)
+    fence = 1.5 * (q3 - q1)
+    kept = [v for v in values if q1 - fence <= v <= q3 + fence]
+    rejected = [v for v in values if not q1 - fence <= v <= q3 + fence]
+    return kept, rejected
+
+
+def summarise(values: list[float], drop_outliers: bool = True) -> dict[str, Any]:
+    """Return count, mean, standard deviation, min, max and p50/p90/p99 of samples."""
+    kept, rejected = reject_outliers(values) if drop_outliers else (list(values), [])
+    if not kept:
+        return {"count": 0, "rejected": len(rejected)}
+    ordered = sorted(kept)
+    return {
+        "count": len(kept),
+        "rejected": len(rejected),
+        "mean": round(statistics.fmean(ordered), 3),
+        "stdev": round(statistics.stdev(ordered), 3) if len(ordered) > 1 else 0.0,
+        "min": ordered[0],
+        "max": ordered[-1],
+        "p50": round(percentile(ordered, 0.5), 3),
+        "p90": round(percentile(ordered, 0.9), 3),
+        "p99": round(percentile(ordered, 0.99), 3),
+    }
+
+
+def summarise_samples(
+    samples: list[dict[str, Any]], drop_outliers: bool = True
+) -> dict[str, dict[str, Any]]:
+    """Summarise every numeric metric across per-run samples."""
+    metrics: dict[str, list[float]] = {}
+    for sample in samples:
+        for name, value in sample.items():
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                metrics.setdefault(name, []).append(float(value))
+    return {name: summarise(values, drop_outliers) for name, values in metrics.items()}
+
+
+async def _navigate_and_wait(client: Any, url: str, timeout: float) -> None:
+    """Navigate and wait for the main frame's load event."""
+    loaded: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+
+    def on_load(params: dict[str, Any]) -> None:
+        if not loaded.done():
+            loaded.set_result(None)
+
+    client.add_event_handler("Page.loadEventFired", on_load)
+    try:
+        result = await client.send_command("Page.navigate", {"url": url})
+        if result.get("errorText"):
+            raise RuntimeError(f"Navigation to {url} failed: {result['errorText']}")
+        await asyncio.wait_for(loaded, timeout)
+    finally:
+        client.remove_event_handler("Page.loadEventFired", on_load)
+
+
+async def measure_load(
+    client: Any, url: str, timeout: float = DEFAULT_TIMEOUT, settle_ms: int = DEFAULT_SETTLE_MS
+) -> dict[str, Any]:
+    """Navigate once and collect the run's timing, paint, long task and heap metrics."""
+    started = time.perf_counter()
+    await _navigate_and_wait(client, url, timeout)
+    wall_ms = (time.perf_counter() - started) * 1000
+    # LCP and long tasks keep arriving after load, so give them time to settle
+    await asyncio.sleep(settle_ms / 1000)
+
+    collected = await client.send_command(
+        "Runtime.evaluate", {"expression": COLLECT_SCRIPT, "returnByValue": True}
+    )
+    sample: dict[str, Any] = collected.get("result", {}).get("value") or {}
+    heap = await client.send_command("Runtime.getHeapUsage")
+    sample["heapUsed"] = heap.get("usedSize")
+    sample["heapTotal"] = heap.get("totalSize")
+    sample["wallTime"] = round(wall_ms, 3)
+    return {name: value for name, value in sample.items() if value is not None}
+
+
+async def run_benchmark(
+    client: Any,
+    url: str,
+    runs: int = 5,
+    cache_mode: str = "cold",
+    cpu_throttling: float = 1.0,
+    network: str | None = None,
+    timeout: float = DEFAULT_TIMEOUT,
+    settle_ms: int = DEFAULT_SETTLE_MS,
+) -> dict[str, Any]:
+    """
+    Run repeated navigations of ``url`` and return their raw samples.
+
+    Emulation and cache settings are restored afterwards even if a run fails.
+
+    Raises:
+        ValueError: If the cache mode or network preset is unknown
+    """
+    if cache_mode not in CACHE_MODES:
+        raise ValueError(f"Unknown cache mode {cache_mode!r}, expected one of {CACHE_MODES}")
+    if network is not None and network not in NETWORK_PRESETS:
+        raise ValueError(
+            f"Unknown network preset {network!r}, expected one of {list(NETWORK_PRESETS)}"
+        )
+
+    await client.send_command("Network.enable")
+    script = await client.send_command(
+        "Page.addScriptToEvaluateOnNewDocument", {"source": OBSERVER_SCRIPT}
+    )
+
+    samples = []
+    try:
+        if cpu_throttling != 1.0:
+            await client.send_command("Emulation.setCPUThrottlingRate", {"rate": cpu_throttling})
+        if network is not None:
+            latency, download, upload = NETWORK_PRESETS[network]
+            await client.send_command(
+                "Network.emulateNetworkConditions",
+                {
+                    "offline": False,
+                    "latency": latency,
+                    "downloadThroughput": download,
+                    "uploadThroughput": upload,
+                },
+            )
+        await client.send_command(
+            "Network.setCacheDisabled", {"cacheDisabled": cache_mode == "cold"}
+        )
+        if cache_mode == "warm":
+            await _navigate_and_wait(client, url, timeout)
+        for _ in range(runs):
+            if cache_mode == "cold":
+                await client.send_command("Network.clearBrowserCache")
+            samples.append(await measure_load(client, url, timeout, settle_ms))
+    finally:
+        cleanup = [
+            ("Page.removeScriptToEvaluateOnNewDocument", {"identifier": script["identifier"]}),
+            ("Network.setCacheDisabled", {"cacheDisabled": False}),
+        ]
+        if cpu_throttling != 1.0:
+            cleanup.append(("Emulation.setCPUThrottlingRate", {"rate": 1}))
+        if network is not None:
+            cleanup.append(
+                (
+                    "Network.emulateNetworkConditions",
+                    {
+                        "offline": False,
+                        "latency": 0,
+                        "downloadThroughput": -1,
+                        "uploadThroughput": -1,
+                    },
+                )
+            )
+        await client.send_commands(cleanup)
+
+    return {
+        "url": url,
+        "cacheMode": cache_mode,
+        "cpuThrottling": cpu_throttling,
+        "network": network,
+        "createdAt": time.time(),
+        "samples": samples,
+    }
+
+
+def save_benchmark(result: dict[str, Any], output_path: str) -> None:
+    """Write a benchmark result with its raw samples to a JSON file."""
+    with open(output_path, "w", encoding="utf-8") as handle:
+        json.dump(result, handle, indent=1)
+
+
+def _flatten(sample: dict[str, Any], prefix: str = "") -> dict[str, float]:
+    """Flatten nested numeric values into dotted metric names."""
+    flat: dict[str, float] = {}
+    for name, value in sample.items():
+        if isinstance(value, dict):
+            flat.update(_flatten(value, f"{prefix}{name}."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[prefix + name] = float(value)
+    return flat
+
+
+def load_samples(path: str) -> list[dict[str, float]]:
+    """
+    Load per-run metric samples from a JSON file.
+
+    Accepts a file saved by ``benchmark_page_load`` (``{"samples": [...]}``) or a plain
+    list of sample objects, such as collected ``get_performance_metrics`` data. Nested
+    numeric values are flattened to dotted names, e.g. ``memory.usedJSHeapSize``.
+
+    Raises:
+        ValueError: If the file holds neither shape
+    """
+    with open(path, encoding="utf-8") as handle:
+        data = json.load(handle)
+    samples = data.get("samples") if isinstance(data, dict) else data
+    if not isinstance(samples, list) or not all(isinstance(s, dict) for s in samples):
+        raise ValueError(f"{path} does not contain a list of metric samples")
+    return [_flatten(sample) for sample in samples]
+
+
+def mann_whitney_u(baseline: list[float], candidate: list[float]) -> tuple[float, float]:
+    """
+    Two-sided Mann-Whitney U test using the tie-corrected normal approximation.
+
+    Returns:
+        Tuple of the U statistic for ``candidate`` and the p-value
+    """
+    n1, n2 = len(baseline), len(candidate)
+    pooled = sorted([(value, 0) for value in baseline] + [(value, 1) for value in candidate])
+    ranks = [0.0] * len(pooled)
+    tie_term = 0.0
+    start = 0
+    while start < len(pooled):
+        end = start
+        while end + 1 < len(pooled) and pooled[end + 1][0] == pooled[start][0]:
+            end += 1
+        for index in range(start, end + 1):
+            ranks[index] = (start + end) / 2 + 1
+        tied = end - start + 1
+        tie_term += tied**3 - tied
+        start = end + 1
+
+    rank_sum = sum(rank for rank, (_, group) in zip(ranks, pooled, strict=True) if group == 1)
+    u = rank_sum - n2 * (n2 + 1) / 2
+    total = n1 + n2
+    variance = n1 * n2 / 12 * ((total + 1) - tie_term / (total * (total - 1)))
+    if variance <= 0:
+        return u, 1.0
+    # Continuity correction towards the mean
+    z = (abs(u - n1 * n2 / 2) - 0.5) / math.sqrt(variance)
+    return u, min(1.0, math.erfc(max(z, 0.0) / math.sqrt(2)))
+
+
+def bootstrap_median_delta(
+    baseline: list[float],
+    candidate: list[float],
+    iterations: int = 2000,
+    confidence: float = 0.95,
+    seed: int = 0,
+) -> tuple[float, float]:
+    """Return a percentile bootstrap interval for median(candidate) - median(baseline)."""
+    rng = random.Random(seed)
+    deltas = sorted(
+        statistics.median(rng.choices(candidate, k=len(candidate)))
+        - statistics.median(rng.choices(baseline, k=len(baseline)))
+        for _ in range(iterations)
+    )
+    tail = (1 - confidence) / 2
+    return percentile(deltas, tail), percentile(deltas, 1 - tail)
+
+
+def compare_samples(
+    baseline: list[dict[str, float]],
+    candidate: list[dict[str, float]],
+    threshold_pct: float = 5.0,
+    alpha: float = 0.05,
+    metrics: list[str] | None = None,
+    higher_is_better: list[str] | None = None,
+    iterations: int = 2000,
+) -> list[dict[str, Any]]:
+    """
+    Compare two sets of per-run samples metric by metric.
+
+    A metric is a regression (or improvement) when its median moves the wrong (or right)
+    way by more than ``threshold_pct`` percent, the Mann-Whitney p-value is below
+    ``alpha`` and the bootstrap interval of the median delta excludes zero. Lower values
+    are better unless the metric is listed in ``higher_is_better``.
+    """
+    names = metrics or sorted(
+        {name for sample in baseline for name in sample}
+        & {name for sample in candidate for name in sample}
+    )
+    better_high = set(higher_is_better or [])
+    rows = []
+    for name in names:
+        before = [sample[name] for sample in baseline if name in sample]
+        after = [sample[name] for sample in candidate if name in sample]
+        if len(before) < 2 or len(after) < 2:
+            continue
+        base_median, new_median = statistics.median(before), statistics.median(after)
+        delta = new_median - base_median
+        change = delta / abs(base_median) * 100 if base_median else 0.0
+        _, p_value = mann_whitney_u(before, after)
+        low, high = bootstrap_median_delta(before, after, iterations)
+        verdict = "no change"
+        if p_value < alpha and (low > 0 or high < 0) and abs(change) >= threshold_pct:
+            worse = delta < 0 if name in better_high else delta > 0
+            verdict = "regression" if worse else "improvement"
+        rows.append(
+            {
+                "metric": name,
+                "baselineMedian": round(base_median, 3),
+                "candidateMedian": round(new_median, 3),
+                "delta": round(delta, 3),
+                "changePct": round(change, 2),
+                "ci": [round(low, 3), round(high, 3)],
+                "pValue": round(p_value, 4),
+                "samples": [len(before), len(after)],
+                "verdict": verdict,
+            }
+        )
+    return rows
+
+
+def format_table(rows: list[dict[str, Any]]) -> str:
+    """Render comparison rows as a compact fixed-width text table."""
+    header = ("metric", "base p50", "new p50", "change", "95% CI of delta", "p", "verdict")
+    lines = [header]
+    for row in rows:
+        lines.append(
+            (
+                row["metric"],
+                f"{row['baselineMedian']:g}",
+                f"{row['candidateMedian']:g}",
+                f"{row['changePct']:+.1f}%",
+                f"[{row['ci'][0]:g}, {row['ci'][1]:g}]",
+                f"{row['pValue']:.3f}",
+                row["verdict"],
+            )
+        )
+    widths = [max(len(line[column]) for line in lines) for column in range(len(header))]
+    return "\n".join(
+        "  ".join(cell.ljust(width) for cell, width in zip(line, widths, strict=True)).rstrip()
+        for line in lines
+    )
@@ -0,0 +1,431 @@
+#!/usr/bin/env python3
+"""Response Body Capture
+
+This module captures network response bodies into a server-side cache so that repeated
+reads do not go back over the socket and still work after Chrome has evicted the body
+from its own buffer.
+
+Capture is opt-in. In eager mode each matching body is fetched with
+``Network.getResponseBody`` as soon as ``Network.loadingFinished`` arrives; in lazy mode
+matching requests are only marked on ``loadingFinished`` and the body is cached on first
+read. Requests are filtered by MIME type prefix and encoded size.
+
+Bodies are stored decoded (base64 payloads are not kept as base64) and compressed with
+zstd when the ``zstandard`` package is installed, otherwise zlib. Compressed bodies above
+a spill threshold are written to temporary files. Memory and disk usage are each bounded
+by total bytes, evicting the least recently used bodies first.
+
+Request IDs are only unique within a target, so bodies are keyed by the session that
+loaded them (None for the page) together with the request ID.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import atexit
+import base64
+import logging
+import os
+import shutil
+import tempfile
+import time
+import zlib
+from collections import OrderedDict
+from typing import Any
+
+try:
+    import zstandard  # type: ignore[import-not-found]
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MEMORY_BYTES = 64 * 1024 * 1024
+DEFAULT_DISK_BYTES = 512 * 1024 * 1024
+DEFAULT_SPILL_BYTES = 1024 * 1024
+DEFAULT_MAX_BODY_BYTES = 50 * 1024 * 1024
+_EAGER_CONCURRENCY = 4
+
+# (sessionId, requestId) of a body; the session is None for the page itself
+BodyKey = tuple[str | None, str]
+
+
+class CapturedBody:
+    """One cached response body, held compressed in memory or in a spill file."""
+
+    __slots__ = (
+        "request_id",
+        "session_id",
+        "mime_type",
+        "base64_encoded",
+        "size",
+        "stored_size",
+        "codec",
+        "data",
+        "path",
+        "captured_at",
+    )
+
+    def __init__(
+        self,
+        request_id: str,
+        mime_type: str,
+        base64_encoded: bool,
+        session_id: str | None = None,
+    ) -> None:
+        self.request_id = request_id
+        self.session_id = session_id
+        self.mime_type = mime_type
+        self.base64_encoded = base64_encoded
+        self.size = 0
+        self.stored_size = 0
+        self.codec = "zlib"
+        self.data: bytes | None = None
+        self.path: str | None = None
+        self.captured_at = time.time()
+
+    def describe(self) -> dict[str, Any]:
+        """Summarise the entry without its content."""
+        return {
+            "requestId": self.request_id,
+            "sessionId": self.session_id,
+            "mimeType": self.mime_type,
+            "sizeBytes": self.size,
+            "storedBytes": self.stored_size,
+            "codec": self.codec,
+            "spilled": self.path is not None,
+        }
+
+
+class BodyCache:
+    """
+    Byte-bounded LRU of compressed response bodies with spill-to-disk.
+
+    Attributes:
+        max_memory_bytes: Upper bound on compressed bytes held in memory
+        max_disk_bytes: Upper bound on compressed bytes held in spill files
+        spill_bytes: Compressed size above which a body is written to disk
+        memory_bytes: Current compressed bytes in memory
+        disk_bytes: Current compressed bytes on disk
+    """
+
+    def __init__(
+        self,
+        max_memory_bytes: int = DEFAULT_MEMORY_BYTES,
+        max_disk_bytes: int = DEFAULT_DISK_BYTES,
+        spill_bytes: int = DEFAULT_SPILL_BYTES,
+    ) -> None:
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self.spill_bytes = spill_bytes
+        self.memory_bytes = 0
+        self.disk_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[BodyKey, CapturedBody] = OrderedDict()
+        self._spill_dir: str | None = None
+
+    def __contains__(self, key: BodyKey) -> bool:
+        return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def put(
+        self,
+        request_id: str,
+        body: str,
+        base64_encoded: bool,
+        mime_type: str,
+        session_id: str | None = None,
+    ) -> None:
+        """Compress and store a body as returned by ``Network.getResponseBody``."""
+        raw = base64.b64decode(body) if base64_encoded else body.encode("utf-8", "surrogatepass")
+        entry = CapturedBody(request_id, mime_type, base64_encoded, session_id)
+        entry.size = len(raw)
+        if zstandard is not None:
+            compressed = zstandard.ZstdCompressor(level=3).compress(raw)
+            entry.codec = "zstd"
+        else:
+            compressed = zlib.compress(raw, 6)
+        entry.stored_size = len(compressed)
+
+        key = (session_id, request_id)
+        self._discard(key)
+        if entry.stored_size > self.spill_bytes:
+            fd, entry.path = tempfile.mkstemp(dir=self._ensure_spill_dir(), suffix=".body")
+            with os.fdopen(fd, "wb") as handle:
+                handle.write(compressed)
+            self.disk_bytes += entry.stored_size
+        else:
+            entry.data = compressed
+            self.memory_bytes += entry.stored_size
+        self._entries[key] = entry
+        self._evict()
+
+    def get(
+        self, request_id: str, session_id: str | None = None
+    ) -> tuple[str, bool, CapturedBody] | None:
+        """
+        Return a cached body in ``Network.getResponseBody`` form.
+
+        Returns:
+            Tuple of the body string, whether it is base64 encoded and the entry,
+            or None on a miss
+        """
+        key = (session_id, request_id)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+
+        if entry.path is not None:
+            with open(entry.path, "rb") as handle:
+                compressed = handle.read()
+        else:
+            compressed = entry.data or b""
+        if entry.codec == "zstd" and zstandard is not None:
+            raw = zstandard.ZstdDecompressor().decompress(compressed, max_output_size=entry.size)
+        else:
+            raw = zlib.decompress(compressed)
+
+        if entry.base64_encoded:
+            return base64.b64encode(raw).decode("ascii"), True, entry
+        return raw.decode("utf-8", "surrogatepass"), False, entry
+
+    def discard(self, request_id: str, session_id: str | None = None) -> None:
+        """Remove one body, deleting its spill file if it has one."""
+        self._discard((session_id, request_id))
+
+    def _discard(self, key: BodyKey) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        if entry.path is not None:
+            self.disk_bytes -= entry.stored_size
+            try:
+                os.remove(entry.path)
+            except OSError:
+                pass
+        else:
+            self.memory_bytes -= entry.stored_size
+
+    def clear(self) -> None:
+        """Drop every body and remove the spill directory."""
+        self._entries.clear()
+        self.memory_bytes = 0
+        self.disk_bytes = 0
+        if self._spill_dir is not None:
+            shutil.rmtree(self._spill_dir, ignore_errors=True)
+            self._spill_dir = None
+
+    def stats(self) -> dict[str, Any]:
+        """Summarise cache occupancy and hit rate."""
+        raw_bytes = sum(entry.size for entry in self._entries.values())
+        stored = self.memory_bytes + self.disk_bytes
+        lookups = self.hits + self.misses
+        return {
+            "bodies": len(self._entries),
+            "rawBytes": raw_bytes,
+            "memoryBytes": self.memory_bytes,
+            "diskBytes": self.disk_bytes,
+            "maxMemoryBytes": self.max_memory_bytes,
+            "maxDiskBytes": self.max_disk_bytes,
+            "compressionRatio": round(raw_bytes / stored, 2) if stored else 0,
+            "codec": "zstd" if zstandard is not None else "zlib",
+            "hits": self.hits,
+            "misses": self.misses,
+            "hitRate": round(self.hits / lookups, 3) if lookups else 0,
+        }
+
+    def _ensure_spill_dir(self) -> str:
+        if self._spill_dir is None:
+            self._spill_dir = tempfile.mkdtemp(prefix="devtools-mcp-bodies-")
+            # Also covers a process that exits without disconnecting
+            atexit.register(shutil.rmtree, self._spill_dir, ignore_errors=True)
+        return self._spill_dir
+
+    def _evict(self) -> None:
+        """Evict least recently used bodies until both budgets are met."""
+        for spilled, limit in ((False, self.max_memory_bytes), (True, self.max_disk_bytes)):
+            for key in list(self._entries):
+                used = self.disk_bytes if spilled else self.memory_bytes
+                if used <= limit:
+                    break
+                if (self._entries[key].path is not None) == spilled:
+                    self._discard(key)
+
+
+class BodyCapture:
+    """
+    Opt-in capture policy feeding a ``BodyCache`` from network events.
+
+    Attributes:
+        enabled: Whether capture is active
+        mode: ``"eager"`` to fetch on loadingFinished, ``"lazy"`` to cache on first read
+        mime_types: MIME type prefixes to capture (empty captures everything)
+        max_body_bytes: Largest encoded body to capture
+        cache: Compressed body storage
+        candidates: (sessionId, requestId) of requests that matched the filters in lazy mode
+        skipped: Count of finished requests rejected by the filters
+        failed: Count of eager fetches that failed
+    """
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self.mode = "lazy"
+        self.mime_types: list[str] = []
+        self.max_body_bytes = DEFAULT_MAX_BODY_BYTES
+        self.cache = BodyCache()
+        self.candidates: set[BodyKey] = set()
+        self.skipped = 0
+        self.failed = 0
+        self._tasks: set[asyncio.Task[None]] = set()
+        self._semaphore = asyncio.Semaphore(_EAGER_CONCURRENCY)
+
+    def start(
+        self,
+        mode: str = "lazy",
+        mime_types: list[str] | None = None,
+        max_body_bytes: int = DEFAULT_MAX_BODY_BYTES,
+        cache: BodyCache | None = None,
+    ) -> None:
+        """
+        Enable capture with the given policy.
+
+        Raises:
+            ValueError: If ``mode`` is not ``"eager"`` or ``"lazy"``
+        """
+        if mode not in ("eager", "lazy"):
+            raise ValueError(f"Unknown capture mode {mode!r}, expected 'eager' or 'lazy'")
+        self.enabled = True
+        self.mode = mode
+        self.mime_types = [prefix.lower() for prefix in mime_types or []]
+        self.max_body_bytes = max_body_bytes
+        if cache is not None:
+            self.cache.clear()
+            self.cache = cache
+        self.skipped = 0
+        self.failed = 0
+
+    async def stop(self, clear: bool = False) -> None:
+        """Disable capture, cancelling in-flight eager fetches."""
+        self.enabled = False
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+        self.candidates.clear()
+        if clear:
+            self.cache.clear()
+
+    def matches(self, mime_type: str, encoded_size: int | None) -> bool:
+        """Return True if a response passes the MIME type and size filters."""
+        if encoded_size is not None and encoded_size > self.max_body_bytes:
+            return False
+        if not self.mime_types:
+            return True
+        mime_type = (mime_type or "").lower()
+        return any(mime_type.startswith(prefix) for prefix in self.mime_types)
+
+    def on_loading_finished(self, client: Any, request: dict[str, Any] | None) -> None:
+        """Handle ``Network.loadingFinished`` for a tracked request."""
+        if not self.enabled or request is None:
+            return
+        request_id = request["requestId"]
+        session_id = request.get("sessionId")
+        mime_type = request.get("response", {}).get("mimeType", "")
+        if not self.matches(mime_type, request.get("encodedDataLength")):
+            self.skipped += 1
+            return
+        if self.mode == "lazy":
+            self.candidates.add((session_id, request_id))
+            return
+        # The body cannot be fetched from inside event processing, which runs on the
+        # receive loop, so hand it to a task
+        task = asyncio.create_task(self._fetch(client, request_id, mime_type, session_id))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def should_store(self, request_id: str, session_id: str | None = None) -> bool:
+        """Return True if a body read on demand should be kept (lazy candidates)."""
+        return self.enabled and (session_id, request_id) in self.candidates
+
+    def store(
+        self,
+        request_id: str,
+        result: dict[str, Any],
+        mime_type: str,
+        session_id: str | None = None,
+    ) -> None:
+        """Cache a ``Network.getResponseBody`` result."""
+        self.cache.put(
+            request_id,
+            result.get("body", ""),
+            result.get("base64Encoded", False),
+            mime_type,
+            session_id,
+        )
+        self.candidates.discard((session_id, request_id))
+
+    async def _fetch(
+        self, client: Any, request_id: str, mime_type: str, session_id: str | None = None
+    ) -> None:
+        async with self._semaphore:
+            try:
+                result = await client.send_command(
+                    "Network.getResponseBody", {"requestId": request_id}, session_id=session_id
+                )
+                self.store(request_id, result, mime_type, session_id)
+            except Exception as e:
+                self.failed += 1
+                logger.debug(f"Body capture for {request_id} failed: {e}")
+
+    def status(self) -> dict[str, Any]:
+        """Summarise the capture policy and cache."""
+        return {
+            "enabled": self.enabled,
+            "mode": self.mode,
+            "mimeTypes": self.mime_types,
+            "maxBodyBytes": self.max_body_bytes,
+            "pendingFetches": len(self._tasks),
+            "lazyCandidates": len(self.candidates),
+            "skipped": self.skipped,
+            "failed": self.failed,
+            "cache": self.cache.stats(),
+        }
+
+
+async def fetch_bodies(
+    client: Any, records: list[dict[str, Any]], max_body_bytes: int
+) -> list[dict[str, Any] | None]:
+    """
+    Fetch ``Network.getResponseBody`` results for completed records.
+
+    Bodies held by the client's body capture cache are used without a round trip; the
+    rest are requested concurrently. Failed fetches and bodies over ``max_body_bytes``
+    are returned as None.
+    """
+    bodies: list[dict[str, Any] | None] = [None] * len(records)
+    commands: list[tuple[str, dict[str, Any], str | None]] = []
+    slots: list[int] = []
+    for index, record in enumerate(records):
+        size = record.get("encodedDataLength") or 0
+        if record.get("status") != "completed" or size > max_body_bytes:
+            continue
+        request_id, session_id = record["requestId"], record.get("sessionId")
+        cached = client.body_capture.cache.get(request_id, session_id)
+        if cached is not None:
+            bodies[index] = {"body": cached[0], "base64Encoded": cached[1]}
+        else:
+            # Bodies of worker and iframe requests live in the session that loaded them
+            commands.append(("Network.getResponseBody", {"requestId": request_id}, session_id))
+            slots.append(index)
+
+    results = await client.send_commands(commands)
+    for index, result in zip(slots, results, strict=True):
+        if not isinstance(result, Exception) and len(result.get("body", "")) <= max_body_bytes:
+            bodies[index] = result
+    return bodies
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""Cache Effectiveness Analysis
+
+This module examines captured network records for HTTP caching waste. Each response is
+classified by where Chrome got it from (memory cache, disk cache, service worker,
+prefetch cache or the network), and the caching headers of static assets are checked for
+the problems that cause avoidable downloads:
+
+    - The same URL downloaded in full more than once instead of served from a cache
+    - No validator (``ETag`` or ``Last-Modified``), so an expired copy cannot be
+      revalidated with a cheap 304 and is downloaded again
+    - No freshness lifetime, or a ``max-age`` shorter than the configured minimum, so the
+      asset is rechecked or refetched on every visit
+    - ``no-store``, which keeps the asset out of the cache entirely
+
+Findings are grouped per URL and ranked by the bytes they waste.
+"""
+
+from __future__ import annotations
+
+from email.utils import parsedate_to_datetime
+from typing import Any
+from urllib.parse import urldefrag
+
+DEFAULT_MIN_MAX_AGE = 24 * 60 * 60
+STATIC_TYPES = {"Script", "Stylesheet", "Font", "Image", "Media"}
+SOURCES = ("memory", "disk", "serviceWorker", "prefetch", "network")
+
+
+def header(headers: dict[str, Any] | None, name: str) -> str | None:
+    """Return a header value by case-insensitive name."""
+    name = name.lower()
+    for key, value in (headers or {}).items():
+        if key.lower() == name:
+            return str(value)
+    return None
+
+
+def parse_cache_control(value: str | None) -> dict[str, str | None]:
+    """Parse a Cache-Control header into lower-cased directives and their values."""
+    directives: dict[str, str | None] = {}
+    for part in (value or "").split(","):
+        name, _, argument = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = argument.strip('"') if argument else None
+    return directives
+
+
+def freshness_lifetime(headers: dict[str, Any] | None) -> int | None:
+    """
+    Return the response's freshness lifetime in seconds.
+
+    ``max-age`` takes precedence over ``Expires``. Returns None when neither is present,
+    leaving the browser to apply heuristic freshness.
+    """
+    directives = parse_cache_control(header(headers, "cache-control"))
+    if "no-store" in directives or "no-cache" in directives:
+        return 0
+    max_age = directives.get("max-age")
+    if max_age is not None:
+        try:
+            return max(0, int(max_age))
+        except ValueError:
+            return 0
+    expires = header(headers, "expires")
+    if expires is None:
+        return None
+    try:
+        date = header(headers, "date")
+        expires_at = parsedate_to_datetime(expires)
+        if date is None:
+            return 0
+        return max(0, int((expires_at - parsedate_to_datetime(date)).total_seconds()))
+    except (TypeError, ValueError):
+        # An invalid Expires date means already expired
+        return 0
+
+
+def cache_source(record: dict[str, Any]) -> str:
+    """Return where Chrome got a response from, one of ``SOURCES``."""
+    response = record.get("response") or {}
+    if record.get("servedFromCache"):
+        return "memory"
+    if response.get("fromServiceWorker"):
+        return "serviceWorker"
+    if response.get("fromPrefetchCache"):
+        return "prefetch"
+    if response.get("fromDiskCache"):
+        return "disk"
+    return "network"
+
+
+def header_issues(headers: dict[str, Any] | None, min_max_age: int) -> list[str]:
+    """Return the caching problems in a static asset's response headers."""
+    issues = []
+    directives = parse_cache_control(header(headers, "cache-control"))
+    if "no-store" in directives:
+        issues.append("no-store")
+    if header(headers, "etag") is None and header(headers, "last-modified") is None:
+        issues.append("no-validator")
+    lifetime = freshness_lifetime(headers)
+    if lifetime is None:
+        issues.append("no-freshness-lifetime")
+    elif lifetime < min_max_age and "no-store" not in directives:
+        issues.append("short-max-age")
+    return issues
+
+
+def analyse_cache(
+    records: list[dict[str, Any]], min_max_age: int = DEFAULT_MIN_MAX_AGE, limit: int = 20
+) -> dict[str, Any]:
+    """
+    Find redundant downloads and weak caching headers in captured network records.
+
+    Args:
+        records: Entries from ``ChromeDevToolsClient.network_requests``
+        min_max_age: Freshness lifetime in seconds below which a static asset is flagged
+        limit: Maximum number of URLs to report
+
+    Returns:
+        Report with per-source totals, bytes re-downloaded and URLs ranked by waste
+    """
+    sources = {source: {"requests": 0, "bytes": 0} for source in SOURCES}
+    by_url: dict[str, list[dict[str, Any]]] = {}
+    for record in records:
+        response = record.get("response")
+        if response is None or record.get("status") != "completed":
+            continue
+        if record.get("method", "GET") != "GET":
+            continue
+        source = cache_source(record)
+        sources[source]["requests"] += 1
+        sources[source]["bytes"] += record.get("encodedDataLength") or 0
+        by_url.setdefault(urldefrag(record.get("url", ""))[0], []).append(record)
+
+    findings = []
+    redownloaded = 0
+    for url, fetches in by_url.items():
+        downloads = [
+            r
+            for r in fetches
+            if cache_source(r) == "network" and r["response"].get("status") != 304
+        ]
+        revalidations = sum(r["response"].get("status") == 304 for r in fetches)
+        sizes = [r.get("encodedDataLength") or 0 for r in downloads]
+        wasted = sum(sizes) - max(sizes) if len(sizes) > 1 else 0
+        redownloaded += wasted
+
+        latest = fetches[-1]
+        headers = (downloads or fetches)[-1]["response"].get("headers")
+        issues: list[str] = []
+        if latest.get("resourceType") in STATIC_TYPES and latest["response"]["status"] < 400:
+            issues = header_issues(headers, min_max_age)
+        if not wasted and not issues:
+            continue
+        findings.append(
+            {
+                "url": url,
+                "type": latest.get("resourceType"),
+                "fetches": len(fetches),
+                "downloads": len(downloads),
+                "revalidations": revalidations,
+                "wastedBytes": wasted,
+                "sizeBytes": max(sizes, default=0),
+                "issues": issues,
+                "cacheControl": header(headers, "cache-control"),
+                "etag": header(headers, "etag") is not None,
+                "lastModified": header(headers, "last-modified") is not None,
+            }
+        )
+
+    # Assets with no waste yet are ranked by what each extra visit would re-download
+    findings.sort(
+        key=lambda f: (f["wastedBytes"], f["sizeBytes"] * bool(f["issues"])), reverse=True
+    )
+    served = sum(counts["requests"] for counts in sources.values())
+    cached = served - sources["network"]["requests"]
+    return {
+        "responses": served,
+        "cacheHitRatio": round(cached / served, 3) if served else 0,
+        "sources": sources,
+        "bytesRedownloaded": redownloaded,
+        "redundantUrls": sum(1 for f in findings if f["wastedBytes"]),
+        "assetsWithHeaderIssues": sum(1 for f in findings if f["issues"]),
+        "findings": findings[:limit],
+    }
@@ -11,12 +11,25 @@ import asyncio
 import json
 import logging
 import os
-from collections.abc import Callable
+from collections.abc import Callable, Sequence
 from typing import Any
 
 import aiohttp
 import websockets
 
+from .body_capture import BodyCapture
+from .css_coverage import CSSCoverageTracker
+from .dom_mirror import DOMMirror
+from .dom_snapshot import DOMSnapshot
+from .fetch_replay import FetchReplay
+from .frame_contexts import AUTO_ATTACH_PARAMS, FrameContexts, prepare_session
+from .jank_timeline import JankRecorder
+from .metrics_sampler import MetricsSampler
+from .response_shaping import ResponseStore
+from .screencast import ScreencastRecorder
+from .stylesheet_cache import StylesheetCache
+from .web_vitals import WebVitalsCollector
+
 logger = logging.getLogger(__name__)
 
 
@@ -40,8 +53,26 @@ class ChromeDevToolsClient:
         message_id: Incremental ID for CDP messages
         pending_messages: Awaiting responses for sent commands
         event_handlers: Registered handlers for CDP events
-        network_requests: Captured network request data
-        console_logs: Captured console log entries
+        session_listeners: Callbacks that take over every event from a child session,
+                           keeping it out of the shared stores (e.g. crawler tabs)
+        network_requests: Captured network request data, tagged with the source target
+        console_logs: Captured console log entries, tagged with the source target
+        stylesheet_cache: Stylesheet headers, text and metadata keyed by styleSheetId
+        css_coverage: Accumulated CSS rule usage for coverage analysis
+        page_snapshot: Most recent decoded DOMSnapshot capture, cleared on navigation
+        dom_mirror: Optional event-maintained local copy of the DOM tree
+        response_store: Oversized tool payloads kept server-side and fetched by handle
+        body_capture: Opt-in response body capture into a compressed cache
+        fetch_replay: Fetch-domain record/replay interception for repeatable loads
+        metrics_sampler: Background time-series sampler of runtime and memory metrics
+        web_vitals: Core Web Vitals and long-task entries pushed from page observers
+        screencast: Screencast frame writer with prompt acks and duplicate dropping
+        jank_recorder: In-page frame/long-task recorder and trace capture for an
+                       interaction window
+        page_timeline: Main-frame milestone timestamps (load, DOMContentLoaded and
+                       lifecycle events) for the current navigation
+        frame_contexts: Default execution context of every frame, and the child
+                        sessions of out-of-process iframes and workers
     """
 
     def __init__(self, port: int = 9222, host: str = "localhost") -> None:
@@ -64,10 +95,25 @@ class ChromeDevToolsClient:
         self.message_id = 0
         self.pending_messages: dict[int, asyncio.Future] = {}
         self.event_handlers: dict[str, list[Callable[[dict[str, Any]], None]]] = {}
+        self.session_listeners: dict[str, Callable[[str, dict[str, Any]], None]] = {}
 
         # Storage for captured browser data
         self.network_requests: list[dict[str, Any]] = []
         self.console_logs: list[dict[str, Any]] = []
+        self.stylesheet_cache = StylesheetCache()
+        self.css_coverage = CSSCoverageTracker()
+        self.page_snapshot: DOMSnapshot | None = None
+        self.dom_mirror = DOMMirror()
+        self.response_store = ResponseStore()
+        self.body_capture = BodyCapture()
+        self.fetch_replay = FetchReplay()
+        self.metrics_sampler = MetricsSampler()
+        self.web_vitals = WebVitalsCollector()
+        self.screencast = ScreencastRecorder()
+        self.jank_recorder = JankRecorder()
+        self.page_timeline: dict[str, float] = {}
+        self.main_frame_id: str | None = None
+        self.frame_contexts = FrameContexts()
 
     async def connect(self) -> bool:
         """
@@ -93,6 +139,7 @@ class ChromeDevToolsClient:
 
             self.ws = await websockets.connect(ws_url)
             self.connected = True
+            self.frame_contexts.clear()
 
             asyncio.create_task(self._handle_incoming_messages())
 
@@ -106,6 +153,21 @@ class ChromeDevToolsClient:
 
     async def disconnect(self) -> None:
         """Gracefully disconnect from Chrome DevTools."""
+        await self.css_coverage.stop_polling()
+        # Cached bodies are keyed by this connection's request IDs; drop them and their spill files
+        await self.body_capture.stop(clear=True)
+        await self.metrics_sampler.stop()
+        if self.fetch_replay.enabled:
+            await self.fetch_replay.stop(self)
+        if self.web_vitals.enabled:
+            await self.web_vitals.stop(self)
+        if self.screencast.enabled:
+            await self.screencast.stop(self)
+        if self.jank_recorder.recording:
+            try:
+                await self.jank_recorder.stop(self, timeout=2.0)
+            except Exception as e:
+                logger.debug(f"Could not stop jank recording cleanly: {e}")
         if self.ws:
             await self.ws.close()
         self.connected = False
@@ -126,31 +188,74 @@ class ChromeDevToolsClient:
             return []
 
     async def send_command(
-        self, method: str, params: dict[str, Any] | None = None
+        self, method: str, params: dict[str, Any] | None = None, session_id: str | None = None
     ) -> dict[str, Any]:
-        """Send a command to Chrome DevTools and wait for response."""
+        """
+        Send a command to Chrome DevTools and wait for response.
+
+        Args:
+            method: CDP method name
+            params: Command parameters
+            session_id: Child session (from auto-attach) to address instead of the page
+        """
         if not self.connected or not self.ws:
             raise ConnectionError("Not connected to Chrome")
 
         self.message_id += 1
-        message = {"id": self.message_id, "method": method, "params": params or {}}
+        message_id = self.message_id
+        message: dict[str, Any] = {"id": message_id, "method": method, "params": params or {}}
+        if session_id is not None:
+            message["sessionId"] = session_id
 
         future: asyncio.Future[dict[str, Any]] = asyncio.Future()
-        self.pending_messages[self.message_id] = future
+        self.pending_messages[message_id] = future
 
         try:
             await self.ws.send(json.dumps(message))
             result = await asyncio.wait_for(future, timeout=10.0)
+            if method == "DOM.getDocument" and session_id is None:
+                # Chrome discards every previously issued node ID on getDocument. Child
+                # sessions have their own node IDs, which the page mirror does not hold
+                self.dom_mirror.on_document_fetched(params or {}, result)
             return result  # type: ignore
         except asyncio.TimeoutError:
-            if self.message_id in self.pending_messages:
-                del self.pending_messages[self.message_id]
+            self.pending_messages.pop(message_id, None)
             raise TimeoutError(f"Command {method} timed out") from None
         except Exception as e:
-            if self.message_id in self.pending_messages:
-                del self.pending_messages[self.message_id]
+            self.pending_messages.pop(message_id, None)
             raise e
 
+    async def send_commands(
+        self,
+        commands: Sequence[tuple[str, dict[str, Any]] | tuple[str, dict[str, Any], str | None]],
+        max_concurrency: int = 8,
+    ) -> list[dict[str, Any] | Exception]:
+        """
+        Send several commands concurrently over the single connection.
+
+        Args:
+            commands: (method, params) pairs to send, or (method, params, session_id)
+                      to address a child session
+            max_concurrency: Maximum number of commands awaiting a response at once
+
+        Returns:
+            Results in the same order as ``commands``; failed commands yield their exception
+        """
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+        async def run(
+            method: str, params: dict[str, Any], session_id: str | None = None
+        ) -> dict[str, Any] | Exception:
+            async with semaphore:
+                try:
+                    if session_id is None:
+                        return await self.send_command(method, params)
+                    return await self.send_command(method, params, session_id=session_id)
+                except Exception as e:
+                    return e
+
+        return list(await asyncio.gather(*(run(*command) for command in commands)))
+
     async def _handle_incoming_messages(self) -> None:
         """Handle incoming WebSocket messages from Chrome."""
         try:
@@ -187,19 +292,75 @@ class ChromeDevToolsClient:
         """Process CDP event notifications and store relevant data."""
         method = event["method"]
         params = event.get("params", {})
+        session_id = event.get("sessionId")
+        listener = self.session_listeners.get(session_id) if session_id else None
+        if listener is not None:
+            try:
+                listener(method, params)
+            except Exception as e:
+                logger.error(f"Error in session listener for {method}: {e}")
+            return
 
         if method == "Network.requestWillBeSent":
-            await self._process_network_request(params)
+            await self._process_network_request(params, session_id)
         elif method == "Network.responseReceived":
-            await self._process_network_response(params)
+            await self._process_network_response(params, session_id)
         elif method == "Network.loadingFinished":
-            await self._process_network_completion(params)
+            await self._process_network_completion(params, session_id)
         elif method == "Network.loadingFailed":
-            await self._process_network_failure(params)
+            await self._process_network_failure(params, session_id)
+        elif method == "Network.requestServedFromCache":
+            await self._process_network_cache_hit(params, session_id)
         elif method == "Runtime.consoleAPICalled":
-            await self._process_console_message(params)
+            await self._process_console_message(params, session_id)
         elif method == "Runtime.exceptionThrown":
-            await self._process_console_exception(params)
+            await self._process_console_exception(params, session_id)
+        elif method == "CSS.styleSheetAdded":
+            self.stylesheet_cache.add_header(params["header"])
+        elif method == "CSS.styleSheetChanged":
+            self.stylesheet_cache.invalidate(params["styleSheetId"])
+        elif method == "CSS.styleSheetRemoved":
+            self.stylesheet_cache.remove(params["styleSheetId"])
+        elif method == "Runtime.executionContextCreated":
+            self.frame_contexts.on_context_created(params["context"], session_id)
+        elif method == "Runtime.executionContextDestroyed":
+            self.frame_contexts.on_context_destroyed(params["executionContextId"], session_id)
+        elif method == "Runtime.executionContextsCleared":
+            self.frame_contexts.on_contexts_cleared(session_id)
+        elif method == "Target.attachedToTarget":
+            # Auto-attach only yields iframes and workers; a page target was attached
+            # explicitly by its owner (e.g. a crawler tab), which prepares it itself.
+            # Chrome sends this event before the attach response, so the owner cannot
+            # have registered its session listener yet
+            child = params["sessionId"]
+            if child not in self.session_listeners and params["targetInfo"]["type"] != "page":
+                self.frame_contexts.on_attached(params, session_id)
+                asyncio.create_task(prepare_session(self, params))
+        elif method == "Target.detachedFromTarget":
+            self.frame_contexts.on_detached(params["sessionId"])
+        elif method == "Runtime.bindingCalled":
+            self.web_vitals.on_binding_called(params)
+        elif method == "Page.screencastFrame":
+            self.screencast.on_frame(self, params)
+        elif method == "Fetch.requestPaused":
+            self.fetch_replay.on_request_paused(self, params)
+        elif method.startswith("DOM."):
+            if session_id is None:
+                self.dom_mirror.handle_event(method, params)
+        elif method == "Page.frameNavigated":
+            if not params["frame"].get("parentId"):
+                self.main_frame_id = params["frame"]["id"]
+                self.stylesheet_cache.clear()
+                self.page_snapshot = None
+        elif method == "Page.lifecycleEvent":
+            if self.main_frame_id in (None, params["frameId"]):
+                if params["name"] == "init":
+                    self.page_timeline = {}
+                self.page_timeline[params["name"]] = params["timestamp"]
+        elif method == "Page.loadEventFired":
+            self.page_timeline["load"] = params["timestamp"]
+        elif method == "Page.domContentEventFired":
+            self.page_timeline["DOMContentLoaded"] = params["timestamp"]
 
         if method in self.event_handlers:
             for handler in self.event_handlers[method]:
@@ -211,7 +372,9 @@ class ChromeDevToolsClient:
                 except Exception as e:
                     logger.error(f"Error in event handler for {method}: {e}")
 
-    async def _process_network_request(self, params: dict[str, Any]) -> None:
+    async def _process_network_request(
+        self, params: dict[str, Any], session_id: str | None = None
+    ) -> None:
         """Process network request event."""
         from .tools.utils import safe_timestamp_conversion
 
@@ -222,18 +385,32 @@ class ChromeDevToolsClient:
                 "method": params["request"]["method"],
                 "headers": params["request"].get("headers", {}),
                 "timestamp": safe_timestamp_conversion(params["timestamp"]),
+                "wallTime": params.get("wallTime"),
+                "resourceType": params.get("type"),
+                "frameId": params.get("frameId"),
+                "loaderId": params.get("loaderId"),
+                "initiator": params.get("initiator"),
+                "priority": params["request"].get("initialPriority"),
+                "postData": params["request"].get("postData"),
                 "type": "request",
                 "status": "pending",
+                **self.frame_contexts.target_tag(session_id),
             }
         )
 
-    async def _process_network_response(self, params: dict[str, Any]) -> None:
+    async def _process_network_response(
+        self, params: dict[str, Any], session_id: str | None = None
+    ) -> None:
         """Process network response event."""
         from .tools.utils import safe_timestamp_conversion
 
         request_id = params["requestId"]
         for req in self.network_requests:
-            if req.get("requestId") == request_id and req["type"] == "request":
+            if (
+                req.get("requestId") == request_id
+                and req["type"] == "request"
+                and req.get("sessionId") == session_id
+            ):
                 req.update(
                     {
                         "response": {
@@ -243,28 +420,44 @@ class ChromeDevToolsClient:
                             "mimeType": params["response"]["mimeType"],
                             "timestamp": safe_timestamp_conversion(params["timestamp"]),
                             "remoteIPAddress": params["response"].get("remoteIPAddress"),
+                            # Bytes received by the time the headers were parsed
+                            "encodedDataLength": params["response"].get("encodedDataLength"),
                             "protocol": params["response"].get("protocol"),
+                            "timing": params["response"].get("timing"),
+                            "requestHeaders": params["response"].get("requestHeaders"),
+                            "fromDiskCache": params["response"].get("fromDiskCache", False),
+                            "fromServiceWorker": params["response"].get("fromServiceWorker", False),
+                            "fromPrefetchCache": params["response"].get("fromPrefetchCache", False),
                         },
                         "status": "responded",
                     }
                 )
                 break
 
-    async def _process_network_completion(self, params: dict[str, Any]) -> None:
+    async def _process_network_completion(
+        self, params: dict[str, Any], session_id: str | None = None
+    ) -> None:
         """Process network loading completion event."""
         request_id = params["requestId"]
         for req in self.network_requests:
-            if req.get("requestId") == request_id:
+            if req.get("requestId") == request_id and req.get("sessionId") == session_id:
                 req.update(
-                    {"status": "completed", "encodedDataLength": params.get("encodedDataLength")}
+                    {
+                        "status": "completed",
+                        "encodedDataLength": params.get("encodedDataLength"),
+                        "finishedTimestamp": params.get("timestamp"),
+                    }
                 )
+                self.body_capture.on_loading_finished(self, req)
                 break
 
-    async def _process_network_failure(self, params: dict[str, Any]) -> None:
+    async def _process_network_failure(
+        self, params: dict[str, Any], session_id: str | None = None
+    ) -> None:
         """Process network loading failure event."""
         request_id = params["requestId"]
         for req in self.network_requests:
-            if req.get("requestId") == request_id:
+            if req.get("requestId") == request_id and req.get("sessionId") == session_id:
                 req.update(
                     {
                         "status": "failed",
@@ -274,7 +467,19 @@ class ChromeDevToolsClient:
                 )
                 break
 
-    async def _process_console_message(self, params: dict[str, Any]) -> None:
+    async def _process_network_cache_hit(
+        self, params: dict[str, Any], session_id: str | None = None
+    ) -> None:
+        """Process network request served from the memory cache."""
+        request_id = params["requestId"]
+        for req in self.network_requests:
+            if req.get("requestId") == request_id and req.get("sessionId") == session_id:
+                req["servedFromCache"] = True
+                break
+
+    async def _process_console_message(
+        self, params: dict[str, Any], session_id: str | None = None
+    ) -> None:
         """Process console API call event."""
         from .tools.utils import safe_timestamp_conversion
 
@@ -285,10 +490,13 @@ class ChromeDevToolsClient:
                 "timestamp": safe_timestamp_conversion(params["timestamp"]),
                 "executionContextId": params.get("executionContextId"),
                 "stackTrace": params.get("stackTrace"),
+                **self.frame_contexts.target_tag(session_id),
             }
         )
 
-    async def _process_console_exception(self, params: dict[str, Any]) -> None:
+    async def _process_console_exception(
+        self, params: dict[str, Any], session_id: str | None = None
+    ) -> None:
         """Process console exception event."""
         from .tools.utils import safe_timestamp_conversion
 
@@ -301,6 +509,7 @@ class ChromeDevToolsClient:
                 "executionContextId": exception.get("executionContextId"),
                 "stackTrace": exception.get("stackTrace"),
                 "exception": True,
+                **self.frame_contexts.target_tag(session_id),
             }
         )
 
@@ -323,6 +532,16 @@ class ChromeDevToolsClient:
             except Exception as e:
                 logger.warning(f"Failed to enable {domain} domain: {e}")
 
+        try:
+            await self.send_command("Page.setLifecycleEventsEnabled", {"enabled": True})
+        except Exception as e:
+            logger.warning(f"Failed to enable page lifecycle events: {e}")
+
+        try:
+            await self.send_command("Target.setAutoAttach", AUTO_ATTACH_PARAMS)
+        except Exception as e:
+            logger.warning(f"Failed to auto-attach to out-of-process frames: {e}")
+
     async def get_target_info(self) -> dict[str, Any]:
         """Get information about the current target."""
         try:
@@ -337,3 +556,11 @@ class ChromeDevToolsClient:
         if event_method not in self.event_handlers:
             self.event_handlers[event_method] = []
         self.event_handlers[event_method].append(handler)
+
+    def remove_event_handler(
+        self, event_method: str, handler: Callable[[dict[str, Any]], None]
+    ) -> None:
+        """Unregister an event handler previously added with add_event_handler."""
+        handlers = self.event_handlers.get(event_method, [])
+        if handler in handlers:
+            handlers.remove(handler)
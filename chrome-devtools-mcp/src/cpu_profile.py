@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""CPU Profile Summaries
+
+This module reduces a ``Profiler.stop`` result to where the time went. A V8 CPU profile
+is a call tree of nodes plus a list of sampled node IDs with the microseconds between
+samples; each sample is charged the interval up to the next one, as DevTools does.
+
+Self time is charged to the sampled node only. Total time is charged once to every
+distinct function on the sampled stack, so recursion is not double counted. Functions
+are keyed by name, script URL and line, merging the separate tree nodes a function gets
+when it is reached through different callers. The synthetic ``(idle)``, ``(program)``
+and ``(garbage collector)`` nodes are reported as separate buckets.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+DEFAULT_MAX_FUNCTIONS = 20
+_SYNTHETIC = {"(root)", "(idle)", "(program)", "(garbage collector)"}
+
+
+def _function_key(call_frame: dict[str, Any]) -> tuple[str, str, int]:
+    """Return the (name, url, line) identity of a profile node's function."""
+    return (
+        call_frame.get("functionName") or "(anonymous)",
+        call_frame.get("url", ""),
+        call_frame.get("lineNumber", -1),
+    )
+
+
+def sample_durations(profile: dict[str, Any]) -> list[tuple[int, float]]:
+    """Return ``(nodeId, microseconds)`` for every sample in a profile."""
+    samples = profile.get("samples", [])
+    deltas = profile.get("timeDeltas", [])
+    timestamps = []
+    current = profile.get("startTime", 0)
+    for delta in deltas[: len(samples)]:
+        current += delta
+        timestamps.append(current)
+    timestamps.append(max(profile.get("endTime", current), current))
+    return [
+        (node_id, float(timestamps[i + 1] - timestamps[i]))
+        for i, node_id in enumerate(samples[: len(timestamps) - 1])
+    ]
+
+
+def summarise_profile(
+    profile: dict[str, Any], limit: int = DEFAULT_MAX_FUNCTIONS
+) -> dict[str, Any]:
+    """
+    Summarise a CPU profile into self and total time per function and per script.
+
+    Args:
+        profile: ``profile`` object returned by ``Profiler.stop``
+        limit: Maximum number of functions and scripts to report
+
+    Returns:
+        Profile duration, idle/GC/program buckets, and the heaviest functions and scripts
+    """
+    nodes = {node["id"]: node for node in profile.get("nodes", [])}
+    parents: dict[int, int] = {}
+    for node in nodes.values():
+        for child in node.get("children", []):
+            parents[child] = node["id"]
+
+    stack_keys: dict[int, set[tuple[str, str, int]]] = {}
+
+    def keys_for(node_id: int) -> set[tuple[str, str, int]]:
+        """Return the distinct functions on the stack ending at a node."""
+        path = []
+        while node_id in nodes and node_id not in stack_keys:
+            path.append(node_id)
+            node_id = parents.get(node_id, -1)
+        keys = stack_keys.get(node_id, set())
+        for current in reversed(path):
+            frame = nodes[current]["callFrame"]
+            if frame.get("functionName") not in _SYNTHETIC:
+                keys = keys | {_function_key(frame)}
+            stack_keys[current] = keys
+        return keys
+
+    self_time: dict[tuple[str, str, int], float] = {}
+    total_time: dict[tuple[str, str, int], float] = {}
+    script_time: dict[str, float] = {}
+    buckets = {"(idle)": 0.0, "(program)": 0.0, "(garbage collector)": 0.0}
+    duration = 0.0
+    for node_id, micros in sample_durations(profile):
+        duration += micros
+        node = nodes.get(node_id)
+        if node is None:
+            continue
+        frame = node["callFrame"]
+        name = frame.get("functionName")
+        if name in buckets:
+            buckets[name] += micros
+            continue
+        key = _function_key(frame)
+        self_time[key] = self_time.get(key, 0.0) + micros
+        script = frame.get("url") or "(no url)"
+        script_time[script] = script_time.get(script, 0.0) + micros
+        for function in keys_for(node_id):
+            total_time[function] = total_time.get(function, 0.0) + micros
+
+    def ms(micros: float) -> float:
+        return round(micros / 1000, 2)
+
+    busy = duration - buckets["(idle)"]
+    functions = sorted(self_time, key=lambda key: self_time[key], reverse=True)[:limit]
+    scripts = sorted(script_time, key=lambda url: script_time[url], reverse=True)[:limit]
+    return {
+        "durationMs": ms(duration),
+        "samples": len(profile.get("samples", [])),
+        "busyMs": ms(busy),
+        "idleMs": ms(buckets["(idle)"]),
+        "programMs": ms(buckets["(program)"]),
+        "garbageCollectorMs": ms(buckets["(garbage collector)"]),
+        "functions": [
+            {
+                "functionName": key[0],
+                "url": key[1],
+                "lineNumber": key[2],
+                "selfMs": ms(self_time[key]),
+                "totalMs": ms(total_time.get(key, 0.0)),
+                "selfPercentOfBusy": round(self_time[key] / busy * 100, 1) if busy else 0.0,
+            }
+            for key in functions
+        ],
+        "scripts": [{"url": url, "selfMs": ms(script_time[url])} for url in scripts],
+    }
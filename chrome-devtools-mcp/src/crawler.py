@@ -0,0 +1,371 @@
+#!/usr/bin/env python3
+"""Concurrent Crawl and Audit
+
+This module audits many pages at once across a pool of browser tabs. Each page gets a
+fresh tab from ``Target.createTarget``, attached as a flattened child session on the
+existing connection. The session's events go to a per-page listener rather than the
+client's shared stores, so concurrent pages never mix their requests or console output.
+
+A page audit records load timing from Navigation Timing and paint entries, console
+errors and uncaught exceptions, failed and HTTP-error requests, transferred bytes and,
+optionally, JavaScript and CSS coverage. Pages run on K workers pulling from one queue,
+each bounded by a per-page timeout. Each page's result is appended to a JSONL file as
+soon as it finishes, so a long crawl can be followed while it runs and an interrupted
+crawl keeps every page it completed.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import time
+import xml.etree.ElementTree as ET
+from typing import Any
+
+import aiohttp
+
+from .css_coverage import merge_intervals
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONCURRENCY = 4
+DEFAULT_PAGE_TIMEOUT = 30.0
+DEFAULT_MAX_PAGES = 500
+_MAX_LISTED = 10
+_SITEMAP_NS = "{http://www.sitemaps.org/schemas/sitemap/0.9}"
+
+TIMING_SCRIPT = """
+(() => {
+    const nav = performance.getEntriesByType('navigation')[0];
+    const paint = Object.fromEntries(
+        performance.getEntriesByType('paint').map(e => [e.name, e.startTime]));
+    return nav ? {
+        ttfb: nav.responseStart,
+        domContentLoaded: nav.domContentLoadedEventEnd,
+        load: nav.loadEventEnd,
+        firstContentfulPaint: paint['first-contentful-paint'] ?? null,
+        transferSize: nav.transferSize,
+        domNodes: document.getElementsByTagName('*').length
+    } : null;
+})()
+"""
+
+
+def parse_sitemap(text: str) -> tuple[list[str], list[str]]:
+    """Return (page URLs, nested sitemap URLs) from a sitemap or sitemap index."""
+    root = ET.fromstring(text)
+    locations = [
+        (element.text or "").strip()
+        for element in root.iter()
+        if element.tag in (f"{_SITEMAP_NS}loc", "loc")
+    ]
+    if root.tag in (f"{_SITEMAP_NS}sitemapindex", "sitemapindex"):
+        return [], locations
+    return locations, []
+
+
+async def _read(source: str) -> str:
+    """Read a sitemap from a URL or a local file."""
+    if source.startswith(("http://", "https://")):
+        async with aiohttp.ClientSession() as session:
+            async with session.get(source) as response:
+                response.raise_for_status()
+                return await response.text()
+    with open(source, encoding="utf-8") as handle:
+        return handle.read()
+
+
+async def load_sitemap(source: str, limit: int = DEFAULT_MAX_PAGES) -> list[str]:
+    """Collect up to ``limit`` page URLs from a sitemap, following sitemap indexes."""
+    pages: list[str] = []
+    pending = [source]
+    seen: set[str] = set()
+    while pending and len(pages) < limit:
+        current = pending.pop(0)
+        if current in seen:
+            continue
+        seen.add(current)
+        urls, nested = parse_sitemap(await _read(current))
+        pages.extend(urls)
+        pending.extend(nested)
+    return list(dict.fromkeys(pages))[:limit]
+
+
+def _covered_bytes(ranges: list[tuple[int, int]]) -> int:
+    return sum(end - start for start, end in merge_intervals(ranges))
+
+
+def js_coverage(scripts: list[dict[str, Any]]) -> dict[str, int]:
+    """Total and unused bytes from ``Profiler.takePreciseCoverage`` results."""
+    total = unused = 0
+    for script in scripts:
+        if not script.get("url"):
+            continue
+        ranges = [r for function in script["functions"] for r in function["ranges"]]
+        if not ranges:
+            continue
+        total += max(r["endOffset"] for r in ranges)
+        unused += _covered_bytes(
+            [(r["startOffset"], r["endOffset"]) for r in ranges if r["count"] == 0]
+        )
+    return {"totalBytes": total, "unusedBytes": unused}
+
+
+def css_coverage(usage: list[dict[str, Any]], lengths: dict[str, int]) -> dict[str, int]:
+    """Total and unused bytes from ``CSS.stopRuleUsageTracking`` results."""
+    used: dict[str, list[tuple[int, int]]] = {}
+    for rule in usage:
+        if rule.get("used"):
+            used.setdefault(rule["styleSheetId"], []).append(
+                (int(rule["startOffset"]), int(rule["endOffset"]))
+            )
+    total = sum(lengths.values())
+    used_bytes = sum(_covered_bytes(ranges) for ranges in used.values())
+    return {"totalBytes": total, "unusedBytes": max(0, total - used_bytes)}
+
+
+class PageAudit:
+    """
+    Event listener and result for one audited page.
+
+    Attributes:
+        url: Page URL
+        loaded: Resolved when the page's load event fires
+    """
+
+    def __init__(self, url: str) -> None:
+        self.url = url
+        self.loaded: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self.requests = 0
+        self.transferred = 0
+        self.failed: list[dict[str, Any]] = []
+        self.console_errors: list[str] = []
+        self.console_warnings = 0
+        self.exceptions: list[str] = []
+        self.sheet_lengths: dict[str, int] = {}
+        self._urls: dict[str, str] = {}
+
+    def on_event(self, method: str, params: dict[str, Any]) -> None:
+        """Fold one event from the page's session into the audit."""
+        if method == "Page.loadEventFired":
+            if not self.loaded.done():
+                self.loaded.set_result(None)
+        elif method == "Network.requestWillBeSent":
+            self.requests += 1
+            self._urls[params["requestId"]] = params["request"]["url"]
+        elif method == "Network.responseReceived":
+            status = params["response"]["status"]
+            if status >= 400:
+                self.failed.append({"url": params["response"]["url"], "status": status})
+        elif method == "Network.loadingFinished":
+            self.transferred += int(params.get("encodedDataLength", 0))
+        elif method == "Network.loadingFailed":
+            if not params.get("canceled"):
+                url = self._urls.get(params["requestId"], "")
+                self.failed.append({"url": url, "error": params.get("errorText")})
+        elif method == "Runtime.consoleAPICalled":
+            if params["type"] in ("error", "assert"):
+                text = " ".join(
+                    str(arg.get("value", arg.get("description", ""))) for arg in params["args"]
+                )
+                self.console_errors.append(text)
+            elif params["type"] == "warning":
+                self.console_warnings += 1
+        elif method == "Runtime.exceptionThrown":
+            details = params["exceptionDetails"]
+            description = details.get("exception", {}).get("description")
+            self.exceptions.append(description or details.get("text", "Unknown error"))
+        elif method == "CSS.styleSheetAdded":
+            header = params["header"]
+            self.sheet_lengths[header["styleSheetId"]] = int(header.get("length", 0))
+
+    def result(self) -> dict[str, Any]:
+        """Return the audit findings collected so far."""
+        return {
+            "url": self.url,
+            "requests": self.requests,
+            "transferredBytes": self.transferred,
+            "failedRequests": len(self.failed),
+            "failed": self.failed[:_MAX_LISTED],
+            "consoleErrors": len(self.console_errors),
+            "consoleWarnings": self.console_warnings,
+            "errors": self.console_errors[:_MAX_LISTED],
+            "exceptions": len(self.exceptions),
+            "exceptionMessages": self.exceptions[:_MAX_LISTED],
+        }
+
+
+async def _run_audit(
+    client: Any, session_id: str, audit: PageAudit, coverage: bool
+) -> dict[str, Any]:
+    """Navigate the session's tab and collect timing and coverage once it has loaded."""
+    setup: list[tuple[str, dict[str, Any]]] = [
+        ("Page.enable", {}),
+        ("Network.enable", {}),
+        ("Runtime.enable", {}),
+    ]
+    if coverage:
+        setup += [
+            ("Profiler.enable", {}),
+            ("Profiler.startPreciseCoverage", {"callCount": False, "detailed": False}),
+            ("DOM.enable", {}),
+            ("CSS.enable", {}),
+            ("CSS.startRuleUsageTracking", {}),
+        ]
+    for method, params in setup:
+        await client.send_command(method, params, session_id=session_id)
+
+    result = await client.send_command("Page.navigate", {"url": audit.url}, session_id=session_id)
+    if result.get("errorText"):
+        raise RuntimeError(f"Navigation failed: {result['errorText']}")
+    await audit.loaded
+
+    findings: dict[str, Any] = {}
+    timing = await client.send_command(
+        "Runtime.evaluate",
+        {"expression": TIMING_SCRIPT, "returnByValue": True},
+        session_id=session_id,
+    )
+    findings["timing"] = timing.get("result", {}).get("value")
+    if coverage:
+        scripts = await client.send_command("Profiler.takePreciseCoverage", session_id=session_id)
+        usage = await client.send_command("CSS.stopRuleUsageTracking", session_id=session_id)
+        findings["coverage"] = {
+            "js": js_coverage(scripts.get("result", [])),
+            "css": css_coverage(usage.get("ruleUsage", []), audit.sheet_lengths),
+        }
+    return findings
+
+
+async def audit_page(
+    client: Any, url: str, timeout: float = DEFAULT_PAGE_TIMEOUT, coverage: bool = False
+) -> dict[str, Any]:
+    """
+    Audit one page in a new tab, always closing the tab afterwards.
+
+    A page that does not finish within ``timeout``, counted from opening the tab, is
+    reported with ``timedOut`` and whatever requests and console output it produced
+    before the deadline.
+    """
+    audit = PageAudit(url)
+    started = time.perf_counter()
+    target_id = session_id = None
+    findings: dict[str, Any] = {}
+    status = "ok"
+    error = None
+
+    async def run() -> dict[str, Any]:
+        nonlocal target_id, session_id
+        created = await client.send_command("Target.createTarget", {"url": "about:blank"})
+        target_id = created["targetId"]
+        attached = await client.send_command(
+            "Target.attachToTarget", {"targetId": target_id, "flatten": True}
+        )
+        session_id = attached["sessionId"]
+        client.session_listeners[session_id] = audit.on_event
+        return await _run_audit(client, session_id, audit, coverage)
+
+    try:
+        findings = await asyncio.wait_for(run(), timeout)
+    except asyncio.TimeoutError:
+        status = "timeout"
+        error = f"Timed out after {timeout}s"
+    except Exception as e:
+        status = "error"
+        error = str(e)
+    finally:
+        if session_id is not None:
+            client.session_listeners.pop(session_id, None)
+        if target_id is not None:
+            try:
+                await client.send_command("Target.closeTarget", {"targetId": target_id})
+            except Exception as e:
+                logger.debug(f"Could not close crawl tab {target_id}: {e}")
+    return {
+        "status": status,
+        "error": error,
+        "elapsedMs": round((time.perf_counter() - started) * 1000, 1),
+        **audit.result(),
+        **findings,
+    }
+
+
+def summarise_crawl(results: list[dict[str, Any]], limit: int = _MAX_LISTED) -> dict[str, Any]:
+    """Aggregate page results into status counts and the worst pages."""
+    statuses: dict[str, int] = {}
+    for result in results:
+        statuses[result["status"]] = statuses.get(result["status"], 0) + 1
+
+    def load_time(result: dict[str, Any]) -> float:
+        return float((result.get("timing") or {}).get("load") or 0)
+
+    def worst(key: Any, field: str) -> list[dict[str, Any]]:
+        ranked = sorted(results, key=key, reverse=True)
+        return [{"url": r["url"], field: key(r)} for r in ranked[:limit] if key(r)]
+
+    return {
+        "pages": len(results),
+        "statuses": statuses,
+        "slowestLoads": worst(load_time, "loadMs"),
+        "mostConsoleErrors": worst(
+            lambda r: r["consoleErrors"] + r["exceptions"], "errorsAndExceptions"
+        ),
+        "mostFailedRequests": worst(lambda r: r["failedRequests"], "failedRequests"),
+    }
+
+
+async def crawl(
+    client: Any,
+    urls: list[str],
+    output_path: str,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    timeout: float = DEFAULT_PAGE_TIMEOUT,
+    coverage: bool = False,
+) -> dict[str, Any]:
+    """
+    Audit URLs across ``concurrency`` tabs, appending each result to a JSONL file.
+
+    Args:
+        client: Connected ChromeDevToolsClient
+        urls: Pages to audit
+        output_path: JSONL file written one line per page as pages finish
+        concurrency: Number of tabs open at once
+        timeout: Seconds allowed per page
+        coverage: Also measure JavaScript and CSS coverage
+
+    Returns:
+        Crawl summary with wall time, status counts and the worst pages
+
+    Raises:
+        ValueError: If concurrency is less than 1
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+    queue: asyncio.Queue[str] = asyncio.Queue()
+    for url in urls:
+        queue.put_nowait(url)
+    results: list[dict[str, Any]] = []
+    started = time.perf_counter()
+
+    with open(output_path, "w", encoding="utf-8") as handle:
+
+        async def worker() -> None:
+            while True:
+                try:
+                    url = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                result = await audit_page(client, url, timeout, coverage)
+                results.append(result)
+                handle.write(json.dumps(result) + "\n")
+                handle.flush()
+
+        await asyncio.gather(*(worker() for _ in range(min(concurrency, len(urls)))))
+
+    return {
+        "outputPath": output_path,
+        "concurrency": concurrency,
+        "wallTimeSeconds": round(time.perf_counter() - started, 2),
+        **summarise_crawl(results),
+    }
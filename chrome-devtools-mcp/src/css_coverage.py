@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""CSS Coverage Tracker
+
+This module accumulates CSS rule usage reported by Chrome's CSS domain into
+per-stylesheet interval sets, so that coverage can be measured in bytes rather
+than by counting rules.
+
+Long sessions are supported by polling ``CSS.takeCoverageDelta`` in the background
+and merging each delta as it arrives, instead of relying on a single
+``CSS.stopRuleUsageTracking`` call at the end.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+def merge_intervals(intervals: list[tuple[int, int]]) -> list[tuple[int, int]]:
+    """Merge overlapping or touching half-open intervals into a sorted, disjoint list."""
+    merged: list[tuple[int, int]] = []
+    for start, end in sorted(intervals):
+        if end <= start:
+            continue
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def complement_intervals(intervals: list[tuple[int, int]], length: int) -> list[tuple[int, int]]:
+    """Return the gaps in ``[0, length)`` not covered by merged ``intervals``."""
+    gaps: list[tuple[int, int]] = []
+    cursor = 0
+    for start, end in intervals:
+        if start > cursor:
+            gaps.append((cursor, min(start, length)))
+        cursor = max(cursor, end)
+    if cursor < length:
+        gaps.append((cursor, length))
+    return [(s, e) for s, e in gaps if e > s]
+
+
+def interval_bytes(text: str, intervals: list[tuple[int, int]]) -> int:
+    """Count UTF-8 encoded bytes of ``text`` covered by merged character ``intervals``."""
+    if text.isascii():
+        return sum(min(end, len(text)) - start for start, end in intervals if start < len(text))
+    return sum(len(text[start:end].encode("utf-8")) for start, end in intervals)
+
+
+class CSSCoverageTracker:
+    """
+    Server-side accumulator for CSS rule usage.
+
+    Rule usage entries from ``CSS.takeCoverageDelta`` and ``CSS.stopRuleUsageTracking``
+    are folded into merged character intervals keyed by ``styleSheetId``. A background
+    task can poll for deltas while tracking is active.
+
+    Attributes:
+        used: Merged used intervals per stylesheet
+        seen: Merged intervals of every rule reported per stylesheet
+        used_rules: Count of distinct used rules per stylesheet
+        total_rules: Count of distinct rules reported per stylesheet
+        polls: Number of coverage deltas merged since tracking started
+        active: Whether rule usage tracking is currently running
+    """
+
+    def __init__(self) -> None:
+        """Initialise an empty coverage tracker."""
+        self.used: dict[str, list[tuple[int, int]]] = {}
+        self.seen: dict[str, list[tuple[int, int]]] = {}
+        self._used_rules: dict[str, set[tuple[int, int]]] = {}
+        self._all_rules: dict[str, set[tuple[int, int]]] = {}
+        self.polls = 0
+        self.active = False
+        self._poll_task: asyncio.Task[None] | None = None
+
+    def reset(self) -> None:
+        """Discard all accumulated coverage."""
+        self.used.clear()
+        self.seen.clear()
+        self._used_rules.clear()
+        self._all_rules.clear()
+        self.polls = 0
+
+    def add_rule_usage(self, rule_usage: list[dict[str, Any]]) -> None:
+        """Merge a batch of CDP ``RuleUsage`` entries into the interval sets."""
+        used_batch: dict[str, list[tuple[int, int]]] = {}
+        seen_batch: dict[str, list[tuple[int, int]]] = {}
+
+        for rule in rule_usage:
+            sheet_id = rule.get("styleSheetId")
+            if not sheet_id:
+                continue
+            span = (int(rule.get("startOffset", 0)), int(rule.get("endOffset", 0)))
+            seen_batch.setdefault(sheet_id, []).append(span)
+            self._all_rules.setdefault(sheet_id, set()).add(span)
+            if rule.get("used", False):
+                used_batch.setdefault(sheet_id, []).append(span)
+                self._used_rules.setdefault(sheet_id, set()).add(span)
+
+        for sheet_id, spans in used_batch.items():
+            self.used[sheet_id] = merge_intervals(self.used.get(sheet_id, []) + spans)
+        for sheet_id, spans in seen_batch.items():
+            self.seen[sheet_id] = merge_intervals(self.seen.get(sheet_id, []) + spans)
+
+    @property
+    def stylesheet_ids(self) -> list[str]:
+        """All stylesheet IDs that have reported rule usage."""
+        return list(self.seen)
+
+    def rule_counts(self, sheet_id: str) -> tuple[int, int]:
+        """Return ``(used_rules, total_rules)`` for a stylesheet."""
+        return len(self._used_rules.get(sheet_id, ())), len(self._all_rules.get(sheet_id, ()))
+
+    async def start(self, client: Any, poll_interval: float | None = None) -> None:
+        """
+        Start rule usage tracking and, optionally, background delta polling.
+
+        Args:
+            client: Connected ChromeDevToolsClient
+            poll_interval: Seconds between ``CSS.takeCoverageDelta`` polls, or None to
+                           collect everything when tracking stops
+        """
+        await self.stop_polling()
+        self.reset()
+        await client.send_command("CSS.startRuleUsageTracking")
+        self.active = True
+        if poll_interval and poll_interval > 0:
+            self._poll_task = asyncio.create_task(self._poll(client, poll_interval))
+
+    async def take_delta(self, client: Any) -> int:
+        """Fetch and merge one coverage delta, returning the number of entries received."""
+        result = await client.send_command("CSS.takeCoverageDelta")
+        coverage = result.get("coverage", [])
+        self.add_rule_usage(coverage)
+        self.polls += 1
+        return len(coverage)
+
+    async def stop(self, client: Any) -> None:
+        """Stop polling and tracking, merging the final rule usage report."""
+        await self.stop_polling()
+        try:
+            result = await client.send_command("CSS.stopRuleUsageTracking")
+        finally:
+            # A failed stop (e.g. after a navigation) must not leave tracking looking active
+            self.active = False
+        self.add_rule_usage(result.get("ruleUsage", []))
+
+    async def stop_polling(self) -> None:
+        """Cancel the background polling task if one is running."""
+        if self._poll_task is not None:
+            self._poll_task.cancel()
+            try:
+                await self._poll_task
+            except asyncio.CancelledError:
+                pass
+            self._poll_task = None
+
+    async def _poll(self, client: Any, poll_interval: float) -> None:
+        """Poll for coverage deltas until cancelled."""
+        while True:
+            await asyncio.sleep(poll_interval)
+            try:
+                await self.take_delta(client)
+            except Exception as e:
+                logger.warning(f"CSS coverage delta poll failed: {e}")
+
+    def summarise_sheet(
+        self, sheet_id: str, text: str, include_unused_ranges: bool = False
+    ) -> dict[str, Any]:
+        """
+        Build a byte-level coverage summary for one stylesheet.
+
+        Args:
+            sheet_id: Stylesheet ID to summarise
+            text: Full stylesheet text from ``CSS.getStyleSheetText``
+            include_unused_ranges: Whether to include unused character ranges
+
+        Returns:
+            Dictionary with total, used and unused byte counts and rule counts
+        """
+        used = self.used.get(sheet_id, [])
+        total_bytes = len(text.encode("utf-8"))
+        used_bytes = interval_bytes(text, used)
+        used_rules, total_rules = self.rule_counts(sheet_id)
+
+        summary: dict[str, Any] = {
+            "styleSheetId": sheet_id,
+            "totalBytes": total_bytes,
+            "usedBytes": used_bytes,
+            "unusedBytes": total_bytes - used_bytes,
+            "unusedPercentage": round((total_bytes - used_bytes) / total_bytes * 100, 2)
+            if total_bytes
+            else 0,
+            "usedRules": used_rules,
+            "totalRules": total_rules,
+        }
+        if include_unused_ranges:
+            summary["unusedRanges"] = [
+                [start, end] for start, end in complement_intervals(used, len(text))
+            ]
+        return summary
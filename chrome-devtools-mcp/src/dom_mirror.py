@@ -0,0 +1,384 @@
+#!/usr/bin/env python3
+"""Live DOM Mirror
+
+This module keeps an optional local copy of the page's DOM tree in the client. It is
+seeded from ``DOM.getDocument(depth=-1)`` and kept current from DOM domain mutation
+events, so read-heavy tools can answer selector queries, attribute lookups and
+parent/child walks without a round-trip to Chrome.
+
+The mirror tracks its own freshness. ``DOM.documentUpdated`` marks it stale, and it is
+re-seeded on the next use. Any other caller re-fetching the document makes Chrome
+discard every issued node ID, so the mirror adopts that response as its new tree; the
+subtrees a shallow fetch left out are filled in with ``DOM.requestChildNodes`` on the
+next use rather than by a full re-seed.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from typing import Any
+
+from .selector_matching import SimpleSelector
+
+logger = logging.getLogger(__name__)
+
+_ELEMENT_NODE = 1
+
+
+def node_label(node_type: int, node_name: str, local_name: str, attributes: dict[str, str]) -> str:
+    """Build a compact ``tag#id.class`` label for a node."""
+    if node_type != _ELEMENT_NODE:
+        return node_name
+    label = local_name or node_name.lower()
+    if attributes.get("id"):
+        label += f"#{attributes['id']}"
+    for class_name in attributes.get("class", "").split():
+        label += f".{class_name}"
+    return label
+
+
+class MirrorNode:
+    """A single mirrored DOM node keyed by its CDP ``nodeId``."""
+
+    __slots__ = (
+        "node_id",
+        "backend_node_id",
+        "node_type",
+        "node_name",
+        "local_name",
+        "node_value",
+        "attributes",
+        "parent",
+        "children",
+        "child_node_count",
+        "shadow_roots",
+        "content_document",
+        "frame_id",
+    )
+
+    def __init__(self, payload: dict[str, Any], parent: MirrorNode | None) -> None:
+        self.node_id: int = payload["nodeId"]
+        self.backend_node_id: int = payload.get("backendNodeId", 0)
+        self.node_type: int = payload.get("nodeType", 0)
+        self.node_name: str = payload.get("nodeName", "")
+        self.local_name: str = payload.get("localName", "")
+        self.node_value: str = payload.get("nodeValue", "")
+        flat = payload.get("attributes", [])
+        self.attributes: dict[str, str] = {flat[i]: flat[i + 1] for i in range(0, len(flat) - 1, 2)}
+        self.parent = parent
+        self.children: list[MirrorNode] = []
+        self.child_node_count: int = payload.get("childNodeCount", 0)
+        self.shadow_roots: list[MirrorNode] = []
+        self.content_document: MirrorNode | None = None
+        self.frame_id: str | None = payload.get("frameId")
+
+    @property
+    def children_known(self) -> bool:
+        """Whether every child of this node is present in the mirror."""
+        return len(self.children) >= self.child_node_count
+
+    def label(self) -> str:
+        """Compact ``tag#id.class`` label for the node."""
+        return node_label(self.node_type, self.node_name, self.local_name, self.attributes)
+
+
+class DOMMirror:
+    """
+    Event-maintained local mirror of the page DOM.
+
+    Attributes:
+        enabled: Whether the mirror should be maintained and used
+        pierce: Whether the mirror includes shadow roots and iframe documents
+        root: Document node of the mirrored tree, or None until seeded
+        stale: Set when the mirrored node IDs may no longer match Chrome's
+        incomplete: Set when some mirrored node may be missing children
+        seeded_at: Unix timestamp of the last full seed
+        events_applied: Number of mutation events applied since the last seed
+    """
+
+    def __init__(self) -> None:
+        """Initialise a disabled, empty mirror."""
+        self.enabled = False
+        self.pierce = True
+        self.root: MirrorNode | None = None
+        self.stale = True
+        self.incomplete = False
+        self.seeded_at: float | None = None
+        self.events_applied = 0
+        self._nodes: dict[int, MirrorNode] = {}
+        self._seeding = False
+
+    @property
+    def is_fresh(self) -> bool:
+        """Whether the mirror can answer queries without contacting Chrome."""
+        return self.enabled and self.root is not None and not self.stale
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def get(self, node_id: int) -> MirrorNode | None:
+        """Look up a mirrored node by node ID."""
+        return self._nodes.get(node_id)
+
+    async def enable(self, client: Any, pierce: bool = True) -> None:
+        """Enable the mirror and seed it from a full document fetch."""
+        self.enabled = True
+        self.pierce = pierce
+        await self.seed(client)
+
+    def disable(self) -> None:
+        """Disable the mirror and drop all mirrored nodes."""
+        self.enabled = False
+        self._reset()
+
+    async def seed(self, client: Any) -> None:
+        """Fetch the whole document with ``DOM.getDocument(depth=-1)`` and rebuild."""
+        self._seeding = True
+        try:
+            result = await client.send_command(
+                "DOM.getDocument", {"depth": -1, "pierce": self.pierce}
+            )
+        finally:
+            self._seeding = False
+        self._load(result["root"])
+
+    async def ensure_fresh(self, client: Any) -> bool:
+        """
+        Bring an enabled mirror up to date, re-seeding or fetching missing subtrees.
+
+        Returns:
+            True if the mirror is fresh and may be used to answer queries
+        """
+        if not self.enabled:
+            return False
+        try:
+            if self.root is None or self.stale:
+                await self.seed(client)
+            if self.incomplete:
+                await self._fill_children(client)
+        except Exception as e:
+            logger.warning(f"DOM mirror refresh failed: {e}")
+            self.stale = True
+        return self.is_fresh
+
+    def on_document_fetched(self, params: dict[str, Any], result: dict[str, Any]) -> None:
+        """
+        React to any ``DOM.getDocument`` response, which invalidates prior node IDs.
+
+        The response carries the only valid node IDs, so it replaces the mirror. Nodes
+        whose children it left out are filled in on the next ``ensure_fresh``.
+        """
+        if not self.enabled or self._seeding:
+            return
+        root = result["root"]
+        if self.pierce and not params.get("pierce"):
+            # Without pierce the nested nodes lack shadow roots and frame documents, so
+            # only the document node is kept and the rest is requested with pierce
+            root = {key: value for key, value in root.items() if key != "children"}
+        self._load(root)
+
+    def handle_event(self, method: str, params: dict[str, Any]) -> None:
+        """Apply a DOM domain event to the mirror."""
+        if not self.enabled or self.root is None:
+            return
+
+        if method == "DOM.documentUpdated":
+            self.stale = True
+            return
+
+        applied = True
+        if method == "DOM.setChildNodes":
+            parent = self._nodes.get(params["parentId"])
+            if parent is not None:
+                self._replace_children(parent, params.get("nodes", []))
+        elif method == "DOM.childNodeInserted":
+            self._insert(params["parentNodeId"], params.get("previousNodeId", 0), params["node"])
+        elif method == "DOM.childNodeRemoved":
+            self._remove(params["parentNodeId"], params["nodeId"])
+        elif method == "DOM.attributeModified":
+            node = self._nodes.get(params["nodeId"])
+            if node is not None:
+                node.attributes[params["name"]] = params["value"]
+        elif method == "DOM.attributeRemoved":
+            node = self._nodes.get(params["nodeId"])
+            if node is not None:
+                node.attributes.pop(params["name"], None)
+        elif method == "DOM.characterDataModified":
+            node = self._nodes.get(params["nodeId"])
+            if node is not None:
+                node.node_value = params["characterData"]
+        elif method == "DOM.childNodeCountUpdated":
+            node = self._nodes.get(params["nodeId"])
+            if node is not None:
+                node.child_node_count = params["childNodeCount"]
+                self.incomplete = self.incomplete or not node.children_known
+        elif method == "DOM.shadowRootPushed":
+            host = self._nodes.get(params["hostId"])
+            if host is not None:
+                host.shadow_roots.append(self._build(params["root"], host))
+        elif method == "DOM.shadowRootPopped":
+            host = self._nodes.get(params["hostId"])
+            if host is not None:
+                for root in [r for r in host.shadow_roots if r.node_id == params["rootId"]]:
+                    host.shadow_roots.remove(root)
+                    self._forget(root)
+        else:
+            applied = False
+
+        if applied:
+            self.events_applied += 1
+
+    def query_selector_all(self, node_id: int, selector: str) -> list[int]:
+        """
+        Match a selector against the light-DOM descendants of a node, in document order.
+
+        Raises:
+            KeyError: If the node is not in the mirror
+            ValueError: If the selector is outside the locally supported subset
+        """
+        scope = self._nodes.get(node_id)
+        if scope is None:
+            raise KeyError(node_id)
+        compiled = SimpleSelector(selector)
+        matches: list[int] = []
+        stack = list(reversed(scope.children))
+        while stack:
+            node = stack.pop()
+            if compiled.matches(node):
+                matches.append(node.node_id)
+            stack.extend(reversed(node.children))
+        return matches
+
+    def ancestors(self, node: MirrorNode) -> list[MirrorNode]:
+        """Return the node's ancestors from parent to document root."""
+        chain = []
+        parent = node.parent
+        while parent is not None:
+            chain.append(parent)
+            parent = parent.parent
+        return chain
+
+    def to_cdp_node(self, node: MirrorNode, depth: int, pierce: bool = False) -> dict[str, Any]:
+        """Render a mirrored node in the CDP ``DOM.Node`` shape down to ``depth`` levels."""
+        payload: dict[str, Any] = {
+            "nodeId": node.node_id,
+            "backendNodeId": node.backend_node_id,
+            "nodeType": node.node_type,
+            "nodeName": node.node_name,
+            "localName": node.local_name,
+            "nodeValue": node.node_value,
+            "childNodeCount": max(node.child_node_count, len(node.children)),
+        }
+        if node.node_type == _ELEMENT_NODE:
+            payload["attributes"] = [item for pair in node.attributes.items() for item in pair]
+        if node.frame_id:
+            payload["frameId"] = node.frame_id
+        if depth != 0:
+            next_depth = depth - 1 if depth > 0 else -1
+            payload["children"] = [
+                self.to_cdp_node(child, next_depth, pierce) for child in node.children
+            ]
+            if pierce and node.shadow_roots:
+                payload["shadowRoots"] = [
+                    self.to_cdp_node(root, next_depth, pierce) for root in node.shadow_roots
+                ]
+            if pierce and node.content_document is not None:
+                payload["contentDocument"] = self.to_cdp_node(
+                    node.content_document, next_depth, pierce
+                )
+        return payload
+
+    def status(self) -> dict[str, Any]:
+        """Summarise the mirror state."""
+        return {
+            "enabled": self.enabled,
+            "fresh": self.is_fresh,
+            "pierce": self.pierce,
+            "nodeCount": len(self._nodes),
+            "eventsApplied": self.events_applied,
+            "seededAt": self.seeded_at,
+            "ageSeconds": round(time.time() - self.seeded_at, 2) if self.seeded_at else None,
+        }
+
+    async def _fill_children(self, client: Any) -> None:
+        """Request the children of every node that is missing some."""
+        self.incomplete = False
+        for node in [node for node in self._nodes.values() if not node.children_known]:
+            if self._nodes.get(node.node_id) is not node:
+                continue  # Replaced while filling an ancestor
+            # Children arrive through DOM.setChildNodes before the command returns. A
+            # failure leaves the mirror stale, so the next use re-seeds it
+            await client.send_command(
+                "DOM.requestChildNodes",
+                {"nodeId": node.node_id, "depth": -1, "pierce": self.pierce},
+            )
+            # Trust what Chrome sent so the same node is not requested on every call
+            node.child_node_count = len(node.children)
+
+    def _reset(self) -> None:
+        self.root = None
+        self.stale = True
+        self.incomplete = False
+        self._nodes.clear()
+
+    def _load(self, root_payload: dict[str, Any]) -> None:
+        """Replace the mirror contents with a freshly fetched tree."""
+        self._reset()
+        self.root = self._build(root_payload, None)
+        self.stale = False
+        self.seeded_at = time.time()
+        self.events_applied = 0
+
+    def _build(self, payload: dict[str, Any], parent: MirrorNode | None) -> MirrorNode:
+        """Recursively build mirror nodes from a CDP ``DOM.Node`` payload."""
+        node = MirrorNode(payload, parent)
+        self._nodes[node.node_id] = node
+        node.children = [self._build(child, node) for child in payload.get("children", [])]
+        node.shadow_roots = [self._build(root, node) for root in payload.get("shadowRoots", [])]
+        if payload.get("contentDocument"):
+            node.content_document = self._build(payload["contentDocument"], node)
+        if not node.children_known:
+            self.incomplete = True
+        return node
+
+    def _forget(self, node: MirrorNode) -> None:
+        """Remove a node and its whole subtree from the ID index."""
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            self._nodes.pop(current.node_id, None)
+            stack.extend(current.children)
+            stack.extend(current.shadow_roots)
+            if current.content_document is not None:
+                stack.append(current.content_document)
+
+    def _replace_children(self, parent: MirrorNode, payloads: list[dict[str, Any]]) -> None:
+        for child in parent.children:
+            self._forget(child)
+        parent.children = [self._build(child, parent) for child in payloads]
+        parent.child_node_count = len(parent.children)
+
+    def _insert(self, parent_id: int, previous_id: int, payload: dict[str, Any]) -> None:
+        parent = self._nodes.get(parent_id)
+        if parent is None:
+            return
+        node = self._build(payload, parent)
+        position = 0
+        if previous_id:
+            for index, child in enumerate(parent.children):
+                if child.node_id == previous_id:
+                    position = index + 1
+                    break
+        parent.children.insert(position, node)
+        parent.child_node_count = max(parent.child_node_count + 1, len(parent.children))
+
+    def _remove(self, parent_id: int, node_id: int) -> None:
+        parent = self._nodes.get(parent_id)
+        node = self._nodes.get(node_id)
+        if parent is None or node is None:
+            return
+        if node in parent.children:
+            parent.children.remove(node)
+            parent.child_node_count = max(0, parent.child_node_count - 1)
+        self._forget(node)
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""DOM Snapshot Model
+
+This module decodes the string-table, columnar result of ``DOMSnapshot.captureSnapshot``
+into a queryable local model. A single capture gives every node's attributes, layout
+bounds and a caller-chosen set of computed styles, replacing one CDP round-trip per node
+per property with one round-trip for the whole page.
+"""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Callable
+from typing import Any
+
+from .selector_matching import SimpleSelector
+
+DEFAULT_SNAPSHOT_STYLES = ["display", "visibility", "opacity"]
+
+_ELEMENT_NODE = 1
+_TEXT_NODE = 3
+
+
+class SnapshotNode:
+    """A single decoded node from a DOM snapshot."""
+
+    __slots__ = (
+        "index",
+        "document_index",
+        "backend_node_id",
+        "node_type",
+        "local_name",
+        "node_value",
+        "attributes",
+        "parent",
+        "children",
+        "bounds",
+        "styles",
+    )
+
+    def __init__(self, index: int, document_index: int) -> None:
+        self.index = index
+        self.document_index = document_index
+        self.backend_node_id = 0
+        self.node_type = 0
+        self.local_name = ""
+        self.node_value = ""
+        self.attributes: dict[str, str] = {}
+        self.parent: SnapshotNode | None = None
+        self.children: list[SnapshotNode] = []
+        self.bounds: list[float] | None = None
+        self.styles: dict[str, str] = {}
+
+    def text(self, max_length: int = 100) -> str:
+        """Return the element's own text (direct text children), trimmed to ``max_length``."""
+        parts = [child.node_value for child in self.children if child.node_type == _TEXT_NODE]
+        text = " ".join(" ".join(parts).split())
+        return text[:max_length]
+
+    def intersects(self, bbox: list[float]) -> bool:
+        """Return True if the node's layout bounds intersect ``[x, y, width, height]``."""
+        if self.bounds is None:
+            return False
+        x, y, width, height = self.bounds
+        bx, by, bwidth, bheight = bbox
+        return x < bx + bwidth and bx < x + width and y < by + bheight and by < y + height
+
+
+class DOMSnapshot:
+    """
+    Decoded ``DOMSnapshot.captureSnapshot`` result.
+
+    Attributes:
+        nodes: Every decoded node across all captured documents
+        elements: Element nodes only, in document order
+        documents: Per-document metadata (URL, frame ID, node count)
+        computed_styles: Computed style properties captured for each laid-out node
+        captured_at: Capture time as a Unix timestamp
+    """
+
+    def __init__(self, result: dict[str, Any], computed_styles: list[str]) -> None:
+        """
+        Decode a raw captureSnapshot result.
+
+        Args:
+            result: Raw result with ``documents`` and ``strings``
+            computed_styles: Style property names in the order they were requested
+        """
+        self.computed_styles = computed_styles
+        self.captured_at = time.time()
+        self.nodes: list[SnapshotNode] = []
+        self.documents: list[dict[str, Any]] = []
+
+        strings: list[str] = result.get("strings", [])
+
+        def string(index: int) -> str:
+            return strings[index] if 0 <= index < len(strings) else ""
+
+        for document_index, document in enumerate(result.get("documents", [])):
+            self._decode_document(document_index, document, string)
+
+        self.elements = [node for node in self.nodes if node.node_type == _ELEMENT_NODE]
+
+    def _decode_document(
+        self, document_index: int, document: dict[str, Any], string: Callable[[int], str]
+    ) -> None:
+        """Decode one DocumentSnapshot's node tree and layout tree."""
+        tree = document.get("nodes", {})
+        parent_indexes: list[int] = tree.get("parentIndex", [])
+        node_types: list[int] = tree.get("nodeType", [])
+        node_names: list[int] = tree.get("nodeName", [])
+        node_values: list[int] = tree.get("nodeValue", [])
+        backend_ids: list[int] = tree.get("backendNodeId", [])
+        attributes: list[list[int]] = tree.get("attributes", [])
+
+        nodes = [SnapshotNode(index, document_index) for index in range(len(parent_indexes))]
+        for index, node in enumerate(nodes):
+            node.node_type = node_types[index] if index < len(node_types) else 0
+            node.local_name = string(node_names[index]).lower() if index < len(node_names) else ""
+            if index < len(node_values):
+                node.node_value = string(node_values[index])
+            if index < len(backend_ids):
+                node.backend_node_id = backend_ids[index]
+            if index < len(attributes):
+                pairs = attributes[index]
+                node.attributes = {
+                    string(pairs[i]): string(pairs[i + 1]) for i in range(0, len(pairs) - 1, 2)
+                }
+            parent_index = parent_indexes[index]
+            if 0 <= parent_index < len(nodes):
+                node.parent = nodes[parent_index]
+                nodes[parent_index].children.append(node)
+
+        layout = document.get("layout", {})
+        bounds: list[list[float]] = layout.get("bounds", [])
+        styles: list[list[int]] = layout.get("styles", [])
+        for layout_index, node_index in enumerate(layout.get("nodeIndex", [])):
+            if not 0 <= node_index < len(nodes):
+                continue
+            node = nodes[node_index]
+            if layout_index < len(bounds):
+                node.bounds = [round(value, 1) for value in bounds[layout_index]]
+            if layout_index < len(styles):
+                node.styles = {
+                    name: string(value)
+                    for name, value in zip(self.computed_styles, styles[layout_index], strict=False)
+                }
+
+        self.documents.append(
+            {
+                "documentIndex": document_index,
+                "documentURL": string(document.get("documentURL", -1)),
+                "frameId": string(document.get("frameId", -1)),
+                "nodeCount": len(nodes),
+                "layoutCount": len(layout.get("nodeIndex", [])),
+            }
+        )
+        self.nodes.extend(nodes)
+
+    def query(
+        self,
+        selector: str | None = None,
+        bbox: list[float] | None = None,
+        laid_out_only: bool = False,
+    ) -> list[SnapshotNode]:
+        """
+        Filter elements locally by selector and/or bounding box.
+
+        Args:
+            selector: CSS selector in the subset supported by SimpleSelector
+            bbox: Page-coordinate rectangle ``[x, y, width, height]`` to intersect
+            laid_out_only: Only include elements that have a layout box
+
+        Returns:
+            Matching element nodes in document order
+
+        Raises:
+            ValueError: If the selector is not supported for local matching
+        """
+        compiled = SimpleSelector(selector) if selector else None
+        matches = []
+        for node in self.elements:
+            if laid_out_only and node.bounds is None:
+                continue
+            if bbox is not None and not node.intersects(bbox):
+                continue
+            if compiled is not None and not compiled.matches(node):
+                continue
+            matches.append(node)
+        return matches
+
+    def describe(
+        self, node: SnapshotNode, include_attributes: bool = True, include_text: bool = False
+    ) -> dict[str, Any]:
+        """Build a compact JSON-safe description of an element."""
+        attributes = node.attributes
+        description: dict[str, Any] = {
+            "backendNodeId": node.backend_node_id,
+            "nodeName": node.local_name,
+        }
+        if attributes.get("id"):
+            description["id"] = attributes["id"]
+        if attributes.get("class"):
+            description["classes"] = attributes["class"].split()
+        if include_attributes:
+            extra = {k: v for k, v in attributes.items() if k not in ("id", "class")}
+            if extra:
+                description["attributes"] = extra
+        if node.bounds is not None:
+            description["bounds"] = node.bounds
+        if node.styles:
+            description["styles"] = node.styles
+        if include_text:
+            text = node.text()
+            if text:
+                description["text"] = text
+        if node.document_index:
+            description["documentIndex"] = node.document_index
+        return description
@@ -0,0 +1,360 @@
+#!/usr/bin/env python3
+"""Fetch Record/Replay
+
+This module intercepts page requests with the ``Fetch`` domain to make page-load runs
+repeatable. On the first run, responses are recorded into a content-addressed cache on
+disk. On later runs the same requests are answered from that cache with
+``Fetch.fulfillRequest``, so the network and the server are taken out of the
+measurement.
+
+URL pattern rules choose what is recorded, replayed, blocked or left alone, and each
+rule can inject a fixed latency and a bandwidth cap so replayed loads still take a
+controlled, realistic amount of time.
+
+Cache layout::
+
+    <cache_dir>/index.json          "GET https://..." -> status, headers, body hash
+    <cache_dir>/objects/<sha256>    response bodies, stored once per distinct content
+"""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+import fnmatch
+import hashlib
+import json
+import logging
+import os
+import time
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+ACTIONS = ("replay", "passthrough", "block")
+MODES = ("auto", "record", "replay")
+
+# Headers that describe the wire encoding, which no longer applies to a decoded body
+_STRIPPED_HEADERS = {"content-encoding", "content-length", "transfer-encoding"}
+_RECORDABLE_METHODS = {"GET", "HEAD"}
+
+
+class ReplayRule:
+    """
+    URL pattern rule for intercepted requests.
+
+    Attributes:
+        url_pattern: Wildcard pattern (``*`` and ``?``) matched against the request URL
+        action: ``"replay"`` to record/replay, ``"passthrough"`` or ``"block"``
+        latency_ms: Delay injected before the response is delivered
+        bandwidth_kbps: Simulated bandwidth in kilobits per second (None for unlimited)
+    """
+
+    __slots__ = ("url_pattern", "action", "latency_ms", "bandwidth_kbps")
+
+    def __init__(
+        self,
+        url_pattern: str = "*",
+        action: str = "replay",
+        latency_ms: float = 0,
+        bandwidth_kbps: float | None = None,
+    ) -> None:
+        if action not in ACTIONS:
+            raise ValueError(f"Unknown rule action {action!r}, expected one of {ACTIONS}")
+        self.url_pattern = url_pattern
+        self.action = action
+        self.latency_ms = latency_ms
+        self.bandwidth_kbps = bandwidth_kbps
+
+    @classmethod
+    def from_dict(cls, rule: dict[str, Any]) -> ReplayRule:
+        """Build a rule from ``{"urlPattern", "action", "latencyMs", "bandwidthKbps"}``."""
+        return cls(
+            rule.get("urlPattern", "*"),
+            rule.get("action", "replay"),
+            rule.get("latencyMs", 0),
+            rule.get("bandwidthKbps"),
+        )
+
+    def matches(self, url: str) -> bool:
+        """Return True if the rule applies to ``url``."""
+        return fnmatch.fnmatchcase(url, self.url_pattern)
+
+    def delay(self, size: int) -> float:
+        """Return the seconds to wait before delivering a body of ``size`` bytes."""
+        seconds = self.latency_ms / 1000
+        if self.bandwidth_kbps:
+            seconds += size * 8 / (self.bandwidth_kbps * 1000)
+        return seconds
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the rule in the shape accepted by ``from_dict``."""
+        return {
+            "urlPattern": self.url_pattern,
+            "action": self.action,
+            "latencyMs": self.latency_ms,
+            "bandwidthKbps": self.bandwidth_kbps,
+        }
+
+
+class ReplayCache:
+    """
+    Content-addressed response cache on disk.
+
+    Attributes:
+        directory: Cache root directory
+        index: Recorded responses keyed by ``"<METHOD> <URL>"``
+    """
+
+    def __init__(self, directory: str) -> None:
+        self.directory = directory
+        self._objects = os.path.join(directory, "objects")
+        os.makedirs(self._objects, exist_ok=True)
+        self._index_path = os.path.join(directory, "index.json")
+        self.index: dict[str, dict[str, Any]] = {}
+        if os.path.exists(self._index_path):
+            with open(self._index_path, encoding="utf-8") as handle:
+                self.index = json.load(handle)
+
+    @staticmethod
+    def key(method: str, url: str) -> str:
+        return f"{method.upper()} {url}"
+
+    def lookup(self, method: str, url: str) -> dict[str, Any] | None:
+        """Return the recorded response metadata for a request, if any."""
+        return self.index.get(self.key(method, url))
+
+    def read_body(self, digest: str) -> bytes:
+        """Read a stored body by its SHA-256 digest."""
+        with open(os.path.join(self._objects, digest), "rb") as handle:
+            return handle.read()
+
+    def record(
+        self,
+        method: str,
+        url: str,
+        status: int,
+        headers: list[dict[str, str]],
+        body: bytes,
+        mime_type: str | None = None,
+    ) -> str:
+        """Store a response, writing its body only if that content is not already held."""
+        digest = hashlib.sha256(body).hexdigest()
+        path = os.path.join(self._objects, digest)
+        if not os.path.exists(path):
+            temporary = f"{path}.tmp"
+            with open(temporary, "wb") as handle:
+                handle.write(body)
+            os.replace(temporary, path)
+        self.index[self.key(method, url)] = {
+            "status": status,
+            "headers": [h for h in headers if h["name"].lower() not in _STRIPPED_HEADERS],
+            "sha256": digest,
+            "size": len(body),
+            "mimeType": mime_type,
+            "recordedAt": time.time(),
+        }
+        return digest
+
+    def save(self) -> None:
+        """Write the index to disk atomically."""
+        temporary = f"{self._index_path}.tmp"
+        with open(temporary, "w", encoding="utf-8") as handle:
+            json.dump(self.index, handle, indent=1)
+        os.replace(temporary, self._index_path)
+
+    def stats(self) -> dict[str, Any]:
+        """Summarise recorded responses and deduplicated storage."""
+        digests = {entry["sha256"] for entry in self.index.values()}
+        logical = sum(entry["size"] for entry in self.index.values())
+        stored = sum(
+            os.path.getsize(os.path.join(self._objects, digest))
+            for digest in digests
+            if os.path.exists(os.path.join(self._objects, digest))
+        )
+        return {
+            "directory": self.directory,
+            "responses": len(self.index),
+            "uniqueBodies": len(digests),
+            "logicalBytes": logical,
+            "storedBytes": stored,
+        }
+
+
+class FetchReplay:
+    """
+    ``Fetch.requestPaused`` handler implementing record/replay with throttling.
+
+    Attributes:
+        enabled: Whether interception is active
+        mode: ``"auto"`` replays hits and records misses, ``"record"`` always refetches
+              and overwrites, ``"replay"`` serves hits and fails misses
+        rules: Ordered URL rules; the first match wins
+        default_rule: Rule applied when no rule matches
+        cache: Content-addressed response cache
+        counters: Per-outcome request counts
+    """
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self.mode = "auto"
+        self.rules: list[ReplayRule] = []
+        self.default_rule = ReplayRule()
+        self.cache: ReplayCache | None = None
+        self.counters: dict[str, int] = {}
+        self._tasks: set[asyncio.Task[None]] = set()
+
+    async def start(
+        self,
+        client: Any,
+        cache_dir: str,
+        mode: str = "auto",
+        rules: list[ReplayRule] | None = None,
+        default_rule: ReplayRule | None = None,
+    ) -> None:
+        """
+        Enable request interception.
+
+        Raises:
+            ValueError: If ``mode`` is unknown
+        """
+        if mode not in MODES:
+            raise ValueError(f"Unknown replay mode {mode!r}, expected one of {MODES}")
+        self.cache = ReplayCache(cache_dir)
+        self.mode = mode
+        self.rules = rules or []
+        self.default_rule = default_rule or ReplayRule()
+        self.counters = {}
+        await client.send_command("Fetch.enable", {"patterns": [{"urlPattern": "*"}]})
+        self.enabled = True
+
+    async def stop(self, client: Any) -> None:
+        """Disable interception, letting in-flight requests finish, and save the index."""
+        self.enabled = False
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        try:
+            await client.send_command("Fetch.disable")
+        except Exception as e:
+            logger.debug(f"Fetch.disable failed: {e}")
+        if self.cache is not None:
+            self.cache.save()
+
+    def rule_for(self, url: str) -> ReplayRule:
+        """Return the first rule matching ``url``, or the default rule."""
+        for rule in self.rules:
+            if rule.matches(url):
+                return rule
+        return self.default_rule
+
+    def on_request_paused(self, client: Any, params: dict[str, Any]) -> None:
+        """Handle ``Fetch.requestPaused`` without blocking the receive loop."""
+        task = asyncio.create_task(self._handle(client, params))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _handle(self, client: Any, params: dict[str, Any]) -> None:
+        request_id = params["requestId"]
+        try:
+            if "responseStatusCode" in params or "responseErrorReason" in params:
+                await self._handle_response(client, params)
+            else:
+                await self._handle_request(client, params)
+        except Exception as e:
+            self._count("errors")
+            logger.warning(f"Fetch replay failed for {params['request'].get('url')}: {e}")
+            try:
+                await client.send_command("Fetch.continueRequest", {"requestId": request_id})
+            except Exception:
+                pass
+
+    async def _handle_request(self, client: Any, params: dict[str, Any]) -> None:
+        request_id = params["requestId"]
+        request = params["request"]
+        url, method = request["url"], request.get("method", "GET")
+        rule = self.rule_for(url)
+
+        if not self.enabled or rule.action == "passthrough" or self.cache is None:
+            self._count("passthrough")
+            await client.send_command("Fetch.continueRequest", {"requestId": request_id})
+            return
+        if rule.action == "block":
+            self._count("blocked")
+            await client.send_command(
+                "Fetch.failRequest", {"requestId": request_id, "errorReason": "BlockedByClient"}
+            )
+            return
+        if method.upper() not in _RECORDABLE_METHODS:
+            self._count("passthrough")
+            await client.send_command("Fetch.continueRequest", {"requestId": request_id})
+            return
+
+        entry = self.cache.lookup(method, url) if self.mode != "record" else None
+        if entry is not None:
+            body = self.cache.read_body(entry["sha256"])
+            await asyncio.sleep(rule.delay(len(body)))
+            await client.send_command(
+                "Fetch.fulfillRequest",
+                {
+                    "requestId": request_id,
+                    "responseCode": entry["status"],
+                    "responseHeaders": entry["headers"],
+                    "body": base64.b64encode(body).decode("ascii"),
+                },
+            )
+            self._count("replayed")
+            return
+        if self.mode == "replay":
+            self._count("missed")
+            await client.send_command(
+                "Fetch.failRequest",
+                {"requestId": request_id, "errorReason": "InternetDisconnected"},
+            )
+            return
+
+        # Let the request go to the network and pause again when the response arrives
+        await client.send_command(
+            "Fetch.continueRequest", {"requestId": request_id, "interceptResponse": True}
+        )
+
+    async def _handle_response(self, client: Any, params: dict[str, Any]) -> None:
+        request_id = params["requestId"]
+        request = params["request"]
+        status = params.get("responseStatusCode", 0)
+        rule = self.rule_for(request["url"])
+
+        if (
+            self.cache is not None
+            and "responseErrorReason" not in params
+            and not (300 <= status < 400)
+        ):
+            result = await client.send_command("Fetch.getResponseBody", {"requestId": request_id})
+            body = result.get("body", "")
+            raw = base64.b64decode(body) if result.get("base64Encoded") else body.encode("utf-8")
+            headers = params.get("responseHeaders", [])
+            content_type = next(
+                (h["value"] for h in headers if h["name"].lower() == "content-type"), None
+            )
+            self.cache.record(
+                request.get("method", "GET"), request["url"], status, headers, raw, content_type
+            )
+            self._count("recorded")
+            await asyncio.sleep(rule.delay(len(raw)))
+        else:
+            self._count("passthrough")
+        await client.send_command("Fetch.continueRequest", {"requestId": request_id})
+
+    def _count(self, outcome: str) -> None:
+        self.counters[outcome] = self.counters.get(outcome, 0) + 1
+
+    def status(self) -> dict[str, Any]:
+        """Summarise interception state, rules and cache contents."""
+        return {
+            "enabled": self.enabled,
+            "mode": self.mode,
+            "rules": [rule.to_dict() for rule in self.rules],
+            "defaultRule": self.default_rule.to_dict(),
+            "inFlight": len(self._tasks),
+            "counters": self.counters,
+            "cache": self.cache.stats() if self.cache is not None else None,
+        }
@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""Frame Execution Contexts and Child Sessions
+
+This module tracks the default JavaScript execution context of every frame so that code
+can be evaluated in a specific frame rather than always in the main one. Contexts are
+learned from ``Runtime.executionContextCreated`` events, whose ``auxData`` names the
+owning frame, and forgotten on ``Runtime.executionContextDestroyed`` and
+``Runtime.executionContextsCleared``.
+
+Out-of-process iframes live in a different renderer and never report contexts on the
+page's own session. ``Target.setAutoAttach`` in flattened mode attaches to them as
+child sessions on the same WebSocket; each child session has Runtime enabled before it
+is resumed, so its frames' contexts are tracked alongside the page's, keyed by session.
+
+Dedicated, shared and service workers are auto-attached the same way. Their sessions
+get Runtime and Network enabled before they start, so their console output and requests
+flow into the client's ordinary stores, tagged with the target they came from, and
+their Profiler domain can be driven through the session like the page's.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FRAME_TIMEOUT = 5.0
+WORKER_TYPES = ("worker", "shared_worker", "service_worker")
+
+AUTO_ATTACH_PARAMS: dict[str, Any] = {
+    "autoAttach": True,
+    "waitForDebuggerOnStart": True,
+    "flatten": True,
+    "filter": [{"type": target_type} for target_type in ("iframe", *WORKER_TYPES)],
+}
+
+
+class FrameContexts:
+    """
+    Map of frame IDs to their default execution context and owning session.
+
+    Attributes:
+        contexts: ``{"contextId", "sessionId", "origin"}`` keyed by frameId
+        sessions: Attached child target info (out-of-process iframes and workers) keyed
+                  by sessionId
+    """
+
+    def __init__(self) -> None:
+        self.contexts: dict[str, dict[str, Any]] = {}
+        self.sessions: dict[str, dict[str, Any]] = {}
+
+    def on_context_created(self, context: dict[str, Any], session_id: str | None) -> None:
+        """Record a frame's default context from ``Runtime.executionContextCreated``."""
+        aux = context.get("auxData") or {}
+        if not aux.get("isDefault") or not aux.get("frameId"):
+            return  # Isolated worlds and extension contexts
+        self.contexts[aux["frameId"]] = {
+            "contextId": context["id"],
+            "sessionId": session_id,
+            "origin": context.get("origin", ""),
+        }
+
+    def on_context_destroyed(self, context_id: int, session_id: str | None) -> None:
+        """Forget a context after ``Runtime.executionContextDestroyed``."""
+        for frame_id, entry in list(self.contexts.items()):
+            if entry["contextId"] == context_id and entry["sessionId"] == session_id:
+                del self.contexts[frame_id]
+
+    def on_contexts_cleared(self, session_id: str | None) -> None:
+        """Forget every context of a session after ``Runtime.executionContextsCleared``."""
+        self.contexts = {
+            frame_id: entry
+            for frame_id, entry in self.contexts.items()
+            if entry["sessionId"] != session_id
+        }
+
+    def on_attached(self, params: dict[str, Any], parent_session: str | None) -> None:
+        """Record a child session from ``Target.attachedToTarget``."""
+        self.sessions[params["sessionId"]] = {
+            **params["targetInfo"],
+            "parentSessionId": parent_session,
+        }
+
+    def on_detached(self, session_id: str) -> None:
+        """Drop a child session and its contexts after ``Target.detachedFromTarget``."""
+        self.sessions.pop(session_id, None)
+        self.on_contexts_cleared(session_id)
+
+    def target_tag(self, session_id: str | None) -> dict[str, Any]:
+        """Return the fields that tag a stored event with the target it came from."""
+        if session_id is None:
+            return {"sessionId": None, "targetType": "page"}
+        target = self.sessions.get(session_id, {})
+        return {
+            "sessionId": session_id,
+            "targetType": target.get("type", "unknown"),
+            "targetUrl": target.get("url"),
+        }
+
+    def find_session(self, target: str) -> str:
+        """
+        Resolve a child session by targetId, target type or URL substring.
+
+        Raises:
+            ValueError: If no attached target matches
+        """
+        for match in (
+            lambda info: info.get("targetId") == target,
+            lambda info: info.get("type") == target,
+            lambda info: target in info.get("url", ""),
+        ):
+            for session_id, info in self.sessions.items():
+                if match(info):
+                    return session_id
+        attached = [f"{info.get('type')} {info.get('url')}" for info in self.sessions.values()]
+        raise ValueError(f"No attached target matches {target!r}; attached: {attached}")
+
+    def clear(self) -> None:
+        """Forget all contexts and sessions, e.g. on reconnect."""
+        self.contexts.clear()
+        self.sessions.clear()
+
+
+async def prepare_session(client: Any, params: dict[str, Any]) -> None:
+    """
+    Enable Runtime (and Network for workers) in a newly attached child session, then
+    let it run.
+
+    Nested out-of-process frames and workers are attached by repeating auto-attach in
+    the child.
+    """
+    session_id = params["sessionId"]
+    target_type = params["targetInfo"].get("type")
+    commands: list[tuple[str, dict[str, Any]]] = []
+    if target_type == "iframe" or target_type in WORKER_TYPES:
+        commands.append(("Runtime.enable", {}))
+    if target_type in WORKER_TYPES:
+        commands.append(("Network.enable", {}))
+    if commands:
+        commands.append(("Target.setAutoAttach", AUTO_ATTACH_PARAMS))
+    for method, command_params in commands:
+        try:
+            await client.send_command(method, command_params, session_id=session_id)
+        except Exception as e:
+            logger.debug(f"{method} failed in session {session_id}: {e}")
+    if params.get("waitingForDebugger"):
+        try:
+            await client.send_command("Runtime.runIfWaitingForDebugger", session_id=session_id)
+        except Exception as e:
+            logger.debug(f"Could not resume session {session_id}: {e}")
+
+
+def _flatten_frame_tree(node: dict[str, Any]) -> list[dict[str, Any]]:
+    """Return every frame in a ``Page.getFrameTree`` node, parents first."""
+    frames = [node["frame"]]
+    for child in node.get("childFrames", []):
+        frames.extend(_flatten_frame_tree(child))
+    return frames
+
+
+async def list_frames(client: Any) -> list[dict[str, Any]]:
+    """
+    Return every known frame with its URL, context and session.
+
+    In-process frames come from the page's frame tree; out-of-process frames and their
+    descendants are added from the tracked contexts of child sessions.
+    """
+    tree = await client.send_command("Page.getFrameTree")
+    contexts = client.frame_contexts.contexts
+    sessions = client.frame_contexts.sessions
+    frames: dict[str, dict[str, Any]] = {}
+    for frame in _flatten_frame_tree(tree["frameTree"]):
+        frames[frame["id"]] = {"frameId": frame["id"], "frameUrl": frame.get("url", "about:blank")}
+    for frame_id, entry in contexts.items():
+        if entry["sessionId"] is not None:
+            target = sessions.get(entry["sessionId"], {})
+            url = target.get("url") if target.get("targetId") == frame_id else None
+            frames.setdefault(frame_id, {"frameId": frame_id, "frameUrl": url or entry["origin"]})
+    for frame_id, frame in frames.items():
+        entry = contexts.get(frame_id)
+        frame["contextId"] = entry["contextId"] if entry else None
+        frame["sessionId"] = entry["sessionId"] if entry else None
+        frame["outOfProcess"] = bool(entry and entry["sessionId"])
+    return list(frames.values())
+
+
+async def _evaluate_in_frame(
+    client: Any, frame: dict[str, Any], expression: str, timeout: float
+) -> dict[str, Any]:
+    """Evaluate in one frame's context, converting failures into a result entry."""
+    result: dict[str, Any] = {
+        "frameId": frame["frameId"],
+        "frameUrl": frame["frameUrl"],
+        "contextId": frame["contextId"],
+        "outOfProcess": frame["outOfProcess"],
+    }
+    if frame["contextId"] is None:
+        return {**result, "success": False, "error": "No execution context for frame"}
+
+    started = time.perf_counter()
+    try:
+        response = await asyncio.wait_for(
+            client.send_command(
+                "Runtime.evaluate",
+                {
+                    "expression": expression,
+                    "contextId": frame["contextId"],
+                    "returnByValue": True,
+                    # Terminates runaway scripts in the page as well as abandoning the wait
+                    "timeout": int(timeout * 1000),
+                },
+                session_id=frame["sessionId"],
+            ),
+            timeout,
+        )
+    except asyncio.TimeoutError:
+        return {
+            **result,
+            "success": False,
+            "timedOut": True,
+            "error": f"Timed out after {timeout}s",
+        }
+    except Exception as e:
+        return {**result, "success": False, "error": str(e)}
+    result["durationMs"] = round((time.perf_counter() - started) * 1000, 1)
+
+    if response.get("exceptionDetails"):
+        details = response["exceptionDetails"]
+        message = details.get("exception", {}).get("description") or details.get("text")
+        return {**result, "success": False, "error": message or "Unknown error"}
+    return {
+        **result,
+        "success": True,
+        "result": response.get("result", {}),
+        "value": response.get("result", {}).get("value"),
+    }
+
+
+async def evaluate_in_frames(
+    client: Any, expression: str, timeout: float = DEFAULT_FRAME_TIMEOUT
+) -> list[dict[str, Any]]:
+    """
+    Evaluate an expression concurrently in every frame's default context.
+
+    Args:
+        client: Connected ChromeDevToolsClient
+        expression: JavaScript expression to evaluate
+        timeout: Seconds each frame may take before its result is abandoned
+
+    Returns:
+        One result per frame, in frame-tree order
+    """
+    frames = await list_frames(client)
+    return list(
+        await asyncio.gather(
+            *(_evaluate_in_frame(client, frame, expression, timeout) for frame in frames)
+        )
+    )
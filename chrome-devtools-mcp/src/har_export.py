@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""HAR Export
+
+This module converts the client's captured network records into HAR 1.2 entries and
+writes them to disk one entry at a time. The log header is written first, then each
+entry is serialised and appended as soon as it is built, so exporting a session with tens
+of thousands of requests never holds the whole archive in memory.
+"""
+
+from __future__ import annotations
+
+import base64
+import json
+from datetime import datetime, timezone
+from typing import IO, Any
+from urllib.parse import parse_qsl, urlsplit
+
+HAR_VERSION = "1.2"
+CREATOR = {"name": "chrome-devtools-mcp", "version": "1.0.0"}
+
+
+def _iso_time(wall_time: float | None) -> str:
+    """Format a Unix timestamp as an ISO 8601 HAR date."""
+    moment = datetime.fromtimestamp(wall_time or 0, tz=timezone.utc)
+    return moment.isoformat(timespec="milliseconds").replace("+00:00", "Z")
+
+
+def _name_values(headers: dict[str, Any] | None) -> list[dict[str, str]]:
+    """Convert a CDP header dict to a HAR name/value list, splitting folded values."""
+    pairs = []
+    for name, value in (headers or {}).items():
+        for part in str(value).split("\n"):
+            pairs.append({"name": name, "value": part})
+    return pairs
+
+
+def har_timings(record: dict[str, Any]) -> tuple[dict[str, float], float]:
+    """
+    Derive HAR timings from a CDP ResourceTiming.
+
+    Phases Chrome did not report are -1, as HAR requires. Without a ResourceTiming the
+    whole duration is attributed to ``wait``.
+
+    Returns:
+        Tuple of the HAR ``timings`` object and the total time in milliseconds
+    """
+    response = record.get("response") or {}
+    timing = response.get("timing")
+    finished = record.get("finishedTimestamp")
+
+    if not timing:
+        started = record.get("timestamp")
+        total = (finished - started) * 1000 if finished and started else 0.0
+        return {
+            "blocked": -1,
+            "dns": -1,
+            "connect": -1,
+            "send": 0,
+            "wait": total,
+            "receive": 0,
+            "ssl": -1,
+        }, total
+
+    def span(start: str, end: str) -> float:
+        if timing.get(start, -1) < 0 or timing.get(end, -1) < 0:
+            return -1
+        return round(float(timing[end] - timing[start]), 3)
+
+    phase_starts = [timing.get(key, -1) for key in ("dnsStart", "connectStart", "sendStart")]
+    blocked = next((round(value, 3) for value in phase_starts if value >= 0), -1)
+    send_end = timing.get("sendEnd", -1)
+    headers_end = timing.get("receiveHeadersEnd", -1)
+    wait = round(headers_end - send_end, 3) if headers_end >= 0 and send_end >= 0 else -1
+    receive = 0.0
+    if finished and headers_end >= 0:
+        receive = round(max(0.0, (finished - timing["requestTime"]) * 1000 - headers_end), 3)
+
+    timings = {
+        "blocked": blocked,
+        "dns": span("dnsStart", "dnsEnd"),
+        "connect": span("connectStart", "connectEnd"),
+        "send": max(span("sendStart", "sendEnd"), 0),
+        "wait": max(wait, 0),
+        "receive": receive,
+        "ssl": span("sslStart", "sslEnd"),
+    }
+    # ssl is already included in connect, so it is left out of the total
+    total = sum(value for key, value in timings.items() if key != "ssl" and value > 0)
+    return timings, round(total, 3)
+
+
+def build_entry(record: dict[str, Any], body: dict[str, Any] | None = None) -> dict[str, Any]:
+    """
+    Build one HAR entry from a captured network record.
+
+    Args:
+        record: Entry from ``ChromeDevToolsClient.network_requests``
+        body: Optional ``Network.getResponseBody`` result to embed as response content
+
+    Returns:
+        HAR 1.2 entry dictionary
+    """
+    response = record.get("response") or {}
+    request_headers = response.get("requestHeaders") or record.get("headers")
+    url = record.get("url", "")
+    timings, total = har_timings(record)
+    protocol = (response.get("protocol") or "http/1.1").upper()
+    size = record.get("encodedDataLength")
+
+    content: dict[str, Any] = {"size": -1, "mimeType": response.get("mimeType", "")}
+    if body is not None:
+        text = body.get("body", "")
+        content["text"] = text
+        # HAR sizes count the decoded body in bytes, not characters of the text field
+        if body.get("base64Encoded"):
+            content["encoding"] = "base64"
+            content["size"] = len(base64.b64decode(text))
+        else:
+            content["size"] = len(text.encode("utf-8"))
+
+    request: dict[str, Any] = {
+        "method": record.get("method", "GET"),
+        "url": url,
+        "httpVersion": protocol,
+        "cookies": [],
+        "headers": _name_values(request_headers),
+        "queryString": [
+            {"name": name, "value": value}
+            for name, value in parse_qsl(urlsplit(url).query, keep_blank_values=True)
+        ],
+        "headersSize": -1,
+        "bodySize": len(record.get("postData") or ""),
+    }
+    if record.get("postData"):
+        content_type = next(
+            (v for k, v in (request_headers or {}).items() if k.lower() == "content-type"), ""
+        )
+        request["postData"] = {"mimeType": content_type, "text": record["postData"]}
+
+    entry: dict[str, Any] = {
+        "startedDateTime": _iso_time(record.get("wallTime")),
+        "time": total,
+        "request": request,
+        "response": {
+            "status": response.get("status", 0),
+            "statusText": response.get("statusText", ""),
+            "httpVersion": protocol,
+            "cookies": [],
+            "headers": _name_values(response.get("headers")),
+            "content": content,
+            "redirectURL": next(
+                (v for k, v in (response.get("headers") or {}).items() if k.lower() == "location"),
+                "",
+            ),
+            "headersSize": -1,
+            "bodySize": size if size is not None else -1,
+        },
+        "cache": {},
+        "timings": timings,
+        "_requestId": record.get("requestId"),
+        "_resourceType": record.get("resourceType"),
+    }
+    if response.get("remoteIPAddress"):
+        entry["serverIPAddress"] = response["remoteIPAddress"]
+    if record.get("initiator"):
+        entry["_initiator"] = record["initiator"]
+    if record.get("errorText"):
+        entry["response"]["_error"] = record["errorText"]
+    return entry
+
+
+def record_matches(
+    record: dict[str, Any],
+    start_time: float | None = None,
+    end_time: float | None = None,
+    domain: str | None = None,
+    mime_types: list[str] | None = None,
+) -> bool:
+    """Return True if a network record passes the time window, domain and MIME filters."""
+    wall_time = record.get("wallTime")
+    if start_time is not None and (wall_time is None or wall_time < start_time):
+        return False
+    if end_time is not None and (wall_time is None or wall_time > end_time):
+        return False
+    if domain and domain.lower() not in (urlsplit(record.get("url", "")).hostname or ""):
+        return False
+    if mime_types:
+        mime_type = ((record.get("response") or {}).get("mimeType") or "").lower()
+        if not any(mime_type.startswith(prefix.lower()) for prefix in mime_types):
+            return False
+    return True
+
+
+class HarWriter:
+    """
+    Streaming HAR 1.2 writer.
+
+    Example:
+        ```python
+        with open("session.har", "w") as handle:
+            writer = HarWriter(handle, page_title="Mapping Slayer")
+            for record in records:
+                writer.write_entry(build_entry(record))
+            writer.close()
+        ```
+    """
+
+    def __init__(self, handle: IO[str], page_title: str = "", page_url: str = "") -> None:
+        self.handle = handle
+        self.entries = 0
+        self.bytes_written = 0
+        self._page_id = "page_1"
+        self._page_title = page_title or page_url
+        self._write(
+            '{"log":{"version":'
+            + json.dumps(HAR_VERSION)
+            + ',"creator":'
+            + json.dumps(CREATOR)
+            + ',"entries":['
+        )
+        self._first_started: str | None = None
+
+    def write_entry(self, entry: dict[str, Any]) -> None:
+        """Serialise and append one entry."""
+        entry["pageref"] = self._page_id
+        if self._first_started is None:
+            self._first_started = entry["startedDateTime"]
+        self._write(("," if self.entries else "") + json.dumps(entry, separators=(",", ":")))
+        self.entries += 1
+
+    def close(self) -> None:
+        """Finish the entries array and append the page record."""
+        page = {
+            "startedDateTime": self._first_started or _iso_time(None),
+            "id": self._page_id,
+            "title": self._page_title,
+            "pageTimings": {},
+        }
+        # Pages are written after entries; HAR readers key on property names, not order
+        self._write('],"pages":[' + json.dumps(page) + "]}}")
+
+    def _write(self, text: str) -> None:
+        self.handle.write(text)
+        # The handle is text, so count what reaches the file rather than characters
+        self.bytes_written += len(text.encode("utf-8"))
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""Image Decode Cost Audit
+
+This module compares the memory an image costs once decoded with the pixels it actually
+covers on screen. Chrome decodes a raster image at its intrinsic size, four bytes per
+pixel, however small it is drawn, so a 4000x3000 map shown as a 200x150 thumbnail holds
+48MB of bitmap to paint 0.1MB of pixels. Canvases have the same problem when their
+backing store (the ``width``/``height`` attributes) is much larger than their CSS box.
+
+Layout boxes come from a ``DOMSnapshot`` capture. Intrinsic sizes come from the page's
+``naturalWidth``/``naturalHeight`` where available, otherwise from the image file header
+in the captured response body.
+"""
+
+from __future__ import annotations
+
+import math
+import struct
+from typing import Any
+from urllib.parse import urljoin
+
+from .dom_snapshot import DOMSnapshot, SnapshotNode
+
+BYTES_PER_PIXEL = 4
+DEFAULT_MIN_RATIO = 2.0
+# Canvas size when the width/height attributes are absent
+_DEFAULT_CANVAS = (300, 150)
+_JPEG_SOF_MARKERS = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+
+# Returns [src attribute, currentSrc, naturalWidth, naturalHeight] for every <img>
+INTRINSIC_SIZES_SCRIPT = """
+Array.from(document.querySelectorAll('img'), img =>
+    [img.getAttribute('src') || '', img.currentSrc, img.naturalWidth, img.naturalHeight])
+"""
+
+
+def image_dimensions(data: bytes) -> tuple[int, int] | None:
+    """Read the pixel dimensions from a PNG, GIF, JPEG or WebP header."""
+    if data[:8] == b"\x89PNG\r\n\x1a\n" and len(data) >= 24:
+        width, height = struct.unpack(">II", data[16:24])
+        return width, height
+    if data[:6] in (b"GIF87a", b"GIF89a") and len(data) >= 10:
+        width, height = struct.unpack("<HH", data[6:10])
+        return width, height
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP" and len(data) >= 30:
+        chunk = data[12:16]
+        if chunk == b"VP8 ":
+            width, height = struct.unpack("<HH", data[26:30])
+            return width & 0x3FFF, height & 0x3FFF
+        if chunk == b"VP8L":
+            bits = int.from_bytes(data[21:25], "little")
+            return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+        if chunk == b"VP8X":
+            width = int.from_bytes(data[24:27], "little") + 1
+            height = int.from_bytes(data[27:30], "little") + 1
+            return width, height
+        return None
+    if data[:2] == b"\xff\xd8":
+        offset = 2
+        while offset + 9 < len(data):
+            if data[offset] != 0xFF:
+                offset += 1
+                continue
+            marker = data[offset + 1]
+            if marker in _JPEG_SOF_MARKERS:
+                height, width = struct.unpack(">HH", data[offset + 5 : offset + 9])
+                return width, height
+            if marker == 0xD8 or 0xD0 <= marker <= 0xD7 or marker == 0xFF:
+                offset += 2 if marker != 0xFF else 1
+                continue
+            offset += 2 + struct.unpack(">H", data[offset + 2 : offset + 4])[0]
+    return None
+
+
+def _is_vector(url: str) -> bool:
+    """Return True for SVG sources, which are rasterised at their displayed size."""
+    path = url.split("?", 1)[0].split("#", 1)[0].lower()
+    return path.endswith(".svg") or url.startswith("data:image/svg")
+
+
+def _displayed_pixels(bounds: list[float], device_pixel_ratio: float) -> int:
+    """Return the device pixels covered by a layout box."""
+    width, height = bounds[2], bounds[3]
+    return math.ceil(width * device_pixel_ratio) * math.ceil(height * device_pixel_ratio)
+
+
+def image_sources(snapshot: DOMSnapshot) -> list[tuple[SnapshotNode, str]]:
+    """Return every laid-out ``<img>`` with its source resolved against its document URL."""
+    images = []
+    for node in snapshot.elements:
+        if node.local_name != "img" or node.bounds is None:
+            continue
+        document_url = snapshot.documents[node.document_index]["documentURL"]
+        images.append((node, urljoin(document_url, node.attributes.get("src", ""))))
+    return images
+
+
+def audit_images(
+    snapshot: DOMSnapshot,
+    intrinsic: dict[str, tuple[int, int]],
+    device_pixel_ratio: float = 1.0,
+    min_ratio: float = DEFAULT_MIN_RATIO,
+    limit: int = 20,
+) -> dict[str, Any]:
+    """
+    Compare decoded image and canvas memory with the pixels they are displayed at.
+
+    Args:
+        snapshot: Decoded DOMSnapshot capture with layout bounds
+        intrinsic: Intrinsic ``(width, height)`` keyed by resolved image URL
+        device_pixel_ratio: Device pixels per CSS pixel
+        min_ratio: Decoded-to-displayed ratio at or above which an element is reported
+        limit: Maximum number of elements to report
+
+    Returns:
+        Totals of decoded, displayed and wasted bytes and the worst offenders
+    """
+    findings = []
+    totals = {"decodedBytes": 0, "displayedBytes": 0, "wastedBytes": 0}
+    counts = {"images": 0, "canvases": 0, "unknownSize": 0, "vector": 0}
+
+    candidates: list[tuple[SnapshotNode, list[float], str, tuple[int, int]]] = []
+    for node, url in image_sources(snapshot):
+        if node.bounds is None:
+            continue
+        counts["images"] += 1
+        if _is_vector(url):
+            counts["vector"] += 1
+            continue
+        size = intrinsic.get(url)
+        if size is None or not size[0] or not size[1]:
+            counts["unknownSize"] += 1
+            continue
+        candidates.append((node, node.bounds, url, size))
+    for node in snapshot.elements:
+        if node.local_name == "canvas" and node.bounds is not None:
+            counts["canvases"] += 1
+            try:
+                width = int(node.attributes.get("width", _DEFAULT_CANVAS[0]))
+                height = int(node.attributes.get("height", _DEFAULT_CANVAS[1]))
+            except ValueError:
+                width, height = _DEFAULT_CANVAS
+            candidates.append((node, node.bounds, "", (width, height)))
+
+    for node, bounds, url, size in candidates:
+        decoded = size[0] * size[1] * BYTES_PER_PIXEL
+        displayed = _displayed_pixels(bounds, device_pixel_ratio) * BYTES_PER_PIXEL
+        wasted = max(0, decoded - displayed)
+        totals["decodedBytes"] += decoded
+        totals["displayedBytes"] += displayed
+        totals["wastedBytes"] += wasted
+        ratio = decoded / displayed if displayed else math.inf
+        if ratio < min_ratio:
+            continue
+        finding: dict[str, Any] = {
+            "element": node.local_name,
+            "backendNodeId": node.backend_node_id,
+            "intrinsicSize": list(size),
+            "displayedSize": [bounds[2], bounds[3]],
+            "decodedBytes": decoded,
+            "displayedBytes": displayed,
+            "wastedBytes": wasted,
+            "ratio": round(ratio, 1) if displayed else None,
+        }
+        if url:
+            finding["url"] = url
+        elif node.attributes.get("id"):
+            finding["id"] = node.attributes["id"]
+        findings.append(finding)
+
+    findings.sort(key=lambda finding: finding["wastedBytes"], reverse=True)
+    return {
+        **counts,
+        "devicePixelRatio": device_pixel_ratio,
+        **totals,
+        "oversized": len(findings),
+        "findings": findings[:limit],
+    }
@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""Synthetic Input Driver
+
+This module replays declarative input sequences through the browser's real input
+pipeline, so hit testing, event dispatch, default actions, scrolling and compositor
+frames all behave as they would for a user. It replaces ``element.click()`` style
+scripting, which skips everything except the event listeners.
+
+A sequence is a list of steps with CSS pixel coordinates:
+
+    - ``{"type": "click", "x", "y", "button": "left", "clickCount": 1}``
+    - ``{"type": "drag", "from": [x, y], "to": [x, y], "steps": 20, "durationMs": 300}``
+    - ``{"type": "wheel", "x", "y", "deltaX": 0, "deltaY": -120, "modifiers": 0}``
+      (``modifiers: 2`` holds Ctrl, which map views treat as zoom)
+    - ``{"type": "scroll", "x", "y", "xDistance": 0, "yDistance": -600, "speed": 800}``
+      through ``Input.synthesizeScrollGesture``
+    - ``{"type": "key", "key": "Enter", "code": "Enter", "modifiers": 0}``
+    - ``{"type": "wait", "ms": 100}``
+
+Steps are compiled into a schedule of dispatches at fixed offsets. Each dispatch is sent
+at its scheduled time relative to the start of the run rather than after the previous
+one, so Chrome's response latency does not stretch the timing; how late each dispatch
+actually went out is reported as dispatch lag.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from typing import Any
+
+from .benchmark import percentile, summarise_samples
+from .jank_timeline import analyse_jank
+
+DEFAULT_DRAG_STEPS = 20
+DEFAULT_DRAG_MS = 300
+DEFAULT_SCROLL_SPEED = 800
+# Input.synthesizeScrollGesture only responds once the gesture ends, so it has to fit
+# inside send_command's 10s timeout with room for the gesture to start
+MAX_SCROLL_MS = 9000
+STEP_TYPES = ("click", "drag", "wheel", "scroll", "key", "wait")
+# Windows virtual key codes for keys without a printable character
+_KEY_CODES = {
+    "Backspace": 8,
+    "Tab": 9,
+    "Enter": 13,
+    "Shift": 16,
+    "Control": 17,
+    "Alt": 18,
+    "Escape": 27,
+    " ": 32,
+    "PageUp": 33,
+    "PageDown": 34,
+    "End": 35,
+    "Home": 36,
+    "ArrowLeft": 37,
+    "ArrowUp": 38,
+    "ArrowRight": 39,
+    "ArrowDown": 40,
+    "Delete": 46,
+}
+
+Dispatch = tuple[float, str, dict[str, Any]]
+
+
+def load_sequence(path: str) -> list[dict[str, Any]]:
+    """
+    Load steps from a JSON file holding a list or an object with a ``steps`` list.
+
+    Raises:
+        ValueError: If the file does not contain a step list
+    """
+    with open(path, encoding="utf-8") as handle:
+        data = json.load(handle)
+    steps = data.get("steps") if isinstance(data, dict) else data
+    if not isinstance(steps, list):
+        raise ValueError(f"{path} does not contain a list of steps")
+    return steps
+
+
+def _mouse(kind: str, x: float, y: float, **extra: Any) -> dict[str, Any]:
+    return {"type": kind, "x": x, "y": y, **extra}
+
+
+def _key_events(step: dict[str, Any]) -> list[dict[str, Any]]:
+    key = step["key"]
+    text = key if len(key) == 1 else ("\r" if key == "Enter" else "")
+    # Letters and digits share their virtual key code with the uppercase character;
+    # other printable characters do not (ord(".") is VK_DELETE), so they get none
+    printable = len(key) == 1 and key.isascii() and key.isalnum()
+    code = _KEY_CODES.get(key, ord(key.upper()) if printable else 0)
+    common = {
+        "key": key,
+        "code": step.get("code", ""),
+        "modifiers": step.get("modifiers", 0),
+        "windowsVirtualKeyCode": code,
+    }
+    down = {"type": "keyDown" if text else "rawKeyDown", "text": text, **common}
+    return [down, {"type": "keyUp", **common}]
+
+
+def compile_steps(steps: list[dict[str, Any]]) -> tuple[list[Dispatch], float]:
+    """
+    Compile steps into ``(offsetMs, method, params)`` dispatches.
+
+    Returns:
+        The schedule and its total length in milliseconds
+
+    Raises:
+        ValueError: If a step has an unknown type or is missing a field
+    """
+    schedule: list[Dispatch] = []
+    offset = 0.0
+    for index, step in enumerate(steps):
+        if not isinstance(step, dict):
+            raise ValueError(f"Invalid step {index}: expected an object, got {step!r}")
+        kind = step.get("type")
+        try:
+            if kind == "click":
+                x, y = step["x"], step["y"]
+                button = {"button": step.get("button", "left"), "clickCount": 1}
+                count = step.get("clickCount", 1)
+                schedule.append((offset, "Input.dispatchMouseEvent", _mouse("mouseMoved", x, y)))
+                for click in range(1, count + 1):
+                    button["clickCount"] = click
+                    for phase in ("mousePressed", "mouseReleased"):
+                        event = _mouse(phase, x, y, **button)
+                        schedule.append((offset, "Input.dispatchMouseEvent", event))
+            elif kind == "drag":
+                (x0, y0), (x1, y1) = step["from"], step["to"]
+                moves = max(1, step.get("steps", DEFAULT_DRAG_STEPS))
+                interval = step.get("durationMs", DEFAULT_DRAG_MS) / moves
+                held = {"button": "left", "buttons": 1}
+                schedule.append((offset, "Input.dispatchMouseEvent", _mouse("mouseMoved", x0, y0)))
+                schedule.append(
+                    (offset, "Input.dispatchMouseEvent", _mouse("mousePressed", x0, y0, **held))
+                )
+                for move in range(1, moves + 1):
+                    x = x0 + (x1 - x0) * move / moves
+                    y = y0 + (y1 - y0) * move / moves
+                    offset += interval
+                    event = _mouse("mouseMoved", x, y, **held)
+                    schedule.append((offset, "Input.dispatchMouseEvent", event))
+                event = _mouse("mouseReleased", x1, y1, button="left", clickCount=1)
+                schedule.append((offset, "Input.dispatchMouseEvent", event))
+            elif kind == "wheel":
+                event = _mouse(
+                    "mouseWheel",
+                    step["x"],
+                    step["y"],
+                    deltaX=step.get("deltaX", 0),
+                    deltaY=step.get("deltaY", 0),
+                    modifiers=step.get("modifiers", 0),
+                )
+                schedule.append((offset, "Input.dispatchMouseEvent", event))
+            elif kind == "scroll":
+                speed = step.get("speed", DEFAULT_SCROLL_SPEED)
+                gesture = {
+                    "x": step["x"],
+                    "y": step["y"],
+                    "xDistance": step.get("xDistance", 0),
+                    "yDistance": step.get("yDistance", 0),
+                    "speed": speed,
+                    "gestureSourceType": "mouse",
+                }
+                if speed <= 0:
+                    raise ValueError("speed must be positive")
+                distance = max(abs(gesture["xDistance"]), abs(gesture["yDistance"]))
+                duration = distance / speed * 1000
+                if duration > MAX_SCROLL_MS:
+                    raise ValueError(
+                        f"the gesture would take {duration:.0f}ms, longer than the "
+                        f"{MAX_SCROLL_MS}ms limit; raise speed or split it into several scrolls"
+                    )
+                schedule.append((offset, "Input.synthesizeScrollGesture", gesture))
+                offset += duration
+            elif kind == "key":
+                for event in _key_events(step):
+                    schedule.append((offset, "Input.dispatchKeyEvent", event))
+            elif kind == "wait":
+                offset += step["ms"]
+            else:
+                raise ValueError(f"expected one of {', '.join(STEP_TYPES)}, got {kind!r}")
+        except (KeyError, TypeError, ValueError) as e:
+            raise ValueError(f"Invalid step {index} ({kind}): {e}") from None
+    return schedule, offset
+
+
+async def replay(client: Any, schedule: list[Dispatch]) -> list[float]:
+    """
+    Send each dispatch at its offset from the start and return how late each one was.
+
+    Dispatches are awaited in order, so a slow response delays the next dispatch; the
+    delay shows up in the returned lag rather than shifting the rest of the schedule.
+    """
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    lags = []
+    for offset, method, params in schedule:
+        delay = started + offset / 1000 - loop.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        lags.append(max(0.0, (loop.time() - started) * 1000 - offset))
+        await client.send_command(method, params)
+    return lags
+
+
+def run_sample(report: dict[str, Any], lags: list[float]) -> dict[str, Any]:
+    """Flatten one run's jank report and dispatch lags into per-run metrics."""
+    ordered = sorted(lags) or [0.0]
+    sample: dict[str, Any] = {
+        "durationMs": report["durationMs"],
+        "fps": report["frames"]["fps"],
+        "droppedFrames": report["frames"]["droppedFrames"],
+        "longTasks": report["longTasks"]["count"],
+        "longTaskMs": report["longTasks"]["totalMs"],
+        "dispatchLagP95Ms": round(percentile(ordered, 0.95), 2),
+    }
+    if report["interactions"]:
+        sample["worstInteractionMs"] = report["interactions"][0]["inputToNextPaintMs"]
+    trace = report.get("trace")
+    if trace:
+        sample["tracedFramesDropped"] = trace["framesDropped"]
+        for kind, stats in trace["inputToNextPaint"].items():
+            sample[f"{kind}.p95Ms"] = stats["p95Ms"]
+    return sample
+
+
+async def run_sequence(
+    client: Any,
+    steps: list[dict[str, Any]],
+    repeat: int = 1,
+    trace: bool = True,
+    pause_ms: float = 500,
+) -> dict[str, Any]:
+    """
+    Replay a sequence ``repeat`` times, recording a jank timeline around each run.
+
+    Args:
+        client: Connected ChromeDevToolsClient
+        steps: Declarative input steps
+        repeat: Number of runs
+        trace: Capture a trace around each run for frame and input latency stats
+        pause_ms: Idle time after each run so trailing frames are captured
+
+    Returns:
+        Per-run metric samples, in the shape ``compare_benchmarks`` reads, and their
+        summary statistics across runs
+
+    Raises:
+        ValueError: If the steps are invalid or repeat is less than 1
+    """
+    if repeat < 1:
+        raise ValueError("repeat must be at least 1")
+    schedule, length = compile_steps(steps)
+    samples = []
+    for _ in range(repeat):
+        await client.jank_recorder.start(client, trace)
+        try:
+            lags = await replay(client, schedule)
+            await asyncio.sleep(pause_ms / 1000)
+        finally:
+            page, trace_events = await client.jank_recorder.stop(client)
+        if page is None:
+            raise RuntimeError("The page navigated during the run, so its frame data was lost")
+        samples.append(run_sample(analyse_jank(page, trace_events), lags))
+    return {
+        "steps": len(steps),
+        "dispatches": len(schedule),
+        "scheduledMs": round(length, 1),
+        "repeat": repeat,
+        "samples": samples,
+        "summary": summarise_samples(samples, drop_outliers=False),
+    }
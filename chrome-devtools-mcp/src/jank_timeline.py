@@ -0,0 +1,371 @@
+#!/usr/bin/env python3
+"""Main-Thread Jank Timeline
+
+This module records an interaction window and lines up four views of it so a sluggish
+interaction can be explained rather than just measured:
+
+    - ``requestAnimationFrame`` timestamps from an in-page loop; a gap longer than the
+      frame budget means the main thread missed frames
+    - Long tasks and Event Timing entries from PerformanceObservers, giving each
+      interaction's input delay, processing time and presentation delay
+    - A ``Tracing`` capture of timeline and frame events, giving every dispatched input
+      event (including the ``pointermove`` stream of a drag, which Event Timing does not
+      report), the frames the compositor drew or dropped, and when the next one drew
+    - The long tasks that overlap each slow input or frame gap
+
+Page timestamps are ``performance.now()`` milliseconds and trace timestamps are monotonic
+microseconds. The recorder emits a ``console.timeStamp`` marker, which appears in the
+trace as a ``TimeStamp`` event, and the difference between the two clocks at that marker
+aligns everything onto the page's timeline, relative to the start of recording.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import statistics
+from typing import Any
+
+from .benchmark import percentile
+
+logger = logging.getLogger(__name__)
+
+MARKER = "mcp-jank-marker"
+DEFAULT_MAX_ITEMS = 20
+TRACE_CATEGORIES = [
+    "devtools.timeline",
+    "disabled-by-default-devtools.timeline.frame",
+    "toplevel",
+    "input",
+    "latencyInfo",
+]
+INPUT_EVENT_TYPES = {
+    "pointerdown",
+    "pointerup",
+    "pointermove",
+    "mousedown",
+    "mouseup",
+    "mousemove",
+    "click",
+    "wheel",
+    "keydown",
+    "keyup",
+    "keypress",
+    "touchstart",
+    "touchmove",
+    "touchend",
+}
+# A frame interval this many budgets long counts as missed frames
+_GAP_TOLERANCE = 1.5
+
+RECORDER_SCRIPT = (
+    """
+(() => {
+    if (window.__mcpJank) window.__mcpJank.stop();
+    const state = {raf: [], longTasks: [], events: [], observers: [], running: true};
+    const tick = time => {
+        if (!state.running) return;
+        if (state.raf.length < 100000) state.raf.push(time);
+        requestAnimationFrame(tick);
+    };
+    requestAnimationFrame(tick);
+    const observe = (type, options, convert, target) => {
+        try {
+            const observer = new PerformanceObserver(list =>
+                list.getEntries().forEach(e => target.push(convert(e))));
+            observer.observe({type, ...options});
+            state.observers.push([observer, convert, target]);
+        } catch (e) {}
+    };
+    observe('longtask', {}, e => ({startTime: e.startTime, duration: e.duration}),
+            state.longTasks);
+    observe('event', {durationThreshold: 16}, e => ({name: e.name, startTime: e.startTime,
+        duration: e.duration, interactionId: e.interactionId,
+        processingStart: e.processingStart, processingEnd: e.processingEnd}), state.events);
+    state.start = performance.now();
+    console.timeStamp('"""
+    + MARKER
+    + """');
+    state.marker = (state.start + performance.now()) / 2;
+    window.__mcpJank = {stop: () => {
+        state.running = false;
+        for (const [observer, convert, target] of state.observers) {
+            observer.takeRecords().forEach(e => target.push(convert(e)));
+            observer.disconnect();
+        }
+        delete window.__mcpJank;
+        return {start: state.start, end: performance.now(), marker: state.marker,
+                raf: state.raf, longTasks: state.longTasks, events: state.events};
+    }};
+    return true;
+})()
+"""
+)
+STOP_SCRIPT = "window.__mcpJank ? window.__mcpJank.stop() : null"
+
+
+class JankRecorder:
+    """
+    Runs the in-page recorder and a trace capture between ``start`` and ``stop``.
+
+    Attributes:
+        recording: Whether a window is being recorded
+        tracing: Whether the current window includes a trace capture
+    """
+
+    def __init__(self) -> None:
+        self.recording = False
+        self.tracing = False
+        self._trace_events: list[dict[str, Any]] = []
+        self._complete: asyncio.Future[None] | None = None
+
+    def _on_data(self, params: dict[str, Any]) -> None:
+        self._trace_events.extend(params.get("value", []))
+
+    def _on_complete(self, params: dict[str, Any]) -> None:
+        if self._complete is not None and not self._complete.done():
+            self._complete.set_result(None)
+
+    async def start(self, client: Any, trace: bool = True) -> None:
+        """
+        Start tracing (optionally) and install the in-page recorder.
+
+        Raises:
+            ValueError: If a window is already being recorded
+        """
+        if self.recording:
+            raise ValueError("A jank recording is already running")
+        self._trace_events = []
+        self.tracing = trace
+        if trace:
+            self._complete = asyncio.get_running_loop().create_future()
+            client.add_event_handler("Tracing.dataCollected", self._on_data)
+            client.add_event_handler("Tracing.tracingComplete", self._on_complete)
+            try:
+                await client.send_command(
+                    "Tracing.start",
+                    {
+                        "transferMode": "ReportEvents",
+                        "traceConfig": {"includedCategories": TRACE_CATEGORIES},
+                    },
+                )
+            except Exception:
+                self._remove_handlers(client)
+                raise
+        self.recording = True
+        # The marker must be emitted after tracing has started to appear in the trace
+        await client.send_command(
+            "Runtime.evaluate", {"expression": RECORDER_SCRIPT, "returnByValue": True}
+        )
+
+    async def stop(
+        self, client: Any, timeout: float = 30.0
+    ) -> tuple[dict[str, Any] | None, list[dict[str, Any]]]:
+        """
+        Stop recording and return the page data and the trace events.
+
+        The page data is None if the document was replaced during the window.
+        """
+        if not self.recording:
+            raise ValueError("No jank recording is running")
+        self.recording = False
+        try:
+            result = await client.send_command(
+                "Runtime.evaluate", {"expression": STOP_SCRIPT, "returnByValue": True}
+            )
+            page = result.get("result", {}).get("value")
+        finally:
+            if self.tracing:
+                try:
+                    await client.send_command("Tracing.end")
+                    if self._complete is not None:
+                        await asyncio.wait_for(self._complete, timeout)
+                finally:
+                    self._remove_handlers(client)
+        return page, self._trace_events
+
+    def _remove_handlers(self, client: Any) -> None:
+        client.remove_event_handler("Tracing.dataCollected", self._on_data)
+        client.remove_event_handler("Tracing.tracingComplete", self._on_complete)
+
+
+def _overlaps(items: list[dict[str, Any]], start: float, end: float) -> list[dict[str, Any]]:
+    """Return the items whose ``[start, end]`` span intersects the given window."""
+    return [item for item in items if item["start"] < end and item["end"] > start]
+
+
+def _span(start: float, duration: float) -> dict[str, Any]:
+    return {"start": round(start, 1), "end": round(start + duration, 1)}
+
+
+def _trace_offset(events: list[dict[str, Any]], marker: float) -> tuple[float, int] | None:
+    """Return (trace ms minus page ms, renderer pid) from the marker TimeStamp event."""
+    for event in events:
+        if (
+            event.get("name") == "TimeStamp"
+            and event.get("args", {}).get("data", {}).get("message") == MARKER
+        ):
+            return event["ts"] / 1000 - marker, event.get("pid", 0)
+    return None
+
+
+def frame_gaps(raf: list[float], budget: float) -> list[dict[str, Any]]:
+    """Return every rAF interval longer than the budget allows, with the frames it missed."""
+    gaps = []
+    for earlier, later in zip(raf, raf[1:], strict=False):
+        interval = later - earlier
+        if interval > budget * _GAP_TOLERANCE:
+            gaps.append({"start": earlier, "end": later, "dropped": round(interval / budget) - 1})
+    return gaps
+
+
+def _per_second(times: list[tuple[float, int]], duration: float) -> list[int]:
+    """Sum counts into one bucket per second of the window."""
+    buckets = [0] * max(1, int(duration // 1000) + 1)
+    for time, count in times:
+        if 0 <= time <= duration:
+            buckets[int(time // 1000)] += count
+    return buckets
+
+
+def _latency_stats(values: list[float]) -> dict[str, float]:
+    ordered = sorted(values)
+    return {
+        "count": len(ordered),
+        "p50Ms": round(percentile(ordered, 0.5), 1),
+        "p95Ms": round(percentile(ordered, 0.95), 1),
+        "maxMs": round(ordered[-1], 1),
+    }
+
+
+def analyse_jank(
+    page: dict[str, Any],
+    trace_events: list[dict[str, Any]],
+    frame_budget_ms: float | None = None,
+    limit: int = DEFAULT_MAX_ITEMS,
+) -> dict[str, Any]:
+    """
+    Correlate rAF gaps, long tasks, Event Timing entries and trace events.
+
+    Args:
+        page: Data returned by the in-page recorder
+        trace_events: Trace events captured over the same window (may be empty)
+        frame_budget_ms: Frame interval; defaults to the median rAF interval
+        limit: Maximum number of interactions, input events and gaps to list
+
+    Returns:
+        Frame rate and dropped frames per second, long tasks, per-interaction input to
+        next paint with its breakdown, and per-input-type trace latencies
+    """
+    origin: float = page["start"]
+    duration = page["end"] - origin
+
+    def rel(time: float) -> float:
+        return round(time - origin, 1)
+
+    raf = page["raf"]
+    intervals = [later - earlier for earlier, later in zip(raf, raf[1:], strict=False)]
+    budget = frame_budget_ms or (statistics.median(intervals) if intervals else 1000 / 60)
+    long_tasks = [
+        {**_span(rel(task["startTime"]), task["duration"]), "durationMs": task["duration"]}
+        for task in page["longTasks"]
+    ]
+    gaps = [
+        {**_span(rel(gap["start"]), gap["end"] - gap["start"]), "droppedFrames": gap["dropped"]}
+        for gap in frame_gaps(raf, budget)
+    ]
+    for gap in gaps:
+        gap["longTasks"] = _overlaps(long_tasks, gap["start"], gap["end"])
+
+    # Worst Event Timing entry per interaction
+    worst: dict[int, dict[str, Any]] = {}
+    for entry in page["events"]:
+        key = entry.get("interactionId") or 0
+        if key and (key not in worst or entry["duration"] > worst[key]["duration"]):
+            worst[key] = entry
+    interactions = []
+    for entry in sorted(worst.values(), key=lambda e: e["duration"], reverse=True)[:limit]:
+        start = rel(entry["startTime"])
+        interactions.append(
+            {
+                "event": entry["name"],
+                "start": start,
+                "inputToNextPaintMs": entry["duration"],
+                "inputDelayMs": round(entry["processingStart"] - entry["startTime"], 1),
+                "processingMs": round(entry["processingEnd"] - entry["processingStart"], 1),
+                "presentationDelayMs": round(
+                    entry["startTime"] + entry["duration"] - entry["processingEnd"], 1
+                ),
+                "longTasks": _overlaps(long_tasks, start, start + entry["duration"]),
+            }
+        )
+
+    report: dict[str, Any] = {
+        "durationMs": round(duration, 1),
+        "frameBudgetMs": round(budget, 2),
+        "frames": {
+            "count": len(raf),
+            "fps": round(len(raf) / duration * 1000, 1) if duration else 0,
+            "droppedFrames": sum(gap["droppedFrames"] for gap in gaps),
+            "droppedPerSecond": _per_second(
+                [(gap["start"], gap["droppedFrames"]) for gap in gaps], duration
+            ),
+            "worstGaps": sorted(gaps, key=lambda gap: gap["end"] - gap["start"], reverse=True)[
+                :limit
+            ],
+        },
+        "longTasks": {
+            "count": len(long_tasks),
+            "totalMs": round(sum(task["durationMs"] for task in long_tasks), 1),
+        },
+        "interactions": interactions,
+    }
+
+    alignment = _trace_offset(trace_events, page["marker"]) if trace_events else None
+    if alignment is None:
+        report["trace"] = None
+        return report
+    offset, pid = alignment
+
+    def trace_time(event: dict[str, Any]) -> float:
+        return rel(event["ts"] / 1000 - offset)
+
+    renderer = [event for event in trace_events if event.get("pid") == pid]
+    drawn = sorted(trace_time(e) for e in renderer if e.get("name") == "DrawFrame")
+    dropped = [trace_time(e) for e in renderer if e.get("name") == "DroppedFrame"]
+    paints = drawn or sorted(trace_time(e) for e in renderer if e.get("name") == "Paint")
+
+    inputs = []
+    for event in renderer:
+        data = event.get("args", {}).get("data", {})
+        if event.get("name") != "EventDispatch" or data.get("type") not in INPUT_EVENT_TYPES:
+            continue
+        start = trace_time(event)
+        end = start + event.get("dur", 0) / 1000
+        next_paint = next((paint for paint in paints if paint >= end), None)
+        inputs.append(
+            {
+                "type": data["type"],
+                "start": start,
+                "handlerMs": round(event.get("dur", 0) / 1000, 1),
+                "toNextPaintMs": round(next_paint - start, 1) if next_paint is not None else None,
+                "longTasks": _overlaps(long_tasks, start, next_paint or end),
+            }
+        )
+
+    by_type: dict[str, list[float]] = {}
+    for item in inputs:
+        if item["toNextPaintMs"] is not None:
+            by_type.setdefault(item["type"], []).append(item["toNextPaintMs"])
+    measured = [item for item in inputs if item["toNextPaintMs"] is not None]
+    report["trace"] = {
+        "events": len(trace_events),
+        "framesDrawn": len(drawn),
+        "framesDropped": len(dropped),
+        "droppedPerSecond": _per_second([(time, 1) for time in dropped], duration),
+        "inputToNextPaint": {kind: _latency_stats(values) for kind, values in by_type.items()},
+        "slowestInputs": sorted(measured, key=lambda item: item["toNextPaintMs"], reverse=True)[
+            :limit
+        ],
+    }
+    return report
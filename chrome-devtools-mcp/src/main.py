@@ -36,6 +36,7 @@ from .tools import (
     register_dom_tools,
     register_network_tools,
     register_performance_tools,
+    register_response_tools,
     register_storage_tools,
 )
 
@@ -66,6 +67,7 @@ def register_all_tools() -> None:
     register_css_tools(mcp)
     register_storage_tools(mcp)
     register_performance_tools(mcp)
+    register_response_tools(mcp)
 
     logger.info("All MCP tools registered successfully")
 
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""Performance Metrics Sampler
+
+This module polls runtime metrics in the background so that trends such as heap growth
+or a climbing DOM node count can be watched over a long session. Each sample combines
+``Performance.getMetrics``, ``Memory.getDOMCounters`` and the page's ``performance.memory``,
+requested together in one concurrent batch.
+
+Samples are kept in a fixed-capacity ring buffer of ``array('d')`` columns, one per
+metric, so memory use is constant (8 bytes per metric per sample) however long sampling
+runs. Series covering long windows are downsampled into time buckets that keep each
+bucket's minimum, maximum and average, so spikes survive the reduction.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import time
+from array import array
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INTERVAL = 1.0
+DEFAULT_CAPACITY = 3600
+DEFAULT_MAX_POINTS = 200
+
+_MEMORY_SCRIPT = """
+performance.memory ? {
+    usedJSHeapSize: performance.memory.usedJSHeapSize,
+    totalJSHeapSize: performance.memory.totalJSHeapSize,
+    jsHeapSizeLimit: performance.memory.jsHeapSizeLimit
+} : null
+"""
+
+
+class RingBuffer:
+    """
+    Fixed-capacity columnar time series.
+
+    Attributes:
+        capacity: Maximum number of samples kept
+        count: Number of samples currently held
+    """
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY) -> None:
+        if capacity < 1:
+            raise ValueError("Ring buffer capacity must be at least 1")
+        self.capacity = capacity
+        self.count = 0
+        self._head = 0
+        self._timestamps = array("d", [0.0] * capacity)
+        self._columns: dict[str, array[float]] = {}
+
+    @property
+    def metrics(self) -> list[str]:
+        """Names of every metric seen so far."""
+        return list(self._columns)
+
+    def append(self, timestamp: float, values: dict[str, float]) -> None:
+        """Add one sample, overwriting the oldest when full. Missing metrics are NaN."""
+        for name in values:
+            if name not in self._columns:
+                self._columns[name] = array("d", [math.nan] * self.capacity)
+        slot = self._head
+        self._timestamps[slot] = timestamp
+        for name, column in self._columns.items():
+            column[slot] = values.get(name, math.nan)
+        self._head = (slot + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+
+    def _slots(self) -> list[int]:
+        """Return buffer slots in chronological order."""
+        start = (self._head - self.count) % self.capacity
+        return [(start + offset) % self.capacity for offset in range(self.count)]
+
+    def window(
+        self, names: list[str], start: float | None = None, end: float | None = None
+    ) -> tuple[list[float], dict[str, list[float]]]:
+        """Return timestamps and values of the named metrics within ``[start, end]``."""
+        slots = [
+            slot
+            for slot in self._slots()
+            if (start is None or self._timestamps[slot] >= start)
+            and (end is None or self._timestamps[slot] <= end)
+        ]
+        timestamps = [self._timestamps[slot] for slot in slots]
+        values = {
+            name: [self._columns[name][slot] for slot in slots]
+            for name in names
+            if name in self._columns
+        }
+        return timestamps, values
+
+
+def downsample(
+    timestamps: list[float], values: dict[str, list[float]], max_points: int
+) -> dict[str, Any]:
+    """
+    Reduce series to at most ``max_points`` equal-width time buckets.
+
+    Series already within the limit are returned as raw values. Otherwise each bucket
+    reports its start time and the min, max and average of the samples that fall in it;
+    NaN gaps are ignored and empty buckets are dropped.
+    """
+    if len(timestamps) <= max_points:
+        return {
+            "timestamps": timestamps,
+            "series": {
+                name: [None if math.isnan(v) else v for v in column]
+                for name, column in values.items()
+            },
+        }
+
+    first, last = timestamps[0], timestamps[-1]
+    width = (last - first) / max_points or 1.0
+    buckets: list[list[int]] = [[] for _ in range(max_points)]
+    for index, timestamp in enumerate(timestamps):
+        buckets[min(int((timestamp - first) / width), max_points - 1)].append(index)
+    buckets = [bucket for bucket in buckets if bucket]
+
+    series: dict[str, dict[str, list[float | None]]] = {}
+    for name, column in values.items():
+        reduced: dict[str, list[float | None]] = {"min": [], "max": [], "avg": []}
+        for bucket in buckets:
+            points = [column[i] for i in bucket if not math.isnan(column[i])]
+            reduced["min"].append(min(points) if points else None)
+            reduced["max"].append(max(points) if points else None)
+            reduced["avg"].append(round(sum(points) / len(points), 3) if points else None)
+        series[name] = reduced
+    return {
+        "timestamps": [timestamps[bucket[0]] for bucket in buckets],
+        "bucketSeconds": round(width, 3),
+        "series": series,
+    }
+
+
+class MetricsSampler:
+    """
+    Background poller feeding a ``RingBuffer``.
+
+    Attributes:
+        buffer: Sampled metric history
+        interval: Seconds between samples
+        running: Whether the poll task is active
+        failures: Count of samples that could not be taken
+    """
+
+    def __init__(self) -> None:
+        self.buffer = RingBuffer()
+        self.interval = DEFAULT_INTERVAL
+        self.running = False
+        self.failures = 0
+        self._sample_seconds = 0.0
+        self._samples_taken = 0
+        self._task: asyncio.Task[None] | None = None
+
+    async def start(
+        self, client: Any, interval: float = DEFAULT_INTERVAL, capacity: int = DEFAULT_CAPACITY
+    ) -> None:
+        """
+        Start sampling, discarding any previous history.
+
+        Raises:
+            ValueError: If the interval is not positive
+        """
+        if interval <= 0:
+            raise ValueError("Sampling interval must be positive")
+        await self.stop()
+        await client.send_command("Performance.enable")
+        self.buffer = RingBuffer(capacity)
+        self.interval = interval
+        self.failures = 0
+        self._sample_seconds = 0.0
+        self._samples_taken = 0
+        self.running = True
+        self._task = asyncio.create_task(self._poll(client))
+
+    async def stop(self) -> None:
+        """Stop sampling, keeping the collected history."""
+        self.running = False
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def sample(self, client: Any) -> dict[str, float]:
+        """Take one sample and append it to the buffer."""
+        started = time.perf_counter()
+        metrics, counters, memory = await client.send_commands(
+            [
+                ("Performance.getMetrics", {}),
+                ("Memory.getDOMCounters", {}),
+                ("Runtime.evaluate", {"expression": _MEMORY_SCRIPT, "returnByValue": True}),
+            ]
+        )
+        values: dict[str, float] = {}
+        if not isinstance(metrics, Exception):
+            values.update({m["name"]: m["value"] for m in metrics.get("metrics", [])})
+        if not isinstance(counters, Exception):
+            values.update({f"dom.{k}": v for k, v in counters.items() if isinstance(v, int)})
+        if not isinstance(memory, Exception):
+            heap = memory.get("result", {}).get("value") or {}
+            values.update({f"memory.{k}": v for k, v in heap.items()})
+        if not values:
+            raise RuntimeError(f"No metrics returned: {metrics}")
+
+        self.buffer.append(time.time(), values)
+        self._sample_seconds += time.perf_counter() - started
+        self._samples_taken += 1
+        return values
+
+    async def _poll(self, client: Any) -> None:
+        """Sample at the configured interval until cancelled."""
+        while True:
+            try:
+                await self.sample(client)
+            except Exception as e:
+                self.failures += 1
+                logger.debug(f"Metrics sample failed: {e}")
+            await asyncio.sleep(self.interval)
+
+    def status(self) -> dict[str, Any]:
+        """Summarise sampler state, buffer occupancy and per-sample cost."""
+        return {
+            "running": self.running,
+            "intervalSeconds": self.interval,
+            "samples": self.buffer.count,
+            "capacity": self.buffer.capacity,
+            "failures": self.failures,
+            "averageSampleMs": round(self._sample_seconds / self._samples_taken * 1000, 2)
+            if self._samples_taken
+            else 0,
+            "metrics": self.buffer.metrics,
+        }
@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+"""Network Critical Path Analysis
+
+This module turns the client's captured network records into a dependency graph and
+explains where page-load time goes. Each request's parent is resolved from its
+``Network.requestWillBeSent`` initiator (the parser's document, the script on top of the
+initiating stack, or an explicit request ID). Because a parent always starts before its
+children, the graph is a DAG ordered by start time.
+
+From the graph the analysis reports:
+    - The critical path: the initiator chain ending at the last resource to finish
+      before a target milestone (``load``, a lifecycle event such as
+      ``firstContentfulPaint``, or a given resource)
+    - Render-blocking resources requested by the parser at high priority
+    - Serial chains, where each request only started after its parent finished,
+      with the time that fetching them in parallel (e.g. via preload) would save
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from .har_export import har_timings
+
+# A child that starts within this many seconds of its parent finishing waited for it
+_SERIAL_TOLERANCE = 0.001
+_BLOCKING_TYPES = {"Stylesheet", "Script"}
+_BLOCKING_PRIORITIES = {"VeryHigh", "High"}
+
+
+class RequestNode:
+    """One request in the dependency graph. Times are monotonic seconds."""
+
+    __slots__ = (
+        "request_id",
+        "url",
+        "resource_type",
+        "priority",
+        "initiator_type",
+        "start",
+        "end",
+        "bytes",
+        "phases",
+        "parent",
+        "children",
+    )
+
+    def __init__(self, record: dict[str, Any]) -> None:
+        response = record.get("response") or {}
+        self.request_id: str = record["requestId"]
+        self.url: str = record.get("url", "")
+        self.resource_type: str = record.get("resourceType") or ""
+        self.priority: str = record.get("priority") or ""
+        self.initiator_type: str = (record.get("initiator") or {}).get("type", "")
+        self.start: float = record.get("timestamp", 0.0)
+        self.end: float | None = record.get("finishedTimestamp") or response.get("timestamp")
+        self.bytes: int = record.get("encodedDataLength") or 0
+        self.phases = har_timings(record)[0] if response.get("timing") else None
+        self.parent: RequestNode | None = None
+        self.children: list[RequestNode] = []
+
+    @property
+    def duration(self) -> float:
+        """Seconds from request start to loading finished."""
+        return (self.end - self.start) if self.end is not None else 0.0
+
+    def chain(self) -> list[RequestNode]:
+        """Return the initiator chain from the root down to this node."""
+        nodes: list[RequestNode] = []
+        node: RequestNode | None = self
+        while node is not None:
+            nodes.append(node)
+            node = node.parent
+        return nodes[::-1]
+
+    def describe(self, origin: float) -> dict[str, Any]:
+        """Summarise the node with times in milliseconds relative to ``origin``."""
+        summary: dict[str, Any] = {
+            "requestId": self.request_id,
+            "url": self.url,
+            "type": self.resource_type,
+            "startMs": round((self.start - origin) * 1000, 1),
+            "durationMs": round(self.duration * 1000, 1),
+            "bytes": self.bytes,
+        }
+        if self.priority:
+            summary["priority"] = self.priority
+        if self.phases is not None:
+            summary["phases"] = self.phases
+        return summary
+
+
+def _initiator_urls(initiator: dict[str, Any]) -> list[str]:
+    """Return candidate parent URLs from an initiator, most specific first."""
+    urls = []
+    if initiator.get("url"):
+        urls.append(initiator["url"])
+    stack: dict[str, Any] | None = initiator.get("stack")
+    while stack:
+        urls.extend(frame["url"] for frame in stack.get("callFrames", []) if frame.get("url"))
+        stack = stack.get("parent")
+    return urls
+
+
+def build_request_graph(
+    records: list[dict[str, Any]], window_start: float | None = None
+) -> list[RequestNode]:
+    """
+    Build the initiator DAG for captured requests.
+
+    Args:
+        records: Entries from ``ChromeDevToolsClient.network_requests``
+        window_start: Ignore requests that started before this monotonic time
+
+    Returns:
+        Nodes in start order with ``parent`` and ``children`` linked
+    """
+    nodes: list[RequestNode] = []
+    by_id: dict[str, RequestNode] = {}
+    by_url: dict[str, list[RequestNode]] = {}
+    sources = {}
+
+    for record in sorted(records, key=lambda r: r.get("timestamp", 0.0)):
+        if "timestamp" not in record or record.get("type") != "request":
+            continue
+        if window_start is not None and record["timestamp"] < window_start:
+            continue
+        node = RequestNode(record)
+        nodes.append(node)
+        by_id[node.request_id] = node
+        by_url.setdefault(node.url, []).append(node)
+        sources[node.request_id] = record.get("initiator") or {}
+
+    for node in nodes:
+        initiator = sources[node.request_id]
+        parent = by_id.get(initiator.get("requestId", ""))
+        if parent is None:
+            for url in _initiator_urls(initiator):
+                started_before = [c for c in by_url.get(url, []) if c.start <= node.start]
+                if started_before:
+                    parent = started_before[-1]
+                    break
+        if parent is not None and parent is not node and parent.start <= node.start:
+            node.parent = parent
+            parent.children.append(node)
+    return nodes
+
+
+def _serial_run(node: RequestNode) -> list[RequestNode]:
+    """Return the longest run of ancestors ending at ``node`` that each waited for their parent."""
+    run = [node]
+    while run[-1].parent is not None:
+        parent = run[-1].parent
+        if parent.end is None or run[-1].start < parent.end - _SERIAL_TOLERANCE:
+            break
+        run.append(parent)
+    return run[::-1]
+
+
+def find_serial_chains(
+    nodes: list[RequestNode], origin: float, min_length: int = 3, limit: int = 10
+) -> list[dict[str, Any]]:
+    """
+    Find request chains where every request waited for its parent to finish.
+
+    The saving estimates fetching the whole chain in parallel from its first request's
+    start, so the chain would take as long as its slowest member.
+    """
+    runs: dict[tuple[str, ...], list[RequestNode]] = {}
+    for node in nodes:
+        if node.end is None or any(child.end is not None for child in node.children):
+            continue
+        run = _serial_run(node)
+        if len(run) >= min_length:
+            runs[tuple(n.request_id for n in run)] = run
+
+    chains: list[dict[str, Any]] = []
+    for run in runs.values():
+        end = run[-1].end or run[-1].start
+        actual = end - run[0].start
+        parallel = max(n.duration for n in run)
+        chains.append(
+            {
+                "length": len(run),
+                "actualMs": round(actual * 1000, 1),
+                "parallelMs": round(parallel * 1000, 1),
+                "savingMs": round((actual - parallel) * 1000, 1),
+                "requests": [
+                    {
+                        "url": n.url,
+                        "type": n.resource_type,
+                        "durationMs": round(n.duration * 1000, 1),
+                    }
+                    for n in run
+                ],
+                "startMs": round((run[0].start - origin) * 1000, 1),
+            }
+        )
+    chains.sort(key=lambda chain: chain["savingMs"], reverse=True)
+    return chains[:limit]
+
+
+def _is_page_navigation(record: dict[str, Any], main_frame_id: str | None) -> bool:
+    """Return True for the document request of a navigation of the page itself."""
+    if record.get("resourceType") != "Document" or record.get("type") != "request":
+        return False
+    if record.get("sessionId") is not None:
+        return False  # Out-of-process iframes load in a child session
+    # A navigation request starts its own loader; other document loads do not
+    if record.get("loaderId") not in (None, record.get("requestId")):
+        return False
+    if main_frame_id is not None and record.get("frameId") is not None:
+        return bool(record["frameId"] == main_frame_id)
+    # Without frame IDs, an iframe is recognised by being requested by its parent's parser
+    return (record.get("initiator") or {}).get("type") != "parser"
+
+
+def analyse_critical_path(
+    records: list[dict[str, Any]],
+    timeline: dict[str, float],
+    marker: str = "load",
+    marker_url: str | None = None,
+    limit: int = 10,
+    main_frame_id: str | None = None,
+) -> dict[str, Any]:
+    """
+    Compute the critical request path to a milestone and the waste around it.
+
+    The analysis window starts at the last top-level navigation before the milestone;
+    iframe documents load inside that window and never start it.
+
+    Args:
+        records: Entries from ``ChromeDevToolsClient.network_requests``
+        timeline: Milestone name to monotonic timestamp, e.g. ``client.page_timeline``
+        marker: Milestone to analyse up to (``load``, ``DOMContentLoaded`` or a lifecycle
+                event name such as ``firstContentfulPaint``)
+        marker_url: Analyse up to the end of the last request whose URL contains this
+                    instead of a milestone
+        limit: Maximum blocking resources and serial chains to report
+        main_frame_id: Frame ID of the page, e.g. ``client.main_frame_id``, used to tell
+                       its navigations from iframe documents
+
+    Returns:
+        Report with the critical path, blocking resources and serial chains
+
+    Raises:
+        ValueError: If the milestone or marker resource is not available
+    """
+    documents = [r for r in records if _is_page_navigation(r, main_frame_id)]
+    target: float | None = None
+    if marker_url is None:
+        target = timeline.get(marker)
+        if target is None:
+            available = ", ".join(sorted(timeline)) or "none recorded"
+            raise ValueError(f"Milestone {marker!r} not recorded (available: {available})")
+        documents = [r for r in documents if r.get("timestamp", 0.0) <= target]
+    origin = max((r["timestamp"] for r in documents), default=None)
+
+    nodes = build_request_graph(records, origin)
+    if not nodes:
+        raise ValueError("No network requests captured for this navigation")
+    origin = nodes[0].start if origin is None else origin
+
+    if marker_url is not None:
+        matching = [n for n in nodes if marker_url in n.url and n.end is not None]
+        if not matching:
+            raise ValueError(f"No finished request matches {marker_url!r}")
+        last = max(matching, key=lambda n: n.end or 0.0)
+        target = last.end
+        marker = marker_url
+    else:
+        finished = [n for n in nodes if n.end is not None and n.end <= (target or 0.0)]
+        last = max(finished, key=lambda n: n.end or 0.0) if finished else nodes[0]
+    if target is None:
+        raise ValueError(f"No end time recorded for {marker!r}")
+
+    path = last.chain()
+    hops = []
+    for index, node in enumerate(path):
+        hop = node.describe(origin)
+        if index:
+            parent_end = path[index - 1].end
+            if parent_end is not None:
+                hop["discoveryGapMs"] = round((node.start - parent_end) * 1000, 1)
+        hops.append(hop)
+
+    dom_content_loaded = timeline.get("DOMContentLoaded", target)
+    blocking = [
+        n
+        for n in nodes
+        if n.resource_type in _BLOCKING_TYPES
+        and n.initiator_type == "parser"
+        and n.priority in _BLOCKING_PRIORITIES
+        and n.start <= dom_content_loaded
+        and n.end is not None
+    ]
+    blocking.sort(key=lambda n: n.duration, reverse=True)
+
+    network_ms = ((last.end or last.start) - origin) * 1000
+    return {
+        "marker": marker,
+        "markerMs": round((target - origin) * 1000, 1),
+        "requestsConsidered": len(nodes),
+        "criticalPath": hops,
+        "criticalPathNetworkMs": round(network_ms, 1),
+        "afterLastRequestMs": round((target - (last.end or last.start)) * 1000, 1),
+        "blockingResources": [n.describe(origin) for n in blocking[:limit]],
+        "serialChains": find_serial_chains(nodes, origin, limit=limit),
+        "milestonesMs": {
+            name: round((value - origin) * 1000, 1)
+            for name, value in sorted(timeline.items(), key=lambda item: item[1])
+            if value >= origin
+        },
+    }
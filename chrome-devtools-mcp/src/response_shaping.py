@@ -0,0 +1,368 @@
+#!/usr/bin/env python3
+"""Response Shaping
+
+This module keeps tool responses within a caller-chosen budget. Large text payloads
+(outer HTML, response bodies) are clipped to ``max_bytes`` and DOM trees are walked
+breadth-first until ``max_nodes`` or ``max_bytes`` is reached. Whatever does not fit is
+kept on the server in a ``ResponseStore`` and can be fetched later by handle, so a
+truncated response always says where to continue instead of silently dropping data.
+
+DOM trees can optionally be encoded compactly: each node becomes
+``{"id": nodeId, "n": "tag#id.class", "c": childCount, "k": [children]}``.
+"""
+
+from __future__ import annotations
+
+import json
+import time
+from collections import OrderedDict, deque
+from typing import Any
+
+from .dom_mirror import node_label
+
+DEFAULT_STORE_BYTES = 64 * 1024 * 1024
+
+# CDP DOM.Node keys that hold nested nodes, in the order they are expanded
+_CHILD_KEYS = ("children", "shadowRoots", "contentDocument", "templateContent", "pseudoElements")
+
+_TEXT_NODE = 3
+_MAX_TEXT_LABEL = 80
+
+# Rough encoded size of one CDP DOM.Node, used to account stored trees without serialising
+_NODE_SIZE_ESTIMATE = 256
+
+
+class StoredTree:
+    """A DOM tree kept on the server together with a nodeId index."""
+
+    __slots__ = ("root", "index")
+
+    def __init__(self, root: dict[str, Any]) -> None:
+        self.root = root
+        self.index: dict[int, dict[str, Any]] = {}
+        for node in _iter_tree(root):
+            self.index[node.get("nodeId", 0)] = node
+
+    @property
+    def size_estimate(self) -> int:
+        """Approximate encoded size in bytes."""
+        return len(self.index) * _NODE_SIZE_ESTIMATE
+
+
+class ResponseStore:
+    """
+    Byte-bounded LRU of oversized response payloads addressed by opaque handles.
+
+    Attributes:
+        max_bytes: Upper bound on the total size of stored payloads
+        size_bytes: Current total size of stored payloads
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_STORE_BYTES) -> None:
+        """
+        Initialise an empty response store.
+
+        Args:
+            max_bytes: Maximum total size of stored payloads in bytes
+        """
+        self.max_bytes = max_bytes
+        self.size_bytes = 0
+        self._entries: OrderedDict[str, tuple[Any, int, dict[str, Any]]] = OrderedDict()
+        self._counter = 0
+
+    def put(self, kind: str, value: bytes | StoredTree, size: int, **meta: Any) -> str:
+        """Store a payload and return its handle. Oldest payloads are evicted first."""
+        self._counter += 1
+        handle = f"{kind}-{self._counter}"
+        meta.update({"kind": kind, "sizeBytes": size, "storedAt": time.time()})
+        self._entries[handle] = (value, size, meta)
+        self.size_bytes += size
+        while self.size_bytes > self.max_bytes and len(self._entries) > 1:
+            _, (_, evicted_size, _) = self._entries.popitem(last=False)
+            self.size_bytes -= evicted_size
+        return handle
+
+    def get(self, handle: str) -> tuple[Any, dict[str, Any]]:
+        """
+        Return a stored payload and its metadata.
+
+        Raises:
+            KeyError: If the handle is unknown or has been evicted
+        """
+        if handle not in self._entries:
+            raise KeyError(f"Unknown or expired response handle: {handle}")
+        self._entries.move_to_end(handle)
+        value, _, meta = self._entries[handle]
+        return value, meta
+
+    def stats(self) -> dict[str, Any]:
+        """Summarise store occupancy."""
+        return {
+            "entries": len(self._entries),
+            "sizeBytes": self.size_bytes,
+            "maxBytes": self.max_bytes,
+            "handles": [
+                {"handle": handle, **meta} for handle, (_, _, meta) in self._entries.items()
+            ],
+        }
+
+
+def _utf8_boundary(data: bytes, offset: int) -> int:
+    """Move ``offset`` back until it does not split a UTF-8 sequence."""
+    offset = min(offset, len(data))
+    while 0 < offset < len(data) and (data[offset] & 0xC0) == 0x80:
+        offset -= 1
+    return offset
+
+
+def slice_text(data: bytes, offset: int, max_bytes: int, base64: bool = False) -> dict[str, Any]:
+    """
+    Return one window of a stored text payload.
+
+    Args:
+        data: Full payload as UTF-8 (or base64 ASCII) bytes
+        offset: Byte offset to start at
+        max_bytes: Maximum bytes to return
+        base64: Keep the window aligned to 4-byte base64 quanta so it decodes on its own
+
+    Returns:
+        Dictionary with the text window, its byte range and the offset to continue at
+    """
+    start = _utf8_boundary(data, offset)
+    if base64:
+        max_bytes -= max_bytes % 4
+    end = _utf8_boundary(data, start + max(max_bytes, 4 if base64 else 1))
+    if end <= start:
+        # Budget smaller than one character: return that character whole
+        end = start + 1
+        while end < len(data) and (data[end] & 0xC0) == 0x80:
+            end += 1
+    window: dict[str, Any] = {
+        "text": data[start:end].decode("utf-8", "replace"),
+        "offset": start,
+        "endOffset": end,
+        "totalBytes": len(data),
+        "truncated": end < len(data),
+    }
+    if end < len(data):
+        window["continueAt"] = end
+    return window
+
+
+def clip_text(
+    text: str,
+    max_bytes: int | None,
+    store: ResponseStore,
+    kind: str,
+    base64: bool = False,
+    **meta: Any,
+) -> dict[str, Any]:
+    """
+    Clip text to ``max_bytes``, storing the full payload when it does not fit.
+
+    Returns:
+        Dictionary with ``text``, ``totalBytes`` and ``truncated``; truncated results also
+        carry ``handle`` and ``continueAt`` for get_stored_response
+    """
+    if max_bytes is None or max_bytes <= 0 or len(text) * 4 <= max_bytes:
+        return {"text": text, "totalBytes": len(text.encode("utf-8")), "truncated": False}
+    data = text.encode("utf-8")
+    if len(data) <= max_bytes:
+        return {"text": text, "totalBytes": len(data), "truncated": False}
+
+    handle = store.put(kind, data, len(data), base64=base64, **meta)
+    window = slice_text(data, 0, max_bytes, base64)
+    window["handle"] = handle
+    return window
+
+
+def _iter_tree(root: dict[str, Any]) -> Any:
+    """Yield every node of a CDP DOM.Node tree, iteratively."""
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        yield node
+        stack.extend(_child_nodes(node))
+
+
+def _child_nodes(node: dict[str, Any]) -> list[dict[str, Any]]:
+    """Return the nested nodes of a CDP DOM.Node in expansion order."""
+    nested: list[dict[str, Any]] = []
+    for key in _CHILD_KEYS:
+        value = node.get(key)
+        if isinstance(value, list):
+            nested.extend(value)
+        elif isinstance(value, dict):
+            nested.append(value)
+    return nested
+
+
+def _count_within(root: dict[str, Any], max_nodes: int) -> int | None:
+    """Return the node count of a tree, or None as soon as it exceeds ``max_nodes``."""
+    count = 0
+    stack = [root]
+    while stack:
+        count += 1
+        if count > max_nodes:
+            return None
+        stack.extend(_child_nodes(stack.pop()))
+    return count
+
+
+def _compact_node(node: dict[str, Any]) -> dict[str, Any]:
+    """Encode a CDP DOM.Node as ``{"id", "n", "c"}`` without its children."""
+    node_type = node.get("nodeType", 0)
+    if node_type == _TEXT_NODE:
+        value = " ".join(node.get("nodeValue", "").split())
+        label = f"#text {value[:_MAX_TEXT_LABEL]}" if value else "#text"
+    else:
+        flat = node.get("attributes", [])
+        attributes = {flat[i]: flat[i + 1] for i in range(0, len(flat) - 1, 2)}
+        label = node_label(
+            node_type, node.get("nodeName", ""), node.get("localName", ""), attributes
+        )
+    encoded: dict[str, Any] = {"id": node.get("nodeId", 0), "n": label}
+    count = max(node.get("childNodeCount", 0), len(node.get("children", [])))
+    if count:
+        encoded["c"] = count
+    return encoded
+
+
+def _encoded_size(node: dict[str, Any]) -> int:
+    """Return the compact JSON size of a single shaped node."""
+    return len(json.dumps(node, separators=(",", ":")))
+
+
+def _full_node(node: dict[str, Any]) -> dict[str, Any]:
+    """Copy a CDP DOM.Node without its nested nodes."""
+    return {key: value for key, value in node.items() if key not in _CHILD_KEYS}
+
+
+def shape_tree(
+    root: dict[str, Any],
+    max_nodes: int | None = None,
+    max_bytes: int | None = None,
+    compact: bool = False,
+) -> tuple[dict[str, Any], list[int], int]:
+    """
+    Copy a CDP DOM.Node tree breadth-first until a node or byte budget is exhausted.
+
+    Breadth-first order means a truncated tree still shows the whole top of the page,
+    with deep subtrees cut off rather than later siblings.
+
+    Args:
+        root: CDP DOM.Node tree to shape
+        max_nodes: Maximum nodes to include (None for no limit)
+        max_bytes: Approximate maximum encoded size in bytes (None for no limit)
+        compact: Emit ``{"id", "n", "c", "k"}`` nodes instead of full CDP nodes
+
+    Returns:
+        Tuple of the shaped tree, node IDs whose children were cut off (the
+        "continue at" handles) and the number of nodes included
+    """
+    encode = _compact_node if compact else _full_node
+    child_key = "k" if compact else "children"
+    shaped_root = encode(root)
+    included = 1
+    used_bytes = _encoded_size(shaped_root) if max_bytes is not None else 0
+    continue_at: list[int] = []
+    queue: deque[tuple[dict[str, Any], dict[str, Any]]] = deque([(root, shaped_root)])
+    exhausted = False
+
+    while queue:
+        source, shaped = queue.popleft()
+        nested = _child_nodes(source)
+        if not nested:
+            continue
+        if exhausted:
+            continue_at.append(source.get("nodeId", 0))
+            continue
+
+        shaped_children: list[dict[str, Any]] = []
+        for child in nested:
+            encoded = encode(child)
+            size = _encoded_size(encoded) + 1 if max_bytes is not None else 0
+            if (max_nodes is not None and included >= max_nodes) or (
+                max_bytes is not None and used_bytes + size > max_bytes
+            ):
+                exhausted = True
+                break
+            shaped_children.append(encoded)
+            queue.append((child, encoded))
+            included += 1
+            used_bytes += size
+
+        if len(shaped_children) < len(nested):
+            continue_at.append(source.get("nodeId", 0))
+        if shaped_children or not compact:
+            if compact:
+                shaped[child_key] = shaped_children
+            else:
+                _attach_full_children(source, shaped, shaped_children)
+
+    return shaped_root, continue_at, included
+
+
+def _attach_full_children(
+    source: dict[str, Any], shaped: dict[str, Any], shaped_children: list[dict[str, Any]]
+) -> None:
+    """Put shaped children back under the same CDP keys they came from."""
+    remaining = iter(shaped_children)
+    for key in _CHILD_KEYS:
+        value = source.get(key)
+        if isinstance(value, list):
+            kept = [item for _, item in zip(value, remaining, strict=False)]
+            shaped[key] = kept
+            if len(kept) < len(value):
+                return
+        elif isinstance(value, dict):
+            item = next(remaining, None)
+            if item is None:
+                return
+            shaped[key] = item
+
+
+def shape_document(
+    root: dict[str, Any],
+    store: ResponseStore,
+    max_nodes: int | None = None,
+    max_bytes: int | None = None,
+    compact: bool = False,
+    handle: str | None = None,
+) -> tuple[dict[str, Any], dict[str, Any]]:
+    """
+    Shape a DOM tree to budget, keeping the full tree in ``store`` if anything was cut.
+
+    Args:
+        root: CDP DOM.Node tree to shape
+        store: Response store for the full tree when truncated
+        max_nodes: Maximum nodes to include
+        max_bytes: Approximate maximum encoded size in bytes
+        compact: Use the compact node encoding
+        handle: Existing handle when ``root`` is already a stored subtree
+
+    Returns:
+        Tuple of the shaped tree and a shaping summary with ``truncated``,
+        ``nodesIncluded`` and, when truncated, ``handle`` and ``continueAt`` node IDs
+    """
+    if max_nodes is None and max_bytes is None and not compact:
+        return root, {"truncated": False}
+    if max_nodes is not None and max_bytes is None and not compact:
+        # Most documents are under the node budget; counting is far cheaper than copying
+        count = _count_within(root, max_nodes)
+        if count is not None:
+            return root, {"truncated": False, "nodesIncluded": count, "encoding": "cdp"}
+
+    shaped, continue_at, included = shape_tree(root, max_nodes, max_bytes, compact)
+    summary: dict[str, Any] = {
+        "truncated": bool(continue_at),
+        "nodesIncluded": included,
+        "encoding": "compact" if compact else "cdp",
+    }
+    if continue_at:
+        if handle is None:
+            tree = StoredTree(root)
+            handle = store.put("dom", tree, tree.size_estimate, nodeCount=len(tree.index))
+        summary["handle"] = handle
+        summary["continueAt"] = continue_at
+    return shaped, summary
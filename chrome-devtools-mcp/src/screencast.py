@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""Screencast Capture
+
+This module records a visual timeline of the page with ``Page.startScreencast``. Chrome
+keeps only a small number of unacknowledged frames in flight and stops sending until they
+are acknowledged, so every ``Page.screencastFrame`` is acked before anything else is done
+with it. Frames are throttled at the source with ``everyNthFrame`` and a maximum size.
+
+Each frame is hashed and dropped when it is identical to the previous one, which removes
+the long runs of unchanged frames an idle page produces. Kept frames are written straight
+to disk as they arrive, with a ``frames.json`` manifest of file names and capture
+timestamps, so nothing large is held in memory or returned through MCP. When the optional
+``Pillow`` package is installed, the kept frames can be assembled into an animated WebP
+or GIF whose frame durations follow the original timestamps.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+import hashlib
+import json
+import logging
+import os
+import time
+from typing import Any
+
+try:
+    from PIL import Image  # type: ignore[import-not-found]
+except ImportError:  # pragma: no cover - optional dependency
+    Image = None
+
+logger = logging.getLogger(__name__)
+
+FRAME_FORMATS = ("jpeg", "png")
+ANIMATION_FORMATS = ("webp", "gif")
+MANIFEST_NAME = "frames.json"
+# Duration shown for the last frame, which has no successor to measure against
+_LAST_FRAME_MS = 500
+
+
+class ScreencastRecorder:
+    """
+    Acknowledges, de-duplicates and writes ``Page.screencastFrame`` events.
+
+    Attributes:
+        enabled: Whether a screencast is running
+        output_dir: Directory frames are written to
+        frames: ``{"file", "timestamp", "hash"}`` for every kept frame
+        received: Frames delivered by Chrome
+        duplicates: Frames dropped as identical to the previous one
+        failed: Frames that could not be written
+    """
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self.output_dir = ""
+        self.frame_format = "jpeg"
+        self.frames: list[dict[str, Any]] = []
+        self.received = 0
+        self.duplicates = 0
+        self.failed = 0
+        self.bytes_written = 0
+        self._last_hash: str | None = None
+        self._started = 0.0
+        self._acks: set[asyncio.Task[Any]] = set()
+
+    async def start(
+        self,
+        client: Any,
+        output_dir: str,
+        frame_format: str = "jpeg",
+        quality: int = 80,
+        max_width: int | None = None,
+        max_height: int | None = None,
+        every_nth_frame: int = 1,
+    ) -> None:
+        """
+        Start a screencast writing frames into ``output_dir``.
+
+        Raises:
+            ValueError: If the format is unknown or a screencast is already running
+        """
+        if frame_format not in FRAME_FORMATS:
+            raise ValueError(f"frame_format must be one of {', '.join(FRAME_FORMATS)}")
+        if self.enabled:
+            raise ValueError("A screencast is already running")
+        os.makedirs(output_dir, exist_ok=True)
+        self.output_dir = output_dir
+        self.frame_format = frame_format
+        self.frames = []
+        self.received = self.duplicates = self.failed = self.bytes_written = 0
+        self._last_hash = None
+        self._started = time.time()
+
+        params: dict[str, Any] = {
+            "format": frame_format,
+            "everyNthFrame": max(1, every_nth_frame),
+        }
+        if frame_format == "jpeg":
+            params["quality"] = quality
+        if max_width:
+            params["maxWidth"] = max_width
+        if max_height:
+            params["maxHeight"] = max_height
+        self.enabled = True
+        try:
+            await client.send_command("Page.startScreencast", params)
+        except Exception:
+            self.enabled = False
+            raise
+
+    def on_frame(self, client: Any, params: dict[str, Any]) -> None:
+        """Handle ``Page.screencastFrame``: ack first, then de-duplicate and write."""
+        # Commands cannot be awaited on the receive loop; the ack goes out as soon as
+        # this handler returns
+        task = asyncio.create_task(
+            client.send_command("Page.screencastFrameAck", {"sessionId": params["sessionId"]})
+        )
+        self._acks.add(task)
+        task.add_done_callback(self._acks.discard)
+        if not self.enabled:
+            return
+
+        self.received += 1
+        data = base64.b64decode(params["data"])
+        digest = hashlib.blake2b(data, digest_size=16).hexdigest()
+        if digest == self._last_hash:
+            self.duplicates += 1
+            return
+        self._last_hash = digest
+
+        timestamp = params.get("metadata", {}).get("timestamp") or time.time()
+        extension = "jpg" if self.frame_format == "jpeg" else "png"
+        name = f"frame-{len(self.frames):05d}.{extension}"
+        try:
+            with open(os.path.join(self.output_dir, name), "wb") as handle:
+                handle.write(data)
+        except OSError as e:
+            self.failed += 1
+            logger.debug(f"Could not write screencast frame {name}: {e}")
+            return
+        self.bytes_written += len(data)
+        self.frames.append({"file": name, "timestamp": timestamp, "hash": digest})
+
+    async def stop(self, client: Any) -> None:
+        """Stop the screencast, flush outstanding acks and write the manifest."""
+        if not self.enabled:
+            return
+        self.enabled = False
+        try:
+            await client.send_command("Page.stopScreencast")
+        finally:
+            if self._acks:
+                await asyncio.gather(*self._acks, return_exceptions=True)
+            with open(os.path.join(self.output_dir, MANIFEST_NAME), "w", encoding="utf-8") as f:
+                json.dump({"format": self.frame_format, "frames": self.frames}, f, indent=1)
+
+    def status(self) -> dict[str, Any]:
+        """Summarise the current or last screencast."""
+        timestamps = [frame["timestamp"] for frame in self.frames]
+        return {
+            "enabled": self.enabled,
+            "outputDir": self.output_dir,
+            "format": self.frame_format,
+            "framesReceived": self.received,
+            "framesKept": len(self.frames),
+            "duplicatesDropped": self.duplicates,
+            "writeFailures": self.failed,
+            "bytesWritten": self.bytes_written,
+            "spanSeconds": round(timestamps[-1] - timestamps[0], 3) if timestamps else 0,
+        }
+
+
+def frame_durations(timestamps: list[float]) -> list[int]:
+    """Return display milliseconds for each frame from the gaps between timestamps."""
+    durations = [
+        max(20, round((later - earlier) * 1000))
+        for earlier, later in zip(timestamps, timestamps[1:], strict=False)
+    ]
+    return durations + [_LAST_FRAME_MS] if timestamps else []
+
+
+def assemble_animation(output_dir: str, animation_format: str, output_path: str) -> int:
+    """
+    Assemble the frames listed in a screencast manifest into an animated WebP or GIF.
+
+    Returns:
+        Size of the written animation in bytes
+
+    Raises:
+        ValueError: If the format is unknown or there are no frames
+        RuntimeError: If Pillow is not installed
+    """
+    if animation_format not in ANIMATION_FORMATS:
+        raise ValueError(f"Animation format must be one of {', '.join(ANIMATION_FORMATS)}")
+    if Image is None:
+        raise RuntimeError("Assembling animations requires Pillow (pip install Pillow)")
+    with open(os.path.join(output_dir, MANIFEST_NAME), encoding="utf-8") as handle:
+        frames = json.load(handle)["frames"]
+    if not frames:
+        raise ValueError("No frames were captured")
+
+    # Each frame is decoded and its file closed straight away; keeping every file open
+    # until the save runs out of descriptors on long recordings
+    images = [_load_frame(output_dir, frame["file"], animation_format) for frame in frames]
+    images[0].save(
+        output_path,
+        format=animation_format.upper(),
+        save_all=True,
+        append_images=images[1:],
+        duration=frame_durations([frame["timestamp"] for frame in frames]),
+        loop=0,
+    )
+    return os.path.getsize(output_path)
+
+
+def _load_frame(output_dir: str, name: str, animation_format: str) -> Any:
+    """Read one frame fully into memory and close its file."""
+    with Image.open(os.path.join(output_dir, name)) as image:
+        if animation_format == "gif":
+            return image.convert("P", palette=Image.Palette.ADAPTIVE)
+        return image.copy()
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""Simple CSS Selector Matching
+
+This module matches a practical subset of CSS selectors against locally held DOM
+models (DOM snapshots and the live DOM mirror) without a round-trip to Chrome.
+
+Supported syntax:
+    - Type, universal, ``#id`` and ``.class`` selectors
+    - Attribute selectors: ``[attr]``, ``[attr=v]``, ``~=``, ``|=``, ``^=``, ``$=``, ``*=``
+      with optional ``i`` flag
+    - Descendant (whitespace) and child (``>``) combinators
+    - Selector lists separated by commas
+
+Pseudo-classes, pseudo-elements and sibling combinators raise ``ValueError`` so callers
+can fall back to Chrome's own ``DOM.querySelectorAll``.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Protocol
+
+_ELEMENT_NODE = 1
+
+_IDENT = r"-?(?:[_a-zA-Z]|[^\x00-\x7f]|\\.)(?:[\w-]|[^\x00-\x7f]|\\.)*"
+_TOKEN = re.compile(
+    rf"""
+    (?P<tag>\*|{_IDENT})
+    | \#(?P<id>(?:[\w-]|[^\x00-\x7f]|\\.)+)
+    | \.(?P<cls>{_IDENT})
+    | \[\s*(?P<attr>[\w:-]+)\s*
+        (?:(?P<op>[~|^$*]?=)\s*
+            (?:"(?P<dq>[^"]*)"|'(?P<sq>[^']*)'|(?P<bare>[^\]\s]+))
+            \s*(?P<flag>[iIsS])?\s*
+        )?\]
+    """,
+    re.VERBOSE,
+)
+_ESCAPE = re.compile(r"\\(.)")
+
+
+class SelectorNode(Protocol):
+    """Minimal node interface required for selector matching."""
+
+    node_type: int
+    local_name: str
+    attributes: dict[str, str]
+
+    @property
+    def parent(self) -> SelectorNode | None: ...
+
+
+class _Compound:
+    """One compound selector such as ``div#map.marker[data-type=exit]``."""
+
+    __slots__ = ("tag", "ids", "classes", "attrs")
+
+    def __init__(self) -> None:
+        self.tag: str | None = None
+        self.ids: list[str] = []
+        self.classes: list[str] = []
+        self.attrs: list[tuple[str, str | None, str, bool]] = []
+
+    def matches(self, node: SelectorNode) -> bool:
+        """Return True if the element satisfies every part of the compound."""
+        if node.node_type != _ELEMENT_NODE:
+            return False
+        if self.tag is not None and node.local_name.lower() != self.tag:
+            return False
+        attributes = node.attributes
+        if self.ids and any(attributes.get("id") != value for value in self.ids):
+            return False
+        if self.classes:
+            class_list = attributes.get("class", "").split()
+            if any(value not in class_list for value in self.classes):
+                return False
+        for name, op, value, ignore_case in self.attrs:
+            actual = attributes.get(name)
+            if actual is None:
+                return False
+            if op is not None and not _attribute_matches(actual, op, value, ignore_case):
+                return False
+        return True
+
+
+def _attribute_matches(actual: str, op: str, value: str, ignore_case: bool) -> bool:
+    """Evaluate an attribute selector operator."""
+    if ignore_case:
+        actual, value = actual.lower(), value.lower()
+    if op == "=":
+        return actual == value
+    if op == "~=":
+        return value in actual.split()
+    if op == "|=":
+        return actual == value or actual.startswith(value + "-")
+    if op == "^=":
+        return bool(value) and actual.startswith(value)
+    if op == "$=":
+        return bool(value) and actual.endswith(value)
+    return bool(value) and value in actual  # "*="
+
+
+def _unescape(value: str) -> str:
+    return _ESCAPE.sub(r"\1", value)
+
+
+def _parse_complex(text: str) -> list[tuple[str | None, _Compound]]:
+    """Parse one complex selector into ``(combinator, compound)`` pairs, left to right."""
+    parts: list[tuple[str | None, _Compound]] = []
+    pos = 0
+    combinator: str | None = None
+    compound: _Compound | None = None
+
+    while pos < len(text):
+        char = text[pos]
+        if char.isspace() or char == ">":
+            if compound is not None:
+                parts.append((combinator, compound))
+                compound = None
+                combinator = " "
+            if char == ">":
+                if not parts:
+                    raise ValueError(f"Selector cannot start with a combinator: {text!r}")
+                combinator = ">"
+            pos += 1
+            continue
+        if char in "+~:":
+            raise ValueError(f"Unsupported selector syntax {char!r} in {text!r}")
+
+        match = _TOKEN.match(text, pos)
+        if not match:
+            raise ValueError(f"Invalid selector: {text!r}")
+        if compound is None:
+            compound = _Compound()
+        if match.group("tag"):
+            if compound.tag is not None or compound.ids or compound.classes or compound.attrs:
+                raise ValueError(f"Invalid selector: {text!r}")
+            tag = match.group("tag")
+            compound.tag = None if tag == "*" else _unescape(tag).lower()
+        elif match.group("id"):
+            compound.ids.append(_unescape(match.group("id")))
+        elif match.group("cls"):
+            compound.classes.append(_unescape(match.group("cls")))
+        else:
+            raw = match.group("dq")
+            if raw is None:
+                raw = match.group("sq")
+            if raw is None:
+                raw = match.group("bare") or ""
+            compound.attrs.append(
+                (
+                    match.group("attr").lower(),
+                    match.group("op"),
+                    _unescape(raw),
+                    (match.group("flag") or "").lower() == "i",
+                )
+            )
+        pos = match.end()
+
+    if compound is None:
+        raise ValueError(f"Selector is empty or ends with a combinator: {text!r}")
+    parts.append((combinator, compound))
+    return parts
+
+
+def _split_selector_list(text: str) -> list[str]:
+    """Split a selector list on commas that are not inside brackets or quotes."""
+    groups: list[str] = []
+    depth = 0
+    quote: str | None = None
+    start = 0
+    for index, char in enumerate(text):
+        if quote:
+            if char == quote:
+                quote = None
+        elif char in "\"'":
+            quote = char
+        elif char == "[":
+            depth += 1
+        elif char == "]":
+            depth -= 1
+        elif char == "," and depth == 0:
+            groups.append(text[start:index])
+            start = index + 1
+    groups.append(text[start:])
+    return [group.strip() for group in groups]
+
+
+class SimpleSelector:
+    """
+    Compiled selector list that can be matched against local DOM models.
+
+    Example:
+        ```python
+        selector = SimpleSelector("#map-container .marker[data-type]")
+        markers = [node for node in snapshot.elements if selector.matches(node)]
+        ```
+
+    Raises:
+        ValueError: If the selector uses syntax outside the supported subset
+    """
+
+    def __init__(self, text: str) -> None:
+        """
+        Compile a selector list.
+
+        Args:
+            text: CSS selector list to compile
+        """
+        self.text = text
+        self._complexes = [_parse_complex(group) for group in _split_selector_list(text)]
+
+    def matches(self, node: SelectorNode) -> bool:
+        """Return True if ``node`` matches any selector in the list."""
+        return any(_match_from(parts, len(parts) - 1, node) for parts in self._complexes)
+
+
+def _parent_element(node: SelectorNode) -> SelectorNode | None:
+    """Return the parent element, stopping at document and shadow root boundaries."""
+    parent = node.parent
+    if parent is not None and parent.node_type == _ELEMENT_NODE:
+        return parent
+    return None
+
+
+def _match_from(parts: list[tuple[str | None, _Compound]], index: int, node: SelectorNode) -> bool:
+    """Match ``parts[: index + 1]`` right-to-left with ``node`` as the rightmost subject."""
+    combinator, compound = parts[index]
+    if not compound.matches(node):
+        return False
+    if index == 0:
+        return True
+
+    ancestor = _parent_element(node)
+    if combinator == ">":
+        return ancestor is not None and _match_from(parts, index - 1, ancestor)
+    while ancestor is not None:
+        if _match_from(parts, index - 1, ancestor):
+            return True
+        ancestor = _parent_element(ancestor)
+    return False
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""Stylesheet Cache
+
+This module provides a client-side cache of stylesheet headers, text, class names and
+media queries so that repeated CSS analysis does not cost any CDP round-trips.
+
+Headers are populated from ``CSS.styleSheetAdded`` events. Stylesheet text, collected
+class names and the page's media query list are fetched on first use and kept in an LRU
+bounded by total bytes. Entries are invalidated on ``CSS.styleSheetChanged`` and
+``CSS.styleSheetRemoved``, and the whole cache is cleared on main-frame navigation.
+"""
+
+from __future__ import annotations
+
+import json
+from collections import OrderedDict
+from typing import Any
+
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+
+# Key for the page-wide media query list, which is not owned by a single stylesheet
+_PAGE_KEY = "*"
+
+
+class StylesheetCache:
+    """
+    Byte-bounded LRU cache of stylesheet data keyed by ``styleSheetId``.
+
+    Attributes:
+        headers: CSSStyleSheetHeader objects keyed by styleSheetId
+        max_bytes: Upper bound on the total size of cached values
+        size_bytes: Current total size of cached values
+        hits: Number of lookups served from the cache
+        misses: Number of lookups that required a CDP round-trip
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        """
+        Initialise an empty stylesheet cache.
+
+        Args:
+            max_bytes: Maximum total size of cached values in bytes
+        """
+        self.headers: dict[str, dict[str, Any]] = {}
+        self.max_bytes = max_bytes
+        self.size_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[tuple[str, str], tuple[Any, int]] = OrderedDict()
+        self._generations: dict[str, int] = {}
+        self._epoch = 0
+
+    def add_header(self, header: dict[str, Any]) -> None:
+        """Record a stylesheet header from a ``CSS.styleSheetAdded`` event."""
+        sheet_id = header["styleSheetId"]
+        self.headers[sheet_id] = header
+        self.invalidate(sheet_id)
+
+    def remove(self, sheet_id: str) -> None:
+        """Forget a stylesheet after a ``CSS.styleSheetRemoved`` event."""
+        self.headers.pop(sheet_id, None)
+        self.invalidate(sheet_id)
+
+    def invalidate(self, sheet_id: str) -> None:
+        """Drop cached data for a stylesheet and the page-wide media query list."""
+        self._generations[sheet_id] = self._generations.get(sheet_id, 0) + 1
+        self._generations[_PAGE_KEY] = self._generations.get(_PAGE_KEY, 0) + 1
+        for key in [key for key in self._entries if key[1] in (sheet_id, _PAGE_KEY)]:
+            self._discard(key)
+
+    def clear(self) -> None:
+        """Drop every header and cached value, e.g. after navigation."""
+        self.headers.clear()
+        self._entries.clear()
+        self.size_bytes = 0
+        self._generations.clear()
+        self._epoch += 1
+
+    async def get_text(self, client: Any, sheet_id: str) -> tuple[str, bool]:
+        """
+        Get stylesheet text, fetching it with ``CSS.getStyleSheetText`` on a miss.
+
+        Returns:
+            Tuple of the stylesheet text and whether it was served from the cache
+        """
+        cached = self._lookup(("text", sheet_id))
+        if cached is not None:
+            return cached, True
+
+        generation = self._generation(sheet_id)
+        result = await client.send_command("CSS.getStyleSheetText", {"styleSheetId": sheet_id})
+        text = result["text"]
+        self._store(("text", sheet_id), text, len(text.encode("utf-8")), generation)
+        return text, False
+
+    async def get_class_names(self, client: Any, sheet_id: str) -> tuple[list[str], bool]:
+        """
+        Get sorted class names used in a stylesheet, fetching with ``CSS.collectClassNames``.
+
+        Returns:
+            Tuple of the class names and whether they were served from the cache
+        """
+        cached = self._lookup(("classNames", sheet_id))
+        if cached is not None:
+            return cached, True
+
+        generation = self._generation(sheet_id)
+        result = await client.send_command("CSS.collectClassNames", {"styleSheetId": sheet_id})
+        class_names = sorted(set(result.get("classNames", [])))
+        size = sum(len(name) for name in class_names)
+        self._store(("classNames", sheet_id), class_names, size, generation)
+        return class_names, False
+
+    async def get_media_queries(self, client: Any) -> tuple[list[dict[str, Any]], bool]:
+        """
+        Get the page's media queries, fetching with ``CSS.getMediaQueries`` on a miss.
+
+        Returns:
+            Tuple of CSSMedia objects and whether they were served from the cache
+        """
+        cached = self._lookup(("mediaQueries", _PAGE_KEY))
+        if cached is not None:
+            return cached, True
+
+        generation = self._generation(_PAGE_KEY)
+        result = await client.send_command("CSS.getMediaQueries")
+        medias = result.get("medias", [])
+        self._store(("mediaQueries", _PAGE_KEY), medias, len(json.dumps(medias)), generation)
+        return medias, False
+
+    def stats(self) -> dict[str, Any]:
+        """Summarise cache occupancy and hit rate."""
+        lookups = self.hits + self.misses
+        return {
+            "stylesheets": len(self.headers),
+            "entries": len(self._entries),
+            "sizeBytes": self.size_bytes,
+            "maxBytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hitRate": round(self.hits / lookups, 3) if lookups else 0,
+        }
+
+    def _lookup(self, key: tuple[str, str]) -> Any:
+        """Return a cached value and mark it most recently used, or None."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def _generation(self, owner: str) -> tuple[int, int]:
+        """Return a token that changes whenever ``owner``'s cached data is invalidated."""
+        return self._epoch, self._generations.get(owner, 0)
+
+    def _store(
+        self, key: tuple[str, str], value: Any, size: int, generation: tuple[int, int]
+    ) -> None:
+        """Cache a value unless it was invalidated while being fetched or is too large."""
+        if self._generation(key[1]) != generation or size > self.max_bytes:
+            return
+        self._discard(key)
+        self._entries[key] = (value, size)
+        self.size_bytes += size
+        while self.size_bytes > self.max_bytes:
+            self._discard(next(iter(self._entries)))
+
+    def _discard(self, key: tuple[str, str]) -> None:
+        """Remove a single entry and release its bytes."""
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.size_bytes -= entry[1]
@@ -14,6 +14,7 @@ browser interaction:
 - Network Monitoring: Request/response capture and analysis
 - Performance Profiling: Metrics collection and resource timing
 - Storage Management: Cookies, localStorage, and quota management
+- Stored Responses: Paging through oversized payloads kept on the server
 
 Each tool group is designed for integration with Chrome's debugging protocol,
 providing error handling and response formatting.
@@ -39,6 +40,7 @@ from .css import register_css_tools
 from .dom import register_dom_tools
 from .network import register_network_tools
 from .performance import register_performance_tools
+from .responses import register_response_tools
 from .storage import register_storage_tools
 
 __all__ = [
@@ -49,4 +51,5 @@ __all__ = [
     "register_css_tools",
     "register_storage_tools",
     "register_performance_tools",
+    "register_response_tools",
 ]
@@ -44,7 +44,12 @@ from typing import Any
 from mcp.server.fastmcp import FastMCP
 
 from ..cdp_context import require_cdp_client
-from .utils import create_error_response, create_success_response, safe_timestamp_conversion
+from .utils import (
+    create_error_response,
+    create_success_response,
+    safe_timestamp_conversion,
+    trusted,
+)
 
 
 def register_console_tools(mcp: FastMCP) -> None:
@@ -82,7 +87,10 @@ def register_console_tools(mcp: FastMCP) -> None:
     @mcp.tool()
     @require_cdp_client
     async def get_console_logs(
-        level: str | None = None, limit: int | None = None, **kwargs: Any
+        level: str | None = None,
+        limit: int | None = None,
+        target_type: str | None = None,
+        **kwargs: Any,
     ) -> dict[str, Any]:
         """
         Get browser console logs with optional filtering.
@@ -90,6 +98,8 @@ def register_console_tools(mcp: FastMCP) -> None:
         Args:
             level: Filter by log level (log, warn, error, info, debug)
             limit: Maximum number of logs to return
+            target_type: Only logs from this target type: page, iframe, worker,
+                         shared_worker or service_worker
 
         Returns:
             List of console logs matching the criteria
@@ -101,6 +111,9 @@ def register_console_tools(mcp: FastMCP) -> None:
             if level:
                 logs = [log for log in logs if log.get("type") == level]
 
+            if target_type:
+                logs = [log for log in logs if log.get("targetType") == target_type]
+
             if limit:
                 logs = logs[:limit]
 
@@ -114,7 +127,7 @@ def register_console_tools(mcp: FastMCP) -> None:
                     "logs": logs,
                     "totalCount": len(cdp_client.console_logs),
                     "filteredCount": len(logs),
-                    "filters": {"level": level, "limit": limit},
+                    "filters": {"level": level, "limit": limit, "targetType": target_type},
                 },
             )
 
@@ -203,8 +216,8 @@ def register_console_tools(mcp: FastMCP) -> None:
                 message="JavaScript executed successfully",
                 data={
                     "code": code,
-                    "result": result.get("result", {}),
-                    "value": result.get("result", {}).get("value"),
+                    "result": trusted(result.get("result", {})),
+                    "value": trusted(result.get("result", {}).get("value")),
                     "type": result.get("result", {}).get("type"),
                 },
             )
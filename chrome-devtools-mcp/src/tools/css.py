@@ -16,7 +16,7 @@ Key Features:
     - Font and colour information extraction
     - Media query enumeration and analysis
     - CSS class name collection from stylesheets
-    - CSS coverage tracking for performance optimisation
+    - Byte-level CSS coverage tracking with incremental delta polling
     - Background colour and typography analysis
 
 Example:
@@ -30,8 +30,9 @@ Example:
     rules = await get_matched_styles(node_id=123)
 
     # Track CSS coverage for optimisation
-    await start_css_coverage_tracking()
+    await start_css_coverage_tracking(poll_interval_seconds=2.0)
     # ... user interactions ...
+    progress = await get_css_coverage_summary()
     coverage = await stop_css_coverage_tracking()
     ```
 
@@ -79,8 +80,9 @@ def register_css_tools(mcp: FastMCP) -> None:
         - get_platform_fonts: Font usage analysis
         - get_media_queries: Media query enumeration
         - collect_css_class_names: Class name collection
-        - start_css_coverage_tracking: Coverage analysis initiation
-        - stop_css_coverage_tracking: Coverage results and analysis
+        - start_css_coverage_tracking: Coverage analysis initiation with delta polling
+        - get_css_coverage_summary: Byte-level coverage while tracking continues
+        - stop_css_coverage_tracking: Byte-level coverage results per stylesheet
 
     Note:
         All tools require access to the global CDP client instance and active
@@ -268,6 +270,9 @@ def register_css_tools(mcp: FastMCP) -> None:
         """
         Get the textual content of a CSS stylesheet.
 
+        Text is served from the client's stylesheet cache after the first fetch and is
+        refreshed automatically when Chrome reports the stylesheet changed.
+
         Args:
             stylesheet_id: ID of the stylesheet
 
@@ -276,18 +281,18 @@ def register_css_tools(mcp: FastMCP) -> None:
         """
         try:
             cdp_client = kwargs["cdp_client"]
-            result = await cdp_client.send_command(
-                "CSS.getStyleSheetText", {"styleSheetId": stylesheet_id}
-            )
+            text, from_cache = await cdp_client.stylesheet_cache.get_text(cdp_client, stylesheet_id)
 
-            text = result["text"]
+            header = cdp_client.stylesheet_cache.headers.get(stylesheet_id, {})
             return create_success_response(
                 message=f"Retrieved stylesheet content (ID: {stylesheet_id})",
                 data={
                     "styleSheetId": stylesheet_id,
+                    "sourceURL": header.get("sourceURL") or None,
                     "text": text,
                     "characterCount": len(text),
                     "lineCount": text.count("\n") + 1 if text else 0,
+                    "fromCache": from_cache,
                 },
             )
 
@@ -374,14 +379,15 @@ def register_css_tools(mcp: FastMCP) -> None:
         """
         Get all media queries parsed by the rendering engine.
 
+        The list is cached until a stylesheet is added, changed or removed.
+
         Returns:
             List of all active media queries
         """
         try:
             cdp_client = kwargs["cdp_client"]
-            result = await cdp_client.send_command("CSS.getMediaQueries")
+            medias, from_cache = await cdp_client.stylesheet_cache.get_media_queries(cdp_client)
 
-            medias = result.get("medias", [])
             media_info = []
 
             for media in medias:
@@ -402,6 +408,7 @@ def register_css_tools(mcp: FastMCP) -> None:
                     "mediaQueries": media_info,
                     "totalCount": len(media_info),
                     "sources": list({m["source"] for m in media_info if m.get("source")}),
+                    "fromCache": from_cache,
                 },
             )
 
@@ -414,6 +421,8 @@ def register_css_tools(mcp: FastMCP) -> None:
         """
         Collect all class names from a specified stylesheet.
 
+        Class names are cached per stylesheet until Chrome reports it changed.
+
         Args:
             stylesheet_id: ID of the stylesheet to analyse
 
@@ -422,18 +431,17 @@ def register_css_tools(mcp: FastMCP) -> None:
         """
         try:
             cdp_client = kwargs["cdp_client"]
-            result = await cdp_client.send_command(
-                "CSS.collectClassNames", {"styleSheetId": stylesheet_id}
+            class_names, from_cache = await cdp_client.stylesheet_cache.get_class_names(
+                cdp_client, stylesheet_id
             )
 
-            class_names = result.get("classNames", [])
-
             return create_success_response(
                 message=f"Collected {len(class_names)} class names from stylesheet {stylesheet_id}",
                 data={
                     "styleSheetId": stylesheet_id,
-                    "classNames": sorted(class_names),
+                    "classNames": class_names,
                     "totalCount": len(class_names),
+                    "fromCache": from_cache,
                 },
             )
 
@@ -442,19 +450,31 @@ def register_css_tools(mcp: FastMCP) -> None:
 
     @mcp.tool()
     @require_cdp_client
-    async def start_css_coverage_tracking(**kwargs: Any) -> dict[str, Any]:
+    async def start_css_coverage_tracking(
+        poll_interval_seconds: float | None = 2.0, **kwargs: Any
+    ) -> dict[str, Any]:
         """
         Start tracking CSS rule usage for coverage analysis.
 
+        Args:
+            poll_interval_seconds: Seconds between background CSS.takeCoverageDelta polls
+                                   (default: 2.0). Use None or 0 to collect usage only
+                                   when tracking stops.
+
         Returns:
             Status of coverage tracking initialization
         """
         try:
             cdp_client = kwargs["cdp_client"]
-            await cdp_client.send_command("CSS.startRuleUsageTracking")
+            await cdp_client.css_coverage.start(cdp_client, poll_interval_seconds)
 
             return create_success_response(
-                message="Started CSS coverage tracking", data={"tracking": True, "status": "active"}
+                message="Started CSS coverage tracking",
+                data={
+                    "tracking": True,
+                    "status": "active",
+                    "pollIntervalSeconds": poll_interval_seconds or None,
+                },
             )
 
         except Exception as e:
@@ -462,34 +482,103 @@ def register_css_tools(mcp: FastMCP) -> None:
 
     @mcp.tool()
     @require_cdp_client
-    async def stop_css_coverage_tracking(**kwargs: Any) -> dict[str, Any]:
+    async def get_css_coverage_summary(
+        limit: int = 20, include_unused_ranges: bool = False, **kwargs: Any
+    ) -> dict[str, Any]:
         """
-        Stop tracking CSS rule usage and get coverage results.
+        Get byte-level CSS coverage collected so far without stopping tracking.
+
+        Args:
+            limit: Maximum number of stylesheets to report, largest unused first (default: 20)
+            include_unused_ranges: Include unused character ranges per stylesheet
 
         Returns:
-            CSS usage analysis with covered and uncovered rules
+            Per-stylesheet used and unused bytes with page totals
         """
         try:
             cdp_client = kwargs["cdp_client"]
-            result = await cdp_client.send_command("CSS.stopRuleUsageTracking")
+            tracker = cdp_client.css_coverage
+            if not tracker.active:
+                return create_error_response(
+                    "CSS coverage tracking is not active",
+                    "Call start_css_coverage_tracking first",
+                )
 
-            rule_usage = result.get("ruleUsage", [])
-            used_rules = [rule for rule in rule_usage if rule.get("used", False)]
-            unused_rules = [rule for rule in rule_usage if not rule.get("used", False)]
+            await tracker.take_delta(cdp_client)
+            report = await _build_coverage_report(cdp_client, limit, include_unused_ranges)
 
             return create_success_response(
-                message=f"Stopped CSS coverage tracking - analysed {len(rule_usage)} rules",
-                data={
-                    "tracking": False,
-                    "totalRules": len(rule_usage),
-                    "usedRules": len(used_rules),
-                    "unusedRules": len(unused_rules),
-                    "coveragePercentage": (len(used_rules) / len(rule_usage) * 100)
-                    if rule_usage
-                    else 0,
-                    "ruleUsage": rule_usage,
-                },
+                message=f"CSS coverage so far: {report['unusedBytes']} of "
+                f"{report['totalBytes']} bytes unused",
+                data={"tracking": True, **report},
+            )
+
+        except Exception as e:
+            return create_error_response(f"Error getting CSS coverage summary: {e}")
+
+    @mcp.tool()
+    @require_cdp_client
+    async def stop_css_coverage_tracking(
+        limit: int = 20, include_unused_ranges: bool = False, **kwargs: Any
+    ) -> dict[str, Any]:
+        """
+        Stop tracking CSS rule usage and get byte-level coverage results.
+
+        Args:
+            limit: Maximum number of stylesheets to report, largest unused first (default: 20)
+            include_unused_ranges: Include unused character ranges per stylesheet
+
+        Returns:
+            Per-stylesheet used and unused bytes with page totals
+        """
+        try:
+            cdp_client = kwargs["cdp_client"]
+            tracker = cdp_client.css_coverage
+            await tracker.stop(cdp_client)
+            report = await _build_coverage_report(cdp_client, limit, include_unused_ranges)
+
+            return create_success_response(
+                message=f"Stopped CSS coverage tracking - analysed {report['totalRules']} rules "
+                f"across {report['stylesheetCount']} stylesheets",
+                data={"tracking": False, **report},
             )
 
         except Exception as e:
             return create_error_response(f"Error stopping CSS coverage tracking: {e}")
+
+
+async def _build_coverage_report(
+    cdp_client: Any, limit: int, include_unused_ranges: bool
+) -> dict[str, Any]:
+    """Map accumulated coverage intervals onto stylesheet text and summarise by bytes."""
+    tracker = cdp_client.css_coverage
+    sheets = []
+
+    for sheet_id in tracker.stylesheet_ids:
+        try:
+            text, _ = await cdp_client.stylesheet_cache.get_text(cdp_client, sheet_id)
+        except Exception:
+            continue  # Stylesheet was removed since its rules were reported
+
+        summary = tracker.summarise_sheet(sheet_id, text, include_unused_ranges)
+        header = cdp_client.stylesheet_cache.headers.get(sheet_id, {})
+        summary["sourceURL"] = header.get("sourceURL") or None
+        summary["isInline"] = header.get("isInline", False)
+        sheets.append(summary)
+
+    sheets.sort(key=lambda sheet: sheet["unusedBytes"], reverse=True)
+    total_bytes = sum(sheet["totalBytes"] for sheet in sheets)
+    used_bytes = sum(sheet["usedBytes"] for sheet in sheets)
+
+    return {
+        "stylesheetCount": len(sheets),
+        "totalBytes": total_bytes,
+        "usedBytes": used_bytes,
+        "unusedBytes": total_bytes - used_bytes,
+        "coveragePercentage": round(used_bytes / total_bytes * 100, 2) if total_bytes else 0,
+        "totalRules": sum(sheet["totalRules"] for sheet in sheets),
+        "usedRules": sum(sheet["usedRules"] for sheet in sheets),
+        "deltaPolls": tracker.polls,
+        "stylesheets": sheets[:limit],
+        "limitedResults": len(sheets) > limit,
+    }
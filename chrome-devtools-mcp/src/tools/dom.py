@@ -15,10 +15,13 @@ Key Features:
     - CSS selector-based element querying (single and multiple)
     - Element attribute and property inspection
     - HTML content extraction (outer HTML)
+    - Node and byte budgets with "continue at" handles for large trees and HTML
     - Box model and layout information analysis
     - Position-based element discovery
     - Text-based element searching with flexible queries
     - Element focus management and interaction
+    - One-shot page snapshots with attributes, layout and computed styles
+    - Optional live DOM mirror for round-trip-free reads
 
 Example:
     Inspecting and interacting with DOM elements:
@@ -35,6 +38,9 @@ Example:
 
     # Get layout information
     box_model = await get_element_box_model(node_id=123)
+
+    # Capture every marker's attributes, bounds and styles in one round-trip
+    markers = await capture_page_snapshot(selector='.marker', computed_styles=['z-index'])
     ```
 
 Note:
@@ -44,12 +50,16 @@ Note:
 
 from __future__ import annotations
 
+import time
 from typing import Any
 
 from mcp.server.fastmcp import FastMCP
 
 from ..cdp_context import require_cdp_client
-from .utils import create_error_response, create_success_response
+from ..dom_mirror import DOMMirror, node_label
+from ..dom_snapshot import DEFAULT_SNAPSHOT_STYLES, DOMSnapshot
+from ..response_shaping import clip_text, shape_document
+from .utils import create_error_response, create_success_response, trusted
 
 
 def register_dom_tools(mcp: FastMCP) -> None:
@@ -82,6 +92,16 @@ def register_dom_tools(mcp: FastMCP) -> None:
         - get_element_at_position: Position-based element discovery
         - search_elements: Text-based element searching
         - focus_element: Element focus management
+        - capture_page_snapshot: One-shot DOMSnapshot capture with local filtering
+        - query_page_snapshot: Re-query the last snapshot without a round-trip
+        - enable_dom_mirror: Maintain a live local DOM mirror from mutation events
+        - disable_dom_mirror: Stop using the local DOM mirror
+        - get_dom_mirror_status: Mirror freshness and size
+        - get_node_relatives: Parent, ancestor and child walk from the mirror
+        - batch_inspect_elements: Concurrent multi-node inspection as a columnar table
+
+    When the DOM mirror is enabled and fresh, get_document, query_selector,
+    query_selector_all, get_element_attributes and describe_element answer locally.
 
     Note:
         All tools require access to the global CDP client instance and active
@@ -91,7 +111,14 @@ def register_dom_tools(mcp: FastMCP) -> None:
 
     @mcp.tool()
     @require_cdp_client
-    async def get_document(depth: int = 1, pierce: bool = False, **kwargs: Any) -> dict[str, Any]:
+    async def get_document(
+        depth: int = 1,
+        pierce: bool = False,
+        max_nodes: int | None = 5000,
+        max_bytes: int | None = None,
+        compact: bool = False,
+        **kwargs: Any,
+    ) -> dict[str, Any]:
         """Retrieve the DOM document structure with configurable depth and shadow DOM access.
 
         Fetches the document tree starting from the root element, with control over
@@ -108,28 +135,51 @@ def register_dom_tools(mcp: FastMCP) -> None:
                    provide more complete structure but increase response size.
             pierce: Whether to traverse shadow DOM boundaries (default: False).
                    When True, includes shadow DOM content in the tree structure.
+            max_nodes: Maximum nodes to return, filled breadth-first (default: 5000).
+                   None returns the whole tree.
+            max_bytes: Approximate maximum encoded size of the returned tree (optional)
+            compact: Encode nodes as {"id", "n": "tag#id.class", "c": childCount, "k": children}
+                   instead of full CDP nodes (default: False)
 
         Returns:
             Document structure dictionary containing:
             - success: Boolean indicating retrieval success
             - message: Summary of document structure retrieved
-            - data: Complete DOM tree structure from the document root,
-                   including all child elements up to the specified depth
+            - data: DOM tree structure from the document root,
+                   including child elements up to the specified depth and budget
+            - shaping: Whether the tree was truncated and, if so, a handle and the
+                   node IDs to continue at with get_stored_response
 
         Note:
-            Large documents with high depth settings may produce substantial responses.
-            Consider using moderate depths for initial exploration, then targeting
-            specific areas for detailed analysis.
+            Large documents are truncated breadth-first, so the top of the page is always
+            complete and deep subtrees are cut off. The full tree is kept on the server.
         """
         try:
             cdp_client = kwargs["cdp_client"]
-            result = await cdp_client.send_command(
-                "DOM.getDocument", {"depth": depth, "pierce": pierce}
-            )
+            mirror = await _fresh_mirror(cdp_client)
+            if mirror is not None and mirror.root is not None and (mirror.pierce or not pierce):
+                root = mirror.to_cdp_node(mirror.root, depth, pierce)
+                source = "mirror"
+            else:
+                result = await cdp_client.send_command(
+                    "DOM.getDocument", {"depth": depth, "pierce": pierce}
+                )
+                root = result["root"]
+                source = "chrome"
 
-            return create_success_response(
-                message=f"Retrieved DOM document structure (depth: {depth})", data=result["root"]
+            shaped, shaping = shape_document(
+                root, cdp_client.response_store, max_nodes, max_bytes, compact
             )
+            message = f"Retrieved DOM document structure (depth: {depth})"
+            if source == "mirror":
+                message = f"Retrieved DOM document structure from mirror (depth: {depth})"
+            if shaping["truncated"]:
+                message += f", truncated to {shaping['nodesIncluded']} nodes"
+
+            extra: dict[str, Any] = {"shaping": shaping}
+            if source == "mirror":
+                extra["fromMirror"] = True
+            return create_success_response(message=message, data=trusted(shaped), **extra)
 
         except Exception as e:
             return create_error_response(f"Error getting document: {e}")
@@ -149,9 +199,13 @@ def register_dom_tools(mcp: FastMCP) -> None:
         """
         try:
             cdp_client = kwargs["cdp_client"]
-            result = await cdp_client.send_command(
-                "DOM.querySelector", {"nodeId": node_id, "selector": selector}
-            )
+            local_matches = await _mirror_query(cdp_client, node_id, selector)
+            if local_matches is not None:
+                result = {"nodeId": local_matches[0] if local_matches else 0}
+            else:
+                result = await cdp_client.send_command(
+                    "DOM.querySelector", {"nodeId": node_id, "selector": selector}
+                )
 
             if result["nodeId"] == 0:
                 return create_success_response(
@@ -182,13 +236,18 @@ def register_dom_tools(mcp: FastMCP) -> None:
         """
         try:
             cdp_client = kwargs["cdp_client"]
-            result = await cdp_client.send_command(
-                "DOM.querySelectorAll", {"nodeId": node_id, "selector": selector}
-            )
+            local_matches = await _mirror_query(cdp_client, node_id, selector)
+            if local_matches is not None:
+                result = {"nodeIds": local_matches}
+            else:
+                result = await cdp_client.send_command(
+                    "DOM.querySelectorAll", {"nodeId": node_id, "selector": selector}
+                )
 
             return create_success_response(
                 message=f"Found {len(result['nodeIds'])} elements matching selector: {selector}",
                 data={"nodeIds": result["nodeIds"], "count": len(result["nodeIds"])},
+                fromMirror=local_matches is not None,
             )
 
         except Exception as e:
@@ -208,6 +267,15 @@ def register_dom_tools(mcp: FastMCP) -> None:
         """
         try:
             cdp_client = kwargs["cdp_client"]
+            mirror = await _fresh_mirror(cdp_client)
+            node = mirror.get(node_id) if mirror is not None else None
+            if node is not None:
+                return create_success_response(
+                    message=f"Retrieved {len(node.attributes)} attributes for node {node_id}",
+                    data={"nodeId": node_id, "attributes": dict(node.attributes)},
+                    fromMirror=True,
+                )
+
             result = await cdp_client.send_command("DOM.getAttributes", {"nodeId": node_id})
 
             attributes = {}
@@ -226,27 +294,43 @@ def register_dom_tools(mcp: FastMCP) -> None:
 
     @mcp.tool()
     @require_cdp_client
-    async def get_element_outer_html(node_id: int, **kwargs: Any) -> dict[str, Any]:
+    async def get_element_outer_html(
+        node_id: int, max_bytes: int | None = 100_000, **kwargs: Any
+    ) -> dict[str, Any]:
         """
         Get the outer HTML of a DOM element.
 
         Args:
             node_id: Node ID of the element
+            max_bytes: Maximum bytes of HTML to return (default: 100000, None for no limit).
+                       Longer HTML is kept on the server and can be paged with
+                       get_stored_response using the returned handle.
 
         Returns:
-            Outer HTML string of the element
+            Outer HTML string of the element, with a handle if it was truncated
         """
         try:
             cdp_client = kwargs["cdp_client"]
             result = await cdp_client.send_command("DOM.getOuterHTML", {"nodeId": node_id})
-
+            html = result["outerHTML"]
+            clipped = clip_text(html, max_bytes, cdp_client.response_store, "html", nodeId=node_id)
+
+            data: dict[str, Any] = {
+                "nodeId": node_id,
+                "outerHTML": clipped["text"],
+                "htmlLength": len(html),
+                "truncated": clipped["truncated"],
+            }
+            if clipped["truncated"]:
+                data.update(
+                    {
+                        "totalBytes": clipped["totalBytes"],
+                        "handle": clipped["handle"],
+                        "continueAt": clipped["continueAt"],
+                    }
+                )
             return create_success_response(
-                message=f"Retrieved outer HTML for node {node_id}",
-                data={
-                    "nodeId": node_id,
-                    "outerHTML": result["outerHTML"],
-                    "htmlLength": len(result["outerHTML"]),
-                },
+                message=f"Retrieved outer HTML for node {node_id}", data=data
             )
 
         except Exception as e:
@@ -300,11 +384,16 @@ def register_dom_tools(mcp: FastMCP) -> None:
         """
         try:
             cdp_client = kwargs["cdp_client"]
-            result = await cdp_client.send_command(
-                "DOM.describeNode", {"nodeId": node_id, "depth": depth}
-            )
+            mirror = await _fresh_mirror(cdp_client)
+            mirrored = mirror.get(node_id) if mirror is not None else None
+            if mirror is not None and mirrored is not None:
+                node = mirror.to_cdp_node(mirrored, depth)
+            else:
+                result = await cdp_client.send_command(
+                    "DOM.describeNode", {"nodeId": node_id, "depth": depth}
+                )
+                node = result["node"]
 
-            node = result["node"]
             return create_success_response(
                 message=f"Retrieved description for node {node_id}",
                 data={
@@ -423,3 +512,443 @@ def register_dom_tools(mcp: FastMCP) -> None:
 
         except Exception as e:
             return create_error_response(f"Error focusing element: {e}")
+
+    @mcp.tool()
+    @require_cdp_client
+    async def capture_page_snapshot(
+        selector: str | None = None,
+        bbox: list[float] | None = None,
+        computed_styles: list[str] | None = None,
+        include_attributes: bool = True,
+        include_text: bool = False,
+        limit: int = 200,
+        **kwargs: Any,
+    ) -> dict[str, Any]:
+        """Capture the whole page with DOMSnapshot and filter elements locally.
+
+        Uses a single DOMSnapshot.captureSnapshot round-trip to obtain every node's
+        attributes, layout bounds and the requested computed styles, then decodes the
+        result on the server. This replaces a query_selector_all followed by per-node
+        get_element_attributes, get_computed_styles and get_element_box_model calls.
+
+        The decoded snapshot is kept so that query_page_snapshot can filter it again
+        without another round-trip, until the page navigates.
+
+        Args:
+            selector: CSS selector to filter elements (type, #id, .class, [attr],
+                      descendant and child combinators). Optional.
+            bbox: Page-coordinate rectangle [x, y, width, height]; only elements whose
+                  layout box intersects it are returned. Optional.
+            computed_styles: Computed style properties to capture for every laid-out
+                             node (default: display, visibility, opacity)
+            include_attributes: Include attributes other than id and class
+            include_text: Include each element's own text content (trimmed)
+            limit: Maximum number of elements to return (default: 200)
+
+        Returns:
+            Snapshot summary and matching elements with backendNodeId, nodeName,
+            id, classes, attributes, bounds [x, y, width, height] and styles
+        """
+        try:
+            cdp_client = kwargs["cdp_client"]
+            styles = computed_styles or DEFAULT_SNAPSHOT_STYLES
+            result = await cdp_client.send_command(
+                "DOMSnapshot.captureSnapshot",
+                {"computedStyles": styles, "includeDOMRects": False},
+            )
+
+            snapshot = DOMSnapshot(result, styles)
+            cdp_client.page_snapshot = snapshot
+
+            return _snapshot_query_response(
+                snapshot, selector, bbox, include_attributes, include_text, limit
+            )
+
+        except Exception as e:
+            return create_error_response(f"Error capturing page snapshot: {e}")
+
+    @mcp.tool()
+    @require_cdp_client
+    async def query_page_snapshot(
+        selector: str | None = None,
+        bbox: list[float] | None = None,
+        include_attributes: bool = True,
+        include_text: bool = False,
+        limit: int = 200,
+        **kwargs: Any,
+    ) -> dict[str, Any]:
+        """
+        Filter the most recent page snapshot again without contacting Chrome.
+
+        Args:
+            selector: CSS selector to filter elements (optional)
+            bbox: Page-coordinate rectangle [x, y, width, height] to intersect (optional)
+            include_attributes: Include attributes other than id and class
+            include_text: Include each element's own text content (trimmed)
+            limit: Maximum number of elements to return (default: 200)
+
+        Returns:
+            Matching elements from the stored snapshot
+        """
+        try:
+            cdp_client = kwargs["cdp_client"]
+            snapshot = cdp_client.page_snapshot
+            if snapshot is None:
+                return create_error_response(
+                    "No page snapshot available", "Call capture_page_snapshot first"
+                )
+
+            return _snapshot_query_response(
+                snapshot, selector, bbox, include_attributes, include_text, limit
+            )
+
+        except Exception as e:
+            return create_error_response(f"Error querying page snapshot: {e}")
+
+    @mcp.tool()
+    @require_cdp_client
+    async def enable_dom_mirror(pierce: bool = True, **kwargs: Any) -> dict[str, Any]:
+        """Enable a live local mirror of the DOM maintained from mutation events.
+
+        Seeds the mirror with DOM.getDocument(depth=-1) and then keeps it current from
+        DOM.setChildNodes, childNodeInserted/Removed, attributeModified/Removed and
+        characterDataModified events. While the mirror is fresh, get_document,
+        query_selector, query_selector_all, get_element_attributes and describe_element
+        answer locally; selectors outside the supported subset still go to Chrome.
+
+        Args:
+            pierce: Include shadow roots and iframe documents in the mirror (default: True)
+
+        Returns:
+            Mirror status including node count
+        """
+        try:
+            cdp_client = kwargs["cdp_client"]
+            await cdp_client.dom_mirror.enable(cdp_client, pierce)
+            status = cdp_client.dom_mirror.status()
+
+            return create_success_response(
+                message=f"DOM mirror enabled with {status['nodeCount']} nodes", data=status
+            )
+
+        except Exception as e:
+            cdp_client.dom_mirror.disable()
+            return create_error_response(f"Error enabling DOM mirror: {e}")
+
+    @mcp.tool()
+    @require_cdp_client
+    async def disable_dom_mirror(**kwargs: Any) -> dict[str, Any]:
+        """
+        Disable the local DOM mirror so DOM tools always query Chrome.
+
+        Returns:
+            Mirror status
+        """
+        try:
+            cdp_client = kwargs["cdp_client"]
+            cdp_client.dom_mirror.disable()
+
+            return create_success_response(
+                message="DOM mirror disabled", data=cdp_client.dom_mirror.status()
+            )
+
+        except Exception as e:
+            return create_error_response(f"Error disabling DOM mirror: {e}")
+
+    @mcp.tool()
+    @require_cdp_client
+    async def get_dom_mirror_status(**kwargs: Any) -> dict[str, Any]:
+        """
+        Get the local DOM mirror's freshness, size and event count.
+
+        Returns:
+            Mirror status
+        """
+        try:
+            cdp_client = kwargs["cdp_client"]
+            status = cdp_client.dom_mirror.status()
+
+            return create_success_response(
+                message="DOM mirror is " + ("fresh" if status["fresh"] else "not fresh"),
+                data=status,
+            )
+
+        except Exception as e:
+            return create_error_response(f"Error getting DOM mirror status: {e}")
+
+    @mcp.tool()
+    @require_cdp_client
+    async def get_node_relatives(
+        node_id: int, max_children: int = 50, **kwargs: Any
+    ) -> dict[str, Any]:
+        """
+        Walk a node's parent, ancestors and children using the local DOM mirror.
+
+        Args:
+            node_id: Node ID of the element
+            max_children: Maximum number of children to list (default: 50)
+
+        Returns:
+            Parent and child node IDs with compact tag#id.class labels and the
+            ancestor path up to the document
+        """
+        try:
+            cdp_client = kwargs["cdp_client"]
+            mirror = await _fresh_mirror(cdp_client)
+            if mirror is None:
+                return create_error_response(
+                    "DOM mirror is not enabled", "Call enable_dom_mirror first"
+                )
+
+            node = mirror.get(node_id)
+            if node is None:
+                return create_error_response(
+                    f"Node {node_id} is not in the current document",
+                    "The node was removed or its ID is stale; query for it again",
+                )
+
+            ancestors = mirror.ancestors(node)
+            return create_success_response(
+                message=f"Retrieved relatives for node {node_id}",
+                data={
+                    "nodeId": node_id,
+                    "label": node.label(),
+                    "parentId": node.parent.node_id if node.parent else None,
+                    "path": " > ".join(a.label() for a in reversed(ancestors) if a.local_name),
+                    "ancestorIds": [a.node_id for a in ancestors],
+                    "children": [
+                        {"nodeId": child.node_id, "label": child.label()}
+                        for child in node.children[:max_children]
+                    ],
+                    "childCount": len(node.children),
+                    "shadowRootIds": [root.node_id for root in node.shadow_roots],
+                },
+                fromMirror=True,
+            )
+
+        except Exception as e:
+            return create_error_response(f"Error getting node relatives: {e}")
+
+    @mcp.tool()
+    @require_cdp_client
+    async def batch_inspect_elements(
+        node_ids: list[int] | None = None,
+        selector: str | None = None,
+        root_node_id: int | None = None,
+        include: list[str] | None = None,
+        style_properties: list[str] | None = None,
+        max_concurrency: int = 8,
+        max_nodes: int = 500,
+        **kwargs: Any,
+    ) -> dict[str, Any]:
+        """Inspect many elements at once and return a compact columnar table.
+
+        Batch form of get_element_attributes, get_element_box_model, describe_element,
+        get_computed_styles and get_platform_fonts. The per-node CDP commands are sent
+        concurrently over the one connection, bounded by max_concurrency. Attributes and
+        descriptions come from the DOM mirror without any round-trip when it is fresh.
+
+        Args:
+            node_ids: Node IDs to inspect. Either this or selector is required.
+            selector: CSS selector whose matches should be inspected
+            root_node_id: Node to run the selector within (default: document root)
+            include: Columns to collect: attributes, box_model, description,
+                     computed_styles, platform_fonts (default: attributes, box_model)
+            style_properties: Computed style properties to keep when computed_styles is
+                              included (default: display, visibility, opacity)
+            max_concurrency: Maximum CDP commands in flight at once (default: 8)
+            max_nodes: Maximum number of nodes to inspect (default: 500)
+
+        Returns:
+            Columnar table: nodeIds plus one aligned list per requested column
+            (attributes, boxes as [x, y, width, height], labels as tag#id.class,
+            styles as {property: [values]}, fonts as family name lists) and, keyed by
+            node ID, the list of "column: error" messages for every command that failed
+        """
+        try:
+            cdp_client = kwargs["cdp_client"]
+            columns_requested = include or ["attributes", "box_model"]
+            unknown = set(columns_requested) - _BATCH_COLUMNS
+            if unknown:
+                return create_error_response(
+                    f"Unknown include values: {', '.join(sorted(unknown))}",
+                    f"Valid values: {', '.join(sorted(_BATCH_COLUMNS))}",
+                )
+            if node_ids is None and not selector:
+                return create_error_response("Either node_ids or selector is required")
+
+            if node_ids is None:
+                if root_node_id is None:
+                    mirror = await _fresh_mirror(cdp_client)
+                    if mirror is not None and mirror.root is not None:
+                        root_node_id = mirror.root.node_id
+                    else:
+                        document = await cdp_client.send_command("DOM.getDocument", {"depth": 0})
+                        root_node_id = document["root"]["nodeId"]
+                local_matches = await _mirror_query(cdp_client, root_node_id, selector or "")
+                if local_matches is not None:
+                    node_ids = local_matches
+                else:
+                    result = await cdp_client.send_command(
+                        "DOM.querySelectorAll", {"nodeId": root_node_id, "selector": selector}
+                    )
+                    node_ids = result["nodeIds"]
+
+            total_nodes = len(node_ids)
+            node_ids = node_ids[:max_nodes]
+            properties = style_properties or DEFAULT_SNAPSHOT_STYLES
+            mirror = await _fresh_mirror(cdp_client)
+
+            table: dict[str, Any] = {}
+            errors: dict[str, list[str]] = {}
+            commands: list[tuple[str, dict[str, Any]]] = []
+            slots: list[tuple[str, int]] = []
+
+            for column in columns_requested:
+                values: list[Any] = [None] * len(node_ids)
+                table[column] = values
+                for index, node_id in enumerate(node_ids):
+                    mirrored = mirror.get(node_id) if mirror is not None else None
+                    if mirrored is not None and column == "attributes":
+                        values[index] = dict(mirrored.attributes)
+                    elif mirrored is not None and column == "description":
+                        values[index] = mirrored.label()
+                    else:
+                        commands.append((_BATCH_COMMANDS[column], {"nodeId": node_id}))
+                        slots.append((column, index))
+
+            results = await cdp_client.send_commands(commands, max_concurrency)
+            for (column, index), result in zip(slots, results, strict=True):
+                if isinstance(result, Exception):
+                    errors.setdefault(str(node_ids[index]), []).append(f"{column}: {result}")
+                else:
+                    table[column][index] = _project_batch_result(column, result, properties)
+
+            data: dict[str, Any] = {"nodeIds": node_ids, "count": len(node_ids)}
+            if "attributes" in table:
+                data["attributes"] = table["attributes"]
+            if "box_model" in table:
+                data["boxes"] = table["box_model"]
+            if "description" in table:
+                data["labels"] = table["description"]
+            if "computed_styles" in table:
+                data["styles"] = {
+                    name: [
+                        styles.get(name) if styles else None for styles in table["computed_styles"]
+                    ]
+                    for name in properties
+                }
+            if "platform_fonts" in table:
+                data["fonts"] = table["platform_fonts"]
+            data.update(
+                {
+                    "errors": errors,
+                    "commandCount": len(commands),
+                    "limitedResults": total_nodes > len(node_ids),
+                }
+            )
+
+            return create_success_response(
+                message=f"Inspected {len(node_ids)} elements with {len(commands)} CDP commands",
+                data=data,
+            )
+
+        except Exception as e:
+            return create_error_response(f"Error batch inspecting elements: {e}")
+
+
+async def _fresh_mirror(cdp_client: Any) -> DOMMirror | None:
+    """Return the client's DOM mirror if it is enabled and can be brought up to date."""
+    mirror: DOMMirror = cdp_client.dom_mirror
+    if mirror.enabled and await mirror.ensure_fresh(cdp_client):
+        return mirror
+    return None
+
+
+async def _mirror_query(cdp_client: Any, node_id: int, selector: str) -> list[int] | None:
+    """Run querySelectorAll against the mirror, or return None to fall back to Chrome."""
+    mirror = await _fresh_mirror(cdp_client)
+    if mirror is None:
+        return None
+    try:
+        return mirror.query_selector_all(node_id, selector)
+    except (KeyError, ValueError):
+        return None
+
+
+def _snapshot_query_response(
+    snapshot: DOMSnapshot,
+    selector: str | None,
+    bbox: list[float] | None,
+    include_attributes: bool,
+    include_text: bool,
+    limit: int,
+) -> dict[str, Any]:
+    """Filter a decoded snapshot and build the tool response."""
+    if bbox is not None and len(bbox) != 4:
+        return create_error_response("bbox must be [x, y, width, height]")
+
+    try:
+        matches = snapshot.query(selector, bbox)
+    except ValueError as e:
+        return create_error_response(
+            f"Selector not supported for snapshot filtering: {e}",
+            "Use query_selector_all for pseudo-classes and sibling combinators",
+        )
+
+    return create_success_response(
+        message=f"Found {len(matches)} of {len(snapshot.elements)} elements in page snapshot",
+        data={
+            "selector": selector,
+            "bbox": bbox,
+            "computedStyles": snapshot.computed_styles,
+            "documents": snapshot.documents,
+            "elementCount": len(snapshot.elements),
+            "matchCount": len(matches),
+            "snapshotAgeSeconds": round(time.time() - snapshot.captured_at, 2),
+            "elements": [
+                snapshot.describe(node, include_attributes, include_text)
+                for node in matches[:limit]
+            ],
+            "limitedResults": len(matches) > limit,
+        },
+    )
+
+
+_BATCH_COMMANDS = {
+    "attributes": "DOM.getAttributes",
+    "box_model": "DOM.getBoxModel",
+    "description": "DOM.describeNode",
+    "computed_styles": "CSS.getComputedStyleForNode",
+    "platform_fonts": "CSS.getPlatformFontsForNode",
+}
+_BATCH_COLUMNS = set(_BATCH_COMMANDS)
+
+
+def _project_batch_result(column: str, result: dict[str, Any], properties: list[str]) -> Any:
+    """Reduce a raw CDP result to the compact value stored in a batch column."""
+    if column == "attributes":
+        flat = result.get("attributes", [])
+        return {flat[i]: flat[i + 1] for i in range(0, len(flat) - 1, 2)}
+    if column == "box_model":
+        model = result["model"]
+        border = model["border"]
+        return [round(min(border[0::2]), 1), round(min(border[1::2]), 1)] + [
+            model["width"],
+            model["height"],
+        ]
+    if column == "description":
+        node = result["node"]
+        flat = node.get("attributes", [])
+        attributes = {flat[i]: flat[i + 1] for i in range(0, len(flat) - 1, 2)}
+        return node_label(
+            node.get("nodeType", 0), node.get("nodeName", ""), node.get("localName", ""), attributes
+        )
+    if column == "computed_styles":
+        wanted = set(properties)
+        return {
+            prop["name"]: prop["value"]
+            for prop in result.get("computedStyle", [])
+            if prop["name"] in wanted
+        }
+    return [font.get("familyName") for font in result.get("fonts", [])]
@@ -8,7 +8,13 @@ traffic during browser sessions.
 Key Features:
     - Real-time network request capture
     - Request filtering by domain and status code
-    - Response body retrieval and analysis
+    - Response body retrieval and analysis, with oversized bodies paged by handle
+    - Opt-in body capture into a compressed cache that outlives Chrome's buffer
+    - Chunked streaming of multi-megabyte bodies to disk with incremental hashing
+    - Fetch-domain record/replay with injected latency and bandwidth for repeatable loads
+    - Streaming HAR 1.2 export with timings, initiators and optional bodies
+    - Critical request path, render-blocking and serial-chain analysis of page loads
+    - Cache effectiveness analysis of redundant downloads and weak caching headers
     - Request/response header inspection
 
 Example:
@@ -26,17 +32,37 @@ Example:
 
     # Get detailed response data
     response = await get_network_response(request_id='12345')
+
+    # Hash and save a large PDF without holding it in memory
+    pdf = await stream_response_body(request_id='12345', output_path='/tmp/plan.pdf')
+
+    # Keep PDF and image bodies as they finish loading
+    await start_body_capture(mode='eager', mime_types=['application/pdf', 'image/'])
     ```
 """
 
 from __future__ import annotations
 
+import base64
+import hashlib
 from typing import Any
 
 from mcp.server.fastmcp import FastMCP
 
+from ..body_capture import DEFAULT_MAX_BODY_BYTES, DEFAULT_SPILL_BYTES, BodyCache, fetch_bodies
+from ..body_stream import DEFAULT_CHUNK_BYTES, main_frame_id, stream_resource
+from ..cache_analysis import DEFAULT_MIN_MAX_AGE, analyse_cache
 from ..cdp_context import require_cdp_client
-from .utils import create_error_response, create_success_response, safe_timestamp_conversion
+from ..fetch_replay import ReplayRule
+from ..har_export import HarWriter, build_entry, record_matches
+from ..network_analysis import analyse_critical_path
+from ..response_shaping import clip_text
+from .utils import (
+    create_error_response,
+    create_success_response,
+    safe_timestamp_conversion,
+    trusted,
+)
 
 
 def register_network_tools(mcp: FastMCP) -> None:
@@ -48,6 +74,7 @@ def register_network_tools(mcp: FastMCP) -> None:
         filter_domain: str | None = None,
         filter_status: int | None = None,
         limit: int | None = None,
+        target_type: str | None = None,
         **kwargs: Any,
     ) -> dict[str, Any]:
         """
@@ -57,6 +84,8 @@ def register_network_tools(mcp: FastMCP) -> None:
             filter_domain: Filter by domain (optional)
             filter_status: Filter by HTTP status code (optional)
             limit: Maximum number of requests to return (optional)
+            target_type: Only requests from this target type: page, iframe, worker,
+                         shared_worker or service_worker (optional)
 
         Returns:
             List of network requests matching the criteria
@@ -77,24 +106,37 @@ def register_network_tools(mcp: FastMCP) -> None:
                     if req.get("response", {}).get("status") == filter_status
                 ]
 
+            if target_type:
+                requests = [req for req in requests if req.get("targetType") == target_type]
+
             if limit:
                 requests = requests[:limit]
 
+            # Copy the records the timestamps are rewritten on, so the client's own
+            # request log is neither modified here nor shared with the response
+            requests = [dict(req) for req in requests]
             for req in requests:
                 if "timestamp" in req:
                     req["timestamp"] = safe_timestamp_conversion(req["timestamp"])
-                if "response" in req and "timestamp" in req["response"]:
-                    req["response"]["timestamp"] = safe_timestamp_conversion(
-                        req["response"]["timestamp"]
-                    )
+                if "response" in req:
+                    req["response"] = dict(req["response"])
+                    if "timestamp" in req["response"]:
+                        req["response"]["timestamp"] = safe_timestamp_conversion(
+                            req["response"]["timestamp"]
+                        )
 
             return create_success_response(
                 message=f"Retrieved {len(requests)} network requests",
                 data={
-                    "requests": requests,
+                    "requests": trusted(requests),
                     "totalCount": len(cdp_client.network_requests),
                     "filteredCount": len(requests),
-                    "filters": {"domain": filter_domain, "status": filter_status, "limit": limit},
+                    "filters": {
+                        "domain": filter_domain,
+                        "status": filter_status,
+                        "limit": limit,
+                        "targetType": target_type,
+                    },
                 },
             )
 
@@ -103,50 +145,528 @@ def register_network_tools(mcp: FastMCP) -> None:
 
     @mcp.tool()
     @require_cdp_client
-    async def get_network_response(request_id: str, **kwargs: Any) -> dict[str, Any]:
+    async def get_network_response(
+        request_id: str,
+        max_bytes: int | None = 100_000,
+        session_id: str | None = None,
+        **kwargs: Any,
+    ) -> dict[str, Any]:
         """
         Get detailed response data for a specific network request.
 
         Args:
             request_id: ID of the network request
+            max_bytes: Maximum bytes of body to return (default: 100000, None for no limit).
+                       Longer bodies are kept on the server and can be paged with
+                       get_stored_response using the returned handle.
+            session_id: sessionId of the request as listed by get_network_requests, for
+                        worker and iframe requests whose ID repeats one from the page
+                        (optional; default: the first request with this ID)
 
         Returns:
-            Detailed response data including body content
+            Detailed response data including body content. Bodies held by body capture
+            are served from its cache with fromCache set.
         """
         try:
             cdp_client = kwargs["cdp_client"]
-            result = await cdp_client.send_command(
-                "Network.getResponseBody", {"requestId": request_id}
-            )
-
+            capture = cdp_client.body_capture
             request_data = None
             for req in cdp_client.network_requests:
-                if req.get("requestId") == request_id:
+                if req.get("requestId") == request_id and (
+                    session_id is None or req.get("sessionId") == session_id
+                ):
                     request_data = req
                     break
+            if request_data is not None:
+                session_id = request_data.get("sessionId")
+
+            cached = capture.cache.get(request_id, session_id)
+            if cached is not None:
+                body, base64_encoded, _ = cached
+            else:
+                result = await cdp_client.send_command(
+                    "Network.getResponseBody", {"requestId": request_id}, session_id=session_id
+                )
+                body = result.get("body", "")
+                base64_encoded = result.get("base64Encoded", False)
 
             if not request_data:
                 return create_error_response(f"Request ID {request_id} not found")
 
+            mime_type = request_data.get("response", {}).get("mimeType", "")
+            if cached is None and capture.should_store(request_id, session_id):
+                capture.store(request_id, result, mime_type, session_id)
+            clipped = clip_text(
+                body,
+                max_bytes,
+                cdp_client.response_store,
+                "body",
+                base64=base64_encoded,
+                requestId=request_id,
+            )
+
             response_data = {
                 "requestId": request_id,
+                "sessionId": session_id,
                 "url": request_data.get("url"),
                 "method": request_data.get("method"),
                 "status": request_data.get("response", {}).get("status"),
                 "statusText": request_data.get("response", {}).get("statusText"),
                 "headers": request_data.get("response", {}).get("headers", {}),
-                "mimeType": request_data.get("response", {}).get("mimeType"),
-                "body": result.get("body"),
-                "base64Encoded": result.get("base64Encoded", False),
-                "bodySize": len(result.get("body", "")),
+                "mimeType": mime_type,
+                "body": clipped["text"],
+                "base64Encoded": base64_encoded,
+                "bodySize": len(body),
+                "truncated": clipped["truncated"],
+                "fromCache": cached is not None,
                 "timestamp": safe_timestamp_conversion(
                     request_data.get("response", {}).get("timestamp", 0)
                 ),
             }
 
+            if clipped["truncated"]:
+                response_data["handle"] = clipped["handle"]
+                response_data["continueAt"] = clipped["continueAt"]
+
             return create_success_response(
                 message=f"Retrieved response data for request {request_id}", data=response_data
             )
 
         except Exception as e:
             return create_error_response(f"Error getting network response: {e}")
+
+    @mcp.tool()
+    @require_cdp_client
+    async def stream_response_body(
+        request_id: str | None = None,
+        url: str | None = None,
+        output_path: str | None = None,
+        hash_algorithm: str = "sha256",
+        range_start: int = 0,
+        range_length: int = 0,
+        chunk_size: int = DEFAULT_CHUNK_BYTES,
+        disable_cache: bool = False,
+        **kwargs: Any,
+    ) -> dict[str, Any]:
+        """
+        Stream a large response body in chunks, returning its size, hash and a byte range.
+
+        The resource is reloaded through Network.loadNetworkResource and read with IO.read,
+        so multi-megabyte bodies (PDFs, base64 icon bundles) never arrive as one giant
+        string. Usually served from the HTTP cache unless disable_cache is set.
+
+        Args:
+            request_id: Captured request whose URL should be streamed
+            url: URL to stream (used when request_id is not given)
+            output_path: File to write the body to (default: hash only, nothing saved)
+            hash_algorithm: Fixed-length hashlib algorithm for the digest (default: sha256)
+            range_start: First byte of a range to return (default: 0)
+            range_length: Bytes of the range to return, at most 256KB (default: 0, none)
+            chunk_size: Bytes per IO.read call (default: 1MB)
+            disable_cache: Bypass the HTTP cache when reloading (default: False)
+
+        Returns:
+            Body metadata, hash as {"algorithm", "digest"}, chunk count, saved path and
+            the requested byte range
+        """
+        try:
+            cdp_client = kwargs["cdp_client"]
+            if request_id is not None:
+                request_data = next(
+                    (r for r in cdp_client.network_requests if r.get("requestId") == request_id),
+                    None,
+                )
+                if request_data is None:
+                    return create_error_response(f"Request ID {request_id} not found")
+                url = request_data.get("url")
+            if not url:
+                return create_error_response("Either request_id or url is required")
+            # SHAKE digests have no fixed length, so hexdigest() cannot be called unsized
+            if (
+                hash_algorithm not in hashlib.algorithms_available
+                or hashlib.new(hash_algorithm).digest_size == 0
+            ):
+                return create_error_response(f"Unsupported hash algorithm: {hash_algorithm}")
+
+            result = await stream_resource(
+                cdp_client,
+                url,
+                await main_frame_id(cdp_client),
+                output_path,
+                hash_algorithm,
+                range_start,
+                range_length,
+                chunk_size,
+                disable_cache,
+            )
+
+            data: dict[str, Any] = {
+                "url": url,
+                "requestId": request_id,
+                "status": result.status,
+                "headers": result.headers,
+                "totalBytes": result.total_bytes,
+                "chunks": result.chunks,
+                "hash": {"algorithm": hash_algorithm, "digest": result.digest},
+                "savedTo": result.output_path,
+                "elapsedSeconds": round(result.elapsed, 3),
+            }
+            if range_length:
+                try:
+                    data["range"] = {"text": result.range_data.decode("utf-8")}
+                except UnicodeDecodeError:
+                    data["range"] = {"base64": base64.b64encode(result.range_data).decode("ascii")}
+                data["range"].update(
+                    {"start": range_start, "end": range_start + len(result.range_data)}
+                )
+
+            return create_success_response(
+                message=f"Streamed {result.total_bytes} bytes in {result.chunks} chunks",
+                data=data,
+            )
+
+        except Exception as e:
+            return create_error_response(f"Error streaming response body: {e}")
+
+    @mcp.tool()
+    @require_cdp_client
+    async def start_body_capture(
+        mode: str = "lazy",
+        mime_types: list[str] | None = None,
+        max_body_bytes: int = DEFAULT_MAX_BODY_BYTES,
+        cache_memory_mb: float = 64,
+        cache_disk_mb: float = 512,
+        spill_threshold_bytes: int = DEFAULT_SPILL_BYTES,
+        **kwargs: Any,
+    ) -> dict[str, Any]:
+        """
+        Start capturing response bodies into a compressed server-side cache.
+
+        Args:
+            mode: "eager" fetches each matching body as soon as it finishes loading, so it
+                  survives Chrome evicting it; "lazy" caches a matching body on first read
+                  (default: "lazy")
+            mime_types: MIME type prefixes to capture, e.g. ["application/pdf", "image/"]
+                        (default: all)
+            max_body_bytes: Skip responses whose encoded size is larger (default: 50MB)
+            cache_memory_mb: Compressed bytes to keep in memory (default: 64)
+            cache_disk_mb: Compressed bytes to keep in spill files (default: 512)
+            spill_threshold_bytes: Compressed size above which a body goes to disk
+                                   (default: 1MB)
+
+        Returns:
+            Capture policy and cache status
+        """
+        try:
+            cdp_client = kwargs["cdp_client"]
+            capture = cdp_client.body_capture
+            cache = BodyCache(
+                int(cache_memory_mb * 1024 * 1024),
+                int(cache_disk_mb * 1024 * 1024),
+                spill_threshold_bytes,
+            )
+            try:
+                capture.start(mode, mime_types, max_body_bytes, cache)
+            except ValueError as e:
+                return create_error_response(str(e))
+
+            return create_success_response(
+                message=f"Started {mode} response body capture", data=capture.status()
+            )
+
+        except Exception as e:
+            return create_error_response(f"Error starting body capture: {e}")
+
+    @mcp.tool()
+    @require_cdp_client
+    async def stop_body_capture(clear_cache: bool = False, **kwargs: Any) -> dict[str, Any]:
+        """
+        Stop capturing response bodies.
+
+        Args:
+            clear_cache: Also drop already captured bodies and their spill files
+                         (default: False, captured bodies stay readable)
+
+        Returns:
+            Final capture status
+        """
+        try:
+            cdp_client = kwargs["cdp_client"]
+            await cdp_client.body_capture.stop(clear_cache)
+            return create_success_response(
+                message="Stopped response body capture", data=cdp_client.body_capture.status()
+            )
+
+        except Exception as e:
+            return create_error_response(f"Error stopping body capture: {e}")
+
+    @mcp.tool()
+    @require_cdp_client
+    async def get_body_capture_status(**kwargs: Any) -> dict[str, Any]:
+        """
+        Report body capture policy, cache occupancy, compression ratio and hit rate.
+
+        Returns:
+            Capture status with cache statistics
+        """
+        try:
+            cdp_client = kwargs["cdp_client"]
+            status = cdp_client.body_capture.status()
+            return create_success_response(
+                message=f"Body capture holds {status['cache']['bodies']} bodies", data=status
+            )
+
+        except Exception as e:
+            return create_error_response(f"Error getting body capture status: {e}")
+
+    @mcp.tool()
+    @require_cdp_client
+    async def start_fetch_replay(
+        cache_dir: str,
+        mode: str = "auto",
+        rules: list[dict[str, Any]] | None = None,
+        latency_ms: float = 0,
+        bandwidth_kbps: float | None = None,
+        **kwargs: Any,
+    ) -> dict[str, Any]:
+        """
+        Intercept requests with the Fetch domain, recording and replaying responses.
+
+        Responses are recorded into a content-addressed cache under cache_dir and served
+        back with Fetch.fulfillRequest on later runs, taking network and server variance
+        out of page-load benchmarks. The cache persists between sessions.
+
+        Args:
+            cache_dir: Directory for the response cache (created if missing)
+            mode: "auto" replays cached responses and records misses, "record" refetches
+                  and overwrites, "replay" serves only cached responses and fails misses
+                  (default: "auto")
+            rules: Ordered URL rules, first match wins, each as {"urlPattern": "*.pdf",
+                   "action": "replay" | "passthrough" | "block", "latencyMs": 50,
+                   "bandwidthKbps": 10000}
+            latency_ms: Latency injected for requests no rule matches (default: 0)
+            bandwidth_kbps: Bandwidth cap for requests no rule matches (default: none)
+
+        Returns:
+            Interception status including rules and cache contents
+        """
+        try:
+            cdp_client = kwargs["cdp_client"]
+            try:
+                parsed_rules = [ReplayRule.from_dict(rule) for rule in rules or []]
+                default_rule = ReplayRule("*", "replay", latency_ms, bandwidth_kbps)
+                await cdp_client.fetch_replay.start(
+                    cdp_client, cache_dir, mode, parsed_rules, default_rule
+                )
+            except ValueError as e:
+                return create_error_response(str(e))
+
+            status = cdp_client.fetch_replay.status()
+            return create_success_response(
+                message=(
+                    f"Started fetch {mode} with {status['cache']['responses']} cached responses"
+                ),
+                data=status,
+            )
+
+        except Exception as e:
+            return create_error_response(f"Error starting fetch replay: {e}")
+
+    @mcp.tool()
+    @require_cdp_client
+    async def stop_fetch_replay(**kwargs: Any) -> dict[str, Any]:
+        """
+        Stop request interception and save the recorded response index.
+
+        Returns:
+            Final counts of replayed, recorded, blocked and passed-through requests
+        """
+        try:
+            cdp_client = kwargs["cdp_client"]
+            await cdp_client.fetch_replay.stop(cdp_client)
+            return create_success_response(
+                message="Stopped fetch replay", data=cdp_client.fetch_replay.status()
+            )
+
+        except Exception as e:
+            return create_error_response(f"Error stopping fetch replay: {e}")
+
+    @mcp.tool()
+    @require_cdp_client
+    async def get_fetch_replay_status(**kwargs: Any) -> dict[str, Any]:
+        """
+        Report interception rules, outcome counters and cache contents.
+
+        Returns:
+            Fetch replay status
+        """
+        try:
+            cdp_client = kwargs["cdp_client"]
+            status = cdp_client.fetch_replay.status()
+            return create_success_response(
+                message=f"Fetch replay is {'enabled' if status['enabled'] else 'disabled'}",
+                data=status,
+            )
+
+        except Exception as e:
+            return create_error_response(f"Error getting fetch replay status: {e}")
+
+    @mcp.tool()
+    @require_cdp_client
+    async def export_har(
+        output_path: str,
+        start_time: float | None = None,
+        end_time: float | None = None,
+        filter_domain: str | None = None,
+        mime_types: list[str] | None = None,
+        include_bodies: bool = False,
+        max_body_bytes: int = 1024 * 1024,
+        **kwargs: Any,
+    ) -> dict[str, Any]:
+        """
+        Export captured network traffic as a HAR 1.2 file.
+
+        Entries are written to disk one at a time, so large sessions are not built up as
+        one in-memory archive. Timings come from each response's ResourceTiming and
+        initiators are kept in the non-standard _initiator field.
+
+        Args:
+            output_path: File to write the HAR to
+            start_time: Only include requests started at or after this Unix time
+            end_time: Only include requests started at or before this Unix time
+            filter_domain: Only include requests whose host contains this string
+            mime_types: Only include responses whose MIME type starts with one of these
+            include_bodies: Embed response bodies, from body capture when available and
+                            otherwise Network.getResponseBody (default: False)
+            max_body_bytes: Skip bodies larger than this when embedding (default: 1MB)
+
+        Returns:
+            Output path, entry count, bodies embedded and bytes written
+        """
+        try:
+            cdp_client = kwargs["cdp_client"]
+            records = [
+                record
+                for record in list(cdp_client.network_requests)
+                if record_matches(record, start_time, end_time, filter_domain, mime_types)
+            ]
+            target = await cdp_client.get_target_info()
+            target_info = target.get("targetInfo", target)
+
+            bodies_embedded = 0
+            with open(output_path, "w", encoding="utf-8") as handle:
+                writer = HarWriter(handle, target_info.get("title", ""), target_info.get("url", ""))
+                # Bodies are fetched a batch at a time so only one batch is held in memory
+                batch_size = 16 if include_bodies else len(records) or 1
+                for index in range(0, len(records), batch_size):
+                    batch = records[index : index + batch_size]
+                    bodies: list[dict[str, Any] | None] = [None] * len(batch)
+                    if include_bodies:
+                        bodies = await fetch_bodies(cdp_client, batch, max_body_bytes)
+                    for record, body in zip(batch, bodies, strict=True):
+                        writer.write_entry(build_entry(record, body))
+                        bodies_embedded += body is not None
+                writer.close()
+
+            return create_success_response(
+                message=f"Exported {writer.entries} requests to {output_path}",
+                data={
+                    "outputPath": output_path,
+                    "entries": writer.entries,
+                    "totalCaptured": len(cdp_client.network_requests),
+                    "bodiesEmbedded": bodies_embedded,
+                    "bytesWritten": writer.bytes_written,
+                },
+            )
+
+        except Exception as e:
+            return create_error_response(f"Error exporting HAR: {e}")
+
+    @mcp.tool()
+    @require_cdp_client
+    async def analyze_network_critical_path(
+        marker: str = "load",
+        marker_url: str | None = None,
+        max_results: int = 10,
+        **kwargs: Any,
+    ) -> dict[str, Any]:
+        """
+        Analyze the critical request path of the last page load.
+
+        Requests are linked into a dependency graph through their initiators (parser,
+        script stack or preload). The critical path is the initiator chain ending at the
+        last request to finish before the milestone. Serial chains are runs of three or
+        more requests that each only started once the previous one finished; their
+        saving estimates how much sooner the chain would complete if every request were
+        fetched in parallel, e.g. with <link rel=preload>.
+
+        Args:
+            marker: Milestone to analyze up to: "load", "DOMContentLoaded" or a lifecycle
+                    event such as "firstContentfulPaint" (default: "load")
+            marker_url: Analyze up to the end of the last request whose URL contains this
+                        string instead of a milestone (optional)
+            max_results: Maximum blocking resources and serial chains to report
+
+        Returns:
+            Critical path hops with discovery gaps and phase timings, render-blocking
+            resources, serial chains ranked by saving and the page milestones
+        """
+        try:
+            cdp_client = kwargs["cdp_client"]
+            report = analyse_critical_path(
+                list(cdp_client.network_requests),
+                dict(cdp_client.page_timeline),
+                marker,
+                marker_url,
+                max_results,
+                cdp_client.main_frame_id,
+            )
+            saving = sum(chain["savingMs"] for chain in report["serialChains"][:1])
+            return create_success_response(
+                message=(
+                    f"Critical path to {report['marker']} has {len(report['criticalPath'])} "
+                    f"requests; largest serial chain could save {saving}ms"
+                ),
+                data=report,
+            )
+
+        except Exception as e:
+            return create_error_response(f"Error analyzing critical path: {e}")
+
+    @mcp.tool()
+    @require_cdp_client
+    async def analyze_cache_effectiveness(
+        min_max_age: int = DEFAULT_MIN_MAX_AGE, max_results: int = 20, **kwargs: Any
+    ) -> dict[str, Any]:
+        """
+        Analyze how well captured responses were cached.
+
+        Responses are classified as served from the memory cache, disk cache, service
+        worker, prefetch cache or network. URLs downloaded in full more than once are
+        reported with the bytes re-downloaded, and static assets (scripts, stylesheets,
+        fonts, images and media) are checked for missing validators, missing or short
+        freshness lifetimes and no-store.
+
+        Args:
+            min_max_age: Freshness lifetime in seconds below which a static asset is
+                         flagged (default: 86400, one day)
+            max_results: Maximum number of URLs to report
+
+        Returns:
+            Cache hit ratio, request and byte totals per source, bytes re-downloaded and
+            URLs ranked by wasted bytes with their caching issues
+        """
+        try:
+            cdp_client = kwargs["cdp_client"]
+            report = analyse_cache(list(cdp_client.network_requests), min_max_age, max_results)
+            return create_success_response(
+                message=(
+                    f"{report['bytesRedownloaded']} bytes re-downloaded across "
+                    f"{report['redundantUrls']} URLs; {report['assetsWithHeaderIssues']} "
+                    "assets have caching header issues"
+                ),
+                data=report,
+            )
+
+        except Exception as e:
+            return create_error_response(f"Error analyzing cache effectiveness: {e}")
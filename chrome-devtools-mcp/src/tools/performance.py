@@ -11,6 +11,18 @@ Key Features:
     - DOM element counts and page structure analysis
     - JavaScript heap and memory usage monitoring
     - Frame timing and rendering performance
+    - Asset weight audit with compressed sizes, duplicates and inlined base64 blobs
+    - Image and canvas decode cost compared with displayed size
+    - Repeatable cold/warm page-load benchmarks with throttling and percentiles
+    - Statistical regression comparison between two saved benchmark runs
+    - Background time-series sampling of heap, DOM counters and runtime metrics
+    - Core Web Vitals (LCP, CLS, INP) and long tasks pushed from page observers
+    - Concurrent evaluation in every frame's own context, including out-of-process iframes
+    - CPU profiling of the page or an attached dedicated, shared or service worker
+    - Screencast frames written to disk with duplicate dropping and WebP/GIF assembly
+    - Jank timeline correlating input, long tasks, rAF gaps and traced frames
+    - Repeatable synthetic input sequences through the real input pipeline
+    - Concurrent multi-tab crawl and audit streamed to JSONL
 
 Example:
     Analyzing page performance and metrics:
@@ -27,6 +39,9 @@ Example:
     # Monitor cookies for performance impact
     cookies = await get_cookies(domain='example.com')
 
+    # Rank byte savings across scripts, stylesheets and fonts
+    audit = await audit_asset_weight()
+
     # Execute code across all frames
     results = await evaluate_in_all_frames('window.location.href')
     ```
@@ -34,11 +49,49 @@ Example:
 
 from __future__ import annotations
 
+import json
+import os
+import time
 from typing import Any
+from urllib.parse import urljoin
 
 from mcp.server.fastmcp import FastMCP
 
+from ..asset_audit import ASSET_TYPES, DEFAULT_MIN_BLOB_BYTES, audit_assets, body_bytes
+from ..benchmark import (
+    DEFAULT_SETTLE_MS,
+    DEFAULT_TIMEOUT,
+    compare_samples,
+    format_table,
+    load_samples,
+    run_benchmark,
+    save_benchmark,
+    summarise_samples,
+)
+from ..body_capture import fetch_bodies
 from ..cdp_context import require_cdp_client
+from ..cpu_profile import DEFAULT_MAX_FUNCTIONS, summarise_profile
+from ..crawler import (
+    DEFAULT_CONCURRENCY,
+    DEFAULT_MAX_PAGES,
+    DEFAULT_PAGE_TIMEOUT,
+    crawl,
+    load_sitemap,
+)
+from ..dom_snapshot import DEFAULT_SNAPSHOT_STYLES, DOMSnapshot
+from ..frame_contexts import DEFAULT_FRAME_TIMEOUT, evaluate_in_frames
+from ..image_audit import (
+    DEFAULT_MIN_RATIO,
+    INTRINSIC_SIZES_SCRIPT,
+    audit_images,
+    image_dimensions,
+    image_sources,
+)
+from ..input_driver import load_sequence, run_sequence
+from ..jank_timeline import DEFAULT_MAX_ITEMS, analyse_jank
+from ..metrics_sampler import DEFAULT_CAPACITY, DEFAULT_INTERVAL, DEFAULT_MAX_POINTS, downsample
+from ..screencast import assemble_animation
+from ..web_vitals import DEFAULT_WORST
 from .utils import create_error_response, create_success_response
 
 
@@ -255,6 +308,867 @@ def register_performance_tools(mcp: FastMCP) -> None:
         except Exception as e:
             return create_error_response(f"Error getting performance metrics: {e}")
 
+    @mcp.tool()
+    @require_cdp_client
+    async def audit_asset_weight(
+        resource_types: list[str] | None = None,
+        min_blob_bytes: int = DEFAULT_MIN_BLOB_BYTES,
+        max_body_bytes: int = 20 * 1024 * 1024,
+        max_results: int = 20,
+        **kwargs: Any,
+    ) -> dict[str, Any]:
+        """
+        Audit script, stylesheet and font weight and rank byte savings.
+
+        Bodies of captured requests are read with Network.getResponseBody (or from body
+        capture) and measured raw, gzip level 9 and brotli. Brotli is estimated from the
+        gzip size unless the brotli package is installed. Identical content served from
+        several URLs and base64 data: URLs of at least min_blob_bytes, inlined in
+        scripts and stylesheets or requested directly, are reported too. Opportunities
+        can overlap, so the total saving is an upper bound.
+
+        Args:
+            resource_types: CDP resource types to audit (default: Script, Stylesheet, Font)
+            min_blob_bytes: Smallest inlined base64 blob to report, in encoded bytes
+            max_body_bytes: Skip bodies larger than this
+            max_results: Maximum assets, duplicates, blobs and opportunities to report
+
+        Returns:
+            Size totals, savings opportunities ranked by bytes, largest assets, duplicate
+            content groups and inlined blobs
+        """
+        try:
+            cdp_client = kwargs["cdp_client"]
+            types = set(resource_types or ASSET_TYPES)
+            records = [
+                record
+                for record in list(cdp_client.network_requests)
+                if record.get("resourceType") in types and record.get("status") == "completed"
+            ]
+            bodies = await fetch_bodies(cdp_client, records, max_body_bytes)
+            assets = [
+                (record, body_bytes(body))
+                for record, body in zip(records, bodies, strict=True)
+                if body is not None
+            ]
+            report = audit_assets(assets, min_blob_bytes, max_results)
+            report["skipped"] = len(records) - len(assets)
+
+            return create_success_response(
+                message=(
+                    f"Audited {report['assets']} assets; up to "
+                    f"{report['potentialSavingBytes']} bytes could be saved"
+                ),
+                data=report,
+            )
+
+        except Exception as e:
+            return create_error_response(f"Error auditing asset weight: {e}")
+
+    @mcp.tool()
+    @require_cdp_client
+    async def audit_image_decode_cost(
+        min_ratio: float = DEFAULT_MIN_RATIO, max_results: int = 20, **kwargs: Any
+    ) -> dict[str, Any]:
+        """
+        Find images and canvases that decode far more pixels than they display.
+
+        Layout boxes come from one DOMSnapshot capture, which is kept for
+        query_page_snapshot. Intrinsic image sizes come from naturalWidth/naturalHeight,
+        falling back to the PNG, GIF, JPEG or WebP header of the captured response body
+        for frames the page script cannot reach. Decoded and displayed memory are both
+        counted at 4 bytes per pixel, with the displayed size in device pixels. SVG
+        images are skipped since they are rasterised at their displayed size.
+
+        Args:
+            min_ratio: Report elements whose decoded size is at least this many times
+                       their displayed size (default: 2.0)
+            max_results: Maximum number of elements to report
+
+        Returns:
+            Image, canvas and unknown-size counts, total decoded, displayed and wasted
+            bytes, and the elements wasting the most memory
+        """
+        try:
+            cdp_client = kwargs["cdp_client"]
+            result = await cdp_client.send_command(
+                "DOMSnapshot.captureSnapshot",
+                {"computedStyles": DEFAULT_SNAPSHOT_STYLES, "includeDOMRects": False},
+            )
+            snapshot = DOMSnapshot(result, DEFAULT_SNAPSHOT_STYLES)
+            cdp_client.page_snapshot = snapshot
+
+            page = await cdp_client.send_command(
+                "Runtime.evaluate",
+                {
+                    "expression": f"[location.href, devicePixelRatio, {INTRINSIC_SIZES_SCRIPT}]",
+                    "returnByValue": True,
+                },
+            )
+            page_url, device_pixel_ratio, sizes = page["result"]["value"]
+            intrinsic: dict[str, tuple[int, int]] = {}
+            for src, current_src, width, height in sizes:
+                if width and height:
+                    intrinsic[current_src] = intrinsic[urljoin(page_url, src)] = (width, height)
+
+            # Images in frames the page script cannot reach are sized from their bodies
+            missing = {url for _, url in image_sources(snapshot) if url not in intrinsic}
+            records = [
+                record
+                for record in list(cdp_client.network_requests)
+                if record.get("url") in missing and record.get("status") == "completed"
+            ]
+            bodies = await fetch_bodies(cdp_client, records, 64 * 1024 * 1024)
+            for record, body in zip(records, bodies, strict=True):
+                dimensions = image_dimensions(body_bytes(body)) if body is not None else None
+                if dimensions is not None:
+                    intrinsic[record["url"]] = dimensions
+
+            report = audit_images(
+                snapshot, intrinsic, float(device_pixel_ratio), min_ratio, max_results
+            )
+            return create_success_response(
+                message=(
+                    f"{report['oversized']} images/canvases decode at least {min_ratio}x "
+                    f"their displayed size, wasting {report['wastedBytes']} bytes"
+                ),
+                data=report,
+            )
+
+        except Exception as e:
+            return create_error_response(f"Error auditing image decode cost: {e}")
+
+    @mcp.tool()
+    @require_cdp_client
+    async def benchmark_page_load(
+        url: str,
+        runs: int = 5,
+        cache_mode: str = "cold",
+        cpu_throttling: float = 1.0,
+        network: str | None = None,
+        output_path: str | None = None,
+        reject_outliers: bool = True,
+        timeout: float = DEFAULT_TIMEOUT,
+        settle_ms: int = DEFAULT_SETTLE_MS,
+        **kwargs: Any,
+    ) -> dict[str, Any]:
+        """
+        Navigate to a URL repeatedly and summarise the load metric distribution.
+
+        Each run records navigation timing (ttfb, domContentLoaded, load), FCP, LCP,
+        long task count and total, total blocking time, transfer size and JS heap use.
+        In cold mode the HTTP cache is cleared and disabled before every run; in warm
+        mode one untimed navigation primes it first. Throttling, network emulation and
+        the cache setting are restored afterwards.
+
+        Args:
+            url: Page to load
+            runs: Number of timed navigations (default: 5)
+            cache_mode: "cold" or "warm" (default: "cold")
+            cpu_throttling: CPU slowdown factor, e.g. 4 for a mid-range phone (default: 1)
+            network: Network preset: "slow-3g", "fast-3g" or "slow-4g" (optional)
+            output_path: JSON file to save raw per-run samples and the summary (optional)
+            reject_outliers: Drop samples outside 1.5 IQR of the quartiles from each
+                             metric's summary (default: True)
+            timeout: Seconds to wait for each load event (default: 30)
+            settle_ms: Time after load for LCP and long tasks to settle (default: 1000)
+
+        Returns:
+            Per-metric count, rejected outliers, mean, stdev, min, max, p50, p90 and p99
+            in milliseconds (bytes for heap and transfer size), and the output path
+        """
+        try:
+            cdp_client = kwargs["cdp_client"]
+            result = await run_benchmark(
+                cdp_client, url, runs, cache_mode, cpu_throttling, network, timeout, settle_ms
+            )
+            result["summary"] = summarise_samples(result["samples"], reject_outliers)
+            if output_path:
+                save_benchmark(result, output_path)
+
+            load = result["summary"].get("load", {})
+            return create_success_response(
+                message=(
+                    f"Benchmarked {len(result['samples'])} {cache_mode} loads of {url}: "
+                    f"load p50 {load.get('p50')}ms, p90 {load.get('p90')}ms"
+                ),
+                data={
+                    "url": url,
+                    "runs": len(result["samples"]),
+                    "cacheMode": cache_mode,
+                    "cpuThrottling": cpu_throttling,
+                    "network": network,
+                    "summary": result["summary"],
+                    "outputPath": output_path,
+                },
+            )
+
+        except Exception as e:
+            return create_error_response(f"Error benchmarking page load: {e}")
+
+    @mcp.tool()
+    async def compare_benchmarks(
+        baseline_path: str,
+        candidate_path: str,
+        threshold_pct: float = 5.0,
+        alpha: float = 0.05,
+        metrics: list[str] | None = None,
+        higher_is_better: list[str] | None = None,
+        iterations: int = 2000,
+    ) -> dict[str, Any]:
+        """
+        Compare two saved sets of per-run metric samples for significant regressions.
+
+        Files may be saved by benchmark_page_load or hold a JSON list of sample objects
+        (e.g. repeated get_performance_metrics data; nested numbers become dotted names).
+        Each metric shared by both files is tested with a two-sided Mann-Whitney U test
+        and a bootstrap confidence interval on the change in median. A metric is flagged
+        only if p < alpha, the interval excludes zero and the median moved by at least
+        threshold_pct percent.
+
+        Args:
+            baseline_path: JSON file with the reference samples
+            candidate_path: JSON file with the samples to check
+            threshold_pct: Smallest median change in percent worth flagging (default: 5)
+            alpha: Significance level (default: 0.05)
+            metrics: Metric names to compare (default: all metrics in both files)
+            higher_is_better: Metrics where an increase is an improvement (default: none;
+                              timings, sizes and counts are lower-is-better)
+            iterations: Bootstrap resamples (default: 2000)
+
+        Returns:
+            Compact text table, per-metric rows and the lists of regressed and improved
+            metrics
+        """
+        try:
+            rows = compare_samples(
+                load_samples(baseline_path),
+                load_samples(candidate_path),
+                threshold_pct,
+                alpha,
+                metrics,
+                higher_is_better,
+                iterations,
+            )
+            regressions = [row["metric"] for row in rows if row["verdict"] == "regression"]
+            improvements = [row["metric"] for row in rows if row["verdict"] == "improvement"]
+
+            return create_success_response(
+                message=(
+                    f"Compared {len(rows)} metrics: {len(regressions)} regressions, "
+                    f"{len(improvements)} improvements"
+                ),
+                data={
+                    "table": format_table(rows),
+                    "regressions": regressions,
+                    "improvements": improvements,
+                    "rows": rows,
+                },
+            )
+
+        except Exception as e:
+            return create_error_response(f"Error comparing benchmarks: {e}")
+
+    @mcp.tool()
+    @require_cdp_client
+    async def start_metrics_sampler(
+        interval: float = DEFAULT_INTERVAL, capacity: int = DEFAULT_CAPACITY, **kwargs: Any
+    ) -> dict[str, Any]:
+        """
+        Start sampling runtime and memory metrics in the background.
+
+        Every interval, Performance.getMetrics (JSHeapUsedSize, Nodes, LayoutCount,
+        ScriptDuration, ...), Memory.getDOMCounters (dom.documents, dom.nodes,
+        dom.jsEventListeners) and performance.memory (memory.usedJSHeapSize, ...) are
+        requested in one concurrent batch and stored in a fixed-size ring buffer.
+        Restarting discards the previous history.
+
+        Args:
+            interval: Seconds between samples (default: 1.0)
+            capacity: Samples kept before the oldest are overwritten (default: 3600,
+                      one hour at the default interval)
+
+        Returns:
+            Sampler status
+        """
+        try:
+            cdp_client = kwargs["cdp_client"]
+            await cdp_client.metrics_sampler.start(cdp_client, interval, capacity)
+            return create_success_response(
+                message=f"Sampling metrics every {interval}s",
+                data=cdp_client.metrics_sampler.status(),
+            )
+
+        except Exception as e:
+            return create_error_response(f"Error starting metrics sampler: {e}")
+
+    @mcp.tool()
+    @require_cdp_client
+    async def stop_metrics_sampler(**kwargs: Any) -> dict[str, Any]:
+        """
+        Stop background metric sampling, keeping the collected history.
+
+        Returns:
+            Sampler status with sample count and average cost per sample
+        """
+        try:
+            cdp_client = kwargs["cdp_client"]
+            await cdp_client.metrics_sampler.stop()
+            status = cdp_client.metrics_sampler.status()
+            return create_success_response(
+                message=f"Stopped metrics sampler after {status['samples']} samples",
+                data=status,
+            )
+
+        except Exception as e:
+            return create_error_response(f"Error stopping metrics sampler: {e}")
+
+    @mcp.tool()
+    @require_cdp_client
+    async def get_metric_series(
+        metrics: list[str] | None = None,
+        last_seconds: float | None = None,
+        start_time: float | None = None,
+        end_time: float | None = None,
+        max_points: int = DEFAULT_MAX_POINTS,
+        **kwargs: Any,
+    ) -> dict[str, Any]:
+        """
+        Get sampled metric series over a time range.
+
+        Windows with more samples than max_points are downsampled into equal time
+        buckets, each with min, max and avg, so short spikes remain visible.
+
+        Args:
+            metrics: Metric names (default: JSHeapUsedSize, Nodes and dom.jsEventListeners)
+            last_seconds: Only include the most recent N seconds (optional)
+            start_time: Only include samples at or after this Unix time (optional)
+            end_time: Only include samples at or before this Unix time (optional)
+            max_points: Maximum points per series before downsampling (default: 200)
+
+        Returns:
+            Unix timestamps and per-metric values (or min/max/avg buckets), with the
+            sampler status listing every available metric
+        """
+        try:
+            cdp_client = kwargs["cdp_client"]
+            sampler = cdp_client.metrics_sampler
+            if last_seconds is not None:
+                start_time = time.time() - last_seconds
+            names = metrics or ["JSHeapUsedSize", "Nodes", "dom.jsEventListeners"]
+            timestamps, values = sampler.buffer.window(names, start_time, end_time)
+            result = downsample(timestamps, values, max(1, max_points))
+            result["status"] = sampler.status()
+
+            return create_success_response(
+                message=f"Retrieved {len(timestamps)} samples of {len(values)} metrics",
+                data=result,
+            )
+
+        except Exception as e:
+            return create_error_response(f"Error getting metric series: {e}")
+
+    @mcp.tool()
+    @require_cdp_client
+    async def start_web_vitals(**kwargs: Any) -> dict[str, Any]:
+        """
+        Start collecting Core Web Vitals and long tasks from the page.
+
+        Installs buffered PerformanceObservers for largest-contentful-paint,
+        layout-shift, event, longtask and long-animation-frame in the current document
+        and every later navigation. Entries are pushed back through a Runtime binding as
+        they occur, so no polling is involved.
+
+        Returns:
+            Collection status
+        """
+        try:
+            cdp_client = kwargs["cdp_client"]
+            await cdp_client.web_vitals.start(cdp_client)
+            return create_success_response(
+                message="Collecting web vitals; reload the page to capture LCP from the start",
+                data={"enabled": True},
+            )
+
+        except Exception as e:
+            return create_error_response(f"Error starting web vitals collection: {e}")
+
+    @mcp.tool()
+    @require_cdp_client
+    async def get_web_vitals(max_entries: int = DEFAULT_WORST, **kwargs: Any) -> dict[str, Any]:
+        """
+        Get aggregated Core Web Vitals for the current navigation.
+
+        LCP is the latest largest-contentful-paint candidate, CLS the largest session
+        window of unexpected layout shifts, and INP the slowest interaction (ignoring one
+        per 50 interactions). Each has a good/needs-improvement/poor rating.
+
+        Args:
+            max_entries: Worst long tasks, long animation frames and CLS sources to
+                         include (default: 10)
+
+        Returns:
+            LCP with element and resource, CLS with shifted elements, INP with event and
+            target, long task totals with container attribution, and long animation
+            frames with script attribution
+        """
+        try:
+            cdp_client = kwargs["cdp_client"]
+            collector = cdp_client.web_vitals
+            if collector.current is None:
+                return create_error_response(
+                    "No web vitals entries received yet",
+                    "Call start_web_vitals, then load or interact with the page",
+                )
+            summary = collector.current.summary(max_entries)
+            summary["enabled"] = collector.enabled
+            summary["batches"] = collector.batches
+            return create_success_response(
+                message=(
+                    f"LCP {summary['lcp']['value']}ms, CLS {summary['cls']['value']}, "
+                    f"INP {summary['inp']['value']}ms"
+                ),
+                data=summary,
+            )
+
+        except Exception as e:
+            return create_error_response(f"Error getting web vitals: {e}")
+
+    @mcp.tool()
+    @require_cdp_client
+    async def stop_web_vitals(**kwargs: Any) -> dict[str, Any]:
+        """
+        Stop collecting web vitals, keeping the last aggregate for get_web_vitals.
+
+        Returns:
+            Collection status
+        """
+        try:
+            cdp_client = kwargs["cdp_client"]
+            await cdp_client.web_vitals.stop(cdp_client)
+            return create_success_response(
+                message="Stopped web vitals collection", data={"enabled": False}
+            )
+
+        except Exception as e:
+            return create_error_response(f"Error stopping web vitals collection: {e}")
+
+    def _resolve_session(cdp_client: Any, target: str | None) -> str | None:
+        """Map a target argument to a child session ID, or None for the page itself."""
+        if not target or target == "page":
+            return None
+        session_id: str = cdp_client.frame_contexts.find_session(target)
+        return session_id
+
+    @mcp.tool()
+    @require_cdp_client
+    async def get_attached_targets(**kwargs: Any) -> dict[str, Any]:
+        """
+        List the out-of-process iframes and workers attached as child sessions.
+
+        Returns:
+            Target ID, type, URL and session of each attached target, plus per-type
+            counts of the console logs and network requests each has produced
+        """
+        try:
+            cdp_client = kwargs["cdp_client"]
+            logs: dict[str | None, int] = {}
+            requests: dict[str | None, int] = {}
+            for log in cdp_client.console_logs:
+                logs[log.get("sessionId")] = logs.get(log.get("sessionId"), 0) + 1
+            for req in cdp_client.network_requests:
+                requests[req.get("sessionId")] = requests.get(req.get("sessionId"), 0) + 1
+            targets = [
+                {
+                    "sessionId": session_id,
+                    "targetId": info.get("targetId"),
+                    "type": info.get("type"),
+                    "url": info.get("url"),
+                    "parentSessionId": info.get("parentSessionId"),
+                    "consoleLogs": logs.get(session_id, 0),
+                    "networkRequests": requests.get(session_id, 0),
+                }
+                for session_id, info in cdp_client.frame_contexts.sessions.items()
+            ]
+            return create_success_response(
+                message=f"{len(targets)} attached targets",
+                data={
+                    "targets": targets,
+                    "page": {
+                        "consoleLogs": logs.get(None, 0),
+                        "networkRequests": requests.get(None, 0),
+                    },
+                },
+            )
+
+        except Exception as e:
+            return create_error_response(f"Error listing attached targets: {e}")
+
+    @mcp.tool()
+    @require_cdp_client
+    async def start_cpu_profile(
+        target: str | None = None, sampling_interval_us: int = 1000, **kwargs: Any
+    ) -> dict[str, Any]:
+        """
+        Start the V8 sampling CPU profiler in the page or an attached worker.
+
+        Args:
+            target: "page" (default), or an attached target's ID, type (worker,
+                    shared_worker, service_worker, iframe) or URL substring
+            sampling_interval_us: Microseconds between samples (default: 1000)
+
+        Returns:
+            The profiled target and sampling interval
+        """
+        try:
+            cdp_client = kwargs["cdp_client"]
+            if sampling_interval_us < 1:
+                return create_error_response("sampling_interval_us must be at least 1")
+            try:
+                session_id = _resolve_session(cdp_client, target)
+            except ValueError as e:
+                return create_error_response(str(e), "Use get_attached_targets to list targets")
+            for method, params in (
+                ("Profiler.enable", {}),
+                ("Profiler.setSamplingInterval", {"interval": sampling_interval_us}),
+                ("Profiler.start", {}),
+            ):
+                await cdp_client.send_command(method, params, session_id=session_id)
+            return create_success_response(
+                message="CPU profiling started",
+                data={
+                    **cdp_client.frame_contexts.target_tag(session_id),
+                    "samplingIntervalUs": sampling_interval_us,
+                },
+            )
+
+        except Exception as e:
+            return create_error_response(f"Error starting CPU profile: {e}")
+
+    @mcp.tool()
+    @require_cdp_client
+    async def stop_cpu_profile(
+        target: str | None = None,
+        max_functions: int = DEFAULT_MAX_FUNCTIONS,
+        output_path: str | None = None,
+        **kwargs: Any,
+    ) -> dict[str, Any]:
+        """
+        Stop a CPU profile started with start_cpu_profile and summarise where time went.
+
+        Args:
+            target: The same target passed to start_cpu_profile
+            max_functions: Maximum number of functions and scripts to report (default: 20)
+            output_path: File to save the raw profile to, loadable in the DevTools
+                         Performance panel as a .cpuprofile (optional)
+
+        Returns:
+            Busy, idle and GC time, and the functions and scripts with the most self time
+        """
+        try:
+            cdp_client = kwargs["cdp_client"]
+            try:
+                session_id = _resolve_session(cdp_client, target)
+            except ValueError as e:
+                return create_error_response(str(e), "Use get_attached_targets to list targets")
+            result = await cdp_client.send_command("Profiler.stop", session_id=session_id)
+            try:
+                await cdp_client.send_command("Profiler.disable", session_id=session_id)
+            except Exception:
+                pass
+            profile = result["profile"]
+            if output_path:
+                with open(output_path, "w", encoding="utf-8") as handle:
+                    json.dump(profile, handle)
+            return create_success_response(
+                message="CPU profile captured",
+                data={
+                    **cdp_client.frame_contexts.target_tag(session_id),
+                    "outputPath": output_path,
+                    **summarise_profile(profile, max_functions),
+                },
+            )
+
+        except Exception as e:
+            return create_error_response(f"Error stopping CPU profile: {e}")
+
+    @mcp.tool()
+    @require_cdp_client
+    async def start_screencast(
+        output_dir: str,
+        frame_format: str = "jpeg",
+        quality: int = 80,
+        max_width: int | None = 1280,
+        max_height: int | None = 720,
+        every_nth_frame: int = 1,
+        **kwargs: Any,
+    ) -> dict[str, Any]:
+        """
+        Start recording page frames to disk as a visual timeline.
+
+        Frames are acknowledged as soon as they arrive, frames identical to the previous
+        one are dropped, and the rest are written to output_dir with a frames.json
+        manifest of capture timestamps. No image data is returned through MCP.
+
+        Args:
+            output_dir: Directory to write frames into (created if missing)
+            frame_format: "jpeg" (default) or "png"
+            quality: JPEG quality 0-100 (default: 80)
+            max_width: Maximum frame width in pixels (default: 1280)
+            max_height: Maximum frame height in pixels (default: 720)
+            every_nth_frame: Only send every Nth compositor frame (default: 1)
+
+        Returns:
+            Screencast settings and status
+        """
+        try:
+            cdp_client = kwargs["cdp_client"]
+            if not 0 <= quality <= 100:
+                return create_error_response("quality must be between 0 and 100")
+            try:
+                await cdp_client.screencast.start(
+                    cdp_client,
+                    output_dir,
+                    frame_format,
+                    quality,
+                    max_width,
+                    max_height,
+                    every_nth_frame,
+                )
+            except ValueError as e:
+                return create_error_response(str(e))
+            return create_success_response(
+                message=f"Screencast recording to {output_dir}",
+                data={
+                    "everyNthFrame": max(1, every_nth_frame),
+                    "maxSize": [max_width, max_height],
+                    **cdp_client.screencast.status(),
+                },
+            )
+
+        except Exception as e:
+            return create_error_response(f"Error starting screencast: {e}")
+
+    @mcp.tool()
+    @require_cdp_client
+    async def stop_screencast(
+        assemble: str | None = None, output_path: str | None = None, **kwargs: Any
+    ) -> dict[str, Any]:
+        """
+        Stop the screencast and optionally assemble the frames into an animation.
+
+        Args:
+            assemble: "webp" or "gif" to build an animation from the kept frames, with
+                      frame durations taken from capture timestamps (requires Pillow)
+            output_path: Animation file path (default: screencast.<format> in output_dir)
+
+        Returns:
+            Frame counts, duplicates dropped, bytes written and the animation path
+        """
+        try:
+            cdp_client = kwargs["cdp_client"]
+            recorder = cdp_client.screencast
+            if not recorder.enabled:
+                return create_error_response("No screencast is running")
+            await recorder.stop(cdp_client)
+            data = recorder.status()
+            if assemble:
+                animation_path = output_path or os.path.join(
+                    recorder.output_dir, f"screencast.{assemble}"
+                )
+                try:
+                    size = assemble_animation(recorder.output_dir, assemble, animation_path)
+                except (ValueError, RuntimeError) as e:
+                    return create_error_response(
+                        f"Frames saved but animation not assembled: {e}", data=data
+                    )
+                data["animation"] = {"path": animation_path, "bytes": size}
+            return create_success_response(
+                message=f"Screencast stopped with {data['framesKept']} frames", data=data
+            )
+
+        except Exception as e:
+            return create_error_response(f"Error stopping screencast: {e}")
+
+    @mcp.tool()
+    @require_cdp_client
+    async def start_jank_recording(trace: bool = True, **kwargs: Any) -> dict[str, Any]:
+        """
+        Start recording an interaction window for main-thread jank analysis.
+
+        Installs an in-page requestAnimationFrame loop with long task and Event Timing
+        observers and, optionally, starts a trace of timeline and frame events. Perform
+        the interaction (by hand, with execute_javascript or dispatched input), then call
+        stop_jank_recording.
+
+        Args:
+            trace: Also capture a Tracing timeline for per-input latency and compositor
+                   frames (default: True)
+
+        Returns:
+            Recording status
+        """
+        try:
+            cdp_client = kwargs["cdp_client"]
+            try:
+                await cdp_client.jank_recorder.start(cdp_client, trace)
+            except ValueError as e:
+                return create_error_response(str(e), "Call stop_jank_recording first")
+            return create_success_response(
+                message="Jank recording started", data={"recording": True, "tracing": trace}
+            )
+
+        except Exception as e:
+            return create_error_response(f"Error starting jank recording: {e}")
+
+    @mcp.tool()
+    @require_cdp_client
+    async def stop_jank_recording(
+        frame_budget_ms: float | None = None,
+        max_items: int = DEFAULT_MAX_ITEMS,
+        **kwargs: Any,
+    ) -> dict[str, Any]:
+        """
+        Stop the jank recording and correlate input, long tasks and frames.
+
+        Args:
+            frame_budget_ms: Frame interval (default: the median requestAnimationFrame
+                             interval, i.e. the display refresh rate)
+            max_items: Maximum interactions, slow inputs and frame gaps to list (default: 20)
+
+        Returns:
+            FPS and dropped frames per second, the longest frame gaps with the long tasks
+            behind them, input-to-next-paint per interaction with its input delay,
+            processing and presentation breakdown, and per-input-type trace latencies
+        """
+        try:
+            cdp_client = kwargs["cdp_client"]
+            try:
+                page, trace_events = await cdp_client.jank_recorder.stop(cdp_client)
+            except ValueError as e:
+                return create_error_response(str(e))
+            if page is None:
+                return create_error_response(
+                    "The page navigated during the recording, so its frame data was lost"
+                )
+            report = analyse_jank(page, trace_events, frame_budget_ms, max_items)
+            frames = report["frames"]
+            return create_success_response(
+                message=(
+                    f"{frames['fps']} fps, {frames['droppedFrames']} dropped frames over "
+                    f"{report['durationMs']}ms"
+                ),
+                data=report,
+            )
+
+        except Exception as e:
+            return create_error_response(f"Error stopping jank recording: {e}")
+
+    @mcp.tool()
+    @require_cdp_client
+    async def run_input_sequence(
+        steps: list[dict[str, Any]] | None = None,
+        sequence_path: str | None = None,
+        repeat: int = 1,
+        trace: bool = True,
+        pause_ms: float = 500,
+        output_path: str | None = None,
+        **kwargs: Any,
+    ) -> dict[str, Any]:
+        """
+        Replay click, drag, wheel, scroll and key steps through real browser input.
+
+        Steps are dispatched with Input.dispatchMouseEvent, Input.dispatchKeyEvent and
+        Input.synthesizeScrollGesture at fixed offsets from the start of each run, and a
+        jank timeline is recorded around every run.
+
+        Args:
+            steps: Declarative steps, e.g. {"type": "drag", "from": [100, 200],
+                   "to": [400, 200], "steps": 20, "durationMs": 300}. Types: click, drag,
+                   wheel, scroll, key, wait
+            sequence_path: JSON file of recorded steps, used when steps is not given
+            repeat: Number of runs (default: 1)
+            trace: Capture a trace around each run for frame and input latency (default: True)
+            pause_ms: Idle time after each run so trailing frames are captured (default: 500)
+            output_path: JSON file to save per-run samples for compare_benchmarks (optional)
+
+        Returns:
+            Per-run FPS, dropped frames, long tasks, worst interaction, per-input-type
+            p95 input-to-next-paint and dispatch lag, with statistics across runs
+        """
+        try:
+            cdp_client = kwargs["cdp_client"]
+            if steps is None:
+                if not sequence_path:
+                    return create_error_response("Provide steps or sequence_path")
+                steps = load_sequence(sequence_path)
+            try:
+                result = await run_sequence(cdp_client, steps, repeat, trace, pause_ms)
+            except ValueError as e:
+                return create_error_response(str(e))
+            if output_path:
+                save_benchmark(result, output_path)
+            return create_success_response(
+                message=f"Replayed {len(steps)} steps {repeat} times",
+                data={**result, "outputPath": output_path},
+            )
+
+        except Exception as e:
+            return create_error_response(f"Error running input sequence: {e}")
+
+    @mcp.tool()
+    @require_cdp_client
+    async def crawl_and_audit(
+        output_path: str,
+        urls: list[str] | None = None,
+        sitemap: str | None = None,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        timeout: float = DEFAULT_PAGE_TIMEOUT,
+        coverage: bool = False,
+        max_pages: int = DEFAULT_MAX_PAGES,
+        **kwargs: Any,
+    ) -> dict[str, Any]:
+        """
+        Audit many pages concurrently across a pool of new tabs.
+
+        Each page loads in its own tab (Target.createTarget) with its events kept apart
+        from the connected page. Load timing, console errors, exceptions, failed requests
+        and optionally JS/CSS coverage are recorded per page and appended to a JSONL file
+        as each page finishes.
+
+        Args:
+            output_path: JSONL file to write one result per page
+            urls: Pages to audit
+            sitemap: Sitemap URL or file to read pages from, used when urls is not given
+            concurrency: Number of tabs audited at once (default: 4)
+            timeout: Seconds allowed per page (default: 30)
+            coverage: Also measure unused JavaScript and CSS bytes (default: False)
+            max_pages: Maximum number of pages to audit (default: 500)
+
+        Returns:
+            Wall time, per-status counts and the slowest, most erroring and most failing pages
+        """
+        try:
+            cdp_client = kwargs["cdp_client"]
+            if urls is None:
+                if not sitemap:
+                    return create_error_response("Provide urls or sitemap")
+                urls = await load_sitemap(sitemap, max_pages)
+            urls = list(dict.fromkeys(urls))[:max_pages]
+            if not urls:
+                return create_error_response("No URLs to audit")
+            try:
+                summary = await crawl(cdp_client, urls, output_path, concurrency, timeout, coverage)
+            except ValueError as e:
+                return create_error_response(str(e))
+            return create_success_response(
+                message=f"Audited {summary['pages']} pages in {summary['wallTimeSeconds']}s",
+                data=summary,
+            )
+
+        except Exception as e:
+            return create_error_response(f"Error crawling pages: {e}")
+
     @mcp.tool()
     @require_cdp_client
     async def get_cookies(domain: str | None = None, **kwargs: Any) -> dict[str, Any]:
@@ -314,75 +1228,35 @@ def register_performance_tools(mcp: FastMCP) -> None:
 
     @mcp.tool()
     @require_cdp_client
-    async def evaluate_in_all_frames(code: str, **kwargs: Any) -> dict[str, Any]:
+    async def evaluate_in_all_frames(
+        code: str, timeout: float = DEFAULT_FRAME_TIMEOUT, **kwargs: Any
+    ) -> dict[str, Any]:
         """
         Execute JavaScript code in all frames/iframes of the page.
 
+        Each frame is evaluated in its own default execution context, concurrently,
+        including out-of-process iframes reached through auto-attached sessions.
+
         Args:
             code: JavaScript code to execute
+            timeout: Seconds each frame may take before its result is abandoned
 
         Returns:
             Results from all frames
         """
         try:
             cdp_client = kwargs["cdp_client"]
-            # Get all frames
-            frame_tree = await cdp_client.send_command("Page.getFrameTree")
-
-            def extract_frames(frame_node: dict[str, Any]) -> list[dict[str, Any]]:
-                frames = [frame_node["frame"]]
-                for child in frame_node.get("childFrames", []):
-                    frames.extend(extract_frames(child))
-                return frames
-
-            all_frames = extract_frames(frame_tree["frameTree"])
-
-            results = []
-
-            for frame in all_frames:
-                frame_id = frame["id"]
-                frame_url = frame.get("url", "about:blank")
-
-                try:
-                    # Execute code in this frame's context
-                    result = await cdp_client.send_command(
-                        "Runtime.evaluate",
-                        {
-                            "expression": code,
-                            "returnByValue": True,
-                            "contextId": None,  # Use default context for now
-                        },
-                    )
-
-                    if result.get("exceptionDetails"):
-                        frame_result = {
-                            "frameId": frame_id,
-                            "frameUrl": frame_url,
-                            "success": False,
-                            "error": result["exceptionDetails"].get("text", "Unknown error"),
-                        }
-                    else:
-                        frame_result = {
-                            "frameId": frame_id,
-                            "frameUrl": frame_url,
-                            "success": True,
-                            "result": result.get("result", {}),
-                            "value": result.get("result", {}).get("value"),
-                        }
-
-                    results.append(frame_result)
-
-                except Exception as frame_error:
-                    results.append(
-                        {
-                            "frameId": frame_id,
-                            "frameUrl": frame_url,
-                            "success": False,
-                            "error": str(frame_error),
-                        }
-                    )
-
-            return create_success_response(data={"framesCount": len(results), "results": results})
+            if timeout <= 0:
+                return create_error_response("timeout must be positive")
+            results = await evaluate_in_frames(cdp_client, code, timeout)
+            return create_success_response(
+                data={
+                    "framesCount": len(results),
+                    "outOfProcessFrames": sum(1 for r in results if r["outOfProcess"]),
+                    "failed": sum(1 for r in results if not r["success"]),
+                    "results": results,
+                }
+            )
 
         except Exception as e:
             return create_error_response(f"Error evaluating in frames: {e}")
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""Stored Response Tools
+
+This module serves the oversized payloads that other tools keep on the server instead of
+returning in full. When get_document, get_element_outer_html or get_network_response hit
+their budget they return a handle; these tools page through the stored payload by handle
+without another round-trip to Chrome.
+
+Key Features:
+    - Byte-range paging through stored HTML and response bodies
+    - Breadth-first continuation of stored DOM trees from any node
+    - Store occupancy and handle listing
+
+Example:
+    Continuing a truncated document:
+
+    ```python
+    document = await get_document(depth=-1, max_nodes=500, compact=True)
+    handle = document['shaping']['handle']
+    node_id = document['shaping']['continueAt'][0]
+
+    # Expand the first cut-off subtree
+    subtree = await get_stored_response(handle, node_id=node_id, max_nodes=500)
+
+    # Page through a large response body
+    body = await get_network_response(request_id='1234.5')
+    more = await get_stored_response(body['data']['handle'], offset=body['data']['continueAt'])
+    ```
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from mcp.server.fastmcp import FastMCP
+
+from ..cdp_context import require_cdp_client
+from ..response_shaping import StoredTree, shape_document, slice_text
+from .utils import create_error_response, create_success_response, trusted
+
+
+def register_response_tools(mcp: FastMCP) -> None:
+    """Register stored response tools with the MCP server."""
+
+    @mcp.tool()
+    @require_cdp_client
+    async def get_stored_response(
+        handle: str,
+        offset: int = 0,
+        max_bytes: int | None = 100_000,
+        node_id: int | None = None,
+        max_nodes: int | None = 2000,
+        compact: bool = True,
+        **kwargs: Any,
+    ) -> dict[str, Any]:
+        """
+        Fetch part of a payload that another tool stored on the server.
+
+        Args:
+            handle: Handle returned in a truncated response
+            offset: Byte offset to start at for text payloads (default: 0)
+            max_bytes: Maximum bytes to return (default: 100000)
+            node_id: Node to continue from for DOM tree payloads (default: tree root)
+            max_nodes: Maximum nodes to return for DOM tree payloads (default: 2000)
+            compact: Use the compact tag#id.class node encoding for DOM trees (default: True)
+
+        Returns:
+            A text window with its byte range and continueAt offset, or a DOM subtree
+            with the node IDs to continue at
+        """
+        try:
+            cdp_client = kwargs["cdp_client"]
+            try:
+                value, meta = cdp_client.response_store.get(handle)
+            except KeyError as e:
+                return create_error_response(
+                    str(e.args[0]), "Stored payloads are evicted oldest-first when space runs out"
+                )
+
+            if isinstance(value, StoredTree):
+                node = value.root if node_id is None else value.index.get(node_id)
+                if node is None:
+                    return create_error_response(f"Node {node_id} is not in stored tree {handle}")
+                shaped, shaping = shape_document(
+                    node, cdp_client.response_store, max_nodes, max_bytes, compact, handle
+                )
+                return create_success_response(
+                    message=f"Retrieved {shaping.get('nodesIncluded', 0)} nodes from {handle}",
+                    data=trusted(shaped),
+                    shaping=shaping,
+                )
+
+            window = slice_text(value, offset, max_bytes or len(value), meta.get("base64", False))
+            window.update({"handle": handle, "kind": meta["kind"]})
+            return create_success_response(
+                message=(
+                    f"Retrieved bytes {window['offset']}-{window['endOffset']} "
+                    f"of {window['totalBytes']} from {handle}"
+                ),
+                data=window,
+            )
+
+        except Exception as e:
+            return create_error_response(f"Error reading stored response: {e}")
+
+    @mcp.tool()
+    @require_cdp_client
+    async def get_response_store_status(**kwargs: Any) -> dict[str, Any]:
+        """
+        List stored payloads and the store's byte usage.
+
+        Returns:
+            Entry count, size, byte limit and one record per live handle
+        """
+        try:
+            cdp_client = kwargs["cdp_client"]
+            stats = cdp_client.response_store.stats()
+            return create_success_response(
+                message=f"Response store holds {stats['entries']} payloads", data=stats
+            )
+
+        except Exception as e:
+            return create_error_response(f"Error getting response store status: {e}")
@@ -5,9 +5,15 @@ This module provides common utility functions used across all Chrome DevTools MC
 It includes standardized response formatting, data sanitization for JSON serialization,
 and timestamp conversion between Chrome and Python formats.
 
+Payloads decoded from CDP messages are already JSON-safe, so tools wrap them in
+``trusted()`` and the sanitiser returns them untouched instead of rebuilding every dict
+and list. Values that tools build themselves are still checked, and containers are only
+copied when something inside them actually needed converting. Pre-encoded JSON can be
+passed as ``RawJSON`` and is decoded once by the C decoder without a Python-level walk.
+
 Key Features:
     - Standardized success/error response formatting
-    - JSON-safe data sanitization
+    - JSON-safe data sanitization that skips trusted CDP payloads
     - Chrome timestamp conversion
     - Consistent error handling patterns
 
@@ -21,6 +27,9 @@ Example:
         data={"nodeId": 123, "tagName": "div"}
     )
 
+    # Pass CDP payloads through without re-walking them
+    document = create_success_response(data=trusted(result["root"]))
+
     # Handle errors consistently
     error = create_error_response(
         error="Element not found",
@@ -34,9 +43,36 @@ Example:
 
 from __future__ import annotations
 
+import itertools
+import json
 import time
 from typing import Any
 
+_SCALAR_TYPES = frozenset({str, int, float, bool, type(None)})
+
+
+class Trusted:
+    """A value decoded from a CDP message, known to be JSON-safe so it is not re-walked."""
+
+    __slots__ = ("value",)
+
+    def __init__(self, value: Any) -> None:
+        self.value = value
+
+
+def trusted(value: Any) -> Trusted:
+    """Mark a value decoded from a CDP message as JSON-safe."""
+    return Trusted(value)
+
+
+class RawJSON:
+    """Pre-encoded JSON that is decoded once and passed through without sanitising."""
+
+    __slots__ = ("encoded",)
+
+    def __init__(self, encoded: bytes | str) -> None:
+        self.encoded = encoded
+
 
 def create_success_response(
     message: str = "Operation completed successfully", **kwargs: Any
@@ -59,15 +95,52 @@ def create_error_response(error: str, details: str | None = None, **kwargs: Any)
 
 
 def sanitise_data(data: Any) -> Any:
-    """Sanitise data for JSON serialisation."""
+    """Sanitise data for JSON serialisation.
+
+    Trusted and pre-encoded values are unwrapped without being walked. Containers are
+    returned as-is unless one of their items needed converting; each item is sanitised
+    exactly once, and a copy is only started from the first item that changed.
+    """
+    if type(data) in _SCALAR_TYPES:
+        return data
+    if isinstance(data, Trusted):
+        return data.value
+    if isinstance(data, RawJSON):
+        return json.loads(data.encoded)
     if isinstance(data, dict):
-        return {k: sanitise_data(v) for k, v in data.items()}
-    elif isinstance(data, list):
-        return [sanitise_data(item) for item in data]
-    elif isinstance(data, int | float | str | bool) or data is None:
+        return _sanitise_dict(data)
+    if isinstance(data, list):
+        return _sanitise_list(data)
+    if isinstance(data, int | float | str):
         return data
-    else:
-        return str(data)
+    return str(data)
+
+
+def _sanitise_dict(data: dict[Any, Any]) -> dict[Any, Any]:
+    """Return ``data``, or a copy from the first key or value that needed converting."""
+    copy: dict[str, Any] | None = None
+    for index, (key, value) in enumerate(data.items()):
+        clean = sanitise_data(value)
+        if copy is None:
+            if clean is value and type(key) is str:
+                continue
+            # Items before this one were unchanged, so they are reused as they are
+            copy = dict(itertools.islice(data.items(), index))
+        copy[key if type(key) is str else str(key)] = clean
+    return data if copy is None else copy
+
+
+def _sanitise_list(data: list[Any]) -> list[Any]:
+    """Return ``data``, or a copy from the first item that needed converting."""
+    copy: list[Any] | None = None
+    for index, value in enumerate(data):
+        clean = sanitise_data(value)
+        if copy is None:
+            if clean is value:
+                continue
+            copy = data[:index]
+        copy.append(clean)
+    return data if copy is None else copy
 
 
 def safe_timestamp_conversion(timestamp: float) -> float:
@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""Core Web Vitals Collection
+
+This module collects Largest Contentful Paint, Cumulative Layout Shift, Interaction to
+Next Paint, long tasks and long animation frames from the page itself. A script added
+with ``Page.addScriptToEvaluateOnNewDocument`` registers buffered PerformanceObservers
+in the top-level document of every navigation and pushes their entries back through a
+``Runtime.addBinding`` binding, so entries arrive as ``Runtime.bindingCalled`` events
+without any polling.
+
+Entries are batched in the page and flushed by a zero-delay timeout once the current
+task ends. Each batch is folded into a per-navigation aggregate on the server: the
+latest LCP candidate, the worst CLS session window, the INP interaction, and the worst
+long tasks and animation frames with their attribution.
+"""
+
+from __future__ import annotations
+
+import heapq
+import json
+import logging
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+BINDING_NAME = "__mcpWebVitals"
+DEFAULT_WORST = 10
+# Good / poor boundaries from web.dev
+THRESHOLDS = {"lcp": (2500, 4000), "cls": (0.1, 0.25), "inp": (200, 500)}
+_KEPT_ENTRIES = 50
+
+OBSERVER_SCRIPT = (
+    """
+(() => {
+    if (window !== window.top || window.__mcpWebVitalsInstalled) return;
+    window.__mcpWebVitalsInstalled = true;
+    const send = window['"""
+    + BINDING_NAME
+    + """'];
+    if (typeof send !== 'function') return;
+    const describe = node => {
+        if (!node || !node.tagName) return null;
+        let text = node.tagName.toLowerCase();
+        if (node.id) text += '#' + node.id;
+        if (typeof node.className === 'string' && node.className.trim())
+            text += '.' + node.className.trim().split(/\\s+/).join('.');
+        return text;
+    };
+    let queue = [];
+    const flush = () => {
+        const batch = queue;
+        queue = [];
+        send(JSON.stringify({url: location.href, timeOrigin: performance.timeOrigin,
+                             entries: batch}));
+    };
+    const push = entry => {
+        if (!queue.length) setTimeout(flush, 0);
+        queue.push(entry);
+    };
+    const handlers = {
+        'largest-contentful-paint': e => ({type: 'lcp', startTime: e.startTime, size: e.size,
+            url: e.url, element: describe(e.element)}),
+        'layout-shift': e => ({type: 'layout-shift', startTime: e.startTime, value: e.value,
+            hadRecentInput: e.hadRecentInput,
+            sources: (e.sources || []).map(s => describe(s.node)).filter(Boolean)}),
+        'event': e => ({type: 'event', name: e.name, startTime: e.startTime,
+            duration: e.duration, interactionId: e.interactionId,
+            processingStart: e.processingStart, processingEnd: e.processingEnd,
+            target: describe(e.target)}),
+        'longtask': e => ({type: 'longtask', startTime: e.startTime, duration: e.duration,
+            attribution: (e.attribution || []).map(a => ({containerType: a.containerType,
+                containerSrc: a.containerSrc, containerId: a.containerId,
+                containerName: a.containerName}))}),
+        'long-animation-frame': e => ({type: 'long-animation-frame', startTime: e.startTime,
+            duration: e.duration, blockingDuration: e.blockingDuration,
+            renderStart: e.renderStart, styleAndLayoutStart: e.styleAndLayoutStart,
+            scripts: (e.scripts || []).map(s => ({sourceURL: s.sourceURL,
+                sourceFunctionName: s.sourceFunctionName, invoker: s.invoker,
+                duration: s.duration,
+                forcedStyleAndLayoutDuration: s.forcedStyleAndLayoutDuration}))})
+    };
+    for (const [type, convert] of Object.entries(handlers)) {
+        try {
+            const options = {type, buffered: true};
+            if (type === 'event') options.durationThreshold = 16;
+            new PerformanceObserver(list => list.getEntries().forEach(e => push(convert(e))))
+                .observe(options);
+        } catch (e) {}
+    }
+})();
+"""
+)
+
+
+def rate(metric: str, value: float | None) -> str | None:
+    """Return "good", "needs-improvement" or "poor" for a vital's value."""
+    if value is None:
+        return None
+    good, poor = THRESHOLDS[metric]
+    if value <= good:
+        return "good"
+    return "needs-improvement" if value <= poor else "poor"
+
+
+class NavigationVitals:
+    """Aggregated entries for one top-level navigation."""
+
+    def __init__(self, url: str, time_origin: float) -> None:
+        self.url = url
+        self.time_origin = time_origin
+        self.lcp: dict[str, Any] | None = None
+        self.cls = 0.0
+        self.cls_sources: list[str] = []
+        self._window_value = 0.0
+        self._window_start = 0.0
+        self._window_last = 0.0
+        self._window_sources: list[str] = []
+        self.interactions: dict[int, dict[str, Any]] = {}
+        self.long_task_count = 0
+        self.long_task_total = 0.0
+        self.blocking_time = 0.0
+        self.animation_frame_count = 0
+        self.long_tasks: list[tuple[float, int, dict[str, Any]]] = []
+        self.animation_frames: list[tuple[float, int, dict[str, Any]]] = []
+        self._sequence = 0
+
+    def add(self, entry: dict[str, Any]) -> None:
+        """Fold one observer entry into the aggregate."""
+        kind = entry.get("type")
+        if kind == "lcp":
+            self.lcp = entry
+        elif kind == "layout-shift":
+            self._add_layout_shift(entry)
+        elif kind == "event":
+            interaction_id = entry.get("interactionId") or 0
+            worst = self.interactions.get(interaction_id)
+            if interaction_id and (worst is None or entry["duration"] > worst["duration"]):
+                self.interactions[interaction_id] = entry
+        elif kind == "longtask":
+            self.long_task_count += 1
+            self.long_task_total += entry["duration"]
+            self.blocking_time += max(0.0, entry["duration"] - 50)
+            self._keep(self.long_tasks, entry)
+        elif kind == "long-animation-frame":
+            self.animation_frame_count += 1
+            self._keep(self.animation_frames, entry)
+
+    def _keep(self, heap: list[tuple[float, int, dict[str, Any]]], entry: dict[str, Any]) -> None:
+        """Keep only the longest entries in a bounded min-heap."""
+        self._sequence += 1
+        item = (entry["duration"], self._sequence, entry)
+        if len(heap) < _KEPT_ENTRIES:
+            heapq.heappush(heap, item)
+        else:
+            heapq.heappushpop(heap, item)
+
+    def _add_layout_shift(self, entry: dict[str, Any]) -> None:
+        """Accumulate CLS as the largest session window (1s gap, 5s maximum)."""
+        if entry.get("hadRecentInput"):
+            return
+        start = entry["startTime"]
+        if (
+            self._window_value
+            and start - self._window_last < 1000
+            and start - self._window_start < 5000
+        ):
+            self._window_value += entry["value"]
+            self._window_sources.extend(entry.get("sources", []))
+        else:
+            self._window_value = entry["value"]
+            self._window_start = start
+            self._window_sources = list(entry.get("sources", []))
+        self._window_last = start
+        if self._window_value > self.cls:
+            self.cls = self._window_value
+            self.cls_sources = list(dict.fromkeys(self._window_sources))
+
+    def inp(self) -> dict[str, Any] | None:
+        """Return the INP interaction: the worst, ignoring one outlier per 50 interactions."""
+        if not self.interactions:
+            return None
+        ranked = sorted(self.interactions.values(), key=lambda e: e["duration"], reverse=True)
+        return ranked[min(len(ranked) - 1, len(ranked) // 50)]
+
+    def summary(self, worst: int = DEFAULT_WORST) -> dict[str, Any]:
+        """Return the vitals with ratings and the worst long tasks and frames."""
+        inp = self.inp()
+        lcp_value = self.lcp["startTime"] if self.lcp else None
+        return {
+            "url": self.url,
+            "lcp": {
+                "value": round(lcp_value, 1) if lcp_value is not None else None,
+                "rating": rate("lcp", lcp_value),
+                "element": self.lcp.get("element") if self.lcp else None,
+                "resource": self.lcp.get("url") if self.lcp else None,
+            },
+            "cls": {
+                "value": round(self.cls, 4),
+                "rating": rate("cls", self.cls),
+                "sources": self.cls_sources[:worst],
+            },
+            "inp": {
+                "value": inp["duration"] if inp else None,
+                "rating": rate("inp", inp["duration"] if inp else None),
+                "interactions": len(self.interactions),
+                "event": inp.get("name") if inp else None,
+                "target": inp.get("target") if inp else None,
+            },
+            "longTasks": {
+                "count": self.long_task_count,
+                "totalMs": round(self.long_task_total, 1),
+                "totalBlockingTimeMs": round(self.blocking_time, 1),
+                "worst": [item[2] for item in heapq.nlargest(worst, self.long_tasks)],
+            },
+            "longAnimationFrames": {
+                "count": self.animation_frame_count,
+                "worst": [item[2] for item in heapq.nlargest(worst, self.animation_frames)],
+            },
+        }
+
+
+class WebVitalsCollector:
+    """
+    Injects the observer script and aggregates entries delivered through the binding.
+
+    Attributes:
+        enabled: Whether collection is active
+        current: Aggregate for the most recent navigation
+        batches: Number of binding calls received
+    """
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self.current: NavigationVitals | None = None
+        self.batches = 0
+        self._script_id: str | None = None
+
+    async def start(self, client: Any) -> None:
+        """
+        Install the binding and observer script, including in the current document.
+
+        Does nothing if collection is already running, so the script is never installed
+        twice.
+        """
+        if self.enabled:
+            return
+        await client.send_command("Runtime.addBinding", {"name": BINDING_NAME})
+        result = await client.send_command(
+            "Page.addScriptToEvaluateOnNewDocument", {"source": OBSERVER_SCRIPT}
+        )
+        self._script_id = result.get("identifier")
+        self.enabled = True
+        # Buffered observers also pick up entries recorded before this point
+        await client.send_command("Runtime.evaluate", {"expression": OBSERVER_SCRIPT})
+
+    async def stop(self, client: Any) -> None:
+        """Remove the observer script and binding, keeping the last aggregate."""
+        self.enabled = False
+        commands: list[tuple[str, dict[str, Any]]] = [
+            ("Runtime.removeBinding", {"name": BINDING_NAME})
+        ]
+        if self._script_id is not None:
+            commands.append(
+                ("Page.removeScriptToEvaluateOnNewDocument", {"identifier": self._script_id})
+            )
+            self._script_id = None
+        await client.send_commands(commands)
+
+    def on_binding_called(self, params: dict[str, Any]) -> None:
+        """Handle ``Runtime.bindingCalled`` for the vitals binding."""
+        if not self.enabled or params.get("name") != BINDING_NAME:
+            return
+        try:
+            batch = json.loads(params["payload"])
+        except (KeyError, ValueError) as e:
+            logger.debug(f"Ignoring malformed web vitals payload: {e}")
+            return
+        self.batches += 1
+        time_origin = batch.get("timeOrigin", 0)
+        if self.current is None or time_origin > self.current.time_origin:
+            self.current = NavigationVitals(batch.get("url", ""), time_origin)
+        elif time_origin < self.current.time_origin:
+            return  # Late batch from a page that has since been replaced
+        for entry in batch.get("entries", []):
+            self.current.add(entry)
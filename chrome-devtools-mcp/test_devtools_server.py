@@ -8,11 +8,16 @@ This test suite validates all MCP tools using pytest framework.
 from __future__ import annotations
 
 import asyncio
+import base64
+import hashlib
+import inspect
+import json
 import logging
 import os
 import platform
 import subprocess
 import sys
+import time
 from collections.abc import AsyncGenerator
 from typing import Any
 
@@ -21,7 +26,37 @@ import pytest_asyncio
 
 sys.path.insert(0, os.path.dirname(__file__))
 
+from src.asset_audit import audit_assets, find_inline_blobs
+from src.benchmark import (
+    compare_samples,
+    format_table,
+    load_samples,
+    mann_whitney_u,
+    run_benchmark,
+    summarise_samples,
+)
+from src.body_capture import BodyCache, BodyCapture, fetch_bodies
+from src.body_stream import stream_resource
+from src.cache_analysis import analyse_cache, freshness_lifetime
 from src.client import ChromeDevToolsClient
+from src.cpu_profile import summarise_profile
+from src.crawler import audit_page, crawl, parse_sitemap
+from src.css_coverage import CSSCoverageTracker, merge_intervals
+from src.dom_mirror import DOMMirror
+from src.dom_snapshot import DOMSnapshot
+from src.fetch_replay import FetchReplay, ReplayRule
+from src.frame_contexts import evaluate_in_frames
+from src.har_export import HarWriter, build_entry, record_matches
+from src.image_audit import audit_images, image_dimensions
+from src.input_driver import compile_steps, run_sequence
+from src.jank_timeline import analyse_jank
+from src.metrics_sampler import RingBuffer, downsample
+from src.network_analysis import analyse_critical_path
+from src.response_shaping import ResponseStore, clip_text, shape_document, slice_text
+from src.screencast import frame_durations
+from src.stylesheet_cache import StylesheetCache
+from src.tools.utils import RawJSON, create_success_response, sanitise_data, trusted
+from src.web_vitals import BINDING_NAME
 
 logging.basicConfig(
     level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
@@ -29,6 +64,52 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+class FakeCommands:
+    """
+    Stand-in for ``ChromeDevToolsClient.send_command`` that records every call.
+
+    Responses are looked up by method. A dict is returned as it is; a callable is called
+    with the params and session ID, may be async, and may raise. Other methods return
+    an empty result.
+
+    Attributes:
+        calls: ``(method, params, session_id)`` for every command sent
+        peak: Largest number of commands in flight at once
+    """
+
+    def __init__(self, client: ChromeDevToolsClient, responses: dict[str, Any] | None = None):
+        self.responses = responses or {}
+        self.calls: list[tuple[str, dict[str, Any], str | None]] = []
+        self.in_flight = 0
+        self.peak = 0
+        client.send_command = self  # type: ignore[method-assign]
+
+    async def __call__(
+        self, method: str, params: dict[str, Any] | None = None, session_id: str | None = None
+    ) -> Any:
+        params = params or {}
+        self.calls.append((method, params, session_id))
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            response = self.responses.get(method, {})
+            if callable(response):
+                response = response(params, session_id)
+                if inspect.isawaitable(response):
+                    response = await response
+            return response
+        finally:
+            self.in_flight -= 1
+
+    def methods(self) -> list[str]:
+        """Return the method of every call in order."""
+        return [method for method, _, _ in self.calls]
+
+    def sent(self, method: str) -> list[tuple[dict[str, Any], str | None]]:
+        """Return ``(params, session_id)`` for every call of one method."""
+        return [(params, session) for name, params, session in self.calls if name == method]
+
+
 def get_chrome_path() -> str | None:
     """Get Chrome executable path for testing."""
     system = platform.system()
@@ -367,3 +448,1259 @@ async def test_search_elements(cdp_client: ChromeDevToolsClient) -> None:
     except Exception:
         # DOM search may not be fully available in all Chrome versions
         pytest.skip("DOM search not fully available in test environment")
+
+
+@pytest.mark.asyncio
+async def test_css_coverage_intervals() -> None:
+    """Test CSS coverage delta merging, byte accounting and a failed stop."""
+    assert merge_intervals([(5, 9), (0, 3), (2, 4), (9, 12), (20, 20)]) == [(0, 4), (5, 12)]
+
+    tracker = CSSCoverageTracker()
+    tracker.add_rule_usage(
+        [
+            {"styleSheetId": "1", "startOffset": 0, "endOffset": 10, "used": True},
+            {"styleSheetId": "1", "startOffset": 10, "endOffset": 20, "used": False},
+        ]
+    )
+    tracker.add_rule_usage([{"styleSheetId": "1", "startOffset": 5, "endOffset": 15, "used": True}])
+
+    summary = tracker.summarise_sheet("1", "a" * 30, include_unused_ranges=True)
+    assert summary["usedBytes"] == 15
+    assert summary["unusedBytes"] == 15
+    assert summary["unusedRanges"] == [[15, 30]]
+    assert (summary["usedRules"], summary["totalRules"]) == (2, 3)
+
+    # Tracking is marked inactive even when Chrome rejects the stop
+    def stop_tracking(params: dict[str, Any], session_id: str | None) -> dict[str, Any]:
+        raise RuntimeError("CSS agent is not enabled")
+
+    client = ChromeDevToolsClient()
+    FakeCommands(client, {"CSS.stopRuleUsageTracking": stop_tracking})
+    await tracker.start(client)
+    assert tracker.active
+    with pytest.raises(RuntimeError):
+        await tracker.stop(client)
+    assert not tracker.active
+
+
+@pytest.mark.asyncio
+async def test_stylesheet_cache_invalidation() -> None:
+    """Test stylesheet cache hits, event invalidation and byte-bounded eviction."""
+
+    class FakeClient:
+        def __init__(self) -> None:
+            self.calls = 0
+
+        async def send_command(self, method: str, params: dict[str, Any]) -> dict[str, Any]:
+            self.calls += 1
+            return {"text": params["styleSheetId"] * 10}
+
+    client = FakeClient()
+    cache = StylesheetCache(max_bytes=25)
+    cache.add_header({"styleSheetId": "a", "sourceURL": "mapping-slayer.css"})
+
+    assert await cache.get_text(client, "a") == ("a" * 10, False)
+    assert await cache.get_text(client, "a") == ("a" * 10, True)
+    assert client.calls == 1
+
+    cache.invalidate("a")
+    await cache.get_text(client, "a")
+    assert client.calls == 2
+
+    await cache.get_text(client, "b")
+    await cache.get_text(client, "c")
+    assert cache.size_bytes <= 25
+    assert (await cache.get_text(client, "a"))[1] is False
+
+
+def test_dom_snapshot_decoding() -> None:
+    """Test decoding of a columnar DOMSnapshot result and local filtering."""
+    strings = ["#document", "HTML", "DIV", "id", "map", "SPAN", "class", "marker exit", "block"]
+    result = {
+        "strings": strings,
+        "documents": [
+            {
+                "documentURL": -1,
+                "frameId": -1,
+                "nodes": {
+                    "parentIndex": [-1, 0, 1, 2, 2],
+                    "nodeType": [9, 1, 1, 1, 1],
+                    "nodeName": [0, 1, 2, 5, 5],
+                    "backendNodeId": [1, 2, 3, 4, 5],
+                    "attributes": [[], [], [3, 4], [6, 7], []],
+                },
+                "layout": {
+                    "nodeIndex": [3, 4],
+                    "bounds": [[10, 10, 20, 20], [500, 500, 5, 5]],
+                    "styles": [[8], [8]],
+                },
+            }
+        ],
+    }
+
+    snapshot = DOMSnapshot(result, ["display"])
+    assert len(snapshot.elements) == 4
+
+    markers = snapshot.query("#map > span.marker")
+    assert [node.backend_node_id for node in markers] == [4]
+    assert snapshot.describe(markers[0])["styles"] == {"display": "block"}
+    assert [node.backend_node_id for node in snapshot.query("span", [0, 0, 100, 100])] == [4]
+
+    with pytest.raises(ValueError):
+        snapshot.query("span:hover")
+
+
+@pytest.mark.asyncio
+async def test_dom_snapshot_capture(cdp_client: ChromeDevToolsClient) -> None:
+    """Test one-shot DOMSnapshot capture of the test page."""
+    await setup_test_page(cdp_client)
+
+    result = await cdp_client.send_command(
+        "DOMSnapshot.captureSnapshot", {"computedStyles": ["display"]}
+    )
+    snapshot = DOMSnapshot(result, ["display"])
+
+    matches = snapshot.query("#test-element.test-class")
+    assert len(matches) == 1, "Should find test element in snapshot"
+    assert matches[0].bounds is not None, "Test element should have a layout box"
+
+
+def test_dom_mirror_events() -> None:
+    """Test DOM mirror maintenance from mutation events and local querying."""
+
+    def element(node_id: int, name: str, attributes: list[str], **extra: Any) -> dict[str, Any]:
+        return {
+            "nodeId": node_id,
+            "nodeType": 1,
+            "nodeName": name.upper(),
+            "localName": name,
+            "attributes": attributes,
+            **extra,
+        }
+
+    body = element(3, "body", [], childNodeCount=1, children=[element(4, "div", ["id", "map"])])
+    root = {"nodeId": 1, "nodeType": 9, "nodeName": "#document", "childNodeCount": 1}
+    root["children"] = [element(2, "html", [], childNodeCount=1, children=[body])]
+
+    mirror = DOMMirror()
+    mirror.enabled = True
+    mirror.on_document_fetched({"depth": -1, "pierce": True}, {"root": root})
+    assert mirror.is_fresh
+
+    marker = element(5, "span", ["class", "marker"])
+    mirror.handle_event(
+        "DOM.childNodeInserted", {"parentNodeId": 4, "previousNodeId": 0, "node": marker}
+    )
+    assert mirror.query_selector_all(1, "#map > .marker") == [5]
+
+    mirror.handle_event("DOM.attributeModified", {"nodeId": 5, "name": "class", "value": "gone"})
+    assert mirror.query_selector_all(1, ".marker") == []
+
+    mirror.handle_event("DOM.childNodeRemoved", {"parentNodeId": 4, "nodeId": 5})
+    assert mirror.get(5) is None
+
+    mirror.handle_event("DOM.documentUpdated", {})
+    assert not mirror.is_fresh
+
+
+@pytest.mark.asyncio
+async def test_send_commands_concurrency() -> None:
+    """Test batched commands keep request order, return failures in place and cap concurrency."""
+    client = ChromeDevToolsClient()
+
+    async def evaluate(params: dict[str, Any], session_id: str | None) -> dict[str, Any]:
+        # Later commands finish first, so ordering cannot come from completion order
+        await asyncio.sleep(0.001 * (10 - params["n"]))
+        if params["n"] == 3:
+            raise TimeoutError("Command Runtime.evaluate timed out")
+        return {"n": params["n"], "session": session_id}
+
+    fake = FakeCommands(client, {"Runtime.evaluate": evaluate})
+    commands = [("Runtime.evaluate", {"n": n}) for n in range(10)]
+    results = await client.send_commands(commands, max_concurrency=3)
+    expected = [n if n != 3 else None for n in range(10)]
+    assert [r["n"] if isinstance(r, dict) else None for r in results] == expected
+    assert isinstance(results[3], TimeoutError)
+    assert fake.peak == 3
+
+    routed = await client.send_commands([("Runtime.evaluate", {"n": 0}, "S1")])
+    assert routed == [{"n": 0, "session": "S1"}]
+
+
+@pytest.mark.asyncio
+async def test_batch_inspect_elements(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test the batch tool truncates to max_nodes, fills columns and lists every error."""
+    from src import main
+    from src.tools.dom import register_dom_tools
+
+    tools: dict[str, Any] = {}
+
+    class Registry:
+        def tool(self) -> Any:
+            def register(fn: Any) -> Any:
+                tools[fn.__name__] = fn
+                return fn
+
+            return register
+
+    register_dom_tools(Registry())  # type: ignore[arg-type]
+    client = ChromeDevToolsClient()
+    client.connected = True
+
+    async def node_result(params: dict[str, Any], result: dict[str, Any]) -> dict[str, Any]:
+        await asyncio.sleep(0.001)
+        if params["nodeId"] == 2:
+            raise RuntimeError("No node with given id found")
+        return result
+
+    border = [10, 20, 110, 20, 110, 70, 10, 70]
+    model = {"model": {"border": border, "width": 100, "height": 50}}
+    fake = FakeCommands(
+        client,
+        {
+            "DOM.getAttributes": lambda params, _: node_result(
+                params, {"attributes": ["id", f"n{params['nodeId']}"]}
+            ),
+            "DOM.getBoxModel": lambda params, _: node_result(params, model),
+        },
+    )
+    monkeypatch.setattr(main, "cdp_client", client)
+    response = await tools["batch_inspect_elements"](
+        node_ids=[1, 2, 3, 4], max_concurrency=2, max_nodes=3
+    )
+    data = response["data"]
+    assert data["nodeIds"] == [1, 2, 3] and data["limitedResults"]
+    assert data["attributes"] == [{"id": "n1"}, None, {"id": "n3"}]
+    assert data["boxes"][0] == [10, 20, 100, 50] and data["boxes"][1] is None
+    assert list(data["errors"]) == ["2"] and len(data["errors"]["2"]) == 2
+    assert data["errors"]["2"][1].startswith("box_model: ")
+    assert data["commandCount"] == 6 and fake.peak == 2
+
+
+@pytest.mark.asyncio
+async def test_dom_mirror_adopts_shallow_fetch() -> None:
+    """Test another caller's shallow getDocument is adopted and filled in once."""
+    client = ChromeDevToolsClient()
+    mirror = client.dom_mirror
+    mirror.enabled = True
+
+    def request_child_nodes(params: dict[str, Any], session_id: str | None) -> dict[str, Any]:
+        html = {"nodeId": 11, "nodeType": 1, "nodeName": "HTML", "localName": "html"}
+        mirror.handle_event("DOM.setChildNodes", {"parentId": 10, "nodes": [html]})
+        return {}
+
+    fake = FakeCommands(client, {"DOM.requestChildNodes": request_child_nodes})
+    root = {"nodeId": 10, "nodeType": 9, "nodeName": "#document", "childNodeCount": 1}
+    mirror.on_document_fetched({"depth": 0}, {"root": root})
+    assert mirror.root is not None and mirror.root.node_id == 10 and mirror.incomplete
+
+    assert await mirror.ensure_fresh(client) and await mirror.ensure_fresh(client)
+    assert fake.methods() == ["DOM.requestChildNodes"] and fake.calls[0][1]["nodeId"] == 10
+    assert mirror.get(11) is not None and not mirror.incomplete
+
+    # DOM traffic from child sessions uses their own node IDs and leaves the mirror alone
+    await client._process_event(
+        {"method": "DOM.documentUpdated", "params": {}, "sessionId": "OOPIF"}
+    )
+    assert mirror.is_fresh
+
+
+def test_response_shaping() -> None:
+    """Test breadth-first tree budgets, continuation handles and text clipping."""
+    leaves = [
+        {"nodeId": 10 + i, "nodeType": 1, "nodeName": "LI", "localName": "li", "attributes": []}
+        for i in range(5)
+    ]
+    items = {"nodeId": 3, "nodeType": 1, "nodeName": "UL", "localName": "ul", "children": leaves}
+    body = {
+        "nodeId": 2,
+        "nodeType": 1,
+        "nodeName": "BODY",
+        "localName": "body",
+        "attributes": ["id", "app", "class", "dark wide"],
+        "children": [items],
+    }
+    root = {"nodeId": 1, "nodeType": 9, "nodeName": "#document", "children": [body]}
+
+    store = ResponseStore()
+    shaped, shaping = shape_document(root, store, max_nodes=4, compact=True)
+    assert shaped["k"][0]["n"] == "body#app.dark.wide"
+    assert shaping["nodesIncluded"] == 4
+    assert shaping["continueAt"] == [3]
+
+    tree, _ = store.get(shaping["handle"])
+    continued, rest = shape_document(
+        tree.index[3], store, max_nodes=10, compact=True, handle=shaping["handle"]
+    )
+    assert len(continued["k"]) == 5 and not rest["truncated"]
+
+    # A tree within the node budget is returned as Chrome sent it
+    whole, summary = shape_document(root, store, max_nodes=5000)
+    assert whole is root and summary == {"truncated": False, "nodesIncluded": 8, "encoding": "cdp"}
+    cut, summary = shape_document(root, store, max_nodes=4)
+    assert summary["truncated"] and summary["nodesIncluded"] == 4
+
+    clipped = clip_text("é" * 100, 51, store, "html")
+    assert clipped["truncated"] and clipped["continueAt"] == 50
+    data, _ = store.get(clipped["handle"])
+    window = slice_text(data, clipped["continueAt"], 1000)
+    assert clipped["text"] + window["text"] == "é" * 100
+    assert not window["truncated"]
+
+
+def test_response_serialisation_benchmark(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Benchmark response building on a 50k-node document decoded from JSON."""
+
+    def full_copy(data: Any) -> Any:
+        # The previous sanitiser: rebuild every container
+        if isinstance(data, dict):
+            return {k: full_copy(v) for k, v in data.items()}
+        if isinstance(data, list):
+            return [full_copy(item) for item in data]
+        return data
+
+    def count_values(data: Any) -> int:
+        if isinstance(data, dict):
+            return 1 + sum(count_values(v) for v in data.values())
+        if isinstance(data, list):
+            return 1 + sum(count_values(item) for item in data)
+        return 1
+
+    rows = [
+        {
+            "nodeId": 100 + i,
+            "nodeType": 1,
+            "nodeName": "DIV",
+            "localName": "div",
+            "attributes": ["class", f"marker m{i}"],
+            "children": [{"nodeId": 100_000 + i, "nodeType": 3, "nodeValue": f"#{i}"}],
+        }
+        for i in range(25_000)
+    ]
+    encoded = json.dumps({"nodeId": 1, "nodeType": 9, "children": rows})
+    root = json.loads(encoded)
+
+    start = time.perf_counter()
+    full_copy(root)
+    copy_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    checked = create_success_response(data={"root": root})
+    checked_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    response = create_success_response(data=trusted(root))
+    trusted_seconds = time.perf_counter() - start
+
+    logger.info(
+        f"50k nodes: full copy {copy_seconds * 1000:.1f}ms, checked "
+        f"{checked_seconds * 1000:.1f}ms, trusted {trusted_seconds * 1000:.3f}ms"
+    )
+    assert checked["data"]["root"] is root, "JSON-safe data should not be copied"
+    assert response["data"] is root
+
+    # The timings above are informational; what is asserted is how much gets walked
+    visits: list[Any] = []
+
+    def counted(data: Any) -> Any:
+        visits.append(data)
+        return sanitise_data(data)
+
+    monkeypatch.setattr("src.tools.utils.sanitise_data", counted)
+    create_success_response(data={"root": root})
+    assert len(visits) == count_values({"root": root}), "each value is visited once"
+    visits.clear()
+    create_success_response(data=trusted(root))
+    assert len(visits) == 1, "trusted data is not walked"
+
+    assert sanitise_data({"raw": RawJSON(encoded)})["raw"] == root
+    assert sanitise_data({"when": {1, 2}, 3: [b"x"]}) == {"when": "{1, 2}", "3": ["b'x'"]}
+
+    # Unchanged items before and after the first converted one are reused, not re-walked
+    mixed = [{"a": 1}, {2}, {"b": 2}]
+    cleaned = sanitise_data(mixed)
+    assert cleaned == [{"a": 1}, "{2}", {"b": 2}]
+    assert cleaned[0] is mixed[0] and cleaned[2] is mixed[2]
+
+    # Each level is walked once, so a converted leaf deep in the tree stays cheap
+    nested: Any = {1}
+    for _ in range(200):
+        nested = {"child": nested, "siblings": [1, 2]}
+    visits.clear()
+    cleaned = counted(nested)
+    assert len(visits) == count_values(nested)
+    for _ in range(200):
+        assert cleaned["siblings"] is nested["siblings"]
+        cleaned, nested = cleaned["child"], nested["child"]
+    assert cleaned == "{1}"
+
+
+@pytest.mark.asyncio
+async def test_body_capture_cache() -> None:
+    """Test body capture filtering, compression, spill files and LRU eviction."""
+    capture = BodyCapture()
+    capture.start("lazy", ["application/pdf"], max_body_bytes=10_000)
+    pdf = {"requestId": "1", "response": {"mimeType": "application/pdf"}, "encodedDataLength": 500}
+    capture.on_loading_finished(None, pdf)
+    capture.on_loading_finished(None, {**pdf, "requestId": "2", "encodedDataLength": 20_000})
+    capture.on_loading_finished(None, {"requestId": "3", "response": {"mimeType": "text/html"}})
+    assert capture.should_store("1") and not capture.should_store("2")
+    assert capture.skipped == 2
+
+    cache = BodyCache(max_memory_bytes=4096, max_disk_bytes=1 << 20, spill_bytes=1024)
+    binary = base64.b64encode(os.urandom(4096)).decode("ascii")
+    cache.put("big", binary, True, "application/pdf")
+    cache.put("text", "marker " * 1000, False, "text/css")
+    assert cache.stats()["diskBytes"] > 0 and cache.stats()["memoryBytes"] < 1024
+    assert cache.get("big") is not None and cache.get("big")[0] == binary
+    assert cache.get("text")[0] == "marker " * 1000
+
+    # Request IDs repeat across targets, so a worker's body does not replace the page's
+    cache.put("text", "worker", False, "text/css", session_id="W1")
+    assert cache.get("text")[0] == "marker " * 1000 and cache.get("text", "W1")[0] == "worker"
+
+    for index in range(50):
+        cache.put(f"css-{index}", os.urandom(300).hex(), False, "text/css")
+    assert (None, "css-0") not in cache and (None, "css-49") in cache
+    assert cache.memory_bytes <= cache.max_memory_bytes
+    cache.clear()
+    assert len(cache) == 0
+
+    # Disconnecting removes the spill directory rather than leaving it in the temp dir
+    client = ChromeDevToolsClient()
+    client.body_capture.cache.spill_bytes = 1024
+    client.body_capture.cache.put("big", binary, True, "application/pdf")
+    spill_dir = os.path.dirname(client.body_capture.cache._entries[(None, "big")].path)
+    assert os.path.isdir(spill_dir)
+    await client.disconnect()
+    assert not os.path.exists(spill_dir) and len(client.body_capture.cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_body_stream_chunks(tmp_path: Any) -> None:
+    """Test chunked streaming writes, hashes and slices a body without buffering it."""
+    body = os.urandom(10_000)
+
+    class FakeClient:
+        def __init__(self) -> None:
+            self.offset = 0
+            self.closed = False
+
+        async def send_command(self, method: str, params: dict[str, Any]) -> dict[str, Any]:
+            if method == "Network.loadNetworkResource":
+                return {"resource": {"success": True, "httpStatusCode": 200, "stream": "s1"}}
+            if method == "IO.close":
+                self.closed = True
+                return {}
+            chunk = body[self.offset : self.offset + params["size"]]
+            self.offset += len(chunk)
+            return {
+                "data": base64.b64encode(chunk).decode("ascii"),
+                "base64Encoded": True,
+                "eof": self.offset >= len(body),
+            }
+
+    client = FakeClient()
+    output = tmp_path / "plan.pdf"
+    url = "https://example.com/plan.pdf"
+    result = await stream_resource(
+        client, url, "frame", str(output), range_start=4090, range_length=20, chunk_bytes=4096
+    )
+    assert result.chunks == 3 and result.total_bytes == len(body)
+    assert result.digest == hashlib.sha256(body).hexdigest()
+    assert result.range_data == body[4090:4110]
+    assert output.read_bytes() == body and client.closed
+
+
+@pytest.mark.asyncio
+async def test_fetch_record_replay(tmp_path: Any) -> None:
+    """Test recording a response on first load and fulfilling it from cache on the next."""
+
+    class FakeClient:
+        def __init__(self) -> None:
+            self.calls: list[tuple[str, dict[str, Any]]] = []
+
+        async def send_command(
+            self, method: str, params: dict[str, Any] | None = None
+        ) -> dict[str, Any]:
+            self.calls.append((method, params or {}))
+            if method == "Fetch.getResponseBody":
+                return {"body": base64.b64encode(b"%PDF-1.7").decode(), "base64Encoded": True}
+            return {}
+
+    request = {"url": "https://example.com/plan.pdf", "method": "GET"}
+    headers = [
+        {"name": "Content-Type", "value": "application/pdf"},
+        {"name": "Content-Encoding", "value": "gzip"},
+    ]
+
+    recorder = FetchReplay()
+    client = FakeClient()
+    await recorder.start(client, str(tmp_path), rules=[ReplayRule("*.js", "block")])
+    await recorder._handle(client, {"requestId": "1", "request": request})
+    assert client.calls[-1] == (
+        "Fetch.continueRequest",
+        {"requestId": "1", "interceptResponse": True},
+    )
+    response = {"requestId": "1", "request": request, "responseStatusCode": 200}
+    await recorder._handle(client, {**response, "responseHeaders": headers})
+    await recorder._handle(client, {"requestId": "2", "request": {"url": "https://x/app.js"}})
+    assert client.calls[-1][0] == "Fetch.failRequest"
+    await recorder.stop(client)
+
+    replayer = FetchReplay()
+    client = FakeClient()
+    await replayer.start(client, str(tmp_path), mode="replay")
+    await replayer._handle(client, {"requestId": "3", "request": request})
+    method, params = client.calls[-1]
+    assert method == "Fetch.fulfillRequest" and params["responseCode"] == 200
+    assert base64.b64decode(params["body"]) == b"%PDF-1.7"
+    assert params["responseHeaders"] == headers[:1]
+    assert replayer.counters == {"replayed": 1}
+
+
+def test_har_export_streaming(tmp_path: Any) -> None:
+    """Test HAR entries carry ResourceTiming phases and the streamed file is valid HAR."""
+    timing = {
+        "requestTime": 100.0,
+        "dnsStart": 1.0,
+        "dnsEnd": 5.0,
+        "connectStart": 5.0,
+        "connectEnd": 20.0,
+        "sslStart": 10.0,
+        "sslEnd": 20.0,
+        "sendStart": 21.0,
+        "sendEnd": 22.0,
+        "receiveHeadersEnd": 72.0,
+    }
+    record = {
+        "requestId": "7",
+        "url": "https://maps.example.com/tiles.json?z=3",
+        "method": "GET",
+        "headers": {"Accept": "application/json"},
+        "wallTime": 1_700_000_000.0,
+        "initiator": {"type": "script"},
+        "status": "completed",
+        "finishedTimestamp": 100.1,
+        "encodedDataLength": 2048,
+        "response": {"status": 200, "mimeType": "application/json", "timing": timing},
+    }
+    entry = build_entry(record, {"body": "{}", "base64Encoded": False})
+    assert entry["timings"]["dns"] == 4 and entry["timings"]["connect"] == 15
+    assert entry["timings"]["wait"] == 50 and entry["timings"]["receive"] == 28
+    assert entry["request"]["queryString"] == [{"name": "z", "value": "3"}]
+    assert entry["_initiator"] == {"type": "script"}
+    assert entry["response"]["content"]["size"] == 2
+    binary = build_entry(record, {"body": "JVBERi0xLjc=", "base64Encoded": True})
+    assert binary["response"]["content"]["size"] == len(b"%PDF-1.7")
+    assert build_entry(record, {"body": "café"})["response"]["content"]["size"] == 5
+    assert record_matches(record, domain="maps.example.com", mime_types=["application/"])
+    assert not record_matches(record, start_time=1_800_000_000)
+
+    path = tmp_path / "session.har"
+    with open(path, "w", encoding="utf-8") as handle:
+        writer = HarWriter(handle, "Mapping Slayer — café")
+        for _ in range(3):
+            writer.write_entry(build_entry(record))
+        writer.close()
+    har = json.loads(path.read_text(encoding="utf-8"))
+    assert har["log"]["version"] == "1.2" and len(har["log"]["entries"]) == 3
+    assert har["log"]["pages"][0]["title"] == "Mapping Slayer — café"
+    assert writer.bytes_written == path.stat().st_size
+
+
+def test_network_critical_path() -> None:
+    """Test initiator linking, the critical path and serial chain savings."""
+
+    def request(request_id, url, kind, start, end, initiator, priority="High"):
+        return {
+            "requestId": request_id,
+            "url": url,
+            "resourceType": kind,
+            "priority": priority,
+            "timestamp": start,
+            "finishedTimestamp": end,
+            "initiator": initiator,
+            "type": "request",
+        }
+
+    page = "https://app.example.com/"
+    stack = {"type": "script", "stack": {"callFrames": [{"url": page + "app.js"}]}}
+    records = [
+        request("old", page, "Document", 5.0, 5.1, {"type": "other"}, "VeryHigh"),
+        request("doc", page, "Document", 10.0, 10.1, {"type": "other"}, "VeryHigh"),
+        request(
+            "css", page + "app.css", "Stylesheet", 10.02, 10.2, {"type": "parser", "url": page}
+        ),
+        request("app", page + "app.js", "Script", 10.05, 10.2, {"type": "parser", "url": page}),
+        request("chunk", page + "chunk.js", "Script", 10.2, 10.35, stack, "Low"),
+        request(
+            "data",
+            page + "data.json",
+            "Fetch",
+            10.35,
+            10.6,
+            {
+                "type": "script",
+                "stack": {"callFrames": [], "parent": {"callFrames": [{"url": page + "chunk.js"}]}},
+            },
+        ),
+    ]
+    timeline = {"DOMContentLoaded": 10.3, "load": 10.7}
+
+    report = analyse_critical_path(records, timeline)
+    assert report["requestsConsidered"] == 5
+    assert [hop["requestId"] for hop in report["criticalPath"]] == ["doc", "app", "chunk", "data"]
+    assert report["criticalPath"][2]["discoveryGapMs"] == 0
+    assert report["afterLastRequestMs"] == 100
+    assert [r["requestId"] for r in report["blockingResources"]] == ["css", "app"]
+
+    chain = report["serialChains"][0]
+    assert [r["url"] for r in chain["requests"]] == [
+        page + "app.js",
+        page + "chunk.js",
+        page + "data.json",
+    ]
+    assert chain["actualMs"] == 550 and chain["parallelMs"] == 250 and chain["savingMs"] == 300
+
+    # An iframe document requested before load must not restart the window
+    frame = request("frame", "https://ads.example/", "Document", 10.1, 10.3, {"type": "parser"})
+    with_frame = [{**r, "frameId": "main", "loaderId": r["requestId"]} for r in records[:2]]
+    with_frame += records[2:] + [{**frame, "frameId": "child", "loaderId": "frame"}]
+    framed = analyse_critical_path(with_frame, timeline, main_frame_id="main")
+    assert framed["requestsConsidered"] == 6
+    assert [hop["requestId"] for hop in framed["criticalPath"]] == ["doc", "app", "chunk", "data"]
+    assert analyse_critical_path(records + [frame], timeline)["requestsConsidered"] == 6
+
+    to_chunk = analyse_critical_path(records, timeline, marker_url="chunk.js")
+    assert to_chunk["criticalPath"][-1]["requestId"] == "chunk"
+    with pytest.raises(ValueError):
+        analyse_critical_path(records, timeline, marker="firstContentfulPaint")
+
+
+def test_cache_effectiveness() -> None:
+    """Test cache source totals, re-download waste and header issue detection."""
+
+    def fetch(url, size, headers, kind="Script", status=200, **flags):
+        return {
+            "requestId": url + str(size),
+            "url": url,
+            "method": "GET",
+            "resourceType": kind,
+            "status": "completed",
+            "encodedDataLength": size,
+            "servedFromCache": flags.pop("memory", False),
+            "response": {"status": status, "headers": headers, **flags},
+        }
+
+    weak = {"Cache-Control": "max-age=60"}
+    good = {"cache-control": "public, max-age=31536000, immutable", "ETag": '"v1"'}
+    records = [
+        fetch("https://cdn.example.com/app.js", 5000, weak),
+        fetch("https://cdn.example.com/app.js#x", 5000, weak),
+        fetch("https://cdn.example.com/app.js", 5000, weak),
+        fetch("https://cdn.example.com/lib.js", 9000, good),
+        fetch("https://cdn.example.com/lib.js", 0, good, fromDiskCache=True),
+        fetch("https://cdn.example.com/lib.js", 0, good, memory=True),
+        fetch("https://cdn.example.com/font.woff2", 300, {"Last-Modified": "x"}, "Font", 304),
+    ]
+    report = analyse_cache(records)
+    assert report["sources"]["network"] == {"requests": 5, "bytes": 24300}
+    assert report["sources"]["disk"]["requests"] == 1
+    assert report["sources"]["memory"]["requests"] == 1
+    assert report["bytesRedownloaded"] == 10000 and report["redundantUrls"] == 1
+
+    first, second = report["findings"]
+    assert first["url"] == "https://cdn.example.com/app.js" and first["downloads"] == 3
+    assert first["issues"] == ["no-validator", "short-max-age"]
+    assert second["url"].endswith("font.woff2") and second["revalidations"] == 1
+    assert second["issues"] == ["no-freshness-lifetime"]
+
+    expires = {
+        "Date": "Wed, 21 Oct 2026 07:28:00 GMT",
+        "Expires": "Thu, 22 Oct 2026 07:28:00 GMT",
+    }
+    assert freshness_lifetime(expires) == 86400
+    assert freshness_lifetime({"Cache-Control": "no-cache, max-age=600"}) == 0
+
+
+def test_asset_weight_audit() -> None:
+    """Test compression savings, duplicate hashes and inlined base64 blob detection."""
+    font = os.urandom(6000)
+    data_url = "data:font/ttf;base64," + base64.b64encode(font).decode()
+    script = ("const flags = {us: '" + data_url + "'};\n" + "let x = 1;\n" * 2000).encode()
+
+    def record(url, kind, size, mime):
+        response = {"mimeType": mime}
+        return {"url": url, "resourceType": kind, "encodedDataLength": size, "response": response}
+
+    assets = [
+        (
+            record("https://a.example.com/flags.js", "Script", len(script), "text/javascript"),
+            script,
+        ),
+        (record("https://a.example.com/copy.js", "Script", 3000, "text/javascript"), script),
+        (record(data_url, "Font", 0, "font/ttf"), font),
+    ]
+    report = audit_assets(assets, min_blob_bytes=4096)
+    assert report["assets"] == 3
+    assert report["duplicates"][0]["wastedBytes"] == 3000
+    assert len(report["inlineBlobs"]) == 3
+    assert report["inlineBlobs"][0]["decodedBytes"] == 6000
+    assert report["opportunities"][0] == {
+        "kind": "compression",
+        "url": "https://a.example.com/flags.js",
+        "savingBytes": len(script) - report["largestAssets"][0]["brotliBytes"],
+        "detail": report["opportunities"][0]["detail"],
+    }
+    assert {item["kind"] for item in report["opportunities"]} == {
+        "compression",
+        "duplicate",
+        "inline-base64",
+    }
+    assert find_inline_blobs("url(data:image/png;base64,QUJD)", min_bytes=5) == []
+
+    # Header bytes, already encoded responses and cache hits are not compression savings
+    served = record("https://a.example.com/gz.js", "Script", len(script) + 400, "text/javascript")
+    served["response"]["encodedDataLength"] = 400
+    gzipped = {**served, "response": {**served["response"], "headers": {"Content-Encoding": "br"}}}
+    cached = {**served, "url": "https://a.example.com/c.js", "servedFromCache": True}
+    report = audit_assets([(served, script), (gzipped, script), (cached, script)])
+    assert [row["transferBytes"] for row in report["largestAssets"]] == [
+        len(script),
+        len(script),
+        0,
+    ]
+    compression = [item for item in report["opportunities"] if item["kind"] == "compression"]
+    assert [item["url"] for item in compression] == ["https://a.example.com/gz.js"]
+
+
+def test_image_decode_cost() -> None:
+    """Test image header parsing and decoded versus displayed byte accounting."""
+    png = b"\x89PNG\r\n\x1a\n" + b"\x00\x00\x00\rIHDR" + bytes.fromhex("00000fa000000bb8")
+    jpeg = bytes.fromhex("ffd8ffe000104a46494600010100000100010000ffc0001108025801f403")
+    assert image_dimensions(png) == (4000, 3000)
+    assert image_dimensions(b"GIF89a\x10\x00\x20\x00") == (16, 32)
+    assert image_dimensions(jpeg) == (500, 600)
+    assert image_dimensions(b"not an image") is None
+
+    strings = ["https://maps.example.com/", "IMG", "src", "plan.png", "CANVAS", "width", "2000"]
+    strings += ["height", "icon.svg", "thumb.jpg"]
+    result = {
+        "strings": strings,
+        "documents": [
+            {
+                "documentURL": 0,
+                "frameId": -1,
+                "nodes": {
+                    "parentIndex": [-1, 0, 0, 0, 0],
+                    "nodeType": [9, 1, 1, 1, 1],
+                    "nodeName": [0, 1, 4, 1, 1],
+                    "backendNodeId": [1, 2, 3, 4, 5],
+                    "attributes": [[], [2, 3], [5, 6, 7, 6], [2, 8], [2, 9]],
+                },
+                "layout": {
+                    "nodeIndex": [1, 2, 3, 4],
+                    "bounds": [[0, 0, 200, 150], [0, 0, 100, 100], [0, 0, 16, 16], [0, 0, 9, 9]],
+                },
+            }
+        ],
+    }
+    snapshot = DOMSnapshot(result, [])
+    intrinsic = {"https://maps.example.com/plan.png": (4000, 3000)}
+    report = audit_images(snapshot, intrinsic, device_pixel_ratio=2.0)
+
+    assert report["images"] == 3 and report["canvases"] == 1
+    assert report["vector"] == 1 and report["unknownSize"] == 1
+    image, canvas = report["findings"]
+    assert image["url"] == "https://maps.example.com/plan.png"
+    assert image["decodedBytes"] == 48_000_000 and image["displayedBytes"] == 480_000
+    assert canvas["element"] == "canvas" and canvas["ratio"] == 100
+    assert report["wastedBytes"] == 47_520_000 + 15_840_000
+
+
+@pytest.mark.asyncio
+async def test_page_load_benchmark() -> None:
+    """Test benchmark runs wait for load, reset emulation and reject outliers."""
+    client = ChromeDevToolsClient()
+    loads = iter([100.0, 110.0, 105.0, 900.0, 102.0, 108.0])
+
+    def navigate(params: dict[str, Any], session_id: str | None) -> dict[str, Any]:
+        event = {"method": "Page.loadEventFired", "params": {"timestamp": 1.0}}
+        asyncio.get_running_loop().call_soon(
+            lambda: asyncio.ensure_future(client._process_event(event))
+        )
+        return {"frameId": "main"}
+
+    fake = FakeCommands(
+        client,
+        {
+            "Page.navigate": navigate,
+            "Page.addScriptToEvaluateOnNewDocument": {"identifier": "1"},
+            "Runtime.evaluate": lambda params, _: {
+                "result": {"value": {"load": next(loads), "fcp": 50.0, "lcp": None}}
+            },
+            "Runtime.getHeapUsage": {"usedSize": 1000, "totalSize": 2000},
+        },
+    )
+    result = await run_benchmark(
+        client, "https://example.com/", runs=6, cpu_throttling=4, network="fast-3g", settle_ms=0
+    )
+    calls = fake.methods()
+    assert len(result["samples"]) == 6 and "lcp" not in result["samples"][0]
+    assert calls.count("Network.clearBrowserCache") == 6
+    assert calls.count("Emulation.setCPUThrottlingRate") == 2
+    assert calls[-4:].count("Network.emulateNetworkConditions") == 1
+    assert not client.event_handlers["Page.loadEventFired"]
+
+    summary = summarise_samples(result["samples"])
+    assert summary["load"]["rejected"] == 1 and summary["load"]["max"] == 110
+    assert summary["load"]["p50"] == 105 and summary["heapUsed"]["stdev"] == 0
+    assert summarise_samples(result["samples"], drop_outliers=False)["load"]["max"] == 900
+
+
+def test_compare_benchmarks(tmp_path: Any) -> None:
+    """Test significance testing flags a real regression and ignores noise."""
+    baseline = [
+        {"load": 100.0 + i, "fcp": 50.0 + i % 3, "memory": {"heap": 10.0}} for i in range(12)
+    ]
+    candidate = [
+        {"load": 130.0 + i, "fcp": 50.0 + (i + 1) % 3, "memory": {"heap": 20.0}} for i in range(12)
+    ]
+    (tmp_path / "base.json").write_text(json.dumps({"samples": baseline}))
+    (tmp_path / "new.json").write_text(json.dumps(candidate))
+
+    rows = compare_samples(
+        load_samples(str(tmp_path / "base.json")),
+        load_samples(str(tmp_path / "new.json")),
+        higher_is_better=["memory.heap"],
+    )
+    verdicts = {row["metric"]: row["verdict"] for row in rows}
+    assert verdicts == {"fcp": "no change", "load": "regression", "memory.heap": "improvement"}
+    load = next(row for row in rows if row["metric"] == "load")
+    assert load["delta"] == 30 and load["ci"][0] > 0 and load["pValue"] < 0.001
+    assert format_table(rows).splitlines()[0].startswith("metric")
+
+    _, p_value = mann_whitney_u([1, 2, 3, 4, 5, 6, 7, 8], [5, 6, 7, 8, 9, 10, 11, 12])
+    assert abs(p_value - 0.0133) < 0.001
+
+
+def test_metrics_ring_buffer() -> None:
+    """Test ring buffer wrap-around, late metrics and min/max/avg downsampling."""
+    buffer = RingBuffer(capacity=100)
+    for second in range(250):
+        values = {"Nodes": float(second)}
+        if second >= 200:
+            values["JSHeapUsedSize"] = 1000.0 + second
+        buffer.append(1000.0 + second, values)
+
+    timestamps, values = buffer.window(["Nodes", "JSHeapUsedSize"])
+    assert buffer.count == 100 and timestamps[0] == 1150 and timestamps[-1] == 1249
+    assert values["Nodes"][0] == 150
+
+    raw = downsample(*buffer.window(["JSHeapUsedSize"], start=1190), max_points=100)
+    assert raw["series"]["JSHeapUsedSize"][:2] == [None, None]
+
+    reduced = downsample(timestamps, values, max_points=10)
+    assert len(reduced["timestamps"]) == 10
+    nodes = reduced["series"]["Nodes"]
+    assert nodes["min"][0] == 150 and nodes["max"][-1] == 249
+    assert nodes["avg"][0] == sum(range(150, 160)) / 10
+    assert reduced["series"]["JSHeapUsedSize"]["min"][:5] == [None] * 5
+
+
+@pytest.mark.asyncio
+async def test_web_vitals_aggregation() -> None:
+    """Test binding payloads aggregate into LCP, CLS session windows, INP and long tasks."""
+    client = ChromeDevToolsClient()
+    client.web_vitals.enabled = True
+
+    async def deliver(time_origin: float, entries: list[dict[str, Any]]) -> None:
+        payload = json.dumps({"url": "https://app/", "timeOrigin": time_origin, "entries": entries})
+        params = {"name": BINDING_NAME, "payload": payload}
+        await client._process_event({"method": "Runtime.bindingCalled", "params": params})
+
+    def shift(start: float, value: float, **extra: Any) -> dict[str, Any]:
+        return {
+            "type": "layout-shift",
+            "startTime": start,
+            "value": value,
+            "sources": ["div#map"],
+            **extra,
+        }
+
+    def event(interaction: int, duration: float) -> dict[str, Any]:
+        return {
+            "type": "event",
+            "name": "click",
+            "interactionId": interaction,
+            "duration": duration,
+        }
+
+    await deliver(1.0, [{"type": "lcp", "startTime": 900.0, "element": "img"}])
+    await deliver(
+        2.0, [{"type": "lcp", "startTime": 1800.0, "element": "img#plan", "url": "plan.png"}]
+    )
+    await deliver(
+        2.0,
+        [
+            shift(100, 0.05),
+            shift(600, 0.05),
+            shift(3000, 0.02),
+            shift(3100, 0.5, hadRecentInput=True),
+            event(1, 80),
+            event(1, 240),
+            event(2, 120),
+            {"type": "longtask", "startTime": 10, "duration": 120, "attribution": []},
+            {"type": "longtask", "startTime": 300, "duration": 60, "attribution": []},
+        ],
+    )
+    await deliver(1.0, [{"type": "lcp", "startTime": 9999.0}])
+
+    summary = client.web_vitals.current.summary()
+    assert summary["lcp"] == {
+        "value": 1800.0,
+        "rating": "good",
+        "element": "img#plan",
+        "resource": "plan.png",
+    }
+    assert summary["cls"]["value"] == 0.1 and summary["cls"]["sources"] == ["div#map"]
+    assert summary["inp"]["value"] == 240 and summary["inp"]["rating"] == "needs-improvement"
+    assert summary["longTasks"]["totalBlockingTimeMs"] == 80
+    assert [task["duration"] for task in summary["longTasks"]["worst"]] == [120, 60]
+
+    # A second start leaves the installed script alone
+    client = ChromeDevToolsClient()
+    fake = FakeCommands(client, {"Page.addScriptToEvaluateOnNewDocument": {"identifier": "1"}})
+    await client.web_vitals.start(client)
+    await client.web_vitals.start(client)
+    assert fake.methods().count("Page.addScriptToEvaluateOnNewDocument") == 1
+
+
+@pytest.mark.asyncio
+async def test_evaluate_in_frame_contexts() -> None:
+    """Test frame contexts are tracked per session and evaluated concurrently with timeouts."""
+    client = ChromeDevToolsClient()
+
+    def context(context_id: int, frame_id: str, default: bool = True) -> dict[str, Any]:
+        aux = {"isDefault": default, "frameId": frame_id}
+        return {"id": context_id, "origin": "https://maps.example", "auxData": aux}
+
+    async def event(method: str, params: dict[str, Any], session: str | None = None) -> None:
+        message: dict[str, Any] = {"method": method, "params": params}
+        if session:
+            message["sessionId"] = session
+        await client._process_event(message)
+
+    await event("Runtime.executionContextCreated", {"context": context(1, "main")})
+    await event("Runtime.executionContextCreated", {"context": context(2, "child")})
+    await event("Runtime.executionContextCreated", {"context": context(3, "main", False)})
+    target = {"targetId": "oopif", "type": "other", "url": "https://maps.example/"}
+    await event("Target.attachedToTarget", {"sessionId": "S1", "targetInfo": target})
+    await event("Runtime.executionContextCreated", {"context": context(1, "oopif")}, "S1")
+    await event("Runtime.executionContextCreated", {"context": context(2, "gone")})
+    await event("Runtime.executionContextDestroyed", {"executionContextId": 2}, "S1")
+    await event("Runtime.executionContextDestroyed", {"executionContextId": 2})
+    assert client.frame_contexts.contexts == {
+        "main": {"contextId": 1, "sessionId": None, "origin": "https://maps.example"},
+        "oopif": {"contextId": 1, "sessionId": "S1", "origin": "https://maps.example"},
+    }
+
+    async def evaluate(params: dict[str, Any], session_id: str | None) -> dict[str, Any]:
+        if session_id == "S1":
+            await asyncio.sleep(1)
+        return {"result": {"type": "string", "value": "ok"}}
+
+    child = {"frame": {"id": "child", "url": "about:blank"}}
+    tree = {"frame": {"id": "main", "url": "https://app/"}, "childFrames": [child]}
+    fake = FakeCommands(
+        client, {"Page.getFrameTree": {"frameTree": tree}, "Runtime.evaluate": evaluate}
+    )
+    results = await evaluate_in_frames(client, "document.title", timeout=0.05)
+
+    by_frame = {result["frameId"]: result for result in results}
+    assert [result["frameId"] for result in results] == ["main", "child", "oopif"]
+    assert by_frame["main"]["value"] == "ok"
+    assert by_frame["child"]["error"] == "No execution context for frame"
+    assert by_frame["oopif"]["timedOut"] and by_frame["oopif"]["outOfProcess"]
+    assert by_frame["oopif"]["frameUrl"] == "https://maps.example/"
+    calls = [(params["contextId"], session) for params, session in fake.sent("Runtime.evaluate")]
+    assert sorted(calls, key=str) == [(1, "S1"), (1, None)]
+
+
+@pytest.mark.asyncio
+async def test_worker_target_telemetry() -> None:
+    """Test worker events are tagged by target and worker CPU profiles are summarised."""
+    client = ChromeDevToolsClient()
+    worker = {"targetId": "W1", "type": "worker", "url": "https://app/core/workers/save-worker.js"}
+    await client._process_event(
+        {"method": "Target.attachedToTarget", "params": {"sessionId": "S1", "targetInfo": worker}}
+    )
+
+    def request(request_id: str) -> dict[str, Any]:
+        return {
+            "requestId": request_id,
+            "request": {"url": "https://app/api/save", "method": "POST"},
+            "timestamp": 1.0,
+        }
+
+    await client._process_event({"method": "Network.requestWillBeSent", "params": request("7")})
+    await client._process_event(
+        {"method": "Network.requestWillBeSent", "params": request("7"), "sessionId": "S1"}
+    )
+    await client._process_event(
+        {"method": "Network.loadingFailed", "params": {"requestId": "7"}, "sessionId": "S1"}
+    )
+    console = {"type": "log", "args": [{"value": "saved"}], "timestamp": 2.0}
+    await client._process_event(
+        {"method": "Runtime.consoleAPICalled", "params": console, "sessionId": "S1"}
+    )
+
+    page_request, worker_request = client.network_requests
+    assert page_request["targetType"] == "page" and page_request["status"] == "pending"
+    assert worker_request["targetType"] == "worker" and worker_request["status"] == "failed"
+    assert client.console_logs[0]["targetUrl"] == worker["url"]
+    assert client.frame_contexts.find_session("worker") == "S1"
+    assert client.frame_contexts.find_session("save-worker") == "S1"
+    with pytest.raises(ValueError):
+        client.frame_contexts.find_session("service_worker")
+
+    # Bodies are fetched from, and cached under, the session that loaded them
+    fake = FakeCommands(
+        client,
+        {
+            "Network.getResponseBody": lambda params, session_id: {
+                "body": f"from {session_id}",
+                "base64Encoded": False,
+            }
+        },
+    )
+    client.body_capture.cache.put("7", "cached page body", False, "application/json")
+    completed = [{**record, "status": "completed"} for record in client.network_requests]
+    bodies = await fetch_bodies(client, completed, 1024)
+    assert [body["body"] for body in bodies if body] == ["cached page body", "from S1"]
+    assert [session for _, session in fake.sent("Network.getResponseBody")] == ["S1"]
+
+    def node(node_id: int, name: str, children: list[int]) -> dict[str, Any]:
+        frame = {"functionName": name, "url": "save-worker.js" if name[0] != "(" else ""}
+        return {"id": node_id, "callFrame": frame, "children": children}
+
+    profile = {
+        "nodes": [
+            node(1, "(root)", [2, 5]),
+            node(2, "serialise", [3]),
+            node(3, "compress", [4]),
+            node(4, "serialise", []),
+            node(5, "(idle)", []),
+        ],
+        "startTime": 0,
+        "endTime": 10_000,
+        "samples": [3, 4, 4, 5],
+        "timeDeltas": [0, 2000, 2000, 2000],
+    }
+    summary = summarise_profile(profile)
+    assert summary["durationMs"] == 10 and summary["idleMs"] == 4 and summary["busyMs"] == 6
+    functions = {f["functionName"]: f for f in summary["functions"]}
+    assert functions["serialise"]["selfMs"] == 4 and functions["serialise"]["totalMs"] == 6
+    assert functions["compress"]["selfMs"] == 2 and functions["compress"]["totalMs"] == 6
+
+
+@pytest.mark.asyncio
+async def test_screencast_frames(tmp_path: Any) -> None:
+    """Test screencast frames are acked, de-duplicated by hash and written with a manifest."""
+    client = ChromeDevToolsClient()
+    fake = FakeCommands(client)
+    await client.screencast.start(client, str(tmp_path), max_width=640, every_nth_frame=2)
+    assert fake.calls[0] == (
+        "Page.startScreencast",
+        {"format": "jpeg", "everyNthFrame": 2, "quality": 80, "maxWidth": 640},
+        None,
+    )
+
+    for session, content, timestamp in ((1, b"a", 10.0), (2, b"a", 10.1), (3, b"b", 10.25)):
+        params = {
+            "data": base64.b64encode(content).decode(),
+            "sessionId": session,
+            "metadata": {"timestamp": timestamp},
+        }
+        await client._process_event({"method": "Page.screencastFrame", "params": params})
+    await client.screencast.stop(client)
+
+    acks = [params for params, _ in fake.sent("Page.screencastFrameAck")]
+    assert acks == [{"sessionId": 1}, {"sessionId": 2}, {"sessionId": 3}]
+    status = client.screencast.status()
+    assert status["framesReceived"] == 3 and status["framesKept"] == 2
+    assert status["duplicatesDropped"] == 1 and status["spanSeconds"] == 0.25
+    assert (tmp_path / "frame-00001.jpg").read_bytes() == b"b"
+    manifest = json.loads((tmp_path / "frames.json").read_text())
+    assert [frame["timestamp"] for frame in manifest["frames"]] == [10.0, 10.25]
+    assert frame_durations([10.0, 10.25]) == [250, 500]
+
+
+def test_jank_timeline() -> None:
+    """Test rAF gaps, long tasks, interactions and trace inputs align on one timeline."""
+    page = {
+        "start": 1000.0,
+        "end": 3000.0,
+        "marker": 1000.5,
+        "raf": [float(t) for t in [*range(1000, 1401, 16), *range(1500, 3000, 16)]],
+        "longTasks": [{"startTime": 1405.0, "duration": 90.0}],
+        "events": [
+            {
+                "name": "pointerdown",
+                "interactionId": 5,
+                "startTime": 1390.0,
+                "duration": 120.0,
+                "processingStart": 1410.0,
+                "processingEnd": 1490.0,
+            },
+        ],
+    }
+
+    def trace_event(name: str, page_ms: float, pid: int = 7, **extra: Any) -> dict[str, Any]:
+        return {"name": name, "ts": (page_ms + 50_000) * 1000, "pid": pid, **extra}
+
+    trace = [
+        trace_event("TimeStamp", 1000.5, args={"data": {"message": "mcp-jank-marker"}}),
+        trace_event("EventDispatch", 1420, dur=60_000, args={"data": {"type": "pointermove"}}),
+        trace_event("EventDispatch", 1420, pid=9, args={"data": {"type": "pointermove"}}),
+        trace_event("DroppedFrame", 1450),
+        trace_event("DroppedFrame", 1466),
+        trace_event("DrawFrame", 1510),
+    ]
+
+    report = analyse_jank(page, trace)
+    assert report["frameBudgetMs"] == 16
+    assert report["frames"]["droppedFrames"] == 5
+    assert report["frames"]["droppedPerSecond"] == [5, 0, 0]
+    assert report["frames"]["worstGaps"][0]["longTasks"][0]["durationMs"] == 90
+    interaction = report["interactions"][0]
+    assert interaction["inputToNextPaintMs"] == 120 and interaction["inputDelayMs"] == 20
+    assert interaction["processingMs"] == 80 and interaction["presentationDelayMs"] == 20
+    assert report["trace"]["droppedPerSecond"] == [2, 0, 0]
+    assert report["trace"]["inputToNextPaint"]["pointermove"]["count"] == 1
+    assert report["trace"]["slowestInputs"][0]["toNextPaintMs"] == 90
+    assert analyse_jank(page, [])["trace"] is None
+
+
+@pytest.mark.asyncio
+async def test_input_sequence_driver() -> None:
+    """Test steps compile to timed Input dispatches and runs produce jank samples."""
+    steps = [
+        {"type": "click", "x": 10, "y": 20},
+        {"type": "drag", "from": [0, 0], "to": [40, 20], "steps": 4, "durationMs": 40},
+        {"type": "wait", "ms": 10},
+        {"type": "key", "key": "a"},
+    ]
+    schedule, length = compile_steps(steps)
+    assert length == 50
+    assert [params["type"] for _, _, params in schedule[:3]] == [
+        "mouseMoved",
+        "mousePressed",
+        "mouseReleased",
+    ]
+    drag_moves = [(offset, params["x"]) for offset, _, params in schedule[5:9]]
+    assert drag_moves == [(10, 10), (20, 20), (30, 30), (40, 40)]
+    assert schedule[-2][2]["text"] == "a" and schedule[-2][2]["windowsVirtualKeyCode"] == 65
+    dot, _ = compile_steps([{"type": "key", "key": "."}])
+    assert dot[0][2]["windowsVirtualKeyCode"] == 0
+    with pytest.raises(ValueError):
+        compile_steps([{"type": "pinch"}])
+    with pytest.raises(ValueError, match="split it"):
+        compile_steps([{"type": "scroll", "x": 0, "y": 0, "yDistance": -20_000}])
+
+    client = ChromeDevToolsClient()
+    page = {
+        "start": 0.0,
+        "end": 100.0,
+        "marker": 0.0,
+        "raf": [0.0, 16.0, 32.0, 80.0, 96.0],
+        "longTasks": [{"startTime": 30.0, "duration": 60.0}],
+        "events": [],
+    }
+
+    fake = FakeCommands(
+        client,
+        {
+            "Runtime.evaluate": lambda params, _: (
+                {"result": {"value": page}} if "stop()" in params["expression"] else {}
+            )
+        },
+    )
+    result = await run_sequence(client, steps[:1], repeat=2, trace=False, pause_ms=0)
+    assert fake.methods().count("Input.dispatchMouseEvent") == 6
+    assert [sample["droppedFrames"] for sample in result["samples"]] == [2, 2]
+    assert result["summary"]["longTaskMs"]["p50"] == 60
+
+
+@pytest.mark.asyncio
+async def test_crawl_tab_pool(tmp_path: Any) -> None:
+    """Test pages are audited in separate tabs with timeouts and streamed to JSONL."""
+    urls, nested = parse_sitemap(
+        '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+        "<url><loc>https://app/a</loc></url><url><loc>https://app/slow</loc></url></urlset>"
+    )
+    assert urls == ["https://app/a", "https://app/slow"] and nested == []
+
+    client = ChromeDevToolsClient()
+    targets = iter(range(1, 10))
+
+    async def attach(params: dict[str, Any], session_id: str | None) -> dict[str, Any]:
+        # Chrome announces the session on the root before answering the command
+        info = {"targetId": params["targetId"], "type": "page", "url": "about:blank"}
+        attached = {"sessionId": f"S-{params['targetId']}", "targetInfo": info}
+        await client._process_event({"method": "Target.attachedToTarget", "params": attached})
+        return {"sessionId": attached["sessionId"]}
+
+    async def navigate(params: dict[str, Any], session_id: str | None) -> dict[str, Any]:
+        if params["url"].endswith("slow"):
+            return {}
+        events = [
+            ("Network.requestWillBeSent", {"requestId": "1", "request": {"url": "x.js"}}),
+            ("Network.loadingFailed", {"requestId": "1", "errorText": "net::ERR_FAILED"}),
+            ("Runtime.consoleAPICalled", {"type": "error", "args": [{"value": "boom"}]}),
+            ("Page.loadEventFired", {"timestamp": 1.0}),
+        ]
+        for event_method, event_params in events:
+            await client._process_event(
+                {"method": event_method, "params": event_params, "sessionId": session_id}
+            )
+        return {}
+
+    fake = FakeCommands(
+        client,
+        {
+            "Target.createTarget": lambda params, _: {"targetId": f"T{next(targets)}"},
+            "Target.attachToTarget": attach,
+            "Page.navigate": navigate,
+            "Runtime.evaluate": {"result": {"value": {"load": 120.0}}},
+        },
+    )
+    output = tmp_path / "crawl.jsonl"
+    summary = await crawl(client, urls, str(output), concurrency=2, timeout=0.1)
+
+    lines = [json.loads(line) for line in output.read_text().splitlines()]
+    by_url = {line["url"]: line for line in lines}
+    assert by_url["https://app/a"]["status"] == "ok"
+    assert by_url["https://app/a"]["failed"] == [{"url": "x.js", "error": "net::ERR_FAILED"}]
+    assert by_url["https://app/a"]["errors"] == ["boom"]
+    assert by_url["https://app/slow"]["status"] == "timeout"
+    assert summary["statuses"] == {"ok": 1, "timeout": 1}
+    assert summary["slowestLoads"] == [{"url": "https://app/a", "loadMs": 120.0}]
+    closed = [params["targetId"] for params, _ in fake.sent("Target.closeTarget")]
+    assert sorted(closed) == ["T1", "T2"] and not client.session_listeners
+    assert client.network_requests == [] and client.console_logs == []
+    assert client.frame_contexts.sessions == {}
+
+    # The deadline also covers opening the tab, and the tab is still closed
+    async def hang(params: dict[str, Any], session_id: str | None) -> dict[str, Any]:
+        await asyncio.sleep(10)
+        return {}
+
+    client = ChromeDevToolsClient()
+    fake = FakeCommands(
+        client, {"Target.createTarget": {"targetId": "T9"}, "Target.attachToTarget": hang}
+    )
+    result = await audit_page(client, "https://app/stuck", timeout=0.05)
+    assert result["status"] == "timeout"
+    assert fake.sent("Target.closeTarget") == [({"targetId": "T9"}, None)]